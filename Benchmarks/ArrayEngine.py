@@ -0,0 +1,275 @@
+"""
+
+ArrayEngine.py
+
+Written by Paul Mokotoff, prmoko@umich.edu
+Last Updated: 18 Oct 2026
+
+Microbenchmarks for the array engine in ReadADH (GetArrayLayout, GetIndexNames, and GetArrayEntries), compared against the functions it replaced (Flatten, GetShape, and WriteIndices).
+
+This is not a MagicDraw script. Run it from the repository root with any Python interpreter:
+
+    python Benchmarks/ArrayEngine.py
+
+The array functions are taken from ReadADH/main.py directly, without importing the MagicDraw modules that the rest of the script needs.
+
+"""
+
+###############################
+#                             #
+# IMPORTS                     #
+#                             #
+###############################
+
+import ast
+import os
+import timeit
+
+# -----------------------------------------------------------
+# -----------------------------------------------------------
+# -----------------------------------------------------------
+
+###############################
+#                             #
+# LOAD THE ARRAY ENGINE       #
+#                             #
+###############################
+
+# functions and settings needed from ReadADH
+ENGINE_NAMES = ["NAME_TABLES", "MAX_NAME_TABLES", "GetArrayLayout", "GetIndexNames", "GetArrayEntries"]
+
+def LoadEngine():
+    """
+
+    LoadEngine()
+
+    Compile the array engine out of ReadADH/main.py.
+
+    INPUTS:
+        none
+
+    OUTPUTS:
+        Engine: a dictionary with the array engine's functions and settings
+
+    """
+
+    # get the path to ReadADH
+    FilePath = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "ReadADH", "main.py")
+
+    # read the script
+    with open(FilePath) as File:
+        Tree = ast.parse(File.read(), FilePath)
+    # end with
+
+    # remember the statements that make up the engine
+    Body = []
+
+    # loop through the top-level statements
+    for Node in Tree.body:
+
+        # check for one of the engine's functions
+        if (isinstance(Node, ast.FunctionDef)) and (Node.name in ENGINE_NAMES):
+            Body.append(Node)
+
+        # check for one of the engine's settings
+        elif (isinstance(Node, ast.Assign)) and (all(isinstance(Target, ast.Name) and (Target.id in ENGINE_NAMES) for Target in Node.targets)):
+            Body.append(Node)
+
+        # end if
+    # end for
+
+    # compile the engine on its own
+    Tree.body = Body
+    Engine = {}
+    exec(compile(Tree, FilePath, "exec"), Engine)
+
+    # return the engine
+    return Engine
+
+# end LoadEngine
+
+# -----------------------------------------------------------
+# -----------------------------------------------------------
+# -----------------------------------------------------------
+
+###############################
+#                             #
+# PREVIOUS ARRAY FUNCTIONS    #
+#                             #
+###############################
+
+def Flatten(Arr):
+
+    # flatten the array recursively
+    FlatArr = []
+    for Elem in Arr:
+        if isinstance(Elem, list):
+            FlatArr.extend(Flatten(Elem))
+        else:
+            FlatArr.append(Elem)
+        # end if
+    # end for
+
+    # return the flattened array
+    return FlatArr
+
+# end Flatten
+
+# -----------------------------------------------------------
+
+def GetShape(Arr):
+
+    # get the shape recursively from the first element
+    if isinstance(Arr, list):
+        InnerShape = GetShape(Arr[0])
+        return (len(Arr),) + InnerShape if InnerShape else (len(Arr),)
+    # end if
+
+    # return nothing if it's not a list
+    return ()
+
+# end GetShape
+
+# -----------------------------------------------------------
+
+def WriteIndices(Name, *Shapes):
+
+    # initialize an index tuple to track current positions
+    CurIndex = [0] * len(Shapes)
+
+    # iterate until all names are written
+    while True:
+
+        # write the name
+        OutString = Name
+        for ishape in range(len(Shapes)):
+            OutString += "__" + str(CurIndex[ishape])
+        # end for
+        yield OutString
+
+        # increment the index, starting from the last dimension
+        for idim in reversed(range(len(Shapes))):
+            CurIndex[idim] += 1
+            if (CurIndex[idim] < Shapes[idim]):
+                break
+            else:
+                CurIndex[idim] = 0
+            # end if
+        else:
+            return
+        # end for
+    # end while
+
+# end WriteIndices
+
+# -----------------------------------------------------------
+
+def PreviousEntries(Name, Arr):
+
+    # get the shape, names, and values as ReadData used to
+    MyShape = GetShape(Arr)
+    FlattenedValue = Flatten(Arr)
+
+    # get the number of elements
+    nelem = 1
+    for idim in MyShape:
+        nelem *= idim
+    # end for
+
+    # pair the names and values
+    return [(iname if (nelem > 1) else Name, FlattenedValue[ielem]) for ielem, iname in enumerate(WriteIndices(Name, *MyShape))]
+
+# end PreviousEntries
+
+# -----------------------------------------------------------
+# -----------------------------------------------------------
+# -----------------------------------------------------------
+
+###############################
+#                             #
+# BENCHMARKS                  #
+#                             #
+###############################
+
+def TimeCase(Label, Function, Repeats):
+    """
+
+    TimeCase(Label, Function, Repeats)
+
+    Print the best time per call of a function.
+
+    INPUTS:
+        Label   : the name of the case
+
+        Function: the function to be timed (no arguments)
+
+        Repeats : the number of calls per timing
+
+    OUTPUTS:
+        none
+
+    """
+
+    # take the best of five timings
+    Best = min(timeit.repeat(Function, number=Repeats, repeat=5))
+
+    # print the time per call
+    print("    %-34s %10.1f us" % (Label, 1.0e6 * Best / Repeats))
+
+# end TimeCase
+
+# -----------------------------------------------------------
+
+def main():
+
+    # get the array engine
+    Engine = LoadEngine()
+    GetArrayEntries = Engine["GetArrayEntries"]
+    NameTables      = Engine["NAME_TABLES"]
+
+    # a spline with 500 points, a 100 x 100 table, and a ragged array
+    Spline = [[0.01 * ipnt, 0.02 * ipnt, 0.0] for ipnt in range(500)]
+    Table  = [[irow + 0.001 * icol for icol in range(100)] for irow in range(100)]
+    Ragged = [[1.0], [2.0, 3.0], [4.0, 5.0]]
+
+    # check that both engines name rectangular arrays the same way
+    for Arr in [Spline, Table, [[7.0]], [1, 2, 3]]:
+        assert PreviousEntries("x", Arr) == GetArrayEntries("x", Arr)
+    # end for
+
+    # show how each engine names a ragged array
+    print("Ragged array [[1], [2, 3], [4, 5]]:")
+    print("    previous: " + ", ".join("%s = %g" % Entry for Entry in PreviousEntries("x", Ragged)))
+    print("    engine  : " + ", ".join("%s = %g" % Entry for Entry in GetArrayEntries("x", Ragged)))
+    print("")
+
+    # time each case
+    for Label, Arr, Repeats in [("Spline (500 x 3)", Spline, 200), ("Table (100 x 100)", Table, 20), ("Ragged (3 rows)", Ragged, 20000)]:
+
+        # print the case
+        print(Label + ":")
+
+        # time the previous functions
+        TimeCase("Flatten/GetShape/WriteIndices", lambda: PreviousEntries("x", Arr), Repeats)
+
+        # time the engine when the names are already known
+        TimeCase("GetArrayEntries (names cached)", lambda: GetArrayEntries("x", Arr), Repeats)
+
+        # time the engine when the names must be written
+        TimeCase("GetArrayEntries (names written)", lambda: (NameTables.clear(), GetArrayEntries("x", Arr)), Repeats)
+
+        # leave a blank line
+        print("")
+
+    # end for
+
+# end main
+
+# -----------------------------------------------------------
+# -----------------------------------------------------------
+# -----------------------------------------------------------
+
+# run the benchmarks
+if (__name__ == "__main__"):
+    main()
+# end if
@@ -0,0 +1,272 @@
+"""
+
+DiffEngine.py
+
+Written by Paul Mokotoff, prmoko@umich.edu
+Last Updated: 18 Oct 2026
+
+Benchmarks for the structural diff engine in UpdateADH (DiffADH), which lists the changes needed to make a model match an ADH without changing the model, with and without skipping the parts that are equal (SKIP_UNCHANGED).
+
+This is not a MagicDraw script. Run it from the repository root with any Python interpreter:
+
+    python Benchmarks/DiffEngine.py
+
+The diff engine is taken from UpdateADH/main.py directly, without importing the MagicDraw modules that the rest of the script needs. Large ADH pairs are made by copying the air vehicle in the first demo ADH, and then changing some of the values in the copy.
+
+"""
+
+###############################
+#                             #
+# IMPORTS                     #
+#                             #
+###############################
+
+import ast
+import copy
+import json
+import os
+import timeit
+
+# -----------------------------------------------------------
+# -----------------------------------------------------------
+# -----------------------------------------------------------
+
+###############################
+#                             #
+# LOAD THE DIFF ENGINE        #
+#                             #
+###############################
+
+# functions and settings needed from UpdateADH
+ENGINE_NAMES = ["SKIP_UNCHANGED", "LAZY_EXPORT", "ABS_TOLERANCE", "REL_TOLERANCE", "INT_FLOAT_EQUAL", "NUMBER_TYPES", "ValuesDiffer", "DiffArray", "DiffADH"]
+
+def LoadEngine():
+    """
+
+    LoadEngine()
+
+    Compile the diff engine out of UpdateADH/main.py.
+
+    INPUTS:
+        none
+
+    OUTPUTS:
+        Engine: a dictionary with the diff engine's functions
+
+    """
+
+    # get the path to UpdateADH
+    FilePath = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "UpdateADH", "main.py")
+
+    # read the script
+    with open(FilePath) as File:
+        Tree = ast.parse(File.read(), FilePath)
+    # end with
+
+    # remember the statements that make up the engine
+    Body = []
+
+    # loop through the top-level statements
+    for Node in Tree.body:
+
+        # check for one of the engine's functions
+        if (isinstance(Node, ast.FunctionDef)) and (Node.name in ENGINE_NAMES):
+
+            # the timing decorator is part of the MagicDraw script, so leave it off
+            Node.decorator_list = []
+            Body.append(Node)
+
+        # check for one of the engine's settings
+        elif (isinstance(Node, ast.Assign)) and (all(isinstance(Target, ast.Name) and (Target.id in ENGINE_NAMES) for Target in Node.targets)):
+            Body.append(Node)
+
+        # end if
+    # end for
+
+    # compile the engine on its own
+    Tree.body = Body
+    Engine = {}
+    exec(compile(Tree, FilePath, "exec"), Engine)
+
+    # return the engine
+    return Engine
+
+# end LoadEngine
+
+# -----------------------------------------------------------
+# -----------------------------------------------------------
+# -----------------------------------------------------------
+
+###############################
+#                             #
+# ADH PAIRS                   #
+#                             #
+###############################
+
+def MakeADH(Copies):
+    """
+
+    MakeADH(Copies)
+
+    Make a large ADH by copying the air vehicle in the first demo ADH.
+
+    INPUTS:
+        Copies: the number of air vehicles in the ADH
+
+    OUTPUTS:
+        MyADH : the ADH, as a dictionary
+
+    """
+
+    # get the path to the demo
+    FilePath = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "Demo", "Step00.json")
+
+    # read the demo ADH
+    with open(FilePath) as File:
+        MyADH = json.load(File)
+    # end with
+
+    # get the system and its air vehicle
+    MySystem  = MyADH["aircraft_system"]
+    MyVehicle = MySystem.pop("air_vehicle")
+
+    # add each copy of the air vehicle
+    for icopy in range(Copies):
+        MySystem["air_vehicle_" + str(icopy)] = copy.deepcopy(MyVehicle)
+    # end for
+
+    # return the ADH
+    return MyADH
+
+# end MakeADH
+
+# -----------------------------------------------------------
+
+def ChangeValues(Data, Every, Count = None):
+    """
+
+    ChangeValues(Data, Every, Count = None)
+
+    Change every few numbers in an ADH (in place).
+
+    INPUTS:
+        Data : the ADH, or part of it
+
+        Every: how often a number is changed (e.g., 10 changes every tenth number)
+
+        Count: the number of numbers seen so far (optional)
+
+    OUTPUTS:
+        Data : the changed ADH
+
+    """
+
+    # start counting the numbers
+    if (Count is None):
+        Count = [0]
+    # end if
+
+    # get the keys (or indices) to be looped through
+    if (isinstance(Data, dict)):
+        Keys = [ikey for ikey in Data.keys() if (ikey != "wbs_no")]
+    elif (isinstance(Data, list)):
+        Keys = range(len(Data))
+    else:
+        return Data
+    # end if
+
+    # loop through the contents
+    for ikey in Keys:
+
+        # get the value
+        Value = Data[ikey]
+
+        # check for a number
+        if (isinstance(Value, (int, float))) and (not isinstance(Value, bool)):
+
+            # count the number and change it if needed
+            Count[0] += 1
+            if (Count[0] % Every == 0):
+                Data[ikey] = Value + 1
+            # end if
+
+        else:
+
+            # look inside the value
+            ChangeValues(Value, Every, Count)
+
+        # end if
+    # end for
+
+    # return the changed ADH
+    return Data
+
+# end ChangeValues
+
+# -----------------------------------------------------------
+# -----------------------------------------------------------
+# -----------------------------------------------------------
+
+###############################
+#                             #
+# BENCHMARKS                  #
+#                             #
+###############################
+
+def main():
+
+    # get the diff engine
+    Engine  = LoadEngine()
+    DiffADH = Engine["DiffADH"]
+
+    # loop through the sizes of the ADH and how often a number is changed
+    for Copies, Every in [(1, 10), (10, 10), (100, 10), (100, 1000), (100, 0)]:
+
+        # make the model export and the ADH it is compared against
+        Data1 = MakeADH(Copies)
+        Data2 = copy.deepcopy(Data1)
+
+        # change some of the numbers
+        if (Every > 0):
+            ChangeValues(Data2, Every)
+        # end if
+
+        # print the case
+        print("%3d air vehicle(s), %s:" % (Copies, ("every %d numbers changed" % Every) if (Every > 0) else "nothing changed"))
+
+        # loop through the settings
+        for Skipped in [0, 1]:
+
+            # compare every value or skip the parts that are equal
+            Engine["SKIP_UNCHANGED"] = Skipped
+
+            # list the changes once
+            Patch = DiffADH(Data1["aircraft_system"], Data2["aircraft_system"], "aircraft_system", "", 0, [None, None])
+
+            # count the blocks that own a change
+            Owners = set(MyChange[1].rsplit("::", 1)[0] for MyChange in Patch)
+
+            # time the diff (best of five)
+            Repeats = max(1, 20 // Copies)
+            Best = min(timeit.repeat(lambda: DiffADH(Data1["aircraft_system"], Data2["aircraft_system"], "aircraft_system", "", 0, [None, None]), number=Repeats, repeat=5))
+
+            # print the timing
+            print("    SKIP_UNCHANGED = %d: %6d changes in %5d blocks, %10.2f ms per diff" % (Skipped, len(Patch), len(Owners), 1.0e3 * Best / Repeats))
+
+        # end for
+
+        # leave a blank line
+        print("")
+
+    # end for
+
+# end main
+
+# -----------------------------------------------------------
+# -----------------------------------------------------------
+# -----------------------------------------------------------
+
+# run the benchmarks
+if (__name__ == "__main__"):
+    main()
+# end if
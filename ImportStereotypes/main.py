@@ -10,7 +10,7 @@ IMPORT STEREOTYPES:
 
  Written by Paul Mokotoff, prmoko@umich.edu
 
- Last Updated: 28 Mar 2025
+ Last Updated: 18 Oct 2026
 
  Inputs:
 
@@ -67,7 +67,187 @@ import javax.swing.LayoutStyle.ComponentPlacement as ComponentPlacement
 import javax.swing.WindowConstants                as WindowConstants
 
 # additional python/jython imports
+import functools
 import json
+import json.decoder as JSONDecoder
+import os
+import re
+import threading
+import time
+
+# -----------------------------------------------------------
+# -----------------------------------------------------------
+# -----------------------------------------------------------
+
+###############################
+#                             #
+# SETTINGS                    #
+#                             #
+###############################
+
+# time the hot functions and write a summary to <name>-Timing.txt next to the ADH (1) or not (0)
+TIME_ADH = 0
+
+# -----------------------------------------------------------
+# -----------------------------------------------------------
+# -----------------------------------------------------------
+
+###############################
+#                             #
+# TIMING INSTRUMENTATION      #
+#                             #
+###############################
+
+# calls and seconds spent in each timed function, and when and on which thread the action started
+TIMING_STATS = {}
+TIMING_START = [0.0, None]
+
+def Timed(Function):
+    """
+
+    Timed(Function)
+
+    Decorate a function so its calls and time are recorded when TIME_ADH is on. Only the outermost call on the thread that runs the action is recorded.
+
+    INPUTS:
+        Function     : the function to be timed
+
+    OUTPUTS:
+        TimedFunction: the timed function (or the function itself, if TIME_ADH is off)
+
+    """
+
+    # check if the function must be timed
+    if (TIME_ADH == 0):
+        return Function
+    # end if
+
+    # get the name of the function
+    Name = Function.__name__
+
+    # wrap the function
+    @functools.wraps(Function)
+    def TimedFunction(*args, **kwargs):
+
+        # get the statistics of the function: [calls, seconds, running]
+        Stats = TIMING_STATS.setdefault(Name, [0, 0.0, 0])
+
+        # skip recursive calls and other threads
+        if (Stats[2] == 1) or (threading.current_thread() is not TIMING_START[1]):
+            return Function(*args, **kwargs)
+        # end if
+
+        # time the call
+        Stats[2] = 1
+        Start    = time.time()
+
+        try:
+            return Function(*args, **kwargs)
+        finally:
+            Stats[0] += 1
+            Stats[1] += time.time() - Start
+            Stats[2]  = 0
+        # end try-finally
+    # end TimedFunction
+
+    # return the timed function
+    return TimedFunction
+
+# end Timed
+
+# -----------------------------------------------------------
+
+def ResetTiming():
+    """
+
+    ResetTiming()
+
+    Forget the statistics of an earlier action and start timing the current thread.
+
+    INPUTS:
+        none
+
+    OUTPUTS:
+        none
+
+    """
+
+    # forget the statistics and start timing
+    TIMING_STATS.clear()
+    TIMING_START[0] = time.time()
+    TIMING_START[1] = threading.current_thread()
+
+# end ResetTiming
+
+# -----------------------------------------------------------
+
+def GetSideFile(Filename, Suffix):
+    """
+
+    GetSideFile(Filename, Suffix)
+
+    Get the name of a file written next to an ADH, by replacing the ADH's extension (including a compression suffix, such as the ".gz" of ".json.gz") with a suffix, as: <ADH><Suffix>.
+
+    INPUTS:
+        Filename: the name of the ADH
+
+        Suffix  : the end of the file's name (e.g., "-Timing.txt")
+
+    OUTPUTS:
+        the name of the file
+
+    """
+
+    # leave off the ".gz" of a compressed ADH
+    if (Filename.lower().endswith(".gz")):
+        Filename = Filename[:-3]
+    # end if
+
+    # replace the extension of the ADH
+    return os.path.splitext(Filename)[0] + Suffix
+
+# end GetSideFile
+
+# -----------------------------------------------------------
+
+def WriteTiming(Filename):
+    """
+
+    WriteTiming(Filename)
+
+    Write the calls and time of each timed function (slowest first) to <name>-Timing.txt, next to the file given, if TIME_ADH is on.
+
+    INPUTS:
+        Filename: the name of the ADH read or written by the action
+
+    OUTPUTS:
+        none
+
+    """
+
+    # check if the functions were timed
+    if (TIME_ADH == 0):
+        return
+    # end if
+
+    # open a file next to the ADH
+    f = open(GetSideFile(Filename, "-Timing.txt"), "w")
+
+    try:
+
+        # write the total time and each function, slowest first
+        f.write("Total time: %.3f s\n\n" % (time.time() - TIMING_START[0]))
+        for Name, Stats in sorted(TIMING_STATS.items(), key = lambda Item: -Item[1][1]):
+            f.write("%-24s %10d calls %12.3f s\n" % (Name, Stats[0], Stats[1]))
+        # end for
+
+    finally:
+
+        # close the file
+        f.close()
+
+    # end try-finally
+# end WriteTiming
 
 # -----------------------------------------------------------
 # -----------------------------------------------------------
@@ -517,6 +697,675 @@ class FilenamePanel(JPanel):
 # -----------------------------------------------------------
 # -----------------------------------------------------------
 
+###############################
+#                             #
+# JSON EVENT PARSER           #
+#                             #
+###############################
+
+# regular expressions for skipping whitespace and reading numbers
+WHITESPACE = re.compile(r"[ \t\n\r]*")
+NUMBER     = re.compile(r"(-?(?:0|[1-9]\d*))(\.\d+)?([eE][-+]?\d+)?")
+NUMBER_RUN = re.compile(r"[-+0-9.eE]*")
+
+# constants that may be written in a JSON file (checked before reading a number)
+CONSTANTS = (("true"     , True        ), \
+             ("false"    , False       ), \
+             ("null"     , None        ), \
+             ("NaN"      , float("nan")), \
+             ("Infinity" , float("inf")), \
+             ("-Infinity", float("-inf")))
+
+class JSONEventParser():
+
+    # initialization function
+    def __init__(self, File, ChunkSize = 65536):
+        """
+
+        __init__(self, File, ChunkSize = 65536)
+
+        Initialize an event-driven JSON parser that reads a file in fixed-size chunks instead of loading it all at once.
+
+        INPUTS:
+            self     : the JSON event parser
+
+            File     : an open file object containing the JSON text
+
+            ChunkSize: (optional, default is 65536) the number of characters read from the file at a time
+
+        OUTPUTS:
+            none
+
+        """
+
+        # remember the file and chunk size
+        self.File      = File
+        self.ChunkSize = ChunkSize
+
+        # start with an empty buffer
+        self.Buffer = ""
+        self.Pos    = 0
+
+        # flag that the end of the file has not been reached
+        self.EOF = False
+
+    # end __init__
+
+    # -------------------------------------------------------
+
+    # read another chunk of the file
+    def Fill(self):
+        """
+
+        Fill(self)
+
+        Read the next chunk of the file into the buffer, discarding any characters that were already parsed.
+
+        INPUTS:
+            self: the JSON event parser
+
+        OUTPUTS:
+            flag to show that more characters were read (True) or the end of the file was reached (False)
+
+        """
+
+        # check if the file is already exhausted
+        if (self.EOF):
+
+            # nothing else to read
+            return False
+
+        # end if
+
+        # read the next chunk
+        Chunk = self.File.read(self.ChunkSize)
+
+        # check if anything was read
+        if (not Chunk):
+
+            # flag the end of the file
+            self.EOF = True
+
+            # nothing else to read
+            return False
+
+        # end if
+
+        # keep only the unparsed characters and append the new chunk
+        self.Buffer = self.Buffer[self.Pos:] + Chunk
+        self.Pos    = 0
+
+        # more characters are available
+        return True
+
+    # end Fill
+
+    # -------------------------------------------------------
+
+    # get the next non-whitespace character
+    def Peek(self):
+        """
+
+        Peek(self)
+
+        Skip any whitespace and return the next character without consuming it.
+
+        INPUTS:
+            self: the JSON event parser
+
+        OUTPUTS:
+            the next character, or an empty string at the end of the file
+
+        """
+
+        # iterate until a character is found or the file ends
+        while True:
+
+            # skip the whitespace
+            self.Pos = WHITESPACE.match(self.Buffer, self.Pos).end()
+
+            # check if a character is available
+            if (self.Pos < len(self.Buffer)):
+
+                # return the character
+                return self.Buffer[self.Pos]
+
+            # end if
+
+            # otherwise, read more of the file
+            if (not self.Fill()):
+
+                # the file has ended
+                return ""
+
+            # end if
+        # end while
+    # end Peek
+
+    # -------------------------------------------------------
+
+    # read a string
+    def ReadString(self):
+        """
+
+        ReadString(self)
+
+        Read a JSON string starting at the current position (an opening quote). More chunks are only read while the closing quote is not in the buffer, so an invalid string raises its error right away.
+
+        INPUTS:
+            self: the JSON event parser
+
+        OUTPUTS:
+            Value: the decoded string
+
+        """
+
+        # where to look for the closing quote, counted from the opening quote
+        Offset = 1
+
+        # iterate until the closing quote is in the buffer
+        while True:
+
+            # find the next quote
+            End = self.Buffer.find('"', self.Pos + Offset)
+
+            # check if the string continues past the end of the buffer
+            if (End < 0):
+
+                # read the next chunk and look again from where this one ended
+                Offset = len(self.Buffer) - self.Pos
+                if (self.Fill()):
+                    continue
+                # end if
+
+                # otherwise, the decoder reports the unterminated string
+                break
+
+            # end if
+
+            # count the backslashes just before the quote
+            Text    = self.Buffer[self.Pos + 1:End]
+            Slashes = len(Text) - len(Text.rstrip("\\"))
+
+            # check if the quote closes the string (it is not escaped)
+            if (Slashes % 2 == 0):
+                break
+            # end if
+
+            # look past the escaped quote
+            Offset = End + 1 - self.Pos
+
+        # end while
+
+        # decode from just after the opening quote (an invalid string raises a ValueError)
+        Value, End = JSONDecoder.scanstring(self.Buffer, self.Pos + 1)
+
+        # move past the string
+        self.Pos = End
+
+        # return the string
+        return Value
+
+    # end ReadString
+
+    # -------------------------------------------------------
+
+    # read a number or constant
+    def ReadScalar(self):
+        """
+
+        ReadScalar(self)
+
+        Read a JSON number or constant (true, false, null, NaN, Infinity, -Infinity) starting at the current position.
+
+        INPUTS:
+            self: the JSON event parser
+
+        OUTPUTS:
+            the value that was read
+
+        """
+
+        # make sure the longest constant fits in the buffer
+        while ((len(self.Buffer) - self.Pos) < 9) and (self.Fill()):
+            pass
+        # end while
+
+        # check for each constant
+        for Name, Value in CONSTANTS:
+
+            # check if the buffer starts with the constant
+            if (self.Buffer.startswith(Name, self.Pos)):
+
+                # move past the constant
+                self.Pos += len(Name)
+
+                # return its value
+                return Value
+
+            # end if
+        # end for
+
+        # iterate until the whole number is in the buffer
+        while True:
+
+            # try matching a number
+            Match = NUMBER.match(self.Buffer, self.Pos)
+
+            # check that a number was found
+            if (Match is None):
+
+                # throw an error
+                raise ValueError("Expecting a JSON value at character " + repr(self.Buffer[self.Pos:self.Pos + 20]))
+
+            # end if
+
+            # check if the number may continue in the next chunk (the characters after the match could still be part of it, such as "1." before "5e-3")
+            if (NUMBER_RUN.match(self.Buffer, self.Pos).end() == len(self.Buffer)) and (self.Fill()):
+
+                # try again
+                continue
+
+            # end if
+
+            # move past the number
+            self.Pos = Match.end()
+
+            # get the parts of the number
+            Integer, Fraction, Exponent = Match.groups()
+
+            # check for an integer
+            if (Fraction is None) and (Exponent is None):
+
+                # return an integer
+                return int(Integer)
+
+            # end if
+
+            # return a float
+            return float(Integer + (Fraction or "") + (Exponent or ""))
+
+        # end while
+    # end ReadScalar
+
+    # -------------------------------------------------------
+
+    # generate the parsing events
+    def Events(self):
+        """
+
+        Events(self)
+
+        Parse the file and yield one event at a time, so the caller can act on the data before the whole file is read.
+
+        INPUTS:
+            self: the JSON event parser
+
+        OUTPUTS:
+            a generator of (Event, Value) tuples, where Event is "start_object", "end_object", "start_array", "end_array", "key", or "scalar"
+
+        """
+
+        # remember the open containers
+        Stack = []
+
+        # start by expecting a value
+        State = "value"
+
+        # iterate until the document ends
+        while True:
+
+            # get the next character
+            Char = self.Peek()
+
+            # check what is expected
+            if (State == "value") or (State == "value_or_end"):
+
+                # check for the end of an empty array
+                if (Char == "]") and (State == "value_or_end"):
+
+                    # close the array
+                    self.Pos += 1
+                    Stack.pop()
+                    yield ("end_array", None)
+
+                elif (Char == "{"):
+
+                    # open an object
+                    self.Pos += 1
+                    Stack.append("object")
+                    yield ("start_object", None)
+
+                    # expect a key (or an empty object)
+                    State = "key_or_end"
+
+                    # go to the next character
+                    continue
+
+                elif (Char == "["):
+
+                    # open an array
+                    self.Pos += 1
+                    Stack.append("array")
+                    yield ("start_array", None)
+
+                    # expect a value (or an empty array)
+                    State = "value_or_end"
+
+                    # go to the next character
+                    continue
+
+                elif (Char == "\""):
+
+                    # read the string
+                    yield ("scalar", self.ReadString())
+
+                elif (Char == ""):
+
+                    # the file ended too early
+                    raise ValueError("Unexpected end of the JSON file")
+
+                else:
+
+                    # read the number or constant
+                    yield ("scalar", self.ReadScalar())
+
+                # end if
+
+            elif (State == "key") or (State == "key_or_end"):
+
+                # check for the end of an empty object
+                if (Char == "}") and (State == "key_or_end"):
+
+                    # close the object
+                    self.Pos += 1
+                    Stack.pop()
+                    yield ("end_object", None)
+
+                elif (Char == "\""):
+
+                    # read the key
+                    Key = self.ReadString()
+
+                    # check for the separator
+                    if (self.Peek() != ":"):
+
+                        # throw an error
+                        raise ValueError("Expecting ':' after key " + repr(Key))
+
+                    # end if
+
+                    # move past the separator
+                    self.Pos += 1
+
+                    # yield the key
+                    yield ("key", Key)
+
+                    # expect its value
+                    State = "value"
+
+                    # go to the next character
+                    continue
+
+                else:
+
+                    # throw an error
+                    raise ValueError("Expecting a key in the JSON file, found " + repr(Char))
+
+                # end if
+
+            elif (State == "comma_or_end"):
+
+                # check for another item
+                if (Char == ","):
+
+                    # move past the comma
+                    self.Pos += 1
+
+                    # expect a key in an object or a value in an array
+                    if (Stack[-1] == "object"):
+                        State = "key"
+                    else:
+                        State = "value"
+                    # end if
+
+                    # go to the next character
+                    continue
+
+                elif (Char == "}") and (Stack[-1] == "object"):
+
+                    # close the object
+                    self.Pos += 1
+                    Stack.pop()
+                    yield ("end_object", None)
+
+                elif (Char == "]") and (Stack[-1] == "array"):
+
+                    # close the array
+                    self.Pos += 1
+                    Stack.pop()
+                    yield ("end_array", None)
+
+                else:
+
+                    # throw an error
+                    raise ValueError("Expecting ',' or a closing bracket in the JSON file, found " + repr(Char))
+
+                # end if
+
+            else:
+
+                # check that nothing follows the document
+                if (Char != ""):
+
+                    # throw an error
+                    raise ValueError("Extra data after the end of the JSON file")
+
+                # end if
+
+                # stop generating events
+                return
+
+            # end if
+
+            # a value was completed, so check if the document is done
+            if (len(Stack) == 0):
+                State = "done"
+            else:
+                State = "comma_or_end"
+            # end if
+
+        # end while
+    # end Events
+
+    # -------------------------------------------------------
+
+# end JSONEventParser
+
+# -----------------------------------------------------------
+# -----------------------------------------------------------
+# -----------------------------------------------------------
+
+###############################
+#                             #
+# FUNCTION FOR BUILDING A     #
+# VALUE FROM PARSING EVENTS   #
+#                             #
+###############################
+
+def BuildJSON(Event, Value, Events):
+    """
+
+    BuildJSON(Event, Value, Events)
+
+    Build a (possibly nested) value from parsing events, consuming only the events that belong to it.
+
+    INPUTS:
+        Event : the first event of the value
+
+        Value : the value attached to the first event
+
+        Events: the generator of the remaining parsing events
+
+    OUTPUTS:
+        Root  : the dictionary, list, or scalar that was built
+
+    """
+
+    # check for a scalar
+    if (Event == "scalar"):
+
+        # nothing else to build
+        return Value
+
+    elif (Event == "start_object"):
+
+        # start a dictionary
+        Root = {}
+
+    elif (Event == "start_array"):
+
+        # start a list
+        Root = []
+
+    else:
+
+        # throw an error
+        raise ValueError("BuildJSON: cannot start a value with a " + repr(Event) + " event")
+
+    # end if
+
+    # remember the open containers and their current keys
+    Stack = [Root]
+    Keys  = [None]
+
+    # loop through the events
+    for Event, Value in Events:
+
+        # check for the end of a container
+        if (Event == "end_object") or (Event == "end_array"):
+
+            # close the container
+            Stack.pop()
+            Keys.pop()
+
+            # check if the value is complete
+            if (len(Stack) == 0):
+
+                # return the value
+                return Root
+
+            # end if
+
+            # go to the next event
+            continue
+
+        # end if
+
+        # check for a key
+        if (Event == "key"):
+
+            # remember the key
+            Keys[-1] = Value
+
+            # go to the next event
+            continue
+
+        # end if
+
+        # create the new item
+        if (Event == "start_object"):
+            NewItem = {}
+        elif (Event == "start_array"):
+            NewItem = []
+        else:
+            NewItem = Value
+        # end if
+
+        # add the item to its container
+        if (isinstance(Stack[-1], dict)):
+            Stack[-1][Keys[-1]] = NewItem
+        else:
+            Stack[-1].append(NewItem)
+        # end if
+
+        # open the new container
+        if (Event != "scalar"):
+            Stack.append(NewItem)
+            Keys.append(None)
+        # end if
+
+    # end for
+
+    # the events ended before the value was complete
+    raise ValueError("Unexpected end of the JSON file")
+
+# end BuildJSON
+
+# -----------------------------------------------------------
+# -----------------------------------------------------------
+# -----------------------------------------------------------
+
+###############################
+#                             #
+# FUNCTION FOR LOADING A JSON #
+# FILE WITH THE EVENT PARSER  #
+#                             #
+###############################
+
+@Timed
+def LoadJSON(Filename, ChunkSize = 65536):
+    """
+
+    LoadJSON(Filename, ChunkSize = 65536)
+
+    Read a JSON file with the event parser, so the file is never held in memory as a single string.
+
+    INPUTS:
+        Filename : the name of the JSON file to read
+
+        ChunkSize: (optional, default is 65536) the number of characters read from the file at a time
+
+    OUTPUTS:
+        MyJSON   : the nested dictionary in the JSON file
+
+    """
+
+    # open the JSON file
+    f = open(Filename, "r")
+
+    try:
+
+        # get the parsing events
+        Events = JSONEventParser(f, ChunkSize).Events()
+
+        # get the first event
+        Event, Value = next(Events)
+
+        # build the nested dictionary
+        MyJSON = BuildJSON(Event, Value, Events)
+
+        # check that nothing follows the document
+        for Event, Value in Events:
+            pass
+        # end for
+
+    finally:
+
+        # close the file
+        f.close()
+
+    # end try-finally
+
+    # return the nested dictionary
+    return MyJSON
+
+# end LoadJSON
+
+# -----------------------------------------------------------
+# -----------------------------------------------------------
+# -----------------------------------------------------------
+
 ###############################
 #                             #
 # MODEL STRUCTURE GENERATOR   #
@@ -577,6 +1426,9 @@ class ModelStructureGenerator():
 
         """
 
+        # start timing the hot functions
+        ResetTiming()
+
         # try to create a session
         try:
 
@@ -601,6 +1453,10 @@ class ModelStructureGenerator():
             SM.getInstance().cancelSession(self.Project)
 
         # end try-except
+
+        # write where the time went
+        WriteTiming(Filename)
+
     # end execute
 
     # -------------------------------------------------------
@@ -638,17 +1494,8 @@ class ModelStructureGenerator():
         # try to open and read the JSON file
         try:
 
-            # open a JSON file
-            f = open(Filename, "r")
-
-            # read the file and return as a string
-            MyString = f.read()
-
-            # convert string to a nested dictionary
-            MyJSON = json.loads(MyString)
-
-            # close the file
-            f.close()
+            # read the JSON file with the event parser
+            MyJSON = LoadJSON(Filename)
 
             # traverse the nested dictionary and create stereotypes within the input class
             self.GetData(MyJSON, self.Profile)
@@ -664,6 +1511,7 @@ class ModelStructureGenerator():
     # -------------------------------------------------------
 
     # function to recursively get data from the JSON file
+    @Timed
     def GetData(self, MyJSON, MyParent):
         """
 
@@ -773,6 +1621,7 @@ class ModelStructureGenerator():
     # -------------------------------------------------------
 
     # function for creating stereotypes on each block
+    @Timed
     def ImportStereotype(self, MyParent, Value, Description = None):
         """
 
@@ -11,7 +11,7 @@ READ ADH:
 
 Written by Paul Mokotoff, prmoko@umich.edu
 
-Last Updated: 28 Mar 2025
+Last Updated: 18 Oct 2026
 
 Inputs:
 
@@ -48,6 +48,7 @@ import com.nomagic.magicdraw.uml.BaseElement                         as BaseElem
 import com.nomagic.magicdraw.uml.Finder                              as Finder
 import com.nomagic.uml2.ext.jmi.helpers.StereotypesHelper            as SH
 import com.nomagic.uml2.ext.magicdraw.classes.mdkernel               as MDKernel
+import com.nomagic.uml2.ext.magicdraw.mdprofiles.Stereotype          as Stereotype
 
 # import java packages
 import java.awt.Color     as Color
@@ -67,7 +68,220 @@ import javax.swing.LayoutStyle.ComponentPlacement as ComponentPlacement
 import javax.swing.WindowConstants                as WindowConstants
 
 # additional python/jython imports
+import functools
+import gzip
+import hashlib
+import itertools
 import json
+import json.decoder as JSONDecoder
+import os
+import Queue
+import re
+import struct
+import threading
+import time
+
+# -----------------------------------------------------------
+# -----------------------------------------------------------
+# -----------------------------------------------------------
+
+###############################
+#                             #
+# SETTINGS                    #
+#                             #
+###############################
+
+# stream the ADH into the model while it is parsed (1) or load the whole file before building the model (0)
+STREAM_ADH = 1
+
+# number of characters read from the ADH at a time
+CHUNK_SIZE = 65536
+
+# store arrays of values in a single value property (1) or in one value property per element (0)
+COMPACT_ARRAYS = 0
+
+# plan the whole import before changing the model (1, the ADH is loaded in full and STREAM_ADH is ignored) or not (0)
+PLAN_ADH = 0
+
+# re-import only the components whose content changed since the last import (1, the ADH is loaded in full and PLAN_ADH/STREAM_ADH are ignored) or not (0)
+INCREMENTAL_ADH = 0
+
+# split the import into sessions once this many elements were created (0 keeps the whole import in one session, >0 loads the ADH in full and PLAN_ADH/STREAM_ADH are ignored, so only the session size is bounded, not memory)
+SESSION_SIZE = 0
+
+# start a new session for every component (1, the ADH is loaded in full and PLAN_ADH/STREAM_ADH are ignored) or not (0)
+SESSION_PER_COMPONENT = 0
+
+# parse (and, with PLAN_ADH, plan) the ADH on a background thread while the model is built (1) or not (0)
+PIPELINE_ADH = 0
+
+# number of batches that may wait between the background thread and the model, and the number of items per batch
+PIPELINE_QUEUE = 64
+PIPELINE_BATCH = 256
+
+# time the hot functions and write a summary to <name>-Timing.txt next to the ADH (1) or not (0)
+TIME_ADH = 0
+
+# -----------------------------------------------------------
+# -----------------------------------------------------------
+# -----------------------------------------------------------
+
+###############################
+#                             #
+# TIMING INSTRUMENTATION      #
+#                             #
+###############################
+
+# calls and seconds spent in each timed function, and when and on which thread the action started
+TIMING_STATS = {}
+TIMING_START = [0.0, None]
+
+def Timed(Function):
+    """
+
+    Timed(Function)
+
+    Decorate a function so its calls and time are recorded when TIME_ADH is on. Only the outermost call on the thread that runs the action is recorded.
+
+    INPUTS:
+        Function     : the function to be timed
+
+    OUTPUTS:
+        TimedFunction: the timed function (or the function itself, if TIME_ADH is off)
+
+    """
+
+    # check if the function must be timed
+    if (TIME_ADH == 0):
+        return Function
+    # end if
+
+    # get the name of the function
+    Name = Function.__name__
+
+    # wrap the function
+    @functools.wraps(Function)
+    def TimedFunction(*args, **kwargs):
+
+        # get the statistics of the function: [calls, seconds, running]
+        Stats = TIMING_STATS.setdefault(Name, [0, 0.0, 0])
+
+        # skip recursive calls and other threads
+        if (Stats[2] == 1) or (threading.current_thread() is not TIMING_START[1]):
+            return Function(*args, **kwargs)
+        # end if
+
+        # time the call
+        Stats[2] = 1
+        Start    = time.time()
+
+        try:
+            return Function(*args, **kwargs)
+        finally:
+            Stats[0] += 1
+            Stats[1] += time.time() - Start
+            Stats[2]  = 0
+        # end try-finally
+    # end TimedFunction
+
+    # return the timed function
+    return TimedFunction
+
+# end Timed
+
+# -----------------------------------------------------------
+
+def ResetTiming():
+    """
+
+    ResetTiming()
+
+    Forget the statistics of an earlier action and start timing the current thread.
+
+    INPUTS:
+        none
+
+    OUTPUTS:
+        none
+
+    """
+
+    # forget the statistics and start timing
+    TIMING_STATS.clear()
+    TIMING_START[0] = time.time()
+    TIMING_START[1] = threading.current_thread()
+
+# end ResetTiming
+
+# -----------------------------------------------------------
+
+def GetSideFile(Filename, Suffix):
+    """
+
+    GetSideFile(Filename, Suffix)
+
+    Get the name of a file written next to an ADH, by replacing the ADH's extension (including a compression suffix, such as the ".gz" of ".json.gz") with a suffix, as: <ADH><Suffix>.
+
+    INPUTS:
+        Filename: the name of the ADH
+
+        Suffix  : the end of the file's name (e.g., "-Timing.txt")
+
+    OUTPUTS:
+        the name of the file
+
+    """
+
+    # leave off the ".gz" of a compressed ADH
+    if (Filename.lower().endswith(".gz")):
+        Filename = Filename[:-3]
+    # end if
+
+    # replace the extension of the ADH
+    return os.path.splitext(Filename)[0] + Suffix
+
+# end GetSideFile
+
+# -----------------------------------------------------------
+
+def WriteTiming(Filename):
+    """
+
+    WriteTiming(Filename)
+
+    Write the calls and time of each timed function (slowest first) to <name>-Timing.txt, next to the file given, if TIME_ADH is on.
+
+    INPUTS:
+        Filename: the name of the ADH read or written by the action
+
+    OUTPUTS:
+        none
+
+    """
+
+    # check if the functions were timed
+    if (TIME_ADH == 0):
+        return
+    # end if
+
+    # open a file next to the ADH
+    f = open(GetSideFile(Filename, "-Timing.txt"), "w")
+
+    try:
+
+        # write the total time and each function, slowest first
+        f.write("Total time: %.3f s\n\n" % (time.time() - TIMING_START[0]))
+        for Name, Stats in sorted(TIMING_STATS.items(), key = lambda Item: -Item[1][1]):
+            f.write("%-24s %10d calls %12.3f s\n" % (Name, Stats[0], Stats[1]))
+        # end for
+
+    finally:
+
+        # close the file
+        f.close()
+
+    # end try-finally
+# end WriteTiming
 
 # -----------------------------------------------------------
 # -----------------------------------------------------------
@@ -519,662 +733,4302 @@ class FilenamePanel(JPanel):
 
 ###############################
 #                             #
-# FUNCTION FOR FLATTENING AN  #
-# ARRAY                       #
+# JSON EVENT PARSER           #
 #                             #
 ###############################
 
-def Flatten(Arr):
-    """
+# regular expressions for skipping whitespace and reading numbers
+WHITESPACE = re.compile(r"[ \t\n\r]*")
+NUMBER     = re.compile(r"(-?(?:0|[1-9]\d*))(\.\d+)?([eE][-+]?\d+)?")
+NUMBER_RUN = re.compile(r"[-+0-9.eE]*")
 
-    Flatten(Arr)
+# constants that may be written in a JSON file (checked before reading a number)
+CONSTANTS = (("true"     , True        ), \
+             ("false"    , False       ), \
+             ("null"     , None        ), \
+             ("NaN"      , float("nan")), \
+             ("Infinity" , float("inf")), \
+             ("-Infinity", float("-inf")))
 
-    Flatten an array from a n-dimensional array into a 1-dimensional array.
+class JSONEventParser():
 
-    INPUTS:
-        Arr   : the n-dimensional array to be flattened
+    # initialization function
+    def __init__(self, File, ChunkSize = 65536):
+        """
 
-    OUTPUTS:
-        result: the flattened 1-dimensional array
+        __init__(self, File, ChunkSize = 65536)
 
-    """
+        Initialize an event-driven JSON parser that reads a file in fixed-size chunks instead of loading it all at once.
+
+        INPUTS:
+            self     : the JSON event parser
+
+            File     : an open file object containing the JSON text
 
-    # remember the result
-    result = []
+            ChunkSize: (optional, default is 65536) the number of characters read from the file at a time
+
+        OUTPUTS:
+            none
+
+        """
+
+        # remember the file and chunk size
+        self.File      = File
+        self.ChunkSize = ChunkSize
+
+        # start with an empty buffer
+        self.Buffer = ""
+        self.Pos    = 0
+
+        # flag that the end of the file has not been reached
+        self.EOF = False
+
+    # end __init__
 
     # -------------------------------------------------------
-    
-    # define helper function
-    def SubFlatten(SubArr):
+
+    # read another chunk of the file
+    def Fill(self):
         """
 
-        SubFlatten(SubArr)
+        Fill(self)
 
-        Recursively called function that takes each array element and expands it into a 1-dimensional array.
+        Read the next chunk of the file into the buffer, discarding any characters that were already parsed.
 
         INPUTS:
-            SubArr: the subset of the array being flattened
+            self: the JSON event parser
 
         OUTPUTS:
-            none (appended to "result" variable defined previously)
+            flag to show that more characters were read (True) or the end of the file was reached (False)
 
         """
 
-        # loop through all subarrays
-        for element in SubArr:
+        # check if the file is already exhausted
+        if (self.EOF):
 
-            # check if it's a list
-            if isinstance(element, list):
+            # nothing else to read
+            return False
 
-                # if so, flatten in
-                SubFlatten(element)
+        # end if
 
-            else:
+        # read the next chunk
+        Chunk = self.File.read(self.ChunkSize)
 
-                # append it to the result
-                result.append(element)
+        # check if anything was read
+        if (not Chunk):
 
-            # end if
-        # end for
-    # end SubFlatten
+            # flag the end of the file
+            self.EOF = True
 
-    # -------------------------------------------------------
-    
-    # recursively flatten each dimension
-    SubFlatten(Arr)
+            # nothing else to read
+            return False
 
-    # return the flattenened array
-    return result
+        # end if
 
-# end Flatten
+        # keep only the unparsed characters and append the new chunk
+        self.Buffer = self.Buffer[self.Pos:] + Chunk
+        self.Pos    = 0
 
-# -----------------------------------------------------------
-# -----------------------------------------------------------
-# -----------------------------------------------------------
+        # more characters are available
+        return True
 
-###############################
-#                             #
-# FUNCTION FOR GETTING AN     #
-# ARRAY'S SIZE                #
-#                             #
-###############################
+    # end Fill
 
-def GetShape(Arr):
-    """
+    # -------------------------------------------------------
 
-    GetShape(Arr)
+    # get the next non-whitespace character
+    def Peek(self):
+        """
 
-    Get the shape of an n-dimensional array by looking at the shape of its zero'th element recursively.
+        Peek(self)
 
-    INPUTS:
-        Arr: the array to be analyzed
+        Skip any whitespace and return the next character without consuming it.
 
-    OUTPUTS:
-        a tuple of length n, where n is the number of dimensions in the input array.
+        INPUTS:
+            self: the JSON event parser
 
-    """
-    
-    # check if the Array is a list
-    if isinstance(Arr, list):
+        OUTPUTS:
+            the next character, or an empty string at the end of the file
 
-        # get the inner shape recursively
-        InnerShape = GetShape(Arr[0])
+        """
 
-        # return the recursively called shape
-        return (len(Arr),) + InnerShape if InnerShape else (len(Arr),)
+        # iterate until a character is found or the file ends
+        while True:
 
-    # end if
+            # skip the whitespace
+            self.Pos = WHITESPACE.match(self.Buffer, self.Pos).end()
 
-    # return nothing if it's not a list
-    return ()
+            # check if a character is available
+            if (self.Pos < len(self.Buffer)):
 
-# end GetShape
+                # return the character
+                return self.Buffer[self.Pos]
 
-# -----------------------------------------------------------
-# -----------------------------------------------------------
-# -----------------------------------------------------------
+            # end if
 
-###############################
-#                             #
-# FUNCTION FOR RETURNING ALL  #
-# NAMES OF ARRAY ELEMENTS FOR #
-# AN N-DIMENSIONAL ARRAY      #
-#                             #
-###############################
+            # otherwise, read more of the file
+            if (not self.Fill()):
 
-def WriteIndices(Name, *Shapes):
-    """
+                # the file has ended
+                return ""
 
-    WriteIndices(Name, *Shapes)
+            # end if
+        # end while
+    # end Peek
 
-    Given an n-dimensional array, write all the names of the array elements as: VarName__i__j__...__k
+    # -------------------------------------------------------
 
-    INPUTS:
-        Name     : the name of the variable that will be repeated
+    # read a string
+    def ReadString(self):
+        """
 
-        *Shapes  : a tuple representing the shape of the array whose elements will be written out as described above
+        ReadString(self)
 
-    OUTPUTS:
-        OutString: a list of strings following the naming convention outlined previously
+        Read a JSON string starting at the current position (an opening quote). More chunks are only read while the closing quote is not in the buffer, so an invalid string raises its error right away.
 
-    """
+        INPUTS:
+            self: the JSON event parser
+
+        OUTPUTS:
+            Value: the decoded string
 
-    # initialize an index tuple to track current positions
-    CurIndex = [0] * len(Shapes)
+        """
 
-    # iterate until breaking out down below
-    while True:
-        
-        # remember the string "prefix"
-        OutString = Name
+        # where to look for the closing quote, counted from the opening quote
+        Offset = 1
 
-        # get the number of array dimensions
-        nshape = len(Shapes)
+        # iterate until the closing quote is in the buffer
+        while True:
 
-        # loop through the array dimensions
-        for ishape in range(nshape):
+            # find the next quote
+            End = self.Buffer.find('"', self.Pos + Offset)
 
-            # append a "dunder" (double underscore) and the next dimension's index
-            OutString += "__" + str(CurIndex[ishape])
+            # check if the string continues past the end of the buffer
+            if (End < 0):
 
-        # end for
+                # read the next chunk and look again from where this one ended
+                Offset = len(self.Buffer) - self.Pos
+                if (self.Fill()):
+                    continue
+                # end if
 
-        # yield the current string
-        yield OutString
-        
-        # start incrementing from the last dimension
-        for idim in reversed(range(len(Shapes))):
+                # otherwise, the decoder reports the unterminated string
+                break
 
-            # increment the dimension
-            CurIndex[idim] += 1
+            # end if
 
-            # check for overflow
-            if (CurIndex[idim] < Shapes[idim]):
+            # count the backslashes just before the quote
+            Text    = self.Buffer[self.Pos + 1:End]
+            Slashes = len(Text) - len(Text.rstrip("\\"))
 
-                # break out of the loop
+            # check if the quote closes the string (it is not escaped)
+            if (Slashes % 2 == 0):
                 break
-            
-            else:
-                
-                # reset current dimension and carry over to the next
-                CurIndex[idim] = 0
-                
-        else:
-            
-            # stop generating results
-            return
+            # end if
 
-        # end for
-    # end while
-# end WriteIndices
+            # look past the escaped quote
+            Offset = End + 1 - self.Pos
 
-# -----------------------------------------------------------
-# -----------------------------------------------------------
-# -----------------------------------------------------------
+        # end while
 
-###############################
-#                             #
-# MODEL STRUCTURE GENERATOR   #
-#                             #
-###############################
+        # decode from just after the opening quote (an invalid string raises a ValueError)
+        Value, End = JSONDecoder.scanstring(self.Buffer, self.Pos + 1)
 
-class ModelStructureGenerator():
+        # move past the string
+        self.Pos = End
 
-    # initialization function
-    def __init__(self):
+        # return the string
+        return Value
+
+    # end ReadString
+
+    # -------------------------------------------------------
+
+    # read a number or constant
+    def ReadScalar(self):
         """
 
-        __init__(self)
+        ReadScalar(self)
 
-        Initialize the model structure generator, which creates a SysML model.
+        Read a JSON number or constant (true, false, null, NaN, Infinity, -Infinity) starting at the current position.
 
         INPUTS:
-            self: the SysML model
+            self: the JSON event parser
 
         OUTPUTS:
-            none
+            the value that was read
 
         """
-        
-        # get the project
-        self.Project = Application.getInstance().getProject()
 
-        # get the elements factory
-        self.Factory = self.Project.getElementsFactory()
+        # make sure the longest constant fits in the buffer
+        while ((len(self.Buffer) - self.Pos) < 9) and (self.Fill()):
+            pass
+        # end while
 
-        # get the model element manager
-        self.Manager = MEM.getInstance()
+        # check for each constant
+        for Name, Value in CONSTANTS:
 
-        # get the model
-        self.Model = self.Project.getModel()
-        
-    # end __init__
+            # check if the buffer starts with the constant
+            if (self.Buffer.startswith(Name, self.Pos)):
 
-    # -------------------------------------------------------
+                # move past the constant
+                self.Pos += len(Name)
 
-    # action execution
-    def execute(self, Filename):
-        """
+                # return its value
+                return Value
 
-        execute(self, Filename)
+            # end if
+        # end for
 
-        Run the JSON parser and create the model elements for the SysML model.
+        # iterate until the whole number is in the buffer
+        while True:
 
-        INPUTS:
-            self         : the SysML model
+            # try matching a number
+            Match = NUMBER.match(self.Buffer, self.Pos)
 
-            Filename     : the name of the JSON file to be read for creating the SysML model
+            # check that a number was found
+            if (Match is None):
 
-        OUTPUTS:
-            none
+                # throw an error
+                raise ValueError("Expecting a JSON value at character " + repr(self.Buffer[self.Pos:self.Pos + 20]))
 
-        """        
-        
-        # try to create a session
-        try:
+            # end if
 
-            # create the session
-            SM.getInstance().createSession(self.Project, "Read ADH")            
+            # check if the number may continue in the next chunk (the characters after the match could still be part of it, such as "1." before "5e-3")
+            if (NUMBER_RUN.match(self.Buffer, self.Pos).end() == len(self.Buffer)) and (self.Fill()):
 
-            # get the block stereotype from the SysML stereotype profile
-            self.BlockSter = SH.getStereotype(self.Project, "Block", "SysML::Blocks")
+                # try again
+                continue
 
-            # get the requirement stereotype from the SysML stereotype profile
-            self.ReqSter = SH.getStereotype(self.Project, "Requirement", "SysML::Requirements")
+            # end if
 
-            # get the types for integers, reals, and strings
-            self.Integer = Finder.byQualifiedName().find(self.Project, "SysML::Libraries::PrimitiveValueTypes::Integer")
-            self.Real    = Finder.byQualifiedName().find(self.Project, "SysML::Libraries::PrimitiveValueTypes::Real")
-            self.String  = Finder.byQualifiedName().find(self.Project, "SysML::Libraries::PrimitiveValueTypes::String")
-            self.Boolean = Finder.byQualifiedName().find(self.Project, "SysML::Libraries::PrimitiveValueTypes::Boolean")
-            
-            # import the ADH and create stereotypes
-            self.ImportADH(Filename)
+            # move past the number
+            self.Pos = Match.end()
 
-            # close the session
-            SM.getInstance().closeSession(self.Project)
+            # get the parts of the number
+            Integer, Fraction, Exponent = Match.groups()
 
-        except Exception as e:
-            
-            # print that an exception occurred
+            # check for an integer
+            if (Fraction is None) and (Exponent is None):
+
+                # return an integer
+                return int(Integer)
+
+            # end if
+
+            # return a float
+            return float(Integer + (Fraction or "") + (Exponent or ""))
+
+        # end while
+    # end ReadScalar
+
+    # -------------------------------------------------------
+
+    # generate the parsing events
+    def Events(self):
+        """
+
+        Events(self)
+
+        Parse the file and yield one event at a time, so the caller can act on the data before the whole file is read.
+
+        INPUTS:
+            self: the JSON event parser
+
+        OUTPUTS:
+            a generator of (Event, Value) tuples, where Event is "start_object", "end_object", "start_array", "end_array", "key", or "scalar"
+
+        """
+
+        # remember the open containers
+        Stack = []
+
+        # start by expecting a value
+        State = "value"
+
+        # iterate until the document ends
+        while True:
+
+            # get the next character
+            Char = self.Peek()
+
+            # check what is expected
+            if (State == "value") or (State == "value_or_end"):
+
+                # check for the end of an empty array
+                if (Char == "]") and (State == "value_or_end"):
+
+                    # close the array
+                    self.Pos += 1
+                    Stack.pop()
+                    yield ("end_array", None)
+
+                elif (Char == "{"):
+
+                    # open an object
+                    self.Pos += 1
+                    Stack.append("object")
+                    yield ("start_object", None)
+
+                    # expect a key (or an empty object)
+                    State = "key_or_end"
+
+                    # go to the next character
+                    continue
+
+                elif (Char == "["):
+
+                    # open an array
+                    self.Pos += 1
+                    Stack.append("array")
+                    yield ("start_array", None)
+
+                    # expect a value (or an empty array)
+                    State = "value_or_end"
+
+                    # go to the next character
+                    continue
+
+                elif (Char == "\""):
+
+                    # read the string
+                    yield ("scalar", self.ReadString())
+
+                elif (Char == ""):
+
+                    # the file ended too early
+                    raise ValueError("Unexpected end of the JSON file")
+
+                else:
+
+                    # read the number or constant
+                    yield ("scalar", self.ReadScalar())
+
+                # end if
+
+            elif (State == "key") or (State == "key_or_end"):
+
+                # check for the end of an empty object
+                if (Char == "}") and (State == "key_or_end"):
+
+                    # close the object
+                    self.Pos += 1
+                    Stack.pop()
+                    yield ("end_object", None)
+
+                elif (Char == "\""):
+
+                    # read the key
+                    Key = self.ReadString()
+
+                    # check for the separator
+                    if (self.Peek() != ":"):
+
+                        # throw an error
+                        raise ValueError("Expecting ':' after key " + repr(Key))
+
+                    # end if
+
+                    # move past the separator
+                    self.Pos += 1
+
+                    # yield the key
+                    yield ("key", Key)
+
+                    # expect its value
+                    State = "value"
+
+                    # go to the next character
+                    continue
+
+                else:
+
+                    # throw an error
+                    raise ValueError("Expecting a key in the JSON file, found " + repr(Char))
+
+                # end if
+
+            elif (State == "comma_or_end"):
+
+                # check for another item
+                if (Char == ","):
+
+                    # move past the comma
+                    self.Pos += 1
+
+                    # expect a key in an object or a value in an array
+                    if (Stack[-1] == "object"):
+                        State = "key"
+                    else:
+                        State = "value"
+                    # end if
+
+                    # go to the next character
+                    continue
+
+                elif (Char == "}") and (Stack[-1] == "object"):
+
+                    # close the object
+                    self.Pos += 1
+                    Stack.pop()
+                    yield ("end_object", None)
+
+                elif (Char == "]") and (Stack[-1] == "array"):
+
+                    # close the array
+                    self.Pos += 1
+                    Stack.pop()
+                    yield ("end_array", None)
+
+                else:
+
+                    # throw an error
+                    raise ValueError("Expecting ',' or a closing bracket in the JSON file, found " + repr(Char))
+
+                # end if
+
+            else:
+
+                # check that nothing follows the document
+                if (Char != ""):
+
+                    # throw an error
+                    raise ValueError("Extra data after the end of the JSON file")
+
+                # end if
+
+                # stop generating events
+                return
+
+            # end if
+
+            # a value was completed, so check if the document is done
+            if (len(Stack) == 0):
+                State = "done"
+            else:
+                State = "comma_or_end"
+            # end if
+
+        # end while
+    # end Events
+
+    # -------------------------------------------------------
+
+# end JSONEventParser
+
+# -----------------------------------------------------------
+# -----------------------------------------------------------
+# -----------------------------------------------------------
+
+###############################
+#                             #
+# MESSAGEPACK EVENT PARSER    #
+#                             #
+###############################
+
+# fixed-size MessagePack types: (struct format, number of bytes), by type byte
+MSGPACK_NUMBERS = {0xca : (">f", 4), 0xcb : (">d", 8), \
+                   0xcc : (">B", 1), 0xcd : (">H", 2), 0xce : (">I", 4), 0xcf : (">Q", 8), \
+                   0xd0 : (">b", 1), 0xd1 : (">h", 2), 0xd2 : (">i", 4), 0xd3 : (">q", 8)}
+
+# MessagePack types that hold a length: (kind, struct format of the length, number of bytes), by type byte
+MSGPACK_SIZED = {0xc4 : ("bytes" , ">B", 1), 0xc5 : ("bytes" , ">H", 2), 0xc6 : ("bytes" , ">I", 4), \
+                 0xd9 : ("string", ">B", 1), 0xda : ("string", ">H", 2), 0xdb : ("string", ">I", 4), \
+                 0xdc : ("array" , ">H", 2), 0xdd : ("array" , ">I", 4), \
+                 0xde : ("object", ">H", 2), 0xdf : ("object", ">I", 4)}
+
+class MsgPackEventParser():
+
+    # initialization function
+    def __init__(self, File, ChunkSize = 65536):
+        """
+
+        __init__(self, File, ChunkSize = 65536)
+
+        Initialize an event-driven MessagePack parser that reads a file in fixed-size chunks, and makes the same events as the JSON event parser.
+
+        INPUTS:
+            self     : the MessagePack event parser
+
+            File     : an open file object (in binary mode) containing the MessagePack data
+
+            ChunkSize: (optional, default is 65536) the number of bytes read from the file at a time
+
+        OUTPUTS:
+            none
+
+        """
+
+        # remember the file and chunk size
+        self.File      = File
+        self.ChunkSize = ChunkSize
+
+        # start with an empty buffer
+        self.Buffer = ""
+        self.Pos    = 0
+
+    # end __init__
+
+    # -------------------------------------------------------
+
+    # read a number of bytes
+    def Read(self, Size):
+        """
+
+        Read(self, Size)
+
+        Read a number of bytes, reading more chunks of the file as needed.
+
+        INPUTS:
+            self: the MessagePack event parser
+
+            Size: the number of bytes to read
+
+        OUTPUTS:
+            the bytes read
+
+        """
+
+        # read chunks until enough bytes are buffered
+        while (len(self.Buffer) - self.Pos < Size):
+
+            # read the next chunk
+            Chunk = self.File.read(max(Size, self.ChunkSize))
+
+            # check if anything was read
+            if (not Chunk):
+
+                # throw an error
+                raise ValueError("Unexpected end of the MessagePack file")
+
+            # end if
+
+            # keep only the unread bytes and append the new chunk
+            self.Buffer = self.Buffer[self.Pos:] + Chunk
+            self.Pos    = 0
+
+        # end while
+
+        # get the bytes
+        Bytes = self.Buffer[self.Pos:self.Pos + Size]
+        self.Pos += Size
+
+        # return the bytes
+        return Bytes
+
+    # end Read
+
+    # -------------------------------------------------------
+
+    # read the next value or container header
+    def ReadItem(self):
+        """
+
+        ReadItem(self)
+
+        Read a scalar, or the header of a map or array.
+
+        INPUTS:
+            self: the MessagePack event parser
+
+        OUTPUTS:
+            (Event, Value): ("scalar", value), or ("start_object", number of keys) or ("start_array", number of elements)
+
+        """
+
+        # read the type byte
+        Type = ord(self.Read(1))
+
+        # check for a positive or negative fixed integer
+        if (Type <= 0x7f):
+            return ("scalar", Type)
+        elif (Type >= 0xe0):
+            return ("scalar", Type - 0x100)
+        # end if
+
+        # check for a fixed map, array, or string
+        if (Type <= 0x8f):
+            return ("start_object", Type & 0x0f)
+        elif (Type <= 0x9f):
+            return ("start_array", Type & 0x0f)
+        elif (Type <= 0xbf):
+            return ("scalar", self.Read(Type & 0x1f).decode("utf-8"))
+        # end if
+
+        # check for a null or Boolean
+        if (Type == 0xc0):
+            return ("scalar", None)
+        elif (Type == 0xc2):
+            return ("scalar", False)
+        elif (Type == 0xc3):
+            return ("scalar", True)
+        # end if
+
+        # check for a number
+        if (Type in MSGPACK_NUMBERS):
+            Format, Size = MSGPACK_NUMBERS[Type]
+            return ("scalar", struct.unpack(Format, self.Read(Size))[0])
+        # end if
+
+        # check for anything else that the ADH may contain
+        if (Type not in MSGPACK_SIZED):
+            raise ValueError("Unsupported type 0x%02x in the MessagePack file" % Type)
+        # end if
+
+        # read the length
+        Kind, Format, Size = MSGPACK_SIZED[Type]
+        Length = struct.unpack(Format, self.Read(Size))[0]
+
+        # check for a string (or bytes, which are kept as they are)
+        if (Kind == "string"):
+            return ("scalar", self.Read(Length).decode("utf-8"))
+        elif (Kind == "bytes"):
+            return ("scalar", self.Read(Length))
+        # end if
+
+        # return the header of the map or array
+        return ("start_" + Kind, Length)
+
+    # end ReadItem
+
+    # -------------------------------------------------------
+
+    # generate the parsing events
+    def Events(self):
+        """
+
+        Events(self)
+
+        Parse the file and yield one event at a time, so the caller can act on the data before the whole file is read.
+
+        INPUTS:
+            self: the MessagePack event parser
+
+        OUTPUTS:
+            a generator of (Event, Value) tuples, the same as JSONEventParser.Events makes
+
+        """
+
+        # remember the open containers: [kind, items left, expecting a key]
+        Stack = []
+
+        # iterate until the document ends
+        while True:
+
+            # check if a map is expecting a key
+            if (len(Stack) > 0) and (Stack[-1][2]):
+
+                # read the key
+                Event, Key = self.ReadItem()
+
+                # check that the key is a string
+                if (Event != "scalar") or (not isinstance(Key, basestring)):
+                    raise ValueError("Expecting a key in the MessagePack file, found " + repr(Key))
+                # end if
+
+                # yield the key and expect its value
+                Stack[-1][2] = False
+                yield ("key", Key)
+
+                # go to the next item
+                continue
+
+            # end if
+
+            # read the value
+            Event, Value = self.ReadItem()
+
+            # count the value in its container
+            if (len(Stack) > 0):
+                Stack[-1][1] -= 1
+                Stack[-1][2] = (Stack[-1][0] == "object") and (Stack[-1][1] > 0)
+            # end if
+
+            # check for a container
+            if (Event != "scalar"):
+
+                # open it
+                yield (Event, None)
+                Stack.append([Event[6:], Value, (Event == "start_object") and (Value > 0)])
+
+            else:
+
+                # yield the scalar
+                yield (Event, Value)
+
+            # end if
+
+            # close every container that is complete
+            while (len(Stack) > 0) and (Stack[-1][1] == 0):
+                yield ("end_" + Stack.pop()[0], None)
+            # end while
+
+            # check if the document is done
+            if (len(Stack) == 0):
+
+                # check that nothing follows the document
+                if (self.Pos < len(self.Buffer)) or (self.File.read(1)):
+                    raise ValueError("Extra data after the end of the MessagePack file")
+                # end if
+
+                # stop generating events
+                return
+
+            # end if
+
+        # end while
+    # end Events
+
+    # -------------------------------------------------------
+
+# end MsgPackEventParser
+
+# -----------------------------------------------------------
+# -----------------------------------------------------------
+# -----------------------------------------------------------
+
+###############################
+#                             #
+# FUNCTIONS FOR OPENING AN    #
+# ADH IN ANY FORMAT           #
+#                             #
+###############################
+
+def GetADHFormat(Filename):
+    """
+
+    GetADHFormat(Filename)
+
+    Get the format of an ADH from its extension: MessagePack (.msgpack), gzip-compressed JSON (.gz, such as .json.gz), or JSON (anything else, indented or minified).
+
+    INPUTS:
+        Filename: the name of the ADH
+
+    OUTPUTS:
+        the format: "msgpack", "gzip", or "json"
+
+    """
+
+    # check the extension
+    if (Filename.lower().endswith(".msgpack")):
+        return "msgpack"
+    elif (Filename.lower().endswith(".gz")):
+        return "gzip"
+    else:
+        return "json"
+    # end if
+
+# end GetADHFormat
+
+# -----------------------------------------------------------
+
+def OpenADH(Filename):
+    """
+
+    OpenADH(Filename)
+
+    Open an ADH for reading, decompressing it as it is read if needed.
+
+    INPUTS:
+        Filename: the name of the ADH
+
+    OUTPUTS:
+        the open file
+
+    """
+
+    # get the format
+    Format = GetADHFormat(Filename)
+
+    # open the file
+    if (Format == "msgpack"):
+        return open(Filename, "rb")
+    elif (Format == "gzip"):
+        return gzip.open(Filename, "rb")
+    else:
+        return open(Filename, "r")
+    # end if
+
+# end OpenADH
+
+# -----------------------------------------------------------
+
+def GetADHEvents(File, Filename, ChunkSize = 65536):
+    """
+
+    GetADHEvents(File, Filename, ChunkSize = 65536)
+
+    Get the parsing events of an open ADH, using the parser for its format.
+
+    INPUTS:
+        File     : the ADH, opened by OpenADH
+
+        Filename : the name of the ADH
+
+        ChunkSize: (optional, default is 65536) the number of characters (or bytes) read from the file at a time
+
+    OUTPUTS:
+        a generator of (Event, Value) tuples
+
+    """
+
+    # check for MessagePack
+    if (GetADHFormat(Filename) == "msgpack"):
+        return MsgPackEventParser(File, ChunkSize).Events()
+    else:
+        return JSONEventParser(File, ChunkSize).Events()
+    # end if
+
+# end GetADHEvents
+
+# -----------------------------------------------------------
+# -----------------------------------------------------------
+# -----------------------------------------------------------
+
+###############################
+#                             #
+# FUNCTION FOR BUILDING A     #
+# VALUE FROM PARSING EVENTS   #
+#                             #
+###############################
+
+def BuildJSON(Event, Value, Events):
+    """
+
+    BuildJSON(Event, Value, Events)
+
+    Build a (possibly nested) value from parsing events, consuming only the events that belong to it.
+
+    INPUTS:
+        Event : the first event of the value
+
+        Value : the value attached to the first event
+
+        Events: the generator of the remaining parsing events
+
+    OUTPUTS:
+        Root  : the dictionary, list, or scalar that was built
+
+    """
+
+    # check for a scalar
+    if (Event == "scalar"):
+
+        # nothing else to build
+        return Value
+
+    elif (Event == "start_object"):
+
+        # start a dictionary
+        Root = {}
+
+    elif (Event == "start_array"):
+
+        # start a list
+        Root = []
+
+    else:
+
+        # throw an error
+        raise ValueError("BuildJSON: cannot start a value with a " + repr(Event) + " event")
+
+    # end if
+
+    # remember the open containers and their current keys
+    Stack = [Root]
+    Keys  = [None]
+
+    # loop through the events
+    for Event, Value in Events:
+
+        # check for the end of a container
+        if (Event == "end_object") or (Event == "end_array"):
+
+            # close the container
+            Stack.pop()
+            Keys.pop()
+
+            # check if the value is complete
+            if (len(Stack) == 0):
+
+                # return the value
+                return Root
+
+            # end if
+
+            # go to the next event
+            continue
+
+        # end if
+
+        # check for a key
+        if (Event == "key"):
+
+            # remember the key
+            Keys[-1] = Value
+
+            # go to the next event
+            continue
+
+        # end if
+
+        # create the new item
+        if (Event == "start_object"):
+            NewItem = {}
+        elif (Event == "start_array"):
+            NewItem = []
+        else:
+            NewItem = Value
+        # end if
+
+        # add the item to its container
+        if (isinstance(Stack[-1], dict)):
+            Stack[-1][Keys[-1]] = NewItem
+        else:
+            Stack[-1].append(NewItem)
+        # end if
+
+        # open the new container
+        if (Event != "scalar"):
+            Stack.append(NewItem)
+            Keys.append(None)
+        # end if
+
+    # end for
+
+    # the events ended before the value was complete
+    raise ValueError("Unexpected end of the JSON file")
+
+# end BuildJSON
+
+# -----------------------------------------------------------
+# -----------------------------------------------------------
+# -----------------------------------------------------------
+
+###############################
+#                             #
+# FUNCTION FOR LOADING A JSON #
+# FILE WITH THE EVENT PARSER  #
+#                             #
+###############################
+
+@Timed
+def LoadJSON(Filename, ChunkSize = 65536):
+    """
+
+    LoadJSON(Filename, ChunkSize = 65536)
+
+    Read a JSON file (or an ADH in any other format) with the event parser, so the file is never held in memory as a single string.
+
+    INPUTS:
+        Filename : the name of the JSON file to read
+
+        ChunkSize: (optional, default is 65536) the number of characters (or bytes) read from the file at a time
+
+    OUTPUTS:
+        MyJSON   : the nested dictionary in the JSON file
+
+    """
+
+    # open the ADH
+    f = OpenADH(Filename)
+
+    try:
+
+        # get the parsing events
+        Events = GetADHEvents(f, Filename, ChunkSize)
+
+        # get the first event
+        Event, Value = next(Events)
+
+        # build the nested dictionary
+        MyJSON = BuildJSON(Event, Value, Events)
+
+        # check that nothing follows the document
+        for Event, Value in Events:
+            pass
+        # end for
+
+    finally:
+
+        # close the file
+        f.close()
+
+    # end try-finally
+
+    # return the nested dictionary
+    return MyJSON
+
+# end LoadJSON
+
+# -----------------------------------------------------------
+# -----------------------------------------------------------
+# -----------------------------------------------------------
+
+###############################
+#                             #
+# BACKGROUND PIPELINE         #
+#                             #
+###############################
+
+class PipelineStopped(Exception):
+
+    # the consumer stopped reading, so the producer must stop too
+    pass
+
+# end PipelineStopped
+
+# -----------------------------------------------------------
+
+class Pipeline():
+
+    # initialization function
+    def __init__(self, Producer, MaxBatches = 64, BatchSize = 256):
+        """
+
+        __init__(self, Producer, MaxBatches = 64, BatchSize = 256)
+
+        Start a background thread that runs a producer. The producer appends items to the pipeline, which hands them to the consumer in batches through a bounded queue, so the producer never gets far ahead of the consumer.
+
+        INPUTS:
+            self      : the pipeline
+
+            Producer  : a function that takes the pipeline and appends each item to it
+
+            MaxBatches: (optional, default is 64) the number of batches that may wait in the queue
+
+            BatchSize : (optional, default is 256) the number of items per batch
+
+        OUTPUTS:
+            none
+
+        """
+
+        # remember the batch size
+        self.BatchSize = BatchSize
+
+        # the queue of batches and the batch being filled
+        self.Queue = Queue.Queue(MaxBatches)
+        self.Batch = []
+
+        # flag that the consumer stopped reading
+        self.Stopped = 0
+
+        # run the producer on a background thread that does not keep MagicDraw from closing
+        self.Thread = threading.Thread(target = self.Produce, args = (Producer,))
+        self.Thread.setDaemon(True)
+        self.Thread.start()
+
+    # end __init__
+
+    # -------------------------------------------------------
+
+    # function run by the background thread
+    def Produce(self, Producer):
+        """
+
+        Produce(self, Producer)
+
+        Run the producer, then send its last batch and the end of the pipeline (with the producer's error, if any).
+
+        INPUTS:
+            self    : the pipeline
+
+            Producer: a function that takes the pipeline and appends each item to it
+
+        OUTPUTS:
+            none
+
+        """
+
+        # assume the producer succeeds
+        Error = None
+
+        # try to run the producer
+        try:
+
+            # produce the items
+            Producer(self)
+
+        except PipelineStopped:
+
+            # the consumer is gone
+            return
+
+        except Exception as e:
+
+            # hand the error to the consumer
+            Error = e
+
+        # end try-except
+
+        # try to send the end of the pipeline
+        try:
+
+            # send the last batch and the end
+            self.Put(("batch", self.Batch))
+            self.Put(("end"  , Error     ))
+
+        except PipelineStopped:
+
+            # the consumer is gone
+            pass
+
+        # end try-except
+    # end Produce
+
+    # -------------------------------------------------------
+
+    # function to add an item to the pipeline (called by the producer)
+    def append(self, Item):
+        """
+
+        append(self, Item)
+
+        Add an item to the batch being filled, and send the batch once it is full. The name matches a list's, so a producer may fill either one.
+
+        INPUTS:
+            self: the pipeline
+
+            Item: the item to be added
+
+        OUTPUTS:
+            none
+
+        """
+
+        # add the item
+        self.Batch.append(Item)
+
+        # check if the batch is full
+        if (len(self.Batch) >= self.BatchSize):
+
+            # send it
+            self.Put(("batch", self.Batch))
+
+            # start a new batch
+            self.Batch = []
+
+        # end if
+    # end append
+
+    # -------------------------------------------------------
+
+    # function to put a message in the queue (called by the producer)
+    def Put(self, Message):
+        """
+
+        Put(self, Message)
+
+        Wait for room in the queue and put a message in it, unless the consumer stopped reading.
+
+        INPUTS:
+            self   : the pipeline
+
+            Message: the message to be sent
+
+        OUTPUTS:
+            none
+
+        """
+
+        # wait until the consumer stops reading
+        while (self.Stopped == 0):
+
+            # try to put the message
+            try:
+
+                # wait a short time for room in the queue
+                self.Queue.put(Message, True, 0.1)
+
+                # the message was sent
+                return
+
+            except Queue.Full:
+
+                # try again
+                pass
+
+            # end try-except
+        # end while
+
+        # the consumer is gone
+        raise PipelineStopped()
+
+    # end Put
+
+    # -------------------------------------------------------
+
+    # function to read the items (called by the consumer)
+    def Items(self):
+        """
+
+        Items(self)
+
+        Generate the items in the order they were produced, waiting for the producer when needed. An error raised by the producer is raised again here.
+
+        INPUTS:
+            self: the pipeline
+
+        OUTPUTS:
+            the items, one at a time
+
+        """
+
+        # loop until the end of the pipeline
+        while True:
+
+            # wait for the next message
+            Kind, Contents = self.Queue.get()
+
+            # check for the end
+            if (Kind == "end"):
+
+                # check if the producer failed
+                if (Contents is not None):
+                    raise Contents
+                # end if
+
+                # no more items
+                return
+
+            # end if
+
+            # generate the items in the batch
+            for Item in Contents:
+                yield Item
+            # end for
+
+        # end while
+    # end Items
+
+    # -------------------------------------------------------
+
+    # function to stop the producer (called by the consumer)
+    def Stop(self):
+        """
+
+        Stop(self)
+
+        Stop reading the pipeline; the producer stops the next time it sends a batch.
+
+        INPUTS:
+            self: the pipeline
+
+        OUTPUTS:
+            none
+
+        """
+
+        # tell the producer to stop
+        self.Stopped = 1
+
+    # end Stop
+
+# end Pipeline
+
+# -----------------------------------------------------------
+
+def ParseADH(Filename, Sink, ChunkSize = 65536):
+    """
+
+    ParseADH(Filename, Sink, ChunkSize = 65536)
+
+    Parse a JSON file with the event parser and append each parsing event to a sink (a list or a pipeline).
+
+    INPUTS:
+        Filename : the name of the JSON file to read
+
+        Sink     : the list or pipeline that receives the (event, value) pairs
+
+        ChunkSize: (optional, default is 65536) the number of characters read from the file at a time
+
+    OUTPUTS:
+        Sink     : the sink, with the events added
+
+    """
+
+    # open the ADH
+    f = OpenADH(Filename)
+
+    try:
+
+        # add each parsing event
+        for Item in GetADHEvents(f, Filename, ChunkSize):
+            Sink.append(Item)
+        # end for
+
+    finally:
+
+        # close the file
+        f.close()
+
+    # end try-finally
+
+    # return the sink
+    return Sink
+
+# end ParseADH
+
+# -----------------------------------------------------------
+# -----------------------------------------------------------
+# -----------------------------------------------------------
+
+###############################
+#                             #
+# ARRAY ENGINE                #
+#                             #
+###############################
+
+# tables of element names by (key, shape), and the number of tables kept before starting over
+NAME_TABLES     = {}
+MAX_NAME_TABLES = 4096
+
+def GetArrayLayout(Arr):
+    """
+
+    GetArrayLayout(Arr)
+
+    Get the shape of an n-dimensional array and its values in order (the last index changing fastest), visiting each element once. The array must be rectangular: every list at the same depth has the same length, and values are only found at the deepest level.
+
+    INPUTS:
+        Arr   : the array to be analyzed
+
+    OUTPUTS:
+        Shape : a tuple of length n with the size of each dimension (None if the array is not rectangular)
+
+        Values: a flat list of the array values (None if the array is not rectangular)
+
+    """
+
+    # remember the shape of each dimension, as found so far
+    Shape = []
+
+    # check each level of the array, starting at the top
+    Level = [Arr]
+
+    # loop until the values are reached
+    while (len(Level) > 0) and (isinstance(Level[0], list)):
+
+        # get the size of this dimension
+        nelem = len(Level[0])
+
+        # remember the next level
+        NextLevel = []
+
+        # loop through the lists at this level
+        for SubArr in Level:
+
+            # every list at this level must be the same size
+            if (not isinstance(SubArr, list)) or (len(SubArr) != nelem):
+                return None, None
+            # end if
+
+            # add its elements to the next level
+            NextLevel.extend(SubArr)
+
+        # end for
+
+        # remember the size
+        Shape.append(nelem)
+
+        # go to the next level
+        Level = NextLevel
+
+    # end while
+
+    # none of the values can be lists
+    for Value in Level:
+        if isinstance(Value, list):
+            return None, None
+        # end if
+    # end for
+
+    # return the shape and values
+    return tuple(Shape), Level
+
+# end GetArrayLayout
+
+# -----------------------------------------------------------
+
+def GetIndexNames(Name, Shape):
+    """
+
+    GetIndexNames(Name, Shape)
+
+    Get the names of all elements of an n-dimensional array as: VarName__i__j__...__k, in the same order as GetArrayLayout returns the values. The names are kept for the next array with the same name and shape.
+
+    INPUTS:
+        Name : the name of the variable that will be repeated
+
+        Shape: a tuple representing the shape of the array
+
+    OUTPUTS:
+        Names: a tuple with the name of each element
+
+    """
+
+    # look up the names
+    Names = NAME_TABLES.get((Name, Shape))
+
+    # check if they must be written
+    if (Names is None):
+
+        # start with the variable name
+        Names = [Name]
+
+        # loop through the dimensions
+        for nelem in Shape:
+
+            # write the index of each element in this dimension once
+            Suffixes = ["__" + str(ielem) for ielem in range(nelem)]
+
+            # append them to the names so far
+            Names = [Prefix + Suffix for Prefix in Names for Suffix in Suffixes]
+
+        # end for
+
+        # start over if too many tables are kept
+        if (len(NAME_TABLES) >= MAX_NAME_TABLES):
+            NAME_TABLES.clear()
+        # end if
+
+        # remember the names
+        Names = tuple(Names)
+        NAME_TABLES[(Name, Shape)] = Names
+
+    # end if
+
+    # return the names
+    return Names
+
+# end GetIndexNames
+
+# -----------------------------------------------------------
+
+def GetArrayEntries(Name, Arr):
+    """
+
+    GetArrayEntries(Name, Arr)
+
+    Get the name and value of each element of an array, named as: VarName__i__j__...__k. An array that is not rectangular names each value by the indices it is actually found at, and a single value keeps the variable name.
+
+    INPUTS:
+        Name   : the name of the variable
+
+        Arr    : the array
+
+    OUTPUTS:
+        Entries: a list of (name, value) tuples, in order
+
+    """
+
+    # get the shape and values in one pass
+    Shape, Values = GetArrayLayout(Arr)
+
+    # check if the array is rectangular
+    if (Shape is not None):
+
+        # pair the names and values
+        Entries = list(zip(GetIndexNames(Name, Shape), Values))
+
+    else:
+
+        # remember the entries
+        Entries = []
+
+        # walk the array, keeping the name of each list
+        Stack = [(Name, Arr)]
+
+        # loop until all elements are named
+        while (len(Stack) > 0):
+
+            # get the next element
+            ElemName, Elem = Stack.pop()
+
+            # check if it's a list
+            if (isinstance(Elem, list)):
+
+                # visit its elements next, in order
+                Stack.extend(reversed([(ElemName + "__" + str(ielem), Elem[ielem]) for ielem in range(len(Elem))]))
+
+            else:
+
+                # remember the value
+                Entries.append((ElemName, Elem))
+
+            # end if
+        # end while
+    # end if
+
+    # a single value keeps the variable name
+    if (len(Entries) == 1):
+        Entries = [(Name, Entries[0][1])]
+    # end if
+
+    # return the entries
+    return Entries
+
+# end GetArrayEntries
+
+# -----------------------------------------------------------
+# -----------------------------------------------------------
+# -----------------------------------------------------------
+
+###############################
+#                             #
+# FUNCTION FOR CHECKING IF AN #
+# ARRAY CAN BE STORED IN ONE  #
+# VALUE PROPERTY              #
+#                             #
+###############################
+
+# symbol marking the expression that holds a compact array, followed by its shape (e.g., "ADHArray:3x2")
+ARRAY_SYMBOL = "ADHArray"
+
+def GetCompactArray(Arr):
+    """
+
+    GetCompactArray(Arr)
+
+    Check if an n-dimensional array can be stored in a single value property: it must be rectangular, non-empty, and hold only Boolean, only numeric, or only string values.
+
+    INPUTS:
+        Arr   : the array to be analyzed
+
+    OUTPUTS:
+        Shape : a tuple of length n with the size of each dimension (None if the array cannot be stored compactly)
+
+        Values: a flat list of the array values (None if the array cannot be stored compactly)
+
+        Kind  : the kind of values in the array ("Boolean", "Integer", "Real", or "String"; None if the array cannot be stored compactly)
+
+    """
+
+    # get the shape and values in one pass
+    Shape, Values = GetArrayLayout(Arr)
+
+    # the array must be rectangular and non-empty
+    if (Shape is None) or (len(Values) == 0):
+        return None, None, None
+    # end if
+
+    # none of the values can be dictionaries or nulls
+    for Value in Values:
+        if isinstance(Value, dict) or (Value is None):
+            return None, None, None
+        # end if
+    # end for
+
+    # check the kind of values in the array
+    if all(isinstance(Value, bool) for Value in Values):
+
+        # all values are Booleans
+        Kind = "Boolean"
+
+    elif all(isinstance(Value, int) and (not isinstance(Value, bool)) for Value in Values):
+
+        # all values are integers
+        Kind = "Integer"
+
+    elif all((isinstance(Value, int) or isinstance(Value, float)) and (not isinstance(Value, bool)) for Value in Values):
+
+        # the values are a mix of integers and reals
+        Kind = "Real"
+
+    elif all(isinstance(Value, unicode) or isinstance(Value, str) for Value in Values):
+
+        # all values are strings
+        Kind = "String"
+
+    else:
+
+        # the kinds of values cannot be mixed
+        return None, None, None
+
+    # end if
+
+    # return the shape, values, and kind
+    return Shape, Values, Kind
+
+# end GetCompactArray
+
+# -----------------------------------------------------------
+
+def IsCompactArray(Key, Value):
+    """
+
+    IsCompactArray(Key, Value)
+
+    Check if compact arrays are turned on and an array can be stored in a single value property.
+
+    INPUTS:
+        Key  : the key of the array
+
+        Value: the array to be checked
+
+    OUTPUTS:
+        1 if the array can be stored compactly, 0 otherwise
+
+    """
+
+    # check that compact arrays are turned on and the key is not reserved
+    if (COMPACT_ARRAYS != 1) or (Key == "components") or (Key == "requirements") or (Key == "performance") or (Key == "behavior"):
+
+        # store one value property per element
+        return 0
+
+    # end if
+
+    # check the array's contents
+    Shape, Values, Kind = GetCompactArray(Value)
+
+    # return the result
+    return 1 if (Shape is not None) else 0
+
+# end IsCompactArray
+
+# -----------------------------------------------------------
+# -----------------------------------------------------------
+# -----------------------------------------------------------
+
+###############################
+#                             #
+# FUNCTION FOR FINDING THE    #
+# SUB-PACKAGE FOR A KEY       #
+#                             #
+###############################
+
+def GetSubPackageName(Key):
+    """
+
+    GetSubPackageName(Key)
+
+    Find the name of the sub-package that a key within a component (one with a WBS number) requires.
+
+    INPUTS:
+        Key: the key within the component
+
+    OUTPUTS:
+        the name of the sub-package ("Architecture", "Requirements", "Performance", or "Behavior"), or None if no sub-package is required
+
+    """
+
+    # check if the key indicates requirements are present
+    if (Key == "requirements"):
+
+        # a requirements package is required
+        return "Requirements"
+
+    # check if the key indicates performance information is present
+    elif (Key == "performance"):
+
+        # a performance package is required
+        return "Performance"
+
+    # check if the key indicates behaviors are present
+    elif (Key == "behavior"):
+
+        # a behavior package is required
+        return "Behavior"
+
+    # check if it is another reserved word
+    elif (Key == "wbs_no") or (Key == "name") or (Key == "description"):
+
+        # no package is required
+        return None
+
+    # end if
+
+    # components and any other data require an architecture package
+    return "Architecture"
+
+# end GetSubPackageName
+
+# -----------------------------------------------------------
+# -----------------------------------------------------------
+# -----------------------------------------------------------
+
+###############################
+#                             #
+# FUNCTION FOR READING A KEY- #
+# VALUE PAIR FROM EVENTS      #
+#                             #
+###############################
+
+def ReadEntry(Events):
+    """
+
+    ReadEntry(Events)
+
+    Read the next key in an object from the parsing events, along with the first event of its value.
+
+    INPUTS:
+        Events: the generator of parsing events, positioned inside an object
+
+    OUTPUTS:
+        a tuple (Key, Event, Value), or None if the object has ended
+
+    """
+
+    # get the next event
+    Event, Value = next(Events)
+
+    # check for the end of the object
+    if (Event == "end_object"):
+
+        # no more entries
+        return None
+
+    # end if
+
+    # remember the key
+    Key = Value
+
+    # get the first event of the value
+    Event, Value = next(Events)
+
+    # return the entry
+    return (Key, Event, Value)
+
+# end ReadEntry
+
+# -----------------------------------------------------------
+# -----------------------------------------------------------
+# -----------------------------------------------------------
+
+###############################
+#                             #
+# FUNCTION FOR CHAINING READ  #
+# AND PARSED KEY-VALUE PAIRS  #
+#                             #
+###############################
+
+def ChainEntries(Keys, Values, Entry, Events):
+    """
+
+    ChainEntries(Keys, Values, Entry, Events)
+
+    Yield the key-value pairs of an object that were already read, followed by the rest of the object as it is parsed.
+
+    INPUTS:
+        Keys  : the keys that were already read (in order)
+
+        Values: a dictionary with the scalar value of each key that was already read
+
+        Entry : the next entry read from the parsing events (or None if the object has ended)
+
+        Events: the generator of parsing events, positioned inside the object
+
+    OUTPUTS:
+        a generator of (Key, Event, Value) tuples, where the value's events must be consumed before the next tuple is requested
+
+    """
+
+    # loop through the keys that were already read
+    for Key in Keys:
+
+        # yield the scalar
+        yield (Key, "scalar", Values[Key])
+
+    # end for
+
+    # loop through the rest of the object
+    while (Entry is not None):
+
+        # yield the entry
+        yield Entry
+
+        # read the next entry
+        Entry = ReadEntry(Events)
+
+    # end while
+# end ChainEntries
+
+# -----------------------------------------------------------
+# -----------------------------------------------------------
+# -----------------------------------------------------------
+
+###############################
+#                             #
+# FUNCTION FOR HASHING A PART #
+# OF THE ADH                  #
+#                             #
+###############################
+
+# prefix of the content hash stored in the URI of a component's package
+HASH_PREFIX = "adh-md5:"
+
+def HashADH(Value):
+    """
+
+    HashADH(Value)
+
+    Hash part of an ADH so that it can be compared with the same part of another ADH. Keys are sorted first, so the order they are written in does not matter.
+
+    INPUTS:
+        Value: the part of the ADH to be hashed
+
+    OUTPUTS:
+        the hash, as a string of hexadecimal digits
+
+    """
+
+    # hash the ADH with its keys sorted
+    return hashlib.md5(json.dumps(Value, sort_keys = True).encode("utf-8")).hexdigest()
+
+# end HashADH
+
+# -----------------------------------------------------------
+# -----------------------------------------------------------
+# -----------------------------------------------------------
+
+###############################
+#                             #
+# FUNCTION FOR NAMING THE     #
+# PROGRESS MARKER             #
+#                             #
+###############################
+
+def GetProgressFile(Filename):
+    """
+
+    GetProgressFile(Filename)
+
+    Get the name of the file that records how far an import split into sessions got, as: <ADH>-Progress.json. The file exists only while the import is incomplete.
+
+    INPUTS:
+        Filename: the name of the ADH being read
+
+    OUTPUTS:
+        the name of the progress marker
+
+    """
+
+    # replace the extension of the ADH
+    return GetSideFile(Filename, "-Progress.json")
+
+# end GetProgressFile
+
+# -----------------------------------------------------------
+# -----------------------------------------------------------
+# -----------------------------------------------------------
+
+###############################
+#                             #
+# IMPORT PLANNER              #
+#                             #
+###############################
+
+# handle of the package the ADH is imported into
+ROOT = 0
+
+# error raised when placing data requires a model element that existed before the import
+class UnplannedElement(Exception):
+    pass
+# end UnplannedElement
+
+# plan the model elements for a parsed ADH as a flat list of operations, without touching the model:
+#
+#     ("package"   , Handle, Owner, Name, Role)
+#     ("component" , Handle, Owner, Name, ReqFlag)
+#     ("stereotype", Handle, Key, Info)
+#     ("block"     , Handle, Owner, Name, ReqFlag)
+#     ("part"      , Owner, Type)
+#     ("property"  , Owner, Name, Value)
+#     ("array"     , Owner, Name, Value)
+#     ("text"      , Handle, Text)
+#     ("data"      , Owner, Data, ReqSterFlag, HigherLevelComp)
+#
+# each element is referred to by an integer handle (the package the ADH is imported into is ROOT), and
+# "data" hands anything that must be placed next to elements existing before the import to GetData
+class ImportPlanner():
+
+    # initialization function
+    def __init__(self, Plan = None):
+        """
+
+        __init__(self, Plan = None)
+
+        Initialize an empty plan.
+
+        INPUTS:
+            self: the import planner
+
+            Plan: (optional, assumed a new list) the list or pipeline that receives the operations
+
+        OUTPUTS:
+            none
+
+        """
+
+        # list of operations
+        self.Plan = [] if (Plan is None) else Plan
+
+        # next handle to be given out
+        self.NextHandle = ROOT + 1
+
+        # owner of each element created
+        self.Owners = {}
+
+        # elements owned by each element created, in order, with a flag for blocks (1) or not (0)
+        self.Children = {}
+
+        # sub-packages and blocks by (owning package, role), as in the model structure generator
+        self.PackageIndex = {}
+
+    # end __init__
+
+    # -------------------------------------------------------
+
+    # function to plan the import of an ADH
+    @Timed
+    def MakePlan(self, MyJSON):
+        """
+
+        MakePlan(self, MyJSON)
+
+        Plan the import of a parsed ADH into the package with the handle ROOT.
+
+        INPUTS:
+            self  : the import planner
+
+            MyJSON: the parsed ADH
+
+        OUTPUTS:
+            Plan  : the list of operations
+
+        """
+
+        # plan the data
+        self.PlanData(MyJSON, ROOT, 0, None)
+
+        # return the plan
+        return self.Plan
+
+    # end MakePlan
+
+    # -------------------------------------------------------
+
+    # function to add an element to the plan
+    def AddElement(self, Owner, IsBlock):
+        """
+
+        AddElement(self, Owner, IsBlock)
+
+        Give out a handle for a new element and remember where it resides.
+
+        INPUTS:
+            self   : the import planner
+
+            Owner  : the handle of the element's owner
+
+            IsBlock: flag for a block (1) or any other element (0)
+
+        OUTPUTS:
+            Handle : the handle of the new element
+
+        """
+
+        # get the next handle
+        Handle = self.NextHandle
+        self.NextHandle += 1
+
+        # remember the owner
+        self.Owners[Handle] = Owner
+        self.Children[Handle] = []
+
+        # check that the owner was created during the import
+        if (Owner in self.Children):
+
+            # remember the element under its owner
+            self.Children[Owner].append((Handle, IsBlock))
+
+        # end if
+
+        # return the handle
+        return Handle
+
+    # end AddElement
+
+    # -------------------------------------------------------
+
+    # function to get the owner of an element
+    def GetOwner(self, Handle):
+        """
+
+        GetOwner(self, Handle)
+
+        Get the owner of an element created during the import.
+
+        INPUTS:
+            self  : the import planner
+
+            Handle: the handle of the element
+
+        OUTPUTS:
+            the handle of the owner
+
+        """
+
+        # check that the element was created during the import
+        if (Handle not in self.Owners):
+
+            # the owner is only known by the model
+            raise UnplannedElement(Handle)
+
+        # end if
+
+        # return the owner
+        return self.Owners[Handle]
+
+    # end GetOwner
+
+    # -------------------------------------------------------
+
+    # function to look up a sub-package
+    def FindSubPackage(self, Package, Role):
+        """
+
+        FindSubPackage(self, Package, Role)
+
+        Find the sub-package with a given role in a package created during the import.
+
+        INPUTS:
+            self   : the import planner
+
+            Package: the handle of the package that owns the sub-package
+
+            Role   : the role of the sub-package ("Architecture", "Requirements", "Performance", or "Behavior")
+
+        OUTPUTS:
+            the handle of the sub-package, or None if it does not exist
+
+        """
+
+        # check that the package was created during the import
+        if (Package not in self.Children):
+
+            # only the model knows its sub-packages
+            raise UnplannedElement(Package)
+
+        # end if
+
+        # return the sub-package, if any
+        return self.PackageIndex.get((Package, Role), (None, None))[0]
+
+    # end FindSubPackage
+
+    # -------------------------------------------------------
+
+    # function to plan the contents of a component
+    def PlanData(self, MyJSON, ParentPackage, ReqSterFlag, HigherLevelComp = None):
+        """
+
+        PlanData(self, MyJSON, ParentPackage, ReqSterFlag, HigherLevelComp = None)
+
+        Plan the model elements for a subset of the ADH, following the same rules as GetData in the model structure generator.
+
+        INPUTS:
+            self           : the import planner
+
+            MyJSON         : the subset of the ADH being analyzed
+
+            ParentPackage  : the handle of the package where the next set of model elements will reside
+
+            ReqSterFlag    : flag to show that a requirement needs to be made (1) or not (0)
+
+            HigherLevelComp: (optional, assumed None) the handle of the higher-level component that owns part properties
+
+        OUTPUTS:
+            none
+
+        """
+
+        # try to plan the data
+        try:
+
+            # loop through each of the items at this level
+            for ikey, ivalue in MyJSON.items():
+
+                # assume it is a floating value
+                DataType = 0
+
+                # check if the value is a dictionary
+                if (isinstance(ivalue, dict)):
+
+                    # it is a block with additional data inside of it, or a component if it has a WBS number
+                    DataType = +1 if ("wbs_no" in ivalue.keys()) else -1
+
+                # end if
+
+                # check if the data is a list or a keyword
+                if (isinstance(ivalue, list)) or (ikey == "components") or (ikey == "requirements") or (ikey == "performance") or (ikey == "behavior"):
+
+                    # it must be opened up
+                    DataType = +2
+
+                # end if
+
+                # plan the item
+                try:
+
+                    # check how data must be handled
+                    if (DataType == 0):
+
+                        # read the floating parameter into the package above
+                        self.PlanFloatingValue(self.GetOwner(ParentPackage), ikey, ivalue)
+
+                    elif (DataType == -1):
+
+                        # read a data structure
+                        self.PlanDataStructure(ParentPackage, ikey, ivalue, ReqSterFlag, HigherLevelComp)
+
+                    elif (DataType == +1):
+
+                        # plan the component
+                        self.PlanComponent(ikey, ivalue, ParentPackage, ReqSterFlag, HigherLevelComp)
+
+                    else:
+
+                        # get the package the contents must be placed in
+                        Parent, ReqSterFlag = self.GetTargetPackage(ikey, ParentPackage)
+
+                        # check how the value must be opened up
+                        if (isinstance(ivalue, list)) and (IsCompactArray(ikey, ivalue)):
+
+                            # store the whole array in one value property
+                            self.PlanFloatingValue(self.GetOwner(ParentPackage), ikey, ivalue)
+
+                        elif (isinstance(ivalue, list)):
+
+                            # read each component separately
+                            for icomp in range(len(ivalue)):
+                                self.PlanData({ikey + "__" + str(icomp) : ivalue[icomp]}, Parent, ReqSterFlag, HigherLevelComp)
+                            # end for
+
+                        else:
+
+                            # read each element separately
+                            for jkey, jvalue in ivalue.items():
+                                self.PlanData({jkey : jvalue}, Parent, ReqSterFlag, HigherLevelComp)
+                            # end for
+
+                        # end if
+
+                        # turn off the requirement flag
+                        ReqSterFlag = 0
+
+                    # end if
+
+                except UnplannedElement:
+
+                    # let the model structure generator place the item next to the existing elements
+                    self.Plan.append(("data", ParentPackage, {ikey : ivalue}, ReqSterFlag, HigherLevelComp))
+
+                    # the requirement flag is turned off after a list or keyword
+                    if (DataType == +2):
+                        ReqSterFlag = 0
+                    # end if
+
+                # end try-except
+            # end for
+
+        except Exception as e:
+
+            print("Bad: " + repr(MyJSON) + "\n")
+            print("Exception: " + repr(e))
+
+        # end try-except
+
+    # end PlanData
+
+    # -------------------------------------------------------
+
+    # function to plan a component with a WBS number
+    def PlanComponent(self, ikey, ivalue, ParentPackage, ReqSterFlag, HigherLevelComp = None):
+        """
+
+        PlanComponent(self, ikey, ivalue, ParentPackage, ReqSterFlag, HigherLevelComp = None)
+
+        Plan the package, block, stereotype, part property, and sub-packages of a component with a WBS number, followed by its contents.
+
+        INPUTS:
+            self           : the import planner
+
+            ikey           : the name of the component
+
+            ivalue         : the component's data
+
+            ParentPackage  : the handle of the package that the component's package will reside in
+
+            ReqSterFlag    : flag to show that a requirement needs to be made (1) or not (0)
+
+            HigherLevelComp: (optional, assumed None) the handle of the higher-level component that owns the part property
+
+        OUTPUTS:
+            none
+
+        """
+
+        # plan the package
+        MainPackage = self.AddElement(ParentPackage, 0)
+        self.Plan.append(("package", MainPackage, ParentPackage, ikey, None))
+
+        # plan the block
+        ComponentClass = self.AddElement(MainPackage, 1 - ReqSterFlag)
+        self.Plan.append(("component", ComponentClass, MainPackage, ikey, ReqSterFlag))
+
+        # index the block
+        self.PackageIndex[(MainPackage, None)] = (None, ComponentClass)
+
+        # plan the stereotype (only the WBS number and name are needed to find it)
+        self.Plan.append(("stereotype", ComponentClass, ikey, {"wbs_no" : ivalue.get("wbs_no"), "name" : ivalue.get("name")}))
+
+        # check if there's a higher-level component for decomposition relation
+        if (HigherLevelComp != None):
+
+            # plan the part property
+            self.Plan.append(("part", HigherLevelComp, ComponentClass))
+
+        # end if
+
+        # assume no packages need to be made
+        NeedPackage = {"Architecture" : 0, "Requirements" : 0, "Performance" : 0, "Behavior" : 0}
+
+        # loop through all of the keys
+        for jkey in ivalue.keys():
+
+            # get the sub-package the key requires
+            SubName = GetSubPackageName(jkey)
+
+            # check if a sub-package is required
+            if (SubName is not None):
+                NeedPackage[SubName] = 1
+            # end if
+
+        # end for
+
+        # loop through the packages in the order they are created
+        for SubName in ("Architecture", "Requirements", "Performance", "Behavior"):
+
+            # check if the package must be made
+            if (NeedPackage[SubName] == 1):
+
+                # plan and index the sub-package
+                SubPackage = self.AddElement(MainPackage, 0)
+                self.Plan.append(("package", SubPackage, MainPackage, SubName, SubName))
+                self.PackageIndex[(MainPackage, SubName)] = (SubPackage, ComponentClass)
+
+            # end if
+        # end for
+
+        # the parent is the block unless an architecture package exists
+        Parent = self.PackageIndex.get((MainPackage, "Architecture"), (ComponentClass, None))[0]
+
+        # plan the next level of the component
+        self.PlanData(ivalue, Parent, ReqSterFlag, ComponentClass)
+
+    # end PlanComponent
+
+    # -------------------------------------------------------
+
+    # function to get the package for a list or keyword
+    def GetTargetPackage(self, ikey, ParentPackage):
+        """
+
+        GetTargetPackage(self, ikey, ParentPackage)
+
+        Find the package that the contents of a list or reserved keyword are placed in.
+
+        INPUTS:
+            self         : the import planner
+
+            ikey         : the key of the list or reserved keyword
+
+            ParentPackage: the handle of the package the key was found in
+
+        OUTPUTS:
+            Parent       : the handle of the package for the contents
+
+            ReqSterFlag  : flag to show that the contents are requirements (1) or not (0)
+
+        """
+
+        # get the role of the sub-package
+        TargetName = GetSubPackageName(ikey) if (ikey in ("requirements", "performance", "behavior")) else "Architecture"
+
+        # reserved words are placed in the sub-packages of the higher-level package
+        Parent = ParentPackage if (TargetName == "Architecture") else self.GetOwner(ParentPackage)
+
+        # look up the sub-package
+        SubPackage = self.FindSubPackage(Parent, TargetName)
+
+        # check if it exists
+        if (SubPackage is not None):
+            Parent = SubPackage
+        # end if
+
+        # return the package and requirement flag
+        return Parent, 1 if (ikey == "requirements") else 0
+
+    # end GetTargetPackage
+
+    # -------------------------------------------------------
+
+    # function to plan a floating value
+    def PlanFloatingValue(self, ParentPackage, ikey, ivalue):
+        """
+
+        PlanFloatingValue(self, ParentPackage, ikey, ivalue)
+
+        Plan a value that is not part of a data structure, which is stored in the block of the component.
+
+        INPUTS:
+            self         : the import planner
+
+            ParentPackage: the handle of the component's package
+
+            ikey         : the name of the value
+
+            ivalue       : the value
+
+        OUTPUTS:
+            none
+
+        """
+
+        # check that the package was created during the import
+        if (ParentPackage not in self.Children):
+
+            # only the model knows the package's blocks
+            raise UnplannedElement(ParentPackage)
+
+        # end if
+
+        # look up the component's block
+        Block = self.PackageIndex.get((ParentPackage, None), (None, None))[1]
+
+        # check if the block was found
+        if (Block is None):
+
+            # use the first block in the package
+            for Child, IsBlock in self.Children[ParentPackage]:
+                if (IsBlock == 1):
+                    Block = Child
+                    break
+                # end if
+            # end for
+
+        # end if
+
+        # check that there is a block
+        if (Block is not None):
+
+            # plan the value
+            self.PlanValue(Block, ikey, ivalue, 0)
+
+        # end if
+
+    # end PlanFloatingValue
+
+    # -------------------------------------------------------
+
+    # function to plan a data structure
+    def PlanDataStructure(self, ParentPackage, ikey, ivalue, ReqFlag, HigherLevelComp = None):
+        """
+
+        PlanDataStructure(self, ParentPackage, ikey, ivalue, ReqFlag, HigherLevelComp = None)
+
+        Plan a data structure in the sub-package its key belongs in (or in the package itself, if there is no such sub-package).
+
+        INPUTS:
+            self           : the import planner
+
+            ParentPackage  : the handle of the package that contains the sub-packages
+
+            ikey           : the key of the data structure
+
+            ivalue         : the data structure
+
+            ReqFlag        : flag to indicate whether a requirement should be made (1) or not (0)
+
+            HigherLevelComp: (optional, defaults to None) the handle of the higher-level component that owns part properties
+
+        OUTPUTS:
+            none
+
+        """
+
+        # look up the sub-package
+        SubPackage = self.FindSubPackage(ParentPackage, GetSubPackageName(ikey) if (ikey in ("requirements", "performance", "behavior")) else "Architecture")
+
+        # plan the data in the sub-package, or in the package itself at the highest level
+        self.PlanValue(ParentPackage if (SubPackage is None) else SubPackage, ikey, ivalue, ReqFlag, HigherLevelComp)
+
+    # end PlanDataStructure
+
+    # -------------------------------------------------------
+
+    # function to plan a key-value pair
+    def PlanValue(self, Block, Key, Value, ReqFlag, HigherLevelComp = None):
+        """
+
+        PlanValue(self, Block, Key, Value, ReqFlag, HigherLevelComp = None)
+
+        Plan the model elements for a key-value pair, following the same rules as ReadData in the model structure generator.
+
+        INPUTS:
+            self           : the import planner
+
+            Block          : the handle of the element that the new model elements will be built on
+
+            Key            : the current key from the ADH
+
+            Value          : the current value corresponding to the key
+
+            ReqFlag        : flag to make a requirement (1) or not (0)
+
+            HigherLevelComp: (optional, default is None) the handle of a higher-level component to create part properties from
+
+        OUTPUTS:
+            none
+
+        """
+
+        # check if the array can be stored in one value property
+        if (isinstance(Value, list)) and (IsCompactArray(Key, Value)):
+
+            # plan the array value property
+            self.Plan.append(("array", Block, Key, Value))
+
+            # the value is planned
+            return
+
+        # end if
+
+        # check if the value is a list
+        if (not isinstance(Value, list)):
+
+            # make it a list
+            Value = [Value]
+
+        # end if
+
+        # get the name and value of each element in one pass
+        MyEntries = GetArrayEntries(Key, Value)
+
+        # check that the list has a length
+        if (len(MyEntries) == 0):
+
+            # plan an empty value property
+            self.Plan.append(("property", Block, Key, None))
+
+            # the value is planned
+            return
+
+        # end if
+
+        # loop through each item (single items keep the same key)
+        for NewKey, CurVal in MyEntries:
+
+            # check for a dictionary
+            if (isinstance(CurVal, dict)):
+
+                # plan a block
+                NewBlock = self.AddElement(Block, 1 - ReqFlag)
+                self.Plan.append(("block", NewBlock, Block, NewKey, ReqFlag))
+
+                # check for a requirement
+                if (ReqFlag == 1):
+
+                    # try to get the name, description and value
+                    try:
+
+                        # get the name, desription, and value
+                        TempName = CurVal["name"]
+                        TempDesc = CurVal["description"]
+                        TempValu = CurVal["value"]
+
+                        # extract the actual value and units
+                        FinalValue = TempValu["value"]
+                        FinalUnits = TempValu["units"]
+
+                        # plan the requirement text
+                        self.Plan.append(("text", NewBlock, "(" + TempName + "): " + TempDesc + " shall be " + str(FinalValue) + " " + FinalUnits))
+
+                    except:
+
+                        # try to get a string only
+                        try:
+
+                            # plan the requirement text
+                            self.Plan.append(("text", NewBlock, CurVal["text"]))
+
+                        except:
+
+                            # don't load a requirement
+                            pass
+
+                        # end try-except
+                    # end try-except
+
+                else:
+
+                    # check if there's a higher-level component for decomposition relation
+                    if (HigherLevelComp != None):
+
+                        # plan the part property
+                        self.Plan.append(("part", HigherLevelComp, NewBlock))
+
+                    # end if
+
+                    # check that it is not empty
+                    try:
+
+                        # plan the dictionary
+                        for key, value in CurVal.items():
+                            self.PlanValue(NewBlock, key, value, ReqFlag, NewBlock)
+                        # end for
+
+                    except:
+
+                        # do nothing
+                        pass
+
+                    # end try-except
+                # end if
+
+            else:
+
+                # plan the value property
+                self.Plan.append(("property", Block, NewKey, CurVal))
+
+            # end if
+        # end for
+
+    # end PlanValue
+
+# end ImportPlanner
+
+# -----------------------------------------------------------
+
+def PlanADH(Filename, Sink, ChunkSize = 65536):
+    """
+
+    PlanADH(Filename, Sink, ChunkSize = 65536)
+
+    Read a JSON file and plan its import, appending each operation to a sink (a list or a pipeline).
+
+    INPUTS:
+        Filename : the name of the JSON file to read
+
+        Sink     : the list or pipeline that receives the operations
+
+        ChunkSize: (optional, default is 65536) the number of characters read from the file at a time
+
+    OUTPUTS:
+        Sink     : the sink, with the operations added
+
+    """
+
+    # read the JSON file and plan the model elements without touching the model
+    return ImportPlanner(Sink).MakePlan(LoadJSON(Filename, ChunkSize))
+
+# end PlanADH
+
+# -----------------------------------------------------------
+# -----------------------------------------------------------
+# -----------------------------------------------------------
+
+###############################
+#                             #
+# MODEL STRUCTURE GENERATOR   #
+#                             #
+###############################
+
+class ModelStructureGenerator():
+
+    # initialization function
+    def __init__(self):
+        """
+
+        __init__(self)
+
+        Initialize the model structure generator, which creates a SysML model.
+
+        INPUTS:
+            self: the SysML model
+
+        OUTPUTS:
+            none
+
+        """
+        
+        # get the project
+        self.Project = Application.getInstance().getProject()
+
+        # get the elements factory
+        self.Factory = self.Project.getElementsFactory()
+
+        # get the model element manager
+        self.Manager = MEM.getInstance()
+
+        # get the model
+        self.Model = self.Project.getModel()
+        
+    # end __init__
+
+    # -------------------------------------------------------
+
+    # action execution
+    def execute(self, Filename):
+        """
+
+        execute(self, Filename)
+
+        Run the JSON parser and create the model elements for the SysML model.
+
+        INPUTS:
+            self         : the SysML model
+
+            Filename     : the name of the JSON file to be read for creating the SysML model
+
+        OUTPUTS:
+            none
+
+        """        
+
+        # start timing the hot functions
+        ResetTiming()
+        
+        # try to create a session
+        try:
+
+            # create the session
+            SM.getInstance().createSession(self.Project, "Read ADH")            
+
+            # get the block stereotype from the SysML stereotype profile
+            self.BlockSter = SH.getStereotype(self.Project, "Block", "SysML::Blocks")
+
+            # get the requirement stereotype from the SysML stereotype profile
+            self.ReqSter = SH.getStereotype(self.Project, "Requirement", "SysML::Requirements")
+
+            # get the types for integers, reals, and strings
+            self.Integer = Finder.byQualifiedName().find(self.Project, "SysML::Libraries::PrimitiveValueTypes::Integer")
+            self.Real    = Finder.byQualifiedName().find(self.Project, "SysML::Libraries::PrimitiveValueTypes::Real")
+            self.String  = Finder.byQualifiedName().find(self.Project, "SysML::Libraries::PrimitiveValueTypes::String")
+            self.Boolean = Finder.byQualifiedName().find(self.Project, "SysML::Libraries::PrimitiveValueTypes::Boolean")
+            
+            # import the ADH and create stereotypes
+            self.ImportADH(Filename)
+
+            # close the session
+            SM.getInstance().closeSession(self.Project)
+
+        except Exception as e:
+            
+            # print that an exception occurred
             Application.getInstance().getGUILog().showMessage("Exception occurred: " + repr(e))
         
-            # cancel the session
-            SM.getInstance().cancelSession(self.Project)
+            # cancel the session
+            SM.getInstance().cancelSession(self.Project)
+
+        # end try-except
+
+        # write where the time went
+        WriteTiming(Filename)
+
+    # end execute
+
+    # -------------------------------------------------------
+
+    # read a JSON file
+    def ImportADH(self, Filename):
+        """
+
+        ImportADH(self, Filename)
+
+        Read a JSON file to create the system model.
+
+        INPUTS:
+            self    : the SysML model
+
+            Filename: the JSON file to read and create the SysML model from
+
+        OUTPUTS:
+            none
+
+        """
+        
+        # remember the ADH profile
+        self.Profile = SH.getProfile(self.Project, "ImportADHProfile")
+
+        # if there's no profile, throw a warning
+        if (self.Profile is None):
+
+            # throw failure
+            self.ProfileFlag = -1
+
+            # print a warning
+            Application.getInstance().getGUILog().showMessage("WARNING: No ADH Profile imported ... stereotypes won't be assigned.")
+
+        else:
+
+            # throw success
+            self.ProfileFlag = 0
+
+            # load the profile's stereotypes into a dictionary
+            self.LoadStereotypes()
+
+        # end if
+
+        # get the class metadata
+        self.MetaClass = SH.getMetaClassByName(self.Project, "Class")        
+
+        # index the sub-packages by (owning package, role) and remember the packages/blocks created here
+        self.PackageIndex = {}
+        self.KnownOwners  = set()
+
+        # components from earlier imports by owning package, the packages kept from them, and the components found in the ADH
+        self.ExistingComponents = {}
+        self.KeptPackages       = set([self.Model])
+        self.SeenComponents     = set()
+
+        # count what happened to the components
+        self.ComponentCounts = {"Added" : 0, "Skipped" : 0, "Replaced" : 0, "Removed" : 0}
+
+        # check if the import is split into sessions
+        self.Chunked = 1 if ((SESSION_SIZE > 0) or (SESSION_PER_COMPONENT == 1)) else 0
+
+        # remember the ADH and its progress marker (if the marker exists, an earlier import split into sessions did not finish)
+        self.Filename     = Filename
+        self.ProgressFile = GetProgressFile(Filename)
+
+        # resume an unfinished import by only importing the components that are not complete
+        self.Incremental = 1 if ((INCREMENTAL_ADH == 1) or ((self.Chunked == 1) and (os.path.isfile(self.ProgressFile)))) else 0
+
+        # count the elements created and the sessions closed
+        self.Created      = 0
+        self.SessionStart = 0
+        self.Sessions     = 0
+        
+        # try to open and read the JSON file
+        try:
+
+            # create a finder for the model
+            self.QualNameFind = Finder.byName()
+
+            # check if only the changed components should be imported or the import is split into sessions
+            if (self.Incremental == 1) or (self.Chunked == 1):
+
+                # read the JSON file
+                MyJSON = LoadJSON(Filename, CHUNK_SIZE)
+
+                # check if the import is split into sessions
+                if (self.Chunked == 1):
+
+                    # mark the import as started
+                    self.WriteProgress(None)
+
+                # end if
+
+                # traverse the nested dictionary, skipping unchanged components
+                self.GetData(MyJSON, self.Model, 0, None)
+
+                # remove the top-level components that are no longer in the ADH (lower-level ones are removed with their changed owner)
+                if (self.Incremental == 1):
+                    self.RemoveStaleComponents(self.Model)
+                # end if
+
+                # check if the import is split into sessions
+                if (self.Chunked == 1):
+
+                    # the import is complete
+                    os.remove(self.ProgressFile)
+
+                    # report what was done
+                    Application.getInstance().getGUILog().showMessage("ADH Import: " + str(self.Created) + " element(s) created in " + str(self.Sessions + 1) + " session(s).")
+
+                # end if
+
+                # check if components from an earlier import were compared
+                if (self.Incremental == 1):
+
+                    # report what was done
+                    Application.getInstance().getGUILog().showMessage("ADH Import: " + str(self.ComponentCounts["Added"]) + " component(s) added, " + str(self.ComponentCounts["Replaced"]) + " replaced, " + str(self.ComponentCounts["Skipped"]) + " unchanged, and " + str(self.ComponentCounts["Removed"]) + " removed.")
+
+                # end if
+
+            # check if the import should be planned on a background thread
+            elif (PLAN_ADH == 1) and (PIPELINE_ADH == 1):
+
+                # read and plan the ADH on a background thread
+                Pipe = Pipeline(lambda Sink: PlanADH(Filename, Sink, CHUNK_SIZE), PIPELINE_QUEUE, PIPELINE_BATCH)
+
+                try:
+
+                    # create the model elements as they are planned
+                    self.ApplyPlan(Pipe.Items())
+
+                finally:
+
+                    # stop the background thread
+                    Pipe.Stop()
+
+                # end try-finally
+
+            # check if the import should be planned first
+            elif (PLAN_ADH == 1):
+
+                # read the JSON file and plan the model elements without touching the model
+                Plan = PlanADH(Filename, [], CHUNK_SIZE)
+
+                # create the model elements
+                self.ApplyPlan(Plan)
+
+            # check if the ADH should be parsed on a background thread
+            elif (STREAM_ADH == 1) and (PIPELINE_ADH == 1):
+
+                # parse the ADH on a background thread
+                Pipe = Pipeline(lambda Sink: ParseADH(Filename, Sink, CHUNK_SIZE), PIPELINE_QUEUE, PIPELINE_BATCH)
+
+                try:
+
+                    # create the model elements as the events arrive
+                    self.StreamADH(Pipe.Items())
+
+                finally:
+
+                    # stop the background thread
+                    Pipe.Stop()
+
+                # end try-finally
+
+            # check if the ADH should be streamed
+            elif (STREAM_ADH == 1):
+
+                # open the ADH
+                f = OpenADH(Filename)
+
+                try:
+
+                    # create the model elements while the file is parsed
+                    self.StreamADH(GetADHEvents(f, Filename, CHUNK_SIZE))
+
+                finally:
+
+                    # close the file
+                    f.close()
+
+                # end try-finally
+
+            elif (GetADHFormat(Filename) == "msgpack"):
+
+                # read the MessagePack file (there is no decoder for it other than the event parser)
+                MyJSON = LoadJSON(Filename, CHUNK_SIZE)
+
+                # traverse the nested dictionary and create stereotypes within the input class
+                self.GetData(MyJSON, self.Model, 0, None)
+
+            else:
+
+                # open a JSON file (decompressing it if needed)
+                f = OpenADH(Filename)
+
+                # read the file
+                MyString = f.read()
+
+                # convert to a JSON string
+                MyJSON = json.loads(MyString)
+
+                # close the file
+                f.close()
+
+                # traverse the nested dictionary and create stereotypes within the input class
+                self.GetData(MyJSON, self.Model, 0, None)
+
+            # end if
+
+        except Exception as e:
+        
+            # print the exception
+            Application.getInstance().getGUILog().showMessage("ADH Import Failed:\n" + repr(e))
+
+            # check if the import can be resumed
+            if (self.Chunked == 1) and (os.path.isfile(self.ProgressFile)):
+
+                # tell the user how to resume
+                Application.getInstance().getGUILog().showMessage("The sessions committed so far were kept. Read the same ADH again to resume the import.")
+
+            else:
+
+                # the model may be partly built (e.g., a streamed ADH that is cut short), so let execute cancel the session
+                raise
+
+            # end if
+        # end try-except
+    # end ImportADH
+
+    # -------------------------------------------------------
+
+    # function to create the model elements in an import plan
+    @Timed
+    def ApplyPlan(self, Plan):
+        """
+
+        ApplyPlan(self, Plan)
+
+        Create the model elements in a plan made by the import planner, in one pass. The elements are added to the model in batches, one owner at a time.
+
+        INPUTS:
+            self: the SysML model
+
+            Plan: the list of operations made by the import planner
+
+        OUTPUTS:
+            none
+
+        """
+
+        # model elements by handle
+        self.Elements = {ROOT : self.Model}
+
+        # elements waiting to be added to the model, grouped by the handle of their owner
+        self.Pending = {}
+
+        # owners in the order they were first used
+        self.PendingOwners = []
+
+        # loop through the operations
+        for Op in Plan:
+
+            # get the type of operation
+            OpType = Op[0]
+
+            # check the type of operation
+            if (OpType == "package"):
+
+                # get the details
+                Handle, Owner, Name, Role = Op[1:]
+
+                # create the package
+                NewElement = self.CreatePackage(Name)
+
+                # check if it is a sub-package
+                if (Role is not None):
+
+                    # index the sub-package with the component's block
+                    self.PackageIndex[(self.Elements[Owner], Role)] = (NewElement, self.PackageIndex.get((self.Elements[Owner], None), (None, None))[1])
+
+                # end if
+
+            elif (OpType == "component") or (OpType == "block"):
+
+                # get the details
+                Handle, Owner, Name, ReqFlag = Op[1:]
+
+                # create the block (or requirement)
+                NewElement = self.CreateInstance(Name, ReqFlag)
+
+                # check if it is a component's block
+                if (OpType == "component"):
+
+                    # index the block
+                    self.PackageIndex[(self.Elements[Owner], None)] = (None, NewElement)
+                    self.KnownOwners.add(NewElement)
+
+                # end if
+
+            elif (OpType == "stereotype"):
+
+                # check if the stereotype must be added
+                if (self.ProfileFlag == 0):
+
+                    # get the stereotype
+                    MyStereotype = self.GetProfileStereotype(Op[2], Op[3])
+
+                    # check if the stereotype exists
+                    if (MyStereotype != None):
+
+                        # if so, add the stereotype
+                        SH.addStereotype(self.Elements[Op[1]], MyStereotype)
+
+                    # end if
+                # end if
+
+                # nothing to add to the model
+                continue
+
+            elif (OpType == "part"):
+
+                # get the details
+                Handle, Owner, Type = None, Op[1], self.Elements[Op[2]]
+
+                # create a property
+                NewElement = self.Factory.createPropertyInstance()
+
+                # set the part property type as the lower level component
+                NewElement.setType(Type)
+
+                # use the lower level component's name as the property name
+                NewElement.setName(Type.getName())
+
+                # set a composite association
+                NewElement.setAggregation(MDKernel.AggregationKindEnum.COMPOSITE)
+
+            elif (OpType == "property"):
+
+                # get the details
+                Handle, Owner = None, Op[1]
+
+                # create the value property
+                NewElement = self.MakeProperty(Op[2], Op[3])
+
+                # check that it was created
+                if (NewElement is None):
+                    continue
+                # end if
+
+            elif (OpType == "array"):
+
+                # get the details
+                Handle, Owner = None, Op[1]
+
+                # create the array value property
+                NewElement = self.MakeArrayProperty(Op[2], Op[3])
+
+            elif (OpType == "text"):
+
+                # set the requirement text
+                SH.setStereotypePropertyValue(self.Elements[Op[1]], self.ReqSter, "Text", Op[2])
+
+                # nothing to add to the model
+                continue
+
+            elif (OpType == "data"):
+
+                # the elements created so far must be in the model first
+                self.AddPending()
+
+                # read the data next to the elements that existed before the import
+                self.GetData(Op[2], self.Elements[Op[1]], Op[3], self.Elements.get(Op[4]))
+
+                # nothing to add to the model
+                continue
+
+            else:
+
+                # throw an error
+                raise ValueError("Unknown operation in the import plan: " + repr(OpType))
+
+            # end if
+
+            # remember the element
+            if (Handle is not None):
+                self.Elements[Handle] = NewElement
+            # end if
+
+            # check if the owner was used before
+            if (Owner not in self.Pending):
+
+                # start a batch for the owner
+                self.Pending[Owner] = []
+                self.PendingOwners.append(Owner)
+
+            # end if
+
+            # wait to add the element
+            self.Pending[Owner].append(NewElement)
+
+        # end for
+
+        # add the remaining elements to the model
+        self.AddPending()
+
+    # end ApplyPlan
+
+    # -------------------------------------------------------
+
+    # function to add the elements waiting in an import plan to the model
+    def AddPending(self):
+        """
+
+        AddPending(self)
+
+        Add the elements created by ApplyPlan to the model, one owner at a time (owners are added before the elements they own).
+
+        INPUTS:
+            self: the SysML model
+
+        OUTPUTS:
+            none
+
+        """
+
+        # loop through the owners in the order they were first used
+        for Owner in self.PendingOwners:
+
+            # get the owner
+            OwnerElement = self.Elements[Owner]
+
+            # add its elements
+            for NewElement in self.Pending[Owner]:
+                self.Manager.addElement(NewElement, OwnerElement)
+            # end for
+
+        # end for
+
+        # nothing is waiting
+        self.Pending       = {}
+        self.PendingOwners = []
+
+    # end AddPending
+
+    # -------------------------------------------------------
+
+    # function to recursively get data from the JSON file
+    @Timed
+    def GetData(self, MyJSON, ParentPackage, ReqSterFlag, HigherLevelComp = None):
+        """
+
+        GetData(self, MyJSON, ParentPackage, ReqSterFlag, HigherLevelComp = None):
+
+        Look for all components with WBS numbers, create stereotypes for them, and establish dependency relationships between the higher- and lower-level components.
+
+        INPUTS:
+            self           : the SysML model
+
+            MyJSON         : the subset of the JSON string being analyzed
+
+            ParentPackage  : the higher-level package that has already been created (if any) and where the next set of model elements will reside
+
+            ReqSterFlag    : flag to show that a requirement needs to be made (1) or not (0)
+
+            HigherLevelComp: (optional, assumed None) the higher-level component used as theowner of the part property generated between a higher-/lower-level component pair
+
+        OUTPUTS:
+            none
+
+        """
+        
+        # try to get the data
+        try:                
+            
+            # loop through each of the items at this level
+            for ikey, ivalue in MyJSON.items():
+                
+                # assume it is a floating value
+                DataType = 0
+                
+                # check if the value is a dictionary
+                if (isinstance(ivalue, dict)):
+                    
+                    # it is a block with additional data inside of it
+                    DataType = -1
+                    
+                    # check if the value has a WBS number
+                    try:
+                        if ("wbs_no" in ivalue.keys()):
+                            
+                            # then, it is a component that can have folders
+                            DataType = +1
+                            
+                            # end if
+                            
+                    except:
+                        
+                        # do nothing
+                        pass
+                    
+                    # end try-except
+            
+                # end if
+
+                # check if the data is a list
+                if (isinstance(ivalue, list)):
+
+                    # it is an array that must be opened up
+                    DataType = +2
+
+                # end if
+                
+                # check for keywords
+                if (ikey == "components") or (ikey == "requirements") or (ikey == "performance") or (ikey == "behavior"):
+
+                    # open up the data type
+                    DataType = +2
+
+                # end if
+                    
+                # check if a new session must be started before the component
+                if (DataType == +1) and (self.Chunked == 1):
+                    self.CheckSession(ikey)
+                # end if
+
+                # look up the component's package from an earlier import (only once)
+                OldPackage = self.FindComponentPackage(ParentPackage, ikey) if ((DataType == +1) and (self.Incremental == 1)) else None
+
+                # check how data must be handlded
+                if (DataType == 0):
+                    
+                    # we want the package above for storing floating point values
+                    Parent = ParentPackage.getOwner()
+                    
+                    # read the floating parameter
+                    self.ReadFloatingValue(Parent, ikey, ivalue)
+                    
+                elif (DataType == -1):
+                    
+                    # read a data structure
+                    self.ReadDataStructure(ParentPackage, ikey, ivalue, ReqSterFlag, HigherLevelComp)
+                    
+                elif (OldPackage is not None):
+
+                    # skip or replace the component from the earlier import
+                    self.UpdateComponent(OldPackage, ikey, ivalue, ReqSterFlag, HigherLevelComp)
+
+                elif (DataType == +1):
+
+                    # create the package, block, and part property for the component
+                    MainPackage, ComponentClass = self.CreateComponent(ikey, ivalue, ParentPackage, ReqSterFlag, HigherLevelComp)
+
+                    # check if the component's content must be remembered
+                    if (self.Incremental == 1) or (self.Chunked == 1):
+
+                        # count the component
+                        self.SeenComponents.add(MainPackage)
+                        self.ComponentCounts["Added"] += 1
+
+                    # end if
+                    
+                    # create the necessary folders
+                    self.MakePackages(ivalue, MainPackage)
+                    
+                    # look up the architecture package
+                    Parent = self.FindSubPackage(MainPackage, "Architecture")
+                
+                    # the parent is the block unless an architecture package exists
+                    if (Parent is None):
+                        Parent = ComponentClass
+                    # end if
+
+                    # explore the next level of the component
+                    self.GetData(ivalue, Parent, ReqSterFlag, ComponentClass)
+
+                    # check if the component's content must be remembered
+                    if (self.Incremental == 1) or (self.Chunked == 1):
+
+                        # store the hash on the package, now that the component is complete
+                        MainPackage.setURI(HASH_PREFIX + HashADH(ivalue))
+
+                    # end if
+                    
+                elif (DataType == +2):
+
+                    # get the package the contents must be placed in
+                    Parent, ReqSterFlag = self.GetTargetPackage(ikey, ParentPackage)
+                    
+                    # check if the value is a list
+                    if (isinstance(ivalue, list)) and (IsCompactArray(ikey, ivalue)):
+
+                        # store the whole array in one value property
+                        self.ReadFloatingValue(ParentPackage.getOwner(), ikey, ivalue)
+
+                    elif (isinstance(ivalue, list)):
+
+                        # get the length of the list
+                        if (len(ivalue) > 0):
+                            
+                            # loop through each of the components
+                            for icomp in range(len(ivalue)):
+
+                                # create the name
+                                CompName = ikey + "__" + str(icomp)
+                                
+                                # read each component separately
+                                self.GetData({CompName : ivalue[icomp]}, Parent, ReqSterFlag, HigherLevelComp)
+                                
+                            # end for
+                        # end if                            
+                        
+                    else:
+
+                        # loop through the contents of the dictionary
+                        for jkey, jvalue in ivalue.items():
+            
+                            # there is only one element, no loops or lists needed
+                            self.GetData({jkey : jvalue}, Parent, ReqSterFlag, HigherLevelComp)
+
+                        # end for
+                        
+                    # end if
+
+                    # turn off the requirement flag
+                    ReqSterFlag = 0
+                    
+                else:
+                    
+                    # throw an error
+                    print("ERROR - GetData: Invalid DataType selected.")
+                    
+                    # break out of the loop for now
+                    break
+                
+                # end if    
+            # end for
+
+        except Exception as e:
+
+            print("Bad: " + repr(MyJSON) + "\n")
+            print("Exception: " + repr(e))
+
+        # end try-except
+
+    # end GetData
+
+    # -------------------------------------------------------
+
+    # function to create the model elements for a component with a WBS number
+    def CreateComponent(self, ikey, ivalue, ParentPackage, ReqSterFlag, HigherLevelComp = None):
+        """
+
+        CreateComponent(self, ikey, ivalue, ParentPackage, ReqSterFlag, HigherLevelComp = None)
+
+        Create the package and block for a component with a WBS number, apply its stereotype, and relate it to the higher-level component.
+
+        INPUTS:
+            self           : the SysML model
+
+            ikey           : the name of the component
+
+            ivalue         : the component's data (only the "name" is needed, so a partially read component is acceptable)
+
+            ParentPackage  : the package that the component's package will reside in
+
+            ReqSterFlag    : flag to show that a requirement needs to be made (1) or not (0)
+
+            HigherLevelComp: (optional, assumed None) the higher-level component used as the owner of the part property
+
+        OUTPUTS:
+            MainPackage    : the package created for the component
+
+            ComponentClass : the block created for the component
+
+        """
+
+        # create a new package
+        MainPackage = self.CreatePackage(ikey)
+
+        # set the owner of the package to be the parent
+        MainPackage.setOwner(ParentPackage)
+
+        # check if the component's content must be remembered
+        if (self.Incremental == 1) or (self.Chunked == 1):
+
+            # mark the component as incomplete until its content is read
+            MainPackage.setURI(HASH_PREFIX)
+
+        # end if
+
+        # create an instance of the component as normal
+        ComponentClass = self.CreateInstance(ikey, ReqSterFlag)
+
+        # set the owner of the class to be the package just created
+        ComponentClass.setOwner(MainPackage)
+
+        # index the block (a component's floating values are read into it)
+        self.PackageIndex[(MainPackage, None)] = (None, ComponentClass)
+        self.KnownOwners.add(ComponentClass)
+
+        # check if the stereotype must be added
+        if (self.ProfileFlag == 0):
+
+            # get the stereotype
+            MyStereotype = self.GetProfileStereotype(ikey, ivalue)
+
+            # check if the stereotype exists
+            if (MyStereotype != None):
+
+                # if so, add the stereotype
+                SH.addStereotype(ComponentClass, MyStereotype)
+
+            # end if
+        # end if
+
+        # check if there's a higher-level component for decomposition relation
+        if (HigherLevelComp != None):
+
+            # create a property
+            PartProperty = self.Factory.createPropertyInstance()
+
+            # set the owner to the higher level component
+            PartProperty.setOwner(HigherLevelComp)
+
+            # set the part property type as the lower level component
+            PartProperty.setType(ComponentClass)
+
+            # use the lower level component's name as the property name
+            PartProperty.setName(ComponentClass.getName())
+
+            # set a composite association
+            PartProperty.setAggregation(MDKernel.AggregationKindEnum.COMPOSITE)
+
+        # end if
+
+        # return the package and block
+        return MainPackage, ComponentClass
+
+    # end CreateComponent
+    # -------------------------------------------------------
+
+    # function to find a component's package from an earlier import
+    def FindComponentPackage(self, ParentPackage, Name):
+        """
+
+        FindComponentPackage(self, ParentPackage, Name)
+
+        Find the package of a component that was created by an earlier import (its URI holds the component's content hash).
+
+        INPUTS:
+            self         : the SysML model
+
+            ParentPackage: the package that would own the component's package
+
+            Name         : the name of the component
+
+        OUTPUTS:
+            the component's package, or None if the component was not imported before
+
+        """
+
+        # packages created during this import only hold components from this import
+        if (ParentPackage in self.KnownOwners) and (ParentPackage not in self.KeptPackages):
+
+            # nothing from an earlier import
+            return None
+
+        # end if
+
+        # get the components from earlier imports in the package
+        Existing = self.ExistingComponents.get(ParentPackage)
+
+        # check if the package was searched before
+        if (Existing is None):
+
+            # remember the components by name
+            Existing = {}
+
+            # loop through the children of the package
+            for ichild in ParentPackage.getOwnedElement():
+
+                # check for a package with a content hash
+                if (str(ichild.getHumanName()).startswith("Package ")) and (str(ichild.getURI()).startswith(HASH_PREFIX)):
+
+                    # remember the component
+                    Existing[ichild.getName()] = ichild
+
+                # end if
+            # end for
+
+            # remember the components for the next search
+            self.ExistingComponents[ParentPackage] = Existing
+
+        # end if
+
+        # return the component's package, if any
+        return Existing.get(Name)
+
+    # end FindComponentPackage
+
+    # -------------------------------------------------------
+
+    # function to skip or replace a component from an earlier import
+    def UpdateComponent(self, MainPackage, ikey, ivalue, ReqSterFlag, HigherLevelComp = None):
+        """
+
+        UpdateComponent(self, MainPackage, ikey, ivalue, ReqSterFlag, HigherLevelComp = None)
+
+        Compare a component from an earlier import with its content in the ADH. An unchanged component is skipped; otherwise, its own values, data structures, and sub-packages are replaced, and its lower-level components are compared in turn.
+
+        INPUTS:
+            self           : the SysML model
+
+            MainPackage    : the component's package from the earlier import
+
+            ikey           : the name of the component
+
+            ivalue         : the component's data
+
+            ReqSterFlag    : flag to show that a requirement needs to be made (1) or not (0)
+
+            HigherLevelComp: (optional, assumed None) the higher-level component used as the owner of the part property
+
+        OUTPUTS:
+            none
+
+        """
+
+        # the component is still in the ADH
+        self.SeenComponents.add(MainPackage)
+
+        # remember the component's block and sub-packages
+        ComponentClass = None
+        SubPackages    = {}
+
+        # loop through the children of the package
+        for ichild in MainPackage.getOwnedElement():
+
+            # get the human name
+            HumanName = str(ichild.getHumanName())
+
+            # check for the block or a sub-package
+            if (HumanName == "Block " + ikey) or (HumanName == "Requirement " + ikey):
+                ComponentClass = ichild
+            elif (HumanName[len("Package "):] in ("Architecture", "Requirements", "Performance", "Behavior")):
+                SubPackages[HumanName[len("Package "):]] = ichild
+            # end if
+
+        # end for
+
+        # check that the block exists
+        if (ComponentClass is None):
+
+            # get the package that owns the component
+            ParentPackage = MainPackage.getOwner()
+
+            # the component cannot be updated, so forget it and create it again
+            del self.ExistingComponents[ParentPackage][ikey]
+            self.Manager.removeElement(MainPackage)
+            self.GetData({ikey : ivalue}, ParentPackage, ReqSterFlag, HigherLevelComp)
+
+            # nothing else to do
+            return
+
+        # end if
+
+        # index the block and sub-packages, as if they were created during this import
+        self.PackageIndex[(MainPackage, None)] = (None, ComponentClass)
+        self.KnownOwners.update([MainPackage, ComponentClass])
+
+        # loop through the sub-packages
+        for Role, SubPackage in SubPackages.items():
+
+            # index the sub-package, which may hold lower-level components from the earlier import
+            self.PackageIndex[(MainPackage, Role)] = (SubPackage, ComponentClass)
+            self.KnownOwners.add(SubPackage)
+            self.KeptPackages.add(SubPackage)
+
+        # end for
+
+        # check if there's a higher-level component for decomposition relation (its part properties were replaced)
+        if (HigherLevelComp != None):
+
+            # create a property
+            PartProperty = self.Factory.createPropertyInstance()
+
+            # set the owner to the higher level component
+            PartProperty.setOwner(HigherLevelComp)
+
+            # set the part property type as the lower level component
+            PartProperty.setType(ComponentClass)
+
+            # use the lower level component's name as the property name
+            PartProperty.setName(ComponentClass.getName())
+
+            # set a composite association
+            PartProperty.setAggregation(MDKernel.AggregationKindEnum.COMPOSITE)
+
+        # end if
+
+        # get the hash of the component's content
+        Hash = HASH_PREFIX + HashADH(ivalue)
+
+        # check if the component changed
+        if (str(MainPackage.getURI()) == Hash):
+
+            # skip the component
+            self.ComponentCounts["Skipped"] += 1
+
+            # nothing else to do
+            return
+
+        # end if
+
+        # remove the block's values, data structures, and part properties
+        for ichild in list(ComponentClass.getOwnedElement()):
+            self.Manager.removeElement(ichild)
+        # end for
+
+        # loop through the sub-packages
+        for SubPackage in SubPackages.values():
+
+            # get the lower-level components
+            Components = self.FindComponentPackages(SubPackage)
+
+            # remove everything else
+            for ichild in list(SubPackage.getOwnedElement()):
+                if (ichild not in Components):
+                    self.Manager.removeElement(ichild)
+                # end if
+            # end for
+
+        # end for
+
+        # mark the component as incomplete until its content is read
+        MainPackage.setURI(HASH_PREFIX)
+        self.ComponentCounts["Replaced"] += 1
+
+        # create any sub-packages that are now needed
+        self.MakePackages(ivalue, MainPackage)
+
+        # look up the architecture package
+        Parent = self.FindSubPackage(MainPackage, "Architecture")
+
+        # the parent is the block unless an architecture package exists
+        if (Parent is None):
+            Parent = ComponentClass
+        # end if
+
+        # explore the next level of the component
+        self.GetData(ivalue, Parent, ReqSterFlag, ComponentClass)
+
+        # store the new hash, now that the component is complete
+        MainPackage.setURI(Hash)
+
+        # loop through the sub-packages from the earlier import
+        for Role, SubPackage in SubPackages.items():
+
+            # remove the lower-level components that are no longer in the ADH
+            self.RemoveStaleComponents(SubPackage)
+
+            # check if the sub-package is empty and no longer needed
+            if (len(SubPackage.getOwnedElement()) == 0) and (Role not in [GetSubPackageName(jkey) for jkey in ivalue.keys()]):
+
+                # remove it
+                self.Manager.removeElement(SubPackage)
+                del self.PackageIndex[(MainPackage, Role)]
+
+            # end if
+        # end for
+
+    # end UpdateComponent
+
+    # -------------------------------------------------------
+
+    # function to remove the components from an earlier import that are no longer in the ADH
+    def RemoveStaleComponents(self, Package):
+        """
+
+        RemoveStaleComponents(self, Package)
+
+        Remove the packages of components created by an earlier import in a package, if the components were not found in the ADH.
+
+        INPUTS:
+            self   : the SysML model
+
+            Package: the package to be searched
+
+        OUTPUTS:
+            none
+
+        """
+
+        # loop through the components from the earlier import
+        for ichild in self.FindComponentPackages(Package):
+
+            # check if the component is no longer in the ADH
+            if (ichild not in self.SeenComponents):
+
+                # remove it
+                self.Manager.removeElement(ichild)
+                self.ComponentCounts["Removed"] += 1
+
+            # end if
+        # end for
+
+    # end RemoveStaleComponents
+
+    # -------------------------------------------------------
+
+    # function to list the components from an earlier import in a package
+    def FindComponentPackages(self, Package):
+        """
+
+        FindComponentPackages(self, Package)
+
+        List the packages of components created by an earlier import in a package.
+
+        INPUTS:
+            self   : the SysML model
+
+            Package: the package to be searched
+
+        OUTPUTS:
+            a list of the components' packages
+
+        """
+
+        # search the package, if needed
+        self.FindComponentPackage(Package, None)
+
+        # return the components
+        return list(self.ExistingComponents.get(Package, {}).values())
+
+    # end FindComponentPackages
+
+    # -------------------------------------------------------
+
+    # function to start a new session before a component, if needed
+    def CheckSession(self, Component):
+        """
+
+        CheckSession(self, Component)
+
+        Close the current session and start a new one if every component gets its own session or enough elements were created. The progress marker is updated after the session closes, so the import can be resumed from there.
+
+        INPUTS:
+            self     : the SysML model
+
+            Component: the name of the component about to be read
+
+        OUTPUTS:
+            none
+
+        """
+
+        # nothing to commit if no elements were created
+        if (self.Created == self.SessionStart):
+            return
+        # end if
+
+        # check if the session is full
+        if (SESSION_PER_COMPONENT == 1) or ((SESSION_SIZE > 0) and (self.Created - self.SessionStart >= SESSION_SIZE)):
+
+            # commit the elements created so far
+            SM.getInstance().closeSession(self.Project)
+
+            # count the session
+            self.Sessions    += 1
+            self.SessionStart = self.Created
+
+            # record how far the import got
+            self.WriteProgress(Component)
+
+            # start the next session
+            SM.getInstance().createSession(self.Project, "Read ADH (" + str(self.Sessions + 1) + ")")
+
+        # end if
+    # end CheckSession
+
+    # -------------------------------------------------------
+
+    # function to record how far an import split into sessions got
+    def WriteProgress(self, Component):
+        """
+
+        WriteProgress(self, Component)
+
+        Write the progress marker of an import split into sessions. While the marker exists, reading the same ADH again resumes the import: complete components (whose package holds their content hash) are skipped, and incomplete ones are read again.
+
+        INPUTS:
+            self     : the SysML model
+
+            Component: the name of the component the next session starts with (None if the import just started)
+
+        OUTPUTS:
+            none
+
+        """
+
+        # open the progress marker
+        f = open(self.ProgressFile, "w")
+
+        try:
+
+            # record the ADH, the sessions committed, and where the next one starts
+            json.dump({"adh" : self.Filename, "sessions" : self.Sessions, "elements" : self.Created, "next_component" : Component}, f, indent = 4)
+
+        finally:
+
+            # close the file
+            f.close()
+
+        # end try-finally
+    # end WriteProgress
+
+    # -------------------------------------------------------
+
+    # function to load the ADH profile's stereotypes
+    def LoadStereotypes(self):
+        """
+
+        LoadStereotypes(self)
+
+        Load the stereotypes in the ADH profile into a dictionary by name, so applying a stereotype costs a dictionary lookup. The profile is walked once per run, so stereotypes added, renamed, or deleted since the last run are always seen.
+
+        INPUTS:
+            self: the SysML model
+
+        OUTPUTS:
+            none
+
+        """
+
+        # create a new dictionary
+        ByName = {}
+
+        # remember the elements to search (stereotypes may be nested in packages)
+        ToSearch = list(self.Profile.getOwnedElement())
+
+        # loop until every element is searched
+        while (len(ToSearch) > 0):
+
+            # get the next element
+            Element = ToSearch.pop()
+
+            # check if it is a stereotype
+            if (isinstance(Element, Stereotype)):
+
+                # remember the stereotype by its name
+                ByName[Element.getName()] = Element
+
+            else:
+
+                # search its children
+                ToSearch.extend(Element.getOwnedElement())
+
+            # end if
+        # end while
+
+        # remember the dictionary
+        self.StereotypesByName = ByName
+
+    # end LoadStereotypes
+
+    # -------------------------------------------------------
+
+    # function to get the stereotype for a component
+    def GetProfileStereotype(self, ikey, ivalue):
+        """
+
+        GetProfileStereotype(self, ikey, ivalue)
+
+        Get the stereotype for a component from the loaded ADH profile, first by its key, and then by its "name".
+
+        INPUTS:
+            self  : the SysML model
+
+            ikey  : the key of the component
+
+            ivalue: the component's data (only the "name" is needed)
+
+        OUTPUTS:
+            MyStereotype: the stereotype, or None if the profile does not have one
+
+        """
+
+        # get the stereotype by the key
+        MyStereotype = self.StereotypesByName.get(ikey)
+
+        # check if it's non-existant
+        if (MyStereotype is None) and (isinstance(ivalue.get("name"), (str, unicode))):
+
+            # now, try getting the stereotype by the component's name
+            MyStereotype = self.StereotypesByName.get(ivalue["name"])
+
+        # end if
+
+        # return the stereotype
+        return MyStereotype
+
+    # end GetProfileStereotype
+
+    # -------------------------------------------------------
+
+    # function to find the package that a reserved word's contents are placed in
+    def GetTargetPackage(self, ikey, ParentPackage):
+        """
+
+        GetTargetPackage(self, ikey, ParentPackage)
+
+        Find the package that the contents of a list or reserved word ("components", "requirements", "performance", or "behavior") must be placed in.
+
+        INPUTS:
+            self         : the SysML model
+
+            ikey         : the key of the list or reserved word
+
+            ParentPackage: the package that the key was found in
+
+        OUTPUTS:
+            Parent       : the package that the contents must be placed in
+
+            ReqSterFlag  : flag to show that requirements must be made (1) or not (0)
+
+        """
+
+        # assume not a requirement
+        ReqSterFlag = 0
+
+        # get the appropriate sub-package
+        if (ikey == "requirements"):
+
+            # provide the role of the sub-package
+            TargetName = "Requirements"
+
+            # the parent pacakage is the higher-level package
+            Parent = ParentPackage.getOwner()
+
+            # flag that we're dealing with a requirement
+            ReqSterFlag = 1
+
+        elif (ikey == "performance"):
+
+            # provide the role of the sub-package
+            TargetName = "Performance"
+
+            # the parent pacakage is the higher-level package
+            Parent = ParentPackage.getOwner()
+
+        elif (ikey == "behavior"):
+
+            # provide the role of the sub-package
+            TargetName = "Behavior"
+
+            # the parent pacakage is the higher-level package
+            Parent = ParentPackage.getOwner()
 
-        # end try-except
-    # end execute
+        else:
+
+            # provide the role of the sub-package
+            TargetName = "Architecture"
+
+            # the parent package remains the same
+            Parent = ParentPackage
+
+        # end if
+
+        # look up the sub-package
+        SubPackage = self.FindSubPackage(Parent, TargetName)
+
+        # check if it exists
+        if (SubPackage is not None):
+
+            # remember this as the parent package
+            Parent = SubPackage
+
+        # end if
+
+        # return the package and requirement flag
+        return Parent, ReqSterFlag
+
+    # end GetTargetPackage
 
     # -------------------------------------------------------
 
-    # read a JSON file
-    def ImportADH(self, Filename):
+    # function to create model elements from the parsing events of an object
+    def StreamData(self, Events, ParentPackage, ReqSterFlag, HigherLevelComp = None):
         """
 
-        ImportADH(self, Filename)
+        StreamData(self, Events, ParentPackage, ReqSterFlag, HigherLevelComp = None)
 
-        Read a JSON file to create the system model.
+        Streaming counterpart of GetData: create the model elements for each key-value pair of an object as soon as it is parsed.
 
         INPUTS:
-            self    : the SysML model
+            self           : the SysML model
 
-            Filename: the JSON file to read and create the SysML model from
+            Events         : the generator of parsing events, positioned just after the object was opened
+
+            ParentPackage  : the higher-level package where the next set of model elements will reside
+
+            ReqSterFlag    : flag to show that a requirement needs to be made (1) or not (0)
+
+            HigherLevelComp: (optional, assumed None) the higher-level component used as the owner of part properties
 
         OUTPUTS:
             none
 
         """
-        
-        # remember the ADH profile
-        self.Profile = SH.getProfile(self.Project, "ImportADHProfile")
 
-        # if there's no profile, throw a warning
-        if (self.Profile is None):
+        # read the first entry
+        Entry = ReadEntry(Events)
 
-            # throw failure
-            self.ProfileFlag = -1
+        # loop until the object ends
+        while (Entry is not None):
 
-            # print a warning
-            Application.getInstance().getGUILog().showMessage("WARNING: No ADH Profile imported ... stereotypes won't be assigned.")
+            # get the key and the start of its value
+            ikey, Event, Value = Entry
 
-        else:
+            # create the model elements for the value
+            self.StreamValue(ikey, Event, Value, Events, ParentPackage, ReqSterFlag, HigherLevelComp)
 
-            # throw success
-            self.ProfileFlag = 0
+            # lists and reserved words turn off the requirement flag (as in GetData)
+            if (Event == "start_array") or (ikey == "components") or (ikey == "requirements") or (ikey == "performance") or (ikey == "behavior"):
+                ReqSterFlag = 0
+            # end if
 
-        # end if
+            # read the next entry
+            Entry = ReadEntry(Events)
 
-        # get the class metadata
-        self.MetaClass = SH.getMetaClassByName(self.Project, "Class")        
-        
-        # try to open and read the JSON file
-        try:
+        # end while
+    # end StreamData
 
-            # open a JSON file
-            f = open(Filename, "r")
+    # -------------------------------------------------------
 
-            # read the file
-            MyString = f.read()
+    # function to create model elements from the parsing events of a whole ADH
+    def StreamADH(self, Events):
+        """
 
-            # convert to a JSON string
-            MyJSON = json.loads(MyString)
+        StreamADH(self, Events)
 
-            # close the file
-            f.close()
-                
-            # create a finder for the model
-            self.QualNameFind = Finder.byName()
-            
-            # traverse the nested dictionary and create stereotypes within the input class
-            self.GetData(MyJSON, self.Model, 0, None)
+        Check that the ADH is an object and create the model elements for it as its parsing events arrive.
 
-        except Exception as e:
-        
-            # print the exception
-            Application.getInstance().getGUILog().showMessage("ADH Import Failed:\n" + repr(e))
+        INPUTS:
+            self  : the SysML model
 
-        # end try-except
-    # end ImportADH
+            Events: the generator of parsing events for the whole ADH
+
+        OUTPUTS:
+            none
+
+        """
+
+        # check that the ADH starts with an object
+        Event, Value = next(Events)
+
+        # check for an object
+        if (Event != "start_object"):
+
+            # throw an error
+            raise ValueError("The ADH must be a JSON object")
+
+        # end if
+
+        # create the model elements while the file is parsed
+        self.StreamData(Events, self.Model, 0, None)
+
+        # check that nothing follows the object
+        for Event, Value in Events:
+            pass
+        # end for
+
+    # end StreamADH
 
     # -------------------------------------------------------
 
-    # function to recursively get data from the JSON file
-    def GetData(self, MyJSON, ParentPackage, ReqSterFlag, HigherLevelComp = None):
+    # function to create model elements from the parsing events of a single value
+    def StreamValue(self, ikey, Event, Value, Events, ParentPackage, ReqSterFlag, HigherLevelComp = None):
         """
 
-        GetData(self, MyJSON, ParentPackage, ReqSterFlag, HigherLevelComp = None):
+        StreamValue(self, ikey, Event, Value, Events, ParentPackage, ReqSterFlag, HigherLevelComp = None)
 
-        Look for all components with WBS numbers, create stereotypes for them, and establish dependency relationships between the higher- and lower-level components.
+        Create the model elements for one key-value pair, consuming the parsing events of the value.
 
         INPUTS:
             self           : the SysML model
 
-            MyJSON         : the subset of the JSON string being analyzed
+            ikey           : the key of the value
 
-            ParentPackage  : the higher-level package that has already been created (if any) and where the next set of model elements will reside
+            Event          : the first parsing event of the value
+
+            Value          : the value attached to the first parsing event
+
+            Events         : the generator of the remaining parsing events
+
+            ParentPackage  : the higher-level package where the next set of model elements will reside
 
             ReqSterFlag    : flag to show that a requirement needs to be made (1) or not (0)
 
-            HigherLevelComp: (optional, assumed None) the higher-level component used as theowner of the part property generated between a higher-/lower-level component pair
+            HigherLevelComp: (optional, assumed None) the higher-level component used as the owner of part properties
 
         OUTPUTS:
             none
 
         """
-        
-        # try to get the data
-        try:                
-            
-            # loop through each of the items at this level
-            for ikey, ivalue in MyJSON.items():
-                
-                # assume it is a floating value
-                DataType = 0
-                
-                # check if the value is a dictionary
-                if (isinstance(ivalue, dict)):
-                    
-                    # it is a block with additional data inside of it
-                    DataType = -1
-                    
-                    # check if the value has a WBS number
-                    try:
-                        if ("wbs_no" in ivalue.keys()):
-                            
-                            # then, it is a component that can have folders
-                            DataType = +1
-                            
-                            # end if
-                            
-                    except:
-                        
-                        # do nothing
-                        pass
-                    
-                    # end try-except
-            
-                # end if
 
-                # check if the data is a list
-                if (isinstance(ivalue, list)):
+        # check the type of value
+        if (Event == "scalar"):
 
-                    # it is an array that must be opened up
-                    DataType = +2
+            # scalars are small, so read them as usual
+            self.GetData({ikey : Value}, ParentPackage, ReqSterFlag, HigherLevelComp)
 
-                # end if
-                
-                # check for keywords
-                if (ikey == "components") or (ikey == "requirements") or (ikey == "performance") or (ikey == "behavior"):
+        elif (Event == "start_array") or (ikey == "components") or (ikey == "requirements") or (ikey == "performance") or (ikey == "behavior"):
 
-                    # open up the data type
-                    DataType = +2
+            # get the package the contents must be placed in
+            Parent, ReqSterFlag = self.GetTargetPackage(ikey, ParentPackage)
 
-                # end if
-                    
-                # check how data must be handlded
-                if (DataType == 0):
-                    
-                    # we want the package above for storing floating point values
-                    Parent = ParentPackage.getOwner()
-                    
-                    # read the floating parameter
-                    self.ReadFloatingValue(Parent, ikey, ivalue)
-                    
-                elif (DataType == -1):
-                    
-                    # read a data structure
-                    self.ReadDataStructure(ParentPackage, ikey, ivalue, ReqSterFlag, HigherLevelComp)
-                    
-                elif (DataType == +1):
-                    
-                    # create a new package and (possibly) set of folders
-                    MainPackage = self.CreatePackage(ikey)
-                    
-                    # set the owner of the package to be the parent
-                    MainPackage.setOwner(ParentPackage)
+            # check if the value is a list
+            if (Event == "start_array"):
 
-                    # create an instance of the component as normal
-                    ComponentClass = self.CreateInstance(ikey, ReqSterFlag)
+                # start counting the components
+                icomp = 0
 
-                    # set the owner of the class to be the package just created
-                    ComponentClass.setOwner(MainPackage)
-                    
-                    # check if the stereotype must be added
-                    if (self.ProfileFlag == 0):
-                            
-                        # get the stereotype
-                        Stereotype = SH.getStereotype(self.Project, ikey, self.Profile)
+                # look at the first element of the list
+                First = [next(Events)]
 
-                        # check if it's non-existant
-                        if (Stereotype == None):
+                # arrays of values are small, so read them in full in case they can be stored compactly
+                if (COMPACT_ARRAYS == 1) and (First[0][0] in ("scalar", "start_array")) and (ikey != "components") and (ikey != "requirements") and (ikey != "performance") and (ikey != "behavior"):
 
-                            # get the value
-                            TempValue = MyJSON[ikey]
-                                  
-                            # now, look for the name
-                            TempName = TempValue["name"]
+                    # read the array and pass it to GetData
+                    self.GetData({ikey : BuildJSON("start_array", None, itertools.chain(First, Events))}, ParentPackage, ReqSterFlag, HigherLevelComp)
 
-                            # now, try getting the stereotype
-                            Stereotype = SH.getStereotype(self.Project, TempName, self.Profile)
+                    # the array is done
+                    First = [("end_array", None)]
 
-                        # end if
+                # end if
 
-                        # check if the stereotype exists
-                        if (Stereotype != None):
+                # loop through the list
+                for Event, Value in itertools.chain(First, Events):
 
-                            # if so, add the stereotype
-                            SH.addStereotype(ComponentClass, Stereotype)
-                            
-                        # end if
+                    # check for the end of the list
+                    if (Event == "end_array"):
+
+                        # stop reading the list
+                        break
 
                     # end if
-                    
-                    # create the necessary folders
-                    self.MakePackages(ivalue, MainPackage)
-                    
-                    # get the children of the main package
-                    Children = MainPackage.getOwnedElement()
-                
-                    # assume that the parent is the block unless an architecture package exists
-                    Parent = ComponentClass
-                    
-                    # loop through all the children
-                    for ichild in Children:
-                        
-                        # get the name of the child
-                        Name = ichild.getHumanName()
-                        
-                        # check if it is the architecture package
-                        if (Name == "Package Architecture"):
-                            
-                            # update the parent
-                            Parent = ichild
-                            
-                            # break out of the loop
-                            break
-                        
-                        # end if
-                    # end for
 
-                    # check if there's a higher-level component for decomposition relation
-                    if (HigherLevelComp != None):
+                    # read each component separately
+                    self.StreamValue(ikey + "__" + str(icomp), Event, Value, Events, Parent, ReqSterFlag, HigherLevelComp)
 
-                        # create a property
-                        PartProperty = self.Factory.createPropertyInstance()
+                    # go to the next component
+                    icomp += 1
 
-                        # set the owner to the higher level component
-                        PartProperty.setOwner(HigherLevelComp)
+                # end for
 
-                        # set the part property type as the lower level component
-                        PartProperty.setType(ComponentClass)
+            else:
 
-                        # use the lower level component's name as the property name
-                        PartProperty.setName(ComponentClass.getName())
+                # read the first entry
+                Entry = ReadEntry(Events)
 
-                        # set a composite association
-                        PartProperty.setAggregation(MDKernel.AggregationKindEnum.COMPOSITE)
+                # loop until the dictionary ends
+                while (Entry is not None):
 
-                    # end if
-                    
-                    # explore the next level of the component
-                    self.GetData(ivalue, Parent, ReqSterFlag, ComponentClass)
-                    
-                elif (DataType == +2):
+                    # get the key and the start of its value
+                    jkey, Event, Value = Entry
 
-                    # assume not a requirement
-                    ReqSterFlag = 0
-                    
-                    # get the appropriate target name
-                    if (ikey == "requirements"):
+                    # read each element separately
+                    self.StreamValue(jkey, Event, Value, Events, Parent, ReqSterFlag, HigherLevelComp)
 
-                        # provide the target name
-                        TargetName = "Package Requirements"
+                    # read the next entry
+                    Entry = ReadEntry(Events)
 
-                        # the parent pacakage is the higher-level package
-                        Parent = ParentPackage.getOwner()
+                # end while
+            # end if
 
-                        # flag that we're dealing with a requirement
-                        ReqSterFlag = 1
+        else:
 
-                    elif (ikey == "performance"):
+            # read the object
+            self.StreamObject(ikey, Events, ParentPackage, ReqSterFlag, HigherLevelComp)
 
-                        # provide the target name
-                        TargetName = "Package Performance"
+        # end if
+    # end StreamValue
 
-                        # the parent pacakage is the higher-level package
-                        Parent = ParentPackage.getOwner()
+    # -------------------------------------------------------
 
-                    elif (ikey == "behavior"):
+    # function to create model elements from the parsing events of an object
+    def StreamObject(self, ikey, Events, ParentPackage, ReqSterFlag, HigherLevelComp = None):
+        """
 
-                        # provide the target name
-                        TargetName = "Package Behavior"
+        StreamObject(self, ikey, Events, ParentPackage, ReqSterFlag, HigherLevelComp = None)
 
-                        # the parent pacakage is the higher-level package
-                        Parent = ParentPackage.getOwner()
+        Create the model elements for an object. Components with a WBS number are created as soon as their leading scalars are parsed, and their contents are streamed; any other data structure is read in full and passed to GetData.
 
-                    else:
+        INPUTS:
+            self           : the SysML model
 
-                        # provide the target name
-                        TargetName = "Package Architecture"
+            ikey           : the key of the object
 
-                        # the parent package remains the same
-                        Parent = ParentPackage
+            Events         : the generator of parsing events, positioned just after the object was opened
 
-                    # end if
-                                            
-                    # get the children of the main package
-                    Children = Parent.getOwnedElement()
-                    
-                    # loop through all of the children
-                    for ichild in Children:
-                        
-                        # get the name of the child
-                        Name = ichild.getHumanName()
-                        
-                        # check if it matches the architecture folder
-                        if (Name == TargetName):
-                            
-                            # remember this as the parent package
-                            Parent = ichild
-                            
-                            # break out of the loop
-                            break
-                        
-                        # end if
-                    # end for
-                    
-                    # check if the value is a list
-                    if (isinstance(ivalue, list)):
+            ParentPackage  : the higher-level package where the next set of model elements will reside
 
-                        # get the length of the list
-                        if (len(ivalue) > 0):
-                            
-                            # loop through each of the components
-                            for icomp in range(len(ivalue)):
+            ReqSterFlag    : flag to show that a requirement needs to be made (1) or not (0)
 
-                                # create the name
-                                CompName = ikey + "__" + str(icomp)
-                                
-                                # read each component separately
-                                self.GetData({CompName : ivalue[icomp]}, Parent, ReqSterFlag, HigherLevelComp)
-                                
-                            # end for
-                        # end if                            
-                        
-                    else:
+            HigherLevelComp: (optional, assumed None) the higher-level component used as the owner of part properties
 
-                        # loop through the contents of the dictionary
-                        for jkey, jvalue in ivalue.items():
-            
-                            # there is only one element, no loops or lists needed
-                            self.GetData({jkey : jvalue}, Parent, ReqSterFlag, HigherLevelComp)
+        OUTPUTS:
+            none
 
-                        # end for
-                        
-                    # end if
+        """
 
-                    # turn off the requirement flag
-                    ReqSterFlag = 0
-                    
-                else:
-                    
-                    # throw an error
-                    print("ERROR - GetData: Invalid DataType selected.")
-                    
-                    # break out of the loop for now
-                    break
-                
-                # end if    
-            # end for
+        # remember the leading scalars (in order) and the first non-scalar entry
+        Head      = {}
+        HeadOrder = []
+        Entry     = ReadEntry(Events)
+
+        # loop through the leading scalars
+        while (Entry is not None) and (Entry[1] == "scalar"):
+
+            # remember the scalar
+            Head[Entry[0]] = Entry[2]
+            HeadOrder.append(Entry[0])
+
+            # read the next entry
+            Entry = ReadEntry(Events)
+
+        # end while
+
+        # check if it is a component with a WBS number
+        if ("wbs_no" not in Head):
+
+            # read the rest of the object
+            while (Entry is not None):
+
+                # build the value
+                Head[Entry[0]] = BuildJSON(Entry[1], Entry[2], Events)
+
+                # read the next entry
+                Entry = ReadEntry(Events)
+
+            # end while
+
+            # process the full object as usual
+            self.GetData({ikey : Head}, ParentPackage, ReqSterFlag, HigherLevelComp)
+
+            # the object was read
+            return
+
+        # end if
+
+        # create the package, block, and part property for the component
+        MainPackage, ComponentClass = self.CreateComponent(ikey, Head, ParentPackage, ReqSterFlag, HigherLevelComp)
+
+        # assume that the parent is the block unless an architecture package exists
+        Parent = ComponentClass
+
+        # loop through the leading scalars and then the rest of the component as it is parsed
+        for jkey, Event, Value in ChainEntries(HeadOrder, Head, Entry, Events):
+
+            # get the sub-package the key requires
+            SubName = GetSubPackageName(jkey)
+
+            # check if the sub-package must be created
+            if (SubName is not None) and (self.FindSubPackage(MainPackage, SubName) is None):
+
+                # create the sub-package
+                SubPackage = self.MakeSubPackage(SubName, MainPackage)
+
+                # check if the architecture package was created
+                if (SubName == "Architecture"):
+
+                    # update the parent
+                    Parent = SubPackage
 
-        except Exception as e:
+                # end if
+            # end if
 
-            print("Bad: " + repr(MyJSON) + "\n")
-            print("Exception: " + repr(e))
+            # create the model elements for the value
+            self.StreamValue(jkey, Event, Value, Events, Parent, ReqSterFlag, ComponentClass)
 
-        # end try-except
+            # lists and reserved words turn off the requirement flag (as in GetData)
+            if (Event == "start_array") or (jkey == "components") or (jkey == "requirements") or (jkey == "performance") or (jkey == "behavior"):
+                ReqSterFlag = 0
+            # end if
 
-    # end GetData
+        # end for
+    # end StreamObject
 
     # -------------------------------------------------------
 
@@ -1202,6 +5056,12 @@ class ModelStructureGenerator():
         # set the name
         NewPackage.setName(Name)
 
+        # remember that its sub-packages will be indexed
+        self.KnownOwners.add(NewPackage)
+
+        # count the element
+        self.Created += 1
+
         # return the package
         return NewPackage
 
@@ -1209,6 +5069,106 @@ class ModelStructureGenerator():
 
     # -------------------------------------------------------
 
+    # function to create a sub-package of a component
+    def MakeSubPackage(self, Role, MainPackage):
+        """
+
+        MakeSubPackage(self, Role, MainPackage)
+
+        Create a sub-package ("Architecture", "Requirements", "Performance", or "Behavior") of a component and add it to the package index.
+
+        INPUTS:
+            self       : the SysML model
+
+            Role       : the role of the sub-package, which is also its name
+
+            MainPackage: the component's package that will own the sub-package
+
+        OUTPUTS:
+            SubPackage : the sub-package created
+
+        """
+
+        # create the sub-package
+        SubPackage = self.CreatePackage(Role)
+
+        # set the owner to be the main package
+        SubPackage.setOwner(MainPackage)
+
+        # get the component's block (if it was indexed)
+        Block = self.PackageIndex.get((MainPackage, None), (None, None))[1]
+
+        # index the sub-package
+        self.PackageIndex[(MainPackage, Role)] = (SubPackage, Block)
+
+        # return the sub-package
+        return SubPackage
+
+    # end MakeSubPackage
+
+    # -------------------------------------------------------
+
+    # function to look up a sub-package
+    def FindSubPackage(self, Package, Role):
+        """
+
+        FindSubPackage(self, Package, Role)
+
+        Find the sub-package with a given role in a package, using the package index for anything created during this import.
+
+        INPUTS:
+            self   : the SysML model
+
+            Package: the package that owns the sub-package
+
+            Role   : the role of the sub-package ("Architecture", "Requirements", "Performance", or "Behavior")
+
+        OUTPUTS:
+            the sub-package, or None if it does not exist
+
+        """
+
+        # look up the sub-package in the index
+        Entry = self.PackageIndex.get((Package, Role))
+
+        # check if it was found
+        if (Entry is not None):
+
+            # return the sub-package
+            return Entry[0]
+
+        # end if
+
+        # all sub-packages of elements created during this import are indexed
+        if (Package in self.KnownOwners):
+
+            # no sub-package exists
+            return None
+
+        # end if
+
+        # remember the name of the sub-package
+        TargetName = "Package " + Role
+
+        # loop through all children of a package that existed before the import
+        for ichild in Package.getOwnedElement():
+
+            # check if it is the sub-package
+            if (ichild.getHumanName() == TargetName):
+
+                # return the sub-package
+                return ichild
+
+            # end if
+        # end for
+
+        # no sub-package exists
+        return None
+
+    # end FindSubPackage
+
+    # -------------------------------------------------------
+
     # function to create a new instance
     def CreateInstance(self, Name, ReqFlag = 0):
         """
@@ -1247,6 +5207,9 @@ class ModelStructureGenerator():
         # set the name
         NewClass.setName(Name)
 
+        # count the element
+        self.Created += 1
+
         # return the new class
         return NewClass
 
@@ -1255,6 +5218,7 @@ class ModelStructureGenerator():
     # -------------------------------------------------------
 
     # function to read data and make specific values for each array element (if needed)
+    @Timed
     def ReadData(self, Block, Key, Value, ReqFlag, HigherLevelComp = None):
         """
 
@@ -1279,6 +5243,14 @@ class ModelStructureGenerator():
             Block          : the current block with additional model elements built off of it
 
         """
+
+        # check if the array can be stored in one value property
+        if (isinstance(Value, list)) and (IsCompactArray(Key, Value)):
+
+            # create the array value property
+            return self.CreateArrayProperty(Block, Key, Value)
+
+        # end if
         
         # check if the value is a list
         if (not isinstance(Value, list)):
@@ -1288,47 +5260,14 @@ class ModelStructureGenerator():
 
         # end if
         
-        # check that the list has a length
-        if (len(Value) > 0):
+        # get the name and value of each element in one pass
+        MyEntries = GetArrayEntries(Key, Value)
 
-            # get the shape of the list
-            MyShape = GetShape(Value)
-
-            # get all of the names of entries
-            MyNames = WriteIndices(Key, *MyShape)
-            
-            # flatten the array
-            FlattenedValue = Flatten(Value)
-            
-            # assume one element
-            nelem = 1
-            
-            for idim in MyShape:
-                nelem *= idim
-                
-            # end for
-                
-            # set a counter
-            ielem = 0
-            
-            # loop through each item
-            for iname in MyNames:
-                
-                # rename the key to have individual blocks, if needed
-                if (nelem > 1):
-                    
-                    # update the key to account for multiple items
-                    NewKey = iname
-                    
-                else:
-                    
-                    # keep the same key
-                    NewKey = Key
-                    
-                # end if
+        # check that the list has a length
+        if (len(MyEntries) > 0):
 
-                # get the current element
-                CurVal = FlattenedValue[ielem]
+            # loop through each item (single items keep the same key)
+            for NewKey, CurVal in MyEntries:
             
                 # check for a dictionary
                 if (isinstance(CurVal, dict)):
@@ -1425,10 +5364,6 @@ class ModelStructureGenerator():
                     Block = self.CreateProperty(Block, NewKey, CurVal)
                                         
                 # end if
-
-                # increment the element count
-                ielem += 1
-                
             # end for
 
         else:
@@ -1446,6 +5381,7 @@ class ModelStructureGenerator():
     # -------------------------------------------------------
 
     # function to create value properties
+    @Timed
     def CreateProperty(self, Block, Key, Value):
         """
 
@@ -1466,6 +5402,44 @@ class ModelStructureGenerator():
             Block: the block with the value properties built on
 
         """
+
+        # create the property
+        NewProperty = self.MakeProperty(Key, Value)
+
+        # check that it was created
+        if (NewProperty is not None):
+
+            # add the property to the block
+            self.Manager.addElement(NewProperty, Block)
+
+        # end if
+
+        # return the Block
+        return Block
+
+    # end CreateProperty
+
+    # -------------------------------------------------------
+
+    # function to make a value property without adding it to the model
+    def MakeProperty(self, Key, Value):
+        """
+
+        MakeProperty(self, Key, Value)
+
+        Make a value property using either a Boolean, integer, float, or string, without adding it to a block.
+
+        INPUTS:
+            self       : the SysML model
+
+            Key        : the name of the value property to be created
+
+            Value      : the value of the value property to be created
+
+        OUTPUTS:
+            NewProperty: the value property (None if the type is not known)
+
+        """
         
         # check the value type
         if isinstance(Value, bool):
@@ -1514,7 +5488,7 @@ class ModelStructureGenerator():
             print("WARNING: the type for " + repr(Key) + " is not known ... not creating value property.")
             
             # don't proceed
-            return Block
+            return None
         
         # end if
 
@@ -1542,14 +5516,137 @@ class ModelStructureGenerator():
             
         # set the value
         NewProperty.setDefaultValue(MyValueInst)
+
+        # count the element
+        self.Created += 1
+
+        # return the property
+        return NewProperty
         
+    # end MakeProperty
+
+    # -------------------------------------------------------
+
+    # function to create a value property holding an entire array
+    def CreateArrayProperty(self, Block, Key, Value):
+        """
+
+        CreateArrayProperty(self, Block, Key, Value)
+
+        Create one ordered value property holding all values of an array. The values are stored as the operands of an expression whose symbol records the array's shape, and the multiplicity matches the number of values.
+
+        INPUTS:
+            self : the SysML model
+
+            Block: the curent block that the value property will be built on
+
+            Key  : the name of the value property to be created
+
+            Value: the array of values
+
+        OUTPUTS:
+            Block: the block with the value property built on
+
+        """
+
         # add the property to the block
-        self.Manager.addElement(NewProperty, Block)
+        self.Manager.addElement(self.MakeArrayProperty(Key, Value), Block)
 
         # return the Block
         return Block
-        
-    # end CreateProperty
+
+    # end CreateArrayProperty
+
+    # -------------------------------------------------------
+
+    # function to make a value property holding an entire array without adding it to the model
+    def MakeArrayProperty(self, Key, Value):
+        """
+
+        MakeArrayProperty(self, Key, Value)
+
+        Make one ordered value property holding all values of an array, without adding it to a block.
+
+        INPUTS:
+            self       : the SysML model
+
+            Key        : the name of the value property to be created
+
+            Value      : the array of values
+
+        OUTPUTS:
+            NewProperty: the value property
+
+        """
+
+        # get the shape, values, and kind of the array
+        Shape, Values, Kind = GetCompactArray(Value)
+
+        # create an expression to hold the values
+        MyExpression = self.Factory.createExpressionInstance()
+
+        # record the shape of the array
+        MyExpression.setSymbol(ARRAY_SYMBOL + ":" + "x".join([str(n) for n in Shape]))
+
+        # get the operands of the expression
+        Operands = MyExpression.getOperand()
+
+        # loop through the values
+        for ivalue in Values:
+
+            # create a literal of the value's own type
+            if isinstance(ivalue, bool):
+                MyValueInst = self.Factory.createLiteralBooleanInstance()
+            elif isinstance(ivalue, int):
+                MyValueInst = self.Factory.createLiteralIntegerInstance()
+            elif isinstance(ivalue, float):
+                MyValueInst = self.Factory.createLiteralRealInstance()
+            else:
+                MyValueInst = self.Factory.createLiteralStringInstance()
+            # end if
+
+            # set the value
+            MyValueInst.setValue(ivalue)
+
+            # add it to the expression
+            Operands.add(MyValueInst)
+
+        # end for
+
+        # create a new property
+        NewProperty = self.Factory.createPropertyInstance()
+
+        # set the property name
+        NewProperty.setName(Key)
+
+        # set the property type
+        NewProperty.setType({"Boolean" : self.Boolean, "Integer" : self.Integer, "Real" : self.Real, "String" : self.String}[Kind])
+
+        # the values are ordered
+        NewProperty.setOrdered(True)
+
+        # create the lower and upper bounds of the multiplicity
+        LowerValue = self.Factory.createLiteralIntegerInstance()
+        UpperValue = self.Factory.createLiteralUnlimitedNaturalInstance()
+
+        # both bounds are the number of values
+        LowerValue.setValue(len(Values))
+        UpperValue.setValue(len(Values))
+
+        # set the multiplicity
+        NewProperty.setLowerValue(LowerValue)
+        NewProperty.setUpperValue(UpperValue)
+
+        # set the value
+        NewProperty.setDefaultValue(MyExpression)
+
+        # count the element
+        self.Created += 1
+
+        # return the property
+        return NewProperty
+
+    # end MakeArrayProperty
 
     # -------------------------------------------------------
 
@@ -1574,7 +5671,7 @@ class ModelStructureGenerator():
         """
         
         # get the stereotype
-        MyStereotype = SH.getStereotype(self.Project, Name, self.Profile)
+        MyStereotype = self.StereotypesByName.get(Name)
         
         # check if the stereotype exists
         if (MyStereotype is not None):
@@ -1613,7 +5710,21 @@ class ModelStructureGenerator():
 
         """
 
-        # get the children of the parent package
+        # look up the component's block in the package index
+        Entry = self.PackageIndex.get((ParentPackage, None))
+
+        # check if the block was found
+        if (Entry is not None):
+
+            # read the data as a parameter
+            self.ReadData(Entry[1], ikey, ivalue, 0)
+
+            # exit the program
+            return
+
+        # end if
+
+        # get the children of a package that existed before the import
         Children = ParentPackage.getOwnedElement()
             
         # loop through all children until we reach a block
@@ -1675,57 +5786,38 @@ class ModelStructureGenerator():
         if (ikey == "requirements"):
 
             # place the information in the requirements package
-            TargetName = "Package Requirements"
+            TargetName = "Requirements"
 
         elif (ikey == "performance"):
 
             # place the information in the performance package
-            TargetName = "Package Performance"
+            TargetName = "Performance"
 
         elif (ikey == "behavior"):
 
             # place the information in the behavior package
-            TargetName = "Package Behavior"
+            TargetName = "Behavior"
 
         else:
 
             # place the information in the architecture package
-            TargetName = "Package Architecture"
+            TargetName = "Architecture"
 
         # end if
         
-        # get the children of the parent package
-        Children = ParentPackage.getOwnedElement()
-        
-        # flag for finding the architecture package
-        FoundPackage = 0
-        
-        # loop through all children until we reach a block
-        for ichild in range(len(Children)):
-            
-            # get the child's stereotype
-            Name = Children[ichild].getHumanName()
-            
-            # check for the appropriate name
-            if (Name == TargetName):
-                
-                # flag that the package was found
-                FoundPackage = 1
-                
-                # read the data as a parameter
-                Children[ichild] = self.ReadData(Children[ichild], ikey, ivalue, ReqFlag, HigherLevelComp)
-                
-                # break out of the loop
-                break
-            
-            # end if                    
-        # end for
+        # look up the package
+        SubPackage = self.FindSubPackage(ParentPackage, TargetName)
         
         # check that a package was found
-        if (FoundPackage == 0):
+        if (SubPackage is not None):
+
+            # read the data as a parameter
+            self.ReadData(SubPackage, ikey, ivalue, ReqFlag, HigherLevelComp)
+
+        else:
             
             # we must be at the highest level, so create a new block for it
-            ParentPackage = self.ReadData(ParentPackage, ikey, ivalue, ReqFlag, HigherLevelComp)
+            self.ReadData(ParentPackage, ikey, ivalue, ReqFlag, HigherLevelComp)
             
         # end if
         
@@ -1734,6 +5826,7 @@ class ModelStructureGenerator():
     # -------------------------------------------------------
 
     # function to make the necessary packages
+    @Timed
     def MakePackages(self, ivalue, MainPackage):
         """
 
@@ -1754,112 +5847,36 @@ class ModelStructureGenerator():
         """
         
         # assume no packages need to be made
-        NeedArch = 0
-        NeedReqs = 0
-        NeedPerf = 0
-        NeedBhav = 0
+        NeedPackage = {"Architecture" : 0, "Requirements" : 0, "Performance" : 0, "Behavior" : 0}
 
         try:
             
             # loop through all of the keys
             for jkey in ivalue.keys():
-                
-                # check if the key indicates components are present
-                if (jkey == "components"):
-                    
-                    # an architecture package must be created
-                    NeedArch = 1
-                    
-                    # continue on in the loop
-                    continue
-                
-                # end if
-                
-                # check if the key indicates requirements are present
-                if (jkey == "requirements"):
-                    
-                    # a requirements package must be created
-                    NeedReqs = 1
-                    
-                    # continue on in the loop
-                    continue
-                
-                # end if
-                
-                # check if the key indicates performance information is present
-                if (jkey == "performance"):
-                    
-                    # a performance package must be created
-                    NeedPerf = 1
-                    
-                    # continue on in the loop
-                    continue
-                
-                # end if
-                
-                # check if the key indicates behaviors are present
-                if (jkey == "behavior"):
-                    
-                    # a behavior package must be created
-                    NeedBhav = 1
-                    
-                    # continue on in the loop
-                    continue
-                
+
+                # get the sub-package the key requires
+                SubName = GetSubPackageName(jkey)
+
+                # check if a sub-package is required
+                if (SubName is not None):
+
+                    # flag that the package must be created
+                    NeedPackage[SubName] = 1
+
                 # end if
-                
-                # check if it is another reserved word
-                if ((jkey != "wbs_no") and (jkey != "name") and (jkey != "description")):
-                    
-                    # create an architecture folder
-                    NeedArch = 1
-                    
+            # end for
+
+            # loop through the packages in the order they are created
+            for SubName in ("Architecture", "Requirements", "Performance", "Behavior"):
+
+                # check if the package must be made (it may exist if the component was imported before)
+                if (NeedPackage[SubName] == 1) and (self.FindSubPackage(MainPackage, SubName) is None):
+
+                    # create and index the package
+                    self.MakeSubPackage(SubName, MainPackage)
+
                 # end if
             # end for
-            
-            # check if an architecture package must be made
-            if (NeedArch == 1):
-                
-                # create the architecture package
-                ArchPackage = self.CreatePackage("Architecture")
-                
-                # set the owner to be the main package
-                ArchPackage.setOwner(MainPackage)
-                
-            # end if
-            
-            # check if a requirements package must be made
-            if (NeedReqs == 1):
-                
-                # create the requirements package
-                ReqsPackage = self.CreatePackage("Requirements")
-                
-                # set the owner to be the main package
-                ReqsPackage.setOwner(MainPackage)
-                
-            # end if
-            
-            # check if a performance package must be made
-            if (NeedPerf == 1):
-                
-                # create the performance package
-                PerfPackage = self.CreatePackage("Performance")
-                
-                # set the owner to be the main package
-                PerfPackage.setOwner(MainPackage)
-                
-            # end if
-        
-            # check if a behavior package must be made
-            if (NeedBhav == 1):
-                
-                # create the behavior package
-                BhavPackage = self.CreatePackage("Behavior")
-                
-                # set the owner to be the main package
-                BhavPackage.setOwner(MainPackage)
-                
-            # end if
 
         except:
 
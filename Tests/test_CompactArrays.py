@@ -0,0 +1,189 @@
+"""
+
+test_CompactArrays.py
+
+Written by Paul Mokotoff, prmoko@umich.edu
+Last Updated: 18 Oct 2026
+
+Tests for reading a compact array (one value property holding every value, with its shape in an "ADHArray:AxB" expression) in WriteADH, WriteInstance, and UpdateADH. An array whose number of values does not match its shape is returned as a flat list instead of stopping the export.
+
+This is not a MagicDraw script. Run it from the repository root with pytest (or any Python interpreter):
+
+    python -m pytest Tests
+
+The functions are taken from each script directly, without importing the MagicDraw modules that the rest of the script needs.
+
+"""
+
+###############################
+#                             #
+# IMPORTS                     #
+#                             #
+###############################
+
+import ast
+import os
+
+# -----------------------------------------------------------
+# -----------------------------------------------------------
+# -----------------------------------------------------------
+
+###############################
+#                             #
+# LOAD THE FUNCTIONS          #
+#                             #
+###############################
+
+# scripts that read compact arrays
+SCRIPTS = ["WriteADH", "WriteInstance", "UpdateADH"]
+
+# functions needed from each script
+ARRAY_NAMES = ["ReshapeArray", "GetLiteralValue", "ReadArrayValue"]
+
+def LoadArrays(Script):
+    """
+
+    LoadArrays(Script)
+
+    Compile the functions that read a compact array out of a script.
+
+    INPUTS:
+        Script: the folder of the script (e.g., "WriteADH")
+
+    OUTPUTS:
+        Arrays: a dictionary with the functions
+
+    """
+
+    # get the path to the script
+    FilePath = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", Script, "main.py")
+
+    # read the script
+    with open(FilePath) as File:
+        Tree = ast.parse(File.read(), FilePath)
+    # end with
+
+    # keep only the functions needed (without the timing decorator, which is part of the MagicDraw script)
+    Tree.body = [Node for Node in Tree.body if (isinstance(Node, ast.FunctionDef)) and (Node.name in ARRAY_NAMES)]
+    for Node in Tree.body:
+        Node.decorator_list = []
+    # end for
+
+    # compile the functions on their own
+    Arrays = {}
+    exec(compile(Tree, FilePath, "exec"), Arrays)
+
+    # return the functions
+    return Arrays
+
+# end LoadArrays
+
+# -----------------------------------------------------------
+
+class Literal():
+
+    # initialization function
+    def __init__(self, Value):
+        """
+
+        __init__(self, Value)
+
+        Make a stand-in for a MagicDraw literal real.
+
+        INPUTS:
+            self : the literal
+
+            Value: the value of the literal
+
+        OUTPUTS:
+            none
+
+        """
+
+        # remember the value
+        self.Value = Value
+
+    # end __init__
+
+    # get the kind of literal
+    def getHumanName(self):
+        return "Literal Real"
+    # end getHumanName
+
+    # get the value
+    def getValue(self):
+        return self.Value
+    # end getValue
+
+# end Literal
+
+# -----------------------------------------------------------
+# -----------------------------------------------------------
+# -----------------------------------------------------------
+
+###############################
+#                             #
+# TESTS                       #
+#                             #
+###############################
+
+def test_MatchingShape():
+    """
+
+    test_MatchingShape()
+
+    Reshape a compact array whose values fill its shape.
+
+    """
+
+    # loop through the scripts
+    for Script in SCRIPTS:
+
+        # load the functions
+        Arrays = LoadArrays(Script)
+
+        # read a 2x3 array
+        Literals = [Literal(float(ival)) for ival in range(6)]
+        assert Arrays["ReadArrayValue"](Literals, [2, 3]) == [[0.0, 1.0, 2.0], [3.0, 4.0, 5.0]], Script
+
+    # end for
+
+# end test_MatchingShape
+
+# -----------------------------------------------------------
+
+def test_MismatchedShape():
+    """
+
+    test_MismatchedShape()
+
+    Return the values of a compact array as a flat list when there are too few or too many for its shape.
+
+    """
+
+    # loop through the scripts
+    for Script in SCRIPTS:
+
+        # load the functions
+        Arrays = LoadArrays(Script)
+
+        # loop through the number of values
+        for Count in [0, 5, 7]:
+            Literals = [Literal(float(ival)) for ival in range(Count)]
+            assert Arrays["ReadArrayValue"](Literals, [2, 3]) == [float(ival) for ival in range(Count)], (Script, Count)
+        # end for
+
+    # end for
+
+# end test_MismatchedShape
+
+# -----------------------------------------------------------
+# -----------------------------------------------------------
+# -----------------------------------------------------------
+
+# run the tests
+if (__name__ == "__main__"):
+    test_MatchingShape()
+    test_MismatchedShape()
+    print("All tests passed.")
+# end if
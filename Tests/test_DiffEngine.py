@@ -0,0 +1,231 @@
+"""
+
+test_DiffEngine.py
+
+Written by Paul Mokotoff, prmoko@umich.edu
+Last Updated: 18 Oct 2026
+
+Tests for the diff engine in UpdateADH (DiffADH and DiffArray). An array that grew, shrank, or became a value (or the other way around), and a list of components with components added or removed, cannot be updated one value property at a time, so they must be listed as "shape" changes instead of being dropped.
+
+This is not a MagicDraw script. Run it from the repository root with pytest (or any Python interpreter):
+
+    python -m pytest Tests
+
+The diff engine is taken from UpdateADH/main.py directly, without importing the MagicDraw modules that the rest of the script needs.
+
+"""
+
+###############################
+#                             #
+# IMPORTS                     #
+#                             #
+###############################
+
+import ast
+import os
+
+# -----------------------------------------------------------
+# -----------------------------------------------------------
+# -----------------------------------------------------------
+
+###############################
+#                             #
+# LOAD THE DIFF ENGINE        #
+#                             #
+###############################
+
+# functions and settings needed from UpdateADH
+ENGINE_NAMES = ["SKIP_UNCHANGED", "LAZY_EXPORT", "ABS_TOLERANCE", "REL_TOLERANCE", "INT_FLOAT_EQUAL", "NUMBER_TYPES", "ValuesDiffer", "DiffArray", "DiffADH"]
+
+def LoadEngine():
+    """
+
+    LoadEngine()
+
+    Compile the diff engine out of UpdateADH/main.py.
+
+    INPUTS:
+        none
+
+    OUTPUTS:
+        Engine: a dictionary with the diff engine's functions
+
+    """
+
+    # get the path to UpdateADH
+    FilePath = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "UpdateADH", "main.py")
+
+    # read the script
+    with open(FilePath) as File:
+        Tree = ast.parse(File.read(), FilePath)
+    # end with
+
+    # remember the statements that make up the engine
+    Body = []
+
+    # loop through the top-level statements
+    for Node in Tree.body:
+
+        # check for one of the engine's functions
+        if (isinstance(Node, ast.FunctionDef)) and (Node.name in ENGINE_NAMES):
+
+            # the timing decorator is part of the MagicDraw script, so leave it off
+            Node.decorator_list = []
+            Body.append(Node)
+
+        # check for one of the engine's settings
+        elif (isinstance(Node, ast.Assign)) and (all(isinstance(Target, ast.Name) and (Target.id in ENGINE_NAMES) for Target in Node.targets)):
+            Body.append(Node)
+
+        # end if
+    # end for
+
+    # compile the engine on its own
+    Tree.body = Body
+    Engine = {"long" : int}
+    exec(compile(Tree, FilePath, "exec"), Engine)
+
+    # return the engine
+    return Engine
+
+# end LoadEngine
+
+# -----------------------------------------------------------
+
+def Diff(Engine, Model, ADH):
+    """
+
+    Diff(Engine, Model, ADH)
+
+    List the changes between two one-component systems, as (kind, path, indices).
+
+    INPUTS:
+        Engine: the diff engine loaded by LoadEngine
+
+        Model : the component's data in the model export
+
+        ADH   : the component's data in the ADH
+
+    OUTPUTS:
+        the changes
+
+    """
+
+    # wrap the component in a system
+    Data1 = {"system" : dict(Model, wbs_no = "1")}
+    Data2 = {"system" : dict(ADH  , wbs_no = "1")}
+
+    # list the changes
+    Patch = Engine["DiffADH"](Data1, Data2, "", "", 0, [None, None])
+    return [(MyChange[0], MyChange[1], MyChange[5] if (len(MyChange) > 5) else ()) for MyChange in Patch]
+
+# end Diff
+
+# -----------------------------------------------------------
+# -----------------------------------------------------------
+# -----------------------------------------------------------
+
+###############################
+#                             #
+# TESTS                       #
+#                             #
+###############################
+
+def test_ChangedElements():
+    """
+
+    test_ChangedElements()
+
+    List the changed elements of arrays that kept their shape.
+
+    """
+
+    # load the engine
+    Engine = LoadEngine()
+
+    # change one element of a 2x2 array (each element is compared as its own value property)
+    assert Diff(Engine, {"x" : [[1.0, 2.0], [3.0, 4.0]]}, {"x" : [[1.0, 2.0], [3.0, 5.0]]}) == [("value", "system::x__1__1", ())]
+
+    # change one element of a 2x2 array compared as a whole
+    Patch = []
+    Engine["DiffArray"]([[1.0, 2.0], [3.0, 4.0]], [[1.0, 2.0], [3.0, 5.0]], "system::x", [None, None], Patch)
+    assert [(MyChange[0], MyChange[5]) for MyChange in Patch] == [("element", (1, 1))]
+
+# end test_ChangedElements
+
+# -----------------------------------------------------------
+
+def test_ChangedShape():
+    """
+
+    test_ChangedShape()
+
+    List an array that grew, shrank, or changed type as a "shape" change, along with the elements both arrays have.
+
+    """
+
+    # load the engine
+    Engine = LoadEngine()
+
+    # an array that grew (the element both have is still compared)
+    assert Diff(Engine, {"x" : [1.0, 2.0]}, {"x" : [1.0, 3.0, 4.0]}) == [("shape", "system::x", ()), ("value", "system::x__1", ())]
+
+    # an array that shrank
+    assert Diff(Engine, {"x" : [1.0, 2.0, 3.0]}, {"x" : [1.0, 2.0]}) == [("shape", "system::x", ())]
+
+    # a row that grew in a 2-D array
+    assert Diff(Engine, {"x" : [[1.0], [2.0]]}, {"x" : [[1.0], [2.0, 3.0]]}) == [("shape", "system::x__1", ())]
+
+    # an element that became an array
+    assert Diff(Engine, {"x" : [1.0, 2.0]}, {"x" : [1.0, [2.0, 3.0]]}) == [("shape", "system::x__1", ())]
+
+    # an array that became a value, and a value that became an array
+    assert Diff(Engine, {"x" : [1.0, 2.0]}, {"x" : 1.0}) == [("shape", "system::x", ())]
+    assert [MyChange[0] for MyChange in Diff(Engine, {"x" : 1.0}, {"x" : [1.0, 2.0]})] == ["shape"]
+
+    # arrays compared as a whole: a row that grew, and an array that grew
+    Patch = []
+    Engine["DiffArray"]([[1.0], [2.0]], [[1.0], [2.0, 3.0]], "system::x", [None, None], Patch)
+    assert [(MyChange[0], MyChange[5]) for MyChange in Patch] == [("shape", (1,))]
+    Patch = []
+    Engine["DiffArray"]([1.0, 2.0], [1.0, 3.0, 4.0], "system::x", [None, None], Patch)
+    assert [(MyChange[0], MyChange[5]) for MyChange in Patch] == [("element", (1,)), ("shape", ())]
+
+# end test_ChangedShape
+
+# -----------------------------------------------------------
+
+def test_ChangedComponents():
+    """
+
+    test_ChangedComponents()
+
+    List a list of components with a component added as a "shape" change, along with the changes to the components both lists have.
+
+    """
+
+    # load the engine
+    Engine = LoadEngine()
+
+    # the components in the model and the ADH (one component's mass changed, and one component added)
+    Model = {"components" : [{"wing" : {"wbs_no" : "1.1", "mass" : 1.0}}]}
+    ADH   = {"components" : [{"wing" : {"wbs_no" : "1.1", "mass" : 2.0}}, {"tail" : {"wbs_no" : "1.2", "mass" : 3.0}}]}
+
+    # list the changes
+    Changes = Diff(Engine, Model, ADH)
+    assert ("shape", "system::components", ()) in Changes
+    assert [MyChange[0] for MyChange in Changes].count("value") == 1
+
+# end test_ChangedComponents
+
+# -----------------------------------------------------------
+# -----------------------------------------------------------
+# -----------------------------------------------------------
+
+# run the tests
+if (__name__ == "__main__"):
+    test_ChangedElements()
+    test_ChangedShape()
+    test_ChangedComponents()
+    print("All tests passed.")
+# end if
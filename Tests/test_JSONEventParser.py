@@ -0,0 +1,304 @@
+"""
+
+test_JSONEventParser.py
+
+Written by Paul Mokotoff, prmoko@umich.edu
+Last Updated: 18 Oct 2026
+
+Regression tests for the event-driven JSON parser (JSONEventParser and LoadJSON) in ReadADH, UpdateADH, and ImportStereotypes. A number split across two chunks (for example, at its "." or "e") or a string split at an escape must be read whole, so every document is parsed at several small chunk sizes and compared to json.loads. An invalid string must fail without reading the rest of the file.
+
+This is not a MagicDraw script. Run it from the repository root with pytest (or any Python interpreter):
+
+    python -m pytest Tests
+
+The parser is taken from each script directly, without importing the MagicDraw modules that the rest of the script needs.
+
+"""
+
+###############################
+#                             #
+# IMPORTS                     #
+#                             #
+###############################
+
+import ast
+import io
+import json
+import json.decoder
+import os
+import random
+import re
+
+# -----------------------------------------------------------
+# -----------------------------------------------------------
+# -----------------------------------------------------------
+
+###############################
+#                             #
+# LOAD THE PARSER             #
+#                             #
+###############################
+
+# scripts that hold a copy of the parser
+SCRIPTS = ["ReadADH", "UpdateADH", "ImportStereotypes"]
+
+# functions, classes, and constants needed from each script
+PARSER_NAMES = ["WHITESPACE", "NUMBER", "NUMBER_RUN", "CONSTANTS", "JSONEventParser", "BuildJSON"]
+
+def LoadParser(Script):
+    """
+
+    LoadParser(Script)
+
+    Compile the JSON event parser out of a script.
+
+    INPUTS:
+        Script: the folder of the script (e.g., "ReadADH")
+
+    OUTPUTS:
+        Parser: a dictionary with the parser's classes and functions
+
+    """
+
+    # get the path to the script
+    FilePath = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", Script, "main.py")
+
+    # read the script
+    with open(FilePath) as File:
+        Tree = ast.parse(File.read(), FilePath)
+    # end with
+
+    # remember the statements that make up the parser
+    Body = []
+
+    # loop through the top-level statements
+    for Node in Tree.body:
+
+        # check for one of the parser's functions or classes
+        if (isinstance(Node, (ast.FunctionDef, ast.ClassDef))) and (Node.name in PARSER_NAMES):
+
+            # the timing decorator is part of the MagicDraw script, so leave it off
+            Node.decorator_list = []
+            Body.append(Node)
+
+        # check for one of the parser's constants
+        elif (isinstance(Node, ast.Assign)) and (all(isinstance(Target, ast.Name) and (Target.id in PARSER_NAMES) for Target in Node.targets)):
+            Body.append(Node)
+
+        # end if
+    # end for
+
+    # compile the parser on its own
+    Tree.body = Body
+    Parser = {"re" : re, "JSONDecoder" : json.decoder}
+    exec(compile(Tree, FilePath, "exec"), Parser)
+
+    # return the parser
+    return Parser
+
+# end LoadParser
+
+# -----------------------------------------------------------
+
+def Parse(Parser, Text, ChunkSize):
+    """
+
+    Parse(Parser, Text, ChunkSize)
+
+    Parse a JSON string with the event parser, reading a few characters at a time.
+
+    INPUTS:
+        Parser   : the parser loaded by LoadParser
+
+        Text     : the JSON string
+
+        ChunkSize: the number of characters read at a time
+
+    OUTPUTS:
+        the parsed value
+
+    """
+
+    # get the parsing events
+    Events = Parser["JSONEventParser"](io.StringIO(Text), ChunkSize).Events()
+
+    # build the value from the first event
+    Event, Value = next(Events)
+    return Parser["BuildJSON"](Event, Value, Events)
+
+# end Parse
+
+# -----------------------------------------------------------
+# -----------------------------------------------------------
+# -----------------------------------------------------------
+
+###############################
+#                             #
+# TEST DOCUMENTS              #
+#                             #
+###############################
+
+def MakeADH():
+    """
+
+    MakeADH()
+
+    Make an ADH with many numbers of different lengths, in integer, decimal, and exponent form.
+
+    INPUTS:
+        none
+
+    OUTPUTS:
+        the ADH, as a JSON string
+
+    """
+
+    # use the same numbers every time
+    Random = random.Random(0)
+
+    # make some components with scalars and arrays
+    Components = []
+    for icomp in range(20):
+        Components.append({"name"   : "Component %d" % icomp, \
+                           "mass"   : Random.uniform(-1.0e6, 1.0e6), \
+                           "thrust" : Random.uniform(0.0, 1.0) * 10.0 ** Random.randint(-30, 30), \
+                           "count"  : Random.randint(-10 ** 12, 10 ** 12), \
+                           "flags"  : [True, False, None], \
+                           "table"  : [[Random.uniform(-1.0, 1.0) * 10.0 ** Random.randint(-12, 12) for icol in range(7)] for irow in range(5)]})
+    # end for
+
+    # write the ADH as the writers do, with exponents written in full (e.g., "1.5e-07" and "-2E+10")
+    Text = json.dumps({"aircraft_system" : {"components" : Components}}, indent = 4)
+    return Text.replace("e+", "E+")
+
+# end MakeADH
+
+# -----------------------------------------------------------
+# -----------------------------------------------------------
+# -----------------------------------------------------------
+
+###############################
+#                             #
+# TESTS                       #
+#                             #
+###############################
+
+def test_ChunkBoundaries():
+    """
+
+    test_ChunkBoundaries()
+
+    Parse the same ADH at several small chunk sizes with every copy of the parser, so numbers are split at every position, and compare the result to json.loads.
+
+    """
+
+    # get the ADH and its expected value
+    Text     = MakeADH()
+    Expected = json.loads(Text)
+
+    # loop through the scripts
+    for Script in SCRIPTS:
+
+        # load the parser
+        Parser = LoadParser(Script)
+
+        # loop through the chunk sizes
+        for ChunkSize in [1, 2, 3, 5, 7, 8, 9, 10, 11, 13, 16, 64]:
+            assert Parse(Parser, Text, ChunkSize) == Expected, (Script, ChunkSize)
+        # end for
+
+    # end for
+
+# end test_ChunkBoundaries
+
+# -----------------------------------------------------------
+
+def test_Numbers():
+    """
+
+    test_Numbers()
+
+    Parse single numbers and constants split at each of their characters.
+
+    """
+
+    # numbers and constants to split
+    Texts = ["[123456789.25e-10]", "[-1.5E+300, 0.000125]", "[1e5, -0, 7]", "[-Infinity, NaN, true, false, null]", "12345678901234"]
+
+    # loop through the scripts
+    for Script in SCRIPTS:
+
+        # load the parser
+        Parser = LoadParser(Script)
+
+        # loop through the texts and chunk sizes
+        for Text in Texts:
+            for ChunkSize in range(1, len(Text) + 1):
+                assert json.dumps(Parse(Parser, Text, ChunkSize)) == json.dumps(json.loads(Text)), (Script, Text, ChunkSize)
+            # end for
+        # end for
+
+    # end for
+
+# end test_Numbers
+
+# -----------------------------------------------------------
+
+def test_Strings():
+    """
+
+    test_Strings()
+
+    Parse strings with escaped quotes and backslashes split at each of their characters, and check that an invalid string raises its error without reading the rest of the file.
+
+    """
+
+    # strings to split
+    Texts = [r'["a\\", "b\\\"c\"", "\\\\"]', r'{"k\"ey" : "\u00e9\ud83d\ude00\n\t"}', '"' + "x" * 40 + '"']
+
+    # an invalid escape followed by a long document
+    Invalid = r'["\q", ' + ", ".join(['"%d"' % ival for ival in range(1000)]) + "]"
+
+    # loop through the scripts
+    for Script in SCRIPTS:
+
+        # load the parser
+        Parser = LoadParser(Script)
+
+        # loop through the texts and chunk sizes
+        for Text in Texts:
+            for ChunkSize in range(1, len(Text) + 1):
+                assert Parse(Parser, Text, ChunkSize) == json.loads(Text), (Script, Text, ChunkSize)
+            # end for
+        # end for
+
+        # parse the invalid string
+        File = io.StringIO(Invalid)
+        try:
+            Events = Parser["JSONEventParser"](File, 8).Events()
+            Event, Value = next(Events)
+            Parser["BuildJSON"](Event, Value, Events)
+        except ValueError:
+            pass
+        else:
+            assert False, Script
+        # end try-except-else
+
+        # only the first chunks were read
+        assert File.tell() < 64, (Script, File.tell())
+
+    # end for
+
+# end test_Strings
+
+# -----------------------------------------------------------
+# -----------------------------------------------------------
+# -----------------------------------------------------------
+
+# run the tests
+if (__name__ == "__main__"):
+    test_ChunkBoundaries()
+    test_Numbers()
+    test_Strings()
+    print("All tests passed.")
+# end if
@@ -0,0 +1,193 @@
+"""
+
+test_LazyExport.py
+
+Written by Paul Mokotoff, prmoko@umich.edu
+Last Updated: 18 Oct 2026
+
+Tests for how UpdateADH decides which model elements the ADH wants when LAZY_EXPORT is on (IsUnwanted and GetWanted). Components in a list are named by the list and their index (e.g., "components__0"), so they must be matched to the element of the list in the ADH, instead of exporting their whole subtree.
+
+This is not a MagicDraw script. Run it from the repository root with pytest (or any Python interpreter):
+
+    python -m pytest Tests
+
+The functions are taken from UpdateADH/main.py directly, without importing the MagicDraw modules that the rest of the script needs.
+
+"""
+
+###############################
+#                             #
+# IMPORTS                     #
+#                             #
+###############################
+
+import ast
+import json
+import os
+
+# -----------------------------------------------------------
+# -----------------------------------------------------------
+# -----------------------------------------------------------
+
+###############################
+#                             #
+# LOAD THE FUNCTIONS          #
+#                             #
+###############################
+
+# methods needed from UpdateADH's model exporter
+EXPORT_NAMES = ["IsUnwanted", "GetWanted"]
+
+def LoadExport():
+    """
+
+    LoadExport()
+
+    Compile the methods that pick the wanted model elements out of UpdateADH/main.py, as functions (their "self" is not used).
+
+    INPUTS:
+        none
+
+    OUTPUTS:
+        Export: a dictionary with the functions
+
+    """
+
+    # get the path to UpdateADH
+    FilePath = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "UpdateADH", "main.py")
+
+    # read the script
+    with open(FilePath) as File:
+        Tree = ast.parse(File.read(), FilePath)
+    # end with
+
+    # remember the methods
+    Body = []
+
+    # loop through the classes and their methods
+    for Node in Tree.body:
+        if (isinstance(Node, ast.ClassDef)) and (Node.name == "ModelStructureGenerator"):
+            Body.extend([Method for Method in Node.body if (isinstance(Method, ast.FunctionDef)) and (Method.name in EXPORT_NAMES)])
+        # end if
+    # end for
+
+    # compile the methods on their own
+    Tree.body = Body
+    Export = {}
+    exec(compile(Tree, FilePath, "exec"), Export)
+
+    # return the functions
+    return Export
+
+# end LoadExport
+
+# -----------------------------------------------------------
+
+def LoadDemo():
+    """
+
+    LoadDemo()
+
+    Load the first demo ADH, whose components are held in "components" lists.
+
+    INPUTS:
+        none
+
+    OUTPUTS:
+        the ADH, as a dictionary
+
+    """
+
+    # get the path to the demo ADH
+    FilePath = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "Demo", "Step00.json")
+
+    # read the ADH
+    with open(FilePath) as File:
+        return json.load(File)
+    # end with
+
+# end LoadDemo
+
+# -----------------------------------------------------------
+# -----------------------------------------------------------
+# -----------------------------------------------------------
+
+###############################
+#                             #
+# TESTS                       #
+#                             #
+###############################
+
+def test_ListOfComponents():
+    """
+
+    test_ListOfComponents()
+
+    Walk from the airframe into each of its components by the names ReadADH gives their packages, and check that the ADH below each one is used.
+
+    """
+
+    # load the functions and the ADH
+    Export   = LoadExport()
+    Airframe = LoadDemo()["aircraft_system"]["air_vehicle"]["airframe"]
+
+    # the list of components is wanted
+    assert Export["IsUnwanted"](None, Airframe, "components__0") == 0
+
+    # loop through the components
+    for icomp in range(len(Airframe["components"])):
+
+        # get the part of the ADH for the component
+        Wanted = Export["GetWanted"](None, Airframe, "components__" + str(icomp))
+        assert Wanted is Airframe["components"][icomp]
+
+        # its own keys are wanted, and anything else is left out
+        for ikey in Wanted:
+            assert Export["IsUnwanted"](None, Wanted, ikey) == 0
+        # end for
+        assert Export["IsUnwanted"](None, Wanted, "not_in_the_adh") == 1
+
+    # end for
+
+# end test_ListOfComponents
+
+# -----------------------------------------------------------
+
+def test_UnknownElements():
+    """
+
+    test_UnknownElements()
+
+    Export everything below a model element that cannot be matched to a dictionary in the ADH.
+
+    """
+
+    # load the functions
+    Export = LoadExport()
+
+    # a partial ADH with one component in a list, and a scalar
+    Wanted = {"components" : [{"name" : "Wing"}], "mass" : 1.0}
+
+    # everything is wanted below the parent
+    assert Export["GetWanted"](None, None, "components__0") is None
+
+    # components past the end of the list, non-numeric indices, and values that are not dictionaries
+    assert Export["GetWanted"](None, Wanted, "components__1") is None
+    assert Export["GetWanted"](None, Wanted, "components__x") is None
+    assert Export["GetWanted"](None, Wanted, "mass") is None
+
+    # a dictionary that is not in a list
+    assert Export["GetWanted"](None, {"wing" : {"span" : 10.0}}, "wing") == {"span" : 10.0}
+
+# end test_UnknownElements
+
+# -----------------------------------------------------------
+# -----------------------------------------------------------
+# -----------------------------------------------------------
+
+# run the tests
+if (__name__ == "__main__"):
+    test_ListOfComponents()
+    test_UnknownElements()
+    print("All tests passed.")
+# end if
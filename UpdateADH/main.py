@@ -13,7 +13,7 @@ UPDATE ADH:
 
 Written by Paul Mokotoff, prmoko@umich.edu
 
-Last Updated: 28 Mar 2025
+Last Updated: 18 Oct 2026
 
 Inputs:
 
@@ -77,7 +77,221 @@ import javax.swing.LayoutStyle.ComponentPlacement as ComponentPlacement
 import javax.swing.WindowConstants                as WindowConstants
 
 # additional python/jython imports
+import functools
+import gzip
 import json
+import json.decoder as JSONDecoder
+import os
+import Queue
+import re
+import struct
+import threading
+import time
+
+# -----------------------------------------------------------
+# -----------------------------------------------------------
+# -----------------------------------------------------------
+
+###############################
+#                             #
+# SETTINGS                    #
+#                             #
+###############################
+
+# skip the parts of the model and ADH that are equal without opening them up (1) or compare every value (0); only used with INT_FLOAT_EQUAL = 1
+SKIP_UNCHANGED = 1
+
+# numbers in the model and ADH are the same if they differ by no more than the absolute tolerance, or the relative tolerance times the larger magnitude
+ABS_TOLERANCE = 0.0
+REL_TOLERANCE = 1.0e-9
+
+# an integer and a real with the same value are the same (1, e.g., 2000 and 2000.0) or the literal is rewritten to match the ADH's type (0)
+INT_FLOAT_EQUAL = 1
+
+# export only the parts of the model named in the ADH, so a partial ADH may be used (1), or export the whole model (0)
+LAZY_EXPORT = 0
+
+# format of the change log next to the ADH: "text" (<name>-ModifiedValues.txt), "jsonl" (<name>-ModifiedValues.jsonl, one JSON object per change), or "csv" (<name>-ModifiedValues.csv)
+CHANGE_LOG = "text"
+
+# number of changes handed to the change log's background thread at a time
+CHANGE_LOG_BATCH = 256
+
+# compare the model and ADH and report what an update would change, without opening a session or changing the model (1), or update the model (0)
+DRY_RUN = 0
+
+# seconds to change one value property, used by DRY_RUN's estimate until an update was timed in this MagicDraw session
+DRY_RUN_CHANGE_COST = 0.005
+
+# update only the values that changed in the ADH since the last update or WriteADH (saved in <ADH>-Base.json), keeping the values changed in the model (1), or change every value that differs from the ADH (0)
+MERGE_BASE = 0
+
+# when several ADHs, or the model and an ADH, change the same value to different values: the later ADH wins ("last"), the value in the model is kept ("keep"), or nothing is changed ("stop"); conflicts are always reported
+ON_CONFLICT = "last"
+
+# time the hot functions and write a summary to <name>-Timing.txt next to the ADH (1) or not (0)
+TIME_ADH = 0
+
+# -----------------------------------------------------------
+# -----------------------------------------------------------
+# -----------------------------------------------------------
+
+###############################
+#                             #
+# TIMING INSTRUMENTATION      #
+#                             #
+###############################
+
+# calls and seconds spent in each timed function, and when and on which thread the action started
+TIMING_STATS = {}
+TIMING_START = [0.0, None]
+
+def Timed(Function):
+    """
+
+    Timed(Function)
+
+    Decorate a function so its calls and time are recorded when TIME_ADH is on. Only the outermost call on the thread that runs the action is recorded.
+
+    INPUTS:
+        Function     : the function to be timed
+
+    OUTPUTS:
+        TimedFunction: the timed function (or the function itself, if TIME_ADH is off)
+
+    """
+
+    # check if the function must be timed
+    if (TIME_ADH == 0):
+        return Function
+    # end if
+
+    # get the name of the function
+    Name = Function.__name__
+
+    # wrap the function
+    @functools.wraps(Function)
+    def TimedFunction(*args, **kwargs):
+
+        # get the statistics of the function: [calls, seconds, running]
+        Stats = TIMING_STATS.setdefault(Name, [0, 0.0, 0])
+
+        # skip recursive calls and other threads
+        if (Stats[2] == 1) or (threading.current_thread() is not TIMING_START[1]):
+            return Function(*args, **kwargs)
+        # end if
+
+        # time the call
+        Stats[2] = 1
+        Start    = time.time()
+
+        try:
+            return Function(*args, **kwargs)
+        finally:
+            Stats[0] += 1
+            Stats[1] += time.time() - Start
+            Stats[2]  = 0
+        # end try-finally
+    # end TimedFunction
+
+    # return the timed function
+    return TimedFunction
+
+# end Timed
+
+# -----------------------------------------------------------
+
+def ResetTiming():
+    """
+
+    ResetTiming()
+
+    Forget the statistics of an earlier action and start timing the current thread.
+
+    INPUTS:
+        none
+
+    OUTPUTS:
+        none
+
+    """
+
+    # forget the statistics and start timing
+    TIMING_STATS.clear()
+    TIMING_START[0] = time.time()
+    TIMING_START[1] = threading.current_thread()
+
+# end ResetTiming
+
+# -----------------------------------------------------------
+
+def GetSideFile(Filename, Suffix):
+    """
+
+    GetSideFile(Filename, Suffix)
+
+    Get the name of a file written next to an ADH, by replacing the ADH's extension (including a compression suffix, such as the ".gz" of ".json.gz") with a suffix, as: <ADH><Suffix>.
+
+    INPUTS:
+        Filename: the name of the ADH
+
+        Suffix  : the end of the file's name (e.g., "-Timing.txt")
+
+    OUTPUTS:
+        the name of the file
+
+    """
+
+    # leave off the ".gz" of a compressed ADH
+    if (Filename.lower().endswith(".gz")):
+        Filename = Filename[:-3]
+    # end if
+
+    # replace the extension of the ADH
+    return os.path.splitext(Filename)[0] + Suffix
+
+# end GetSideFile
+
+# -----------------------------------------------------------
+
+def WriteTiming(Filename):
+    """
+
+    WriteTiming(Filename)
+
+    Write the calls and time of each timed function (slowest first) to <name>-Timing.txt, next to the file given, if TIME_ADH is on.
+
+    INPUTS:
+        Filename: the name of the ADH read or written by the action
+
+    OUTPUTS:
+        none
+
+    """
+
+    # check if the functions were timed
+    if (TIME_ADH == 0):
+        return
+    # end if
+
+    # open a file next to the ADH
+    f = open(GetSideFile(Filename, "-Timing.txt"), "w")
+
+    try:
+
+        # write the total time and each function, slowest first
+        f.write("Total time: %.3f s\n\n" % (time.time() - TIMING_START[0]))
+        for Name, Stats in sorted(TIMING_STATS.items(), key = lambda Item: -Item[1][1]):
+            f.write("%-24s %10d calls %12.3f s\n" % (Name, Stats[0], Stats[1]))
+        # end for
+
+    finally:
+
+        # close the file
+        f.close()
+
+    # end try-finally
+# end WriteTiming
 
 # -----------------------------------------------------------
 # -----------------------------------------------------------
@@ -414,7 +628,7 @@ class FilenamePanel(JPanel):
         # setup the label below the title
         self.TextLabel.setBackground(Color(255, 255, 255))
         self.TextLabel.setFont(Font("Times New Roman", 1, 18))
-        self.TextLabel.setText("Filename (must be in Program Files --- Magic System of Systems Architect folder):")
+        self.TextLabel.setText("Filename, folder, or filenames separated by ; (must be in Program Files --- Magic System of Systems Architect folder):")
 
         # setup the filename box
         self.FilenameInput.setFont(Font("Times New Roman", 0, 14))
@@ -600,537 +814,3237 @@ def ReshapeArray(Arr, NewShape):
 
 ###############################
 #                             #
-# MODEL STRUCTURE GENERATOR   #
+# FUNCTIONS FOR READING A     #
+# COMPACT ARRAY               #
 #                             #
 ###############################
 
-class ModelStructureGenerator():
+# symbol marking the expression that holds a compact array, followed by its shape (e.g., "ADHArray:3x2")
+ARRAY_SYMBOL = "ADHArray"
 
-    # -------------------------------------------------------
+def GetArrayShape(ValSpec):
+    """
 
-    # initialization
-    def __init__(self):
-        """
+    GetArrayShape(ValSpec)
 
-        __init__(self)
+    Get the shape of a compact array from the symbol of the expression holding its values.
 
-        Initialize the writer, which exports the SysML model.
+    INPUTS:
+        ValSpec: the value specification to be analyzed
 
-        INPUTS:
-            self: the SysML model
+    OUTPUTS:
+        a list with the size of each dimension (None if the value specification is not a compact array)
 
-        OUTPUTS:
-            none
+    """
 
-        """
-        
-        # get the project
-        self.Project = Application.getInstance().getProject()
+    # try to get the expression symbol
+    try:
 
-        # get the elements factory
-        self.Factory = self.Project.getElementsFactory()
+        # get the symbol
+        Symbol = ValSpec.getSymbol()
 
-        # get the model element manager
-        self.Manager = MEM.getInstance()
+    except AttributeError:
 
-        # get the model
-        self.Model = self.Project.getModel()
-        
-    # end __init__
+        # not an expression
+        return None
 
-    # -------------------------------------------------------
+    # end try-except
 
-    # action execution
-    def execute(self, ParentPackage, Filename):
-        """
+    # check that the symbol marks a compact array
+    if (Symbol is None) or (not str(Symbol).startswith(ARRAY_SYMBOL + ":")):
 
-        execute(self, ParentPackage, Filename)
+        # not a compact array
+        return None
 
-        Extract the model elements from the SysML model and convert their information to a JSON string.
+    # end if
 
-        INPUTS:
-            self         : the SysML model
+    # return the size of each dimension
+    return [int(n) for n in str(Symbol)[len(ARRAY_SYMBOL) + 1:].split("x")]
 
-            ParentPackage: the highest-level model element that the model elements will be stored in
+# end GetArrayShape
 
-            Filename     : the name of the JSON file to be read for updating the SysML model
+# -----------------------------------------------------------
 
-        OUTPUTS:
-            none
+def GetArrayPosition(Indices, Shape):
+    """
 
-        """
-        
-        # try to create a session
-        try:
+    GetArrayPosition(Indices, Shape)
 
-            # create the session
-            SM.getInstance().createSession(self.Project, "Modify ADH")
+    Get the position of an element in the flattened values of a compact array.
 
-            # get the block stereotype from the SysML stereotype profile
-            self.BlockSter = SH.getStereotype(self.Project, "Block", "SysML::Blocks")
+    INPUTS:
+        Indices: the indices of the element
 
-            # get the requirement stereotype from the SysML stereotype profile
-            self.ReqSter = SH.getStereotype(self.Project, "Requirement", "SysML::Requirements")
+        Shape  : the size of each dimension
 
-            # get the types for integers, reals, and strings
-            self.Integer = Finder.byQualifiedName().find(self.Project, "SysML::Libraries::PrimitiveValueTypes::Integer")
-            self.Real    = Finder.byQualifiedName().find(self.Project, "SysML::Libraries::PrimitiveValueTypes::Real")
-            self.String  = Finder.byQualifiedName().find(self.Project, "SysML::Libraries::PrimitiveValueTypes::String")
-            self.Boolean = Finder.byQualifiedName().find(self.Project, "SysML::Libraries::PrimitiveValueTypes::Boolean")
+    OUTPUTS:
+        the position of the element (None if the indices do not fit the shape)
 
-            # remember the ADH profile
-            self.Profile = SH.getProfile(self.Project, "ImportADHProfile")
+    """
 
-            # if there's no profile, throw a warning
-            if (self.Profile is None):
+    # check that the indices fit the shape
+    if (Shape is None) or (len(Indices) != len(Shape)) or (any(Index >= Size for Index, Size in zip(Indices, Shape))):
+        return None
+    # end if
 
-                # throw failure
-                self.ProfileFlag = -1
-                
-                # print a warning
-                Application.getInstance().getGUILog().showMessage("WARNING: No ADH Profile imported ... stereotypes won't be assigned.")
-                
-            else:
-                
-                # throw success
-                self.ProfileFlag = 0
-                
-            # end if
+    # find the position of the element in the flattened array
+    Position = 0
 
-            # get the class metadata
-            self.MetaClass = SH.getMetaClassByName(self.Project, "Class")
-        
-            # open a JSON file
-            f = open(Filename, "r")
-            
-            # read the file
-            MyString = f.read()
-            
-            # convert to a JSON string
-            MyJSON = json.loads(MyString)
+    # loop through the dimensions
+    for Index, Size in zip(Indices, Shape):
 
-            # close the file
-            f.close()
+        # account for the current dimension
+        Position = Position * Size + Index
 
-            # remove the JSON suffix
-            NewName = Filename.split(".json")[0]
-            
-            # create a new file for writing differences
-            NewFileName = NewName + "-ModifiedValues.txt"
+    # end for
 
-            # create a new file
-            self.OutFile = open(NewFileName, "w")
-            
-            # get the dictionary needed for writing to the ADH
-            MyDict = self.GetBlock(ParentPackage)
+    # return the position
+    return Position
 
-            # get the parent package name
-            ParentPackageName = ParentPackage.getName()
-            
-            # compare the two dictionaries
-            self.CompareDict(MyDict, MyJSON[ParentPackageName], ParentPackageName, "", 0, [None, None])
+# end GetArrayPosition
 
-            # close the file
-            self.OutFile.close()
-            
-            # close the session
-            SM.getInstance().closeSession(self.Project)
+# -----------------------------------------------------------
 
-        except Exception as e:
-            
-            # print that an exception occurred
-            Application.getInstance().getGUILog().showMessage("Exception occurred: " + repr(e))
-        
-            # cancel the session
-            SM.getInstance().cancelSession(self.Project)
+def GetLiteralValue(Literal):
+    """
 
-        # end try-except
-    # end execute
+    GetLiteralValue(Literal)
 
-    # -------------------------------------------------------
+    Get the value held by a literal value specification.
 
-    def CompareDict(self, Data1, Data2, Name, ParentKeys, SpecialFlag, LastDict):
-        
-        # check that both items are dictionaries
-        if (isinstance(Data1, dict)) and (isinstance(Data2, dict)):
-            
-            # loop through each level of the dictionaries
-            Items1 = Data1.items()
-            
-            # loop through one dictionary
-            for ikey, ival in Items1:
-                
-                # assume a floating point value
-                DataType = 0
-                
-                # check if the value is a dictionary
-                if (isinstance(ival, dict)):
-                    
-                    # assume it is a block with data inside it
-                    DataType = -1
-                    
-                    # try seeing it a WBS number exists
-                    try:
-                        
-                        # get the WBS number
-                        if ("wbs_no" in ival.keys()):
-                            
-                            # it is a component that will may have folders
-                            DataType = +1
-                            
-                        # end if
-                        
-                    except:
-                        
-                        # do nothing
-                        pass
-                    
-                    # end try-except
-                # end if
-                
-                # check if the value is a list
-                if (isinstance(ival, list)):
-                    
-                    # it is an array to be opened up
-                    DataType = +2
-                    
-                # end if
-                
-                # check for reserved words
-                if (ikey == "components") or (ikey == "requirements") or (ikey == "performance") or (ikey == "behavior"):
-                    
-                    # it also needs to be opened up
-                    DataType = +2
-                    
-                # end if
-                
-                # check how the data must be handled
-                if (DataType == -1):
+    INPUTS:
+        Literal: the literal to be read
 
-                    # assume no extra quotes are needed
-                    ExtraBlock1 = ""
-                    ExtraBlock2 = ""
+    OUTPUTS:
+        the value of the literal
 
-                    # try to check if there are keys from the parent item
-                    try:
+    """
 
-                        # check if there are keys
-                        if ("wbs_no" in ParentKeys):
-                            
-                            # get the last part of the name
-                            ExtraBlock1 = "::Architecture"
-                            
-                    except:
+    # check for a Boolean
+    if (str(Literal.getHumanName()) == "Literal Boolean"):
 
-                        # do nothing if it fails
-                        pass
+        # return the value
+        return Literal.isValue()
 
-                    # try to check if there are keys in the current item
-                    try:
+    # end if
 
-                        # check if there are keys
-                        if ("wbs_no" in Data1.keys()):
-                            
-                            # get the last part of the name
-                            ExtraBlock2 = "::Architecture"
-                            
-                    except:
+    # return the value
+    return Literal.getValue()
 
-                        # do nothing if it fails
-                        pass
-                    
-                    # end try-except
-                    
-                    # modify the name accordingly
-                    if (SpecialFlag >= 0):
+# end GetLiteralValue
 
-                        # modify the name
-                        NewName = Name + ExtraBlock1 + ExtraBlock2 + "::" + ikey
-                        
-                    else:
+# -----------------------------------------------------------
 
-                        # don't add extra blocks when modifying the name
-                        NewName = Name + "::" + ikey
-                        
-                    # end if
+def ReadArrayValue(Literals, Shape):
+    """
 
-                    # open up the data more
-                    self.CompareDict(Data1[ikey], Data2[ikey], NewName, Data1.keys(), -1, [LastDict[1], Data2])
-                    
-                elif (DataType == 0):
+    ReadArrayValue(Literals, Shape)
 
-                    # assume no extra text is needed
-                    ExtraBlock = ""
+    Read the values of a compact array and reshape them into an n-dimensional array.
 
-                    # try to see if there's a wbs number in the data
-                    try:
+    INPUTS:
+        Literals: the literals holding the array values, in order
 
-                        # see if there's a wbs number
-                        if ("wbs_no" in Data1):
+        Shape   : the size of each dimension
 
-                            # add the extra text required
-                            ExtraBlock = "::" + Name.split("::")[-1]
+    OUTPUTS:
+        the n-dimensional array (or a flat list if the number of values does not match the shape)
 
+    """
+
+    # get the values
+    Values = [GetLiteralValue(Literal) for Literal in Literals]
+
+    # get the number of values the shape holds
+    Size = 1
+    for Dim in Shape:
+        Size *= Dim
+    # end for
+
+    # check that the values fill the shape
+    if (Size != len(Values)):
+
+        # return the values as they are
+        return Values
+
+    # end if
+
+    # reshape the array
+    return ReshapeArray(Values, Shape)
+
+# end ReadArrayValue
+
+# -----------------------------------------------------------
+# -----------------------------------------------------------
+# -----------------------------------------------------------
+
+###############################
+#                             #
+# JSON EVENT PARSER           #
+#                             #
+###############################
+
+# regular expressions for skipping whitespace and reading numbers
+WHITESPACE = re.compile(r"[ \t\n\r]*")
+NUMBER     = re.compile(r"(-?(?:0|[1-9]\d*))(\.\d+)?([eE][-+]?\d+)?")
+NUMBER_RUN = re.compile(r"[-+0-9.eE]*")
+
+# constants that may be written in a JSON file (checked before reading a number)
+CONSTANTS = (("true"     , True        ), \
+             ("false"    , False       ), \
+             ("null"     , None        ), \
+             ("NaN"      , float("nan")), \
+             ("Infinity" , float("inf")), \
+             ("-Infinity", float("-inf")))
+
+class JSONEventParser():
+
+    # initialization function
+    def __init__(self, File, ChunkSize = 65536):
+        """
+
+        __init__(self, File, ChunkSize = 65536)
+
+        Initialize an event-driven JSON parser that reads a file in fixed-size chunks instead of loading it all at once.
+
+        INPUTS:
+            self     : the JSON event parser
+
+            File     : an open file object containing the JSON text
+
+            ChunkSize: (optional, default is 65536) the number of characters read from the file at a time
+
+        OUTPUTS:
+            none
+
+        """
+
+        # remember the file and chunk size
+        self.File      = File
+        self.ChunkSize = ChunkSize
+
+        # start with an empty buffer
+        self.Buffer = ""
+        self.Pos    = 0
+
+        # flag that the end of the file has not been reached
+        self.EOF = False
+
+    # end __init__
+
+    # -------------------------------------------------------
+
+    # read another chunk of the file
+    def Fill(self):
+        """
+
+        Fill(self)
+
+        Read the next chunk of the file into the buffer, discarding any characters that were already parsed.
+
+        INPUTS:
+            self: the JSON event parser
+
+        OUTPUTS:
+            flag to show that more characters were read (True) or the end of the file was reached (False)
+
+        """
+
+        # check if the file is already exhausted
+        if (self.EOF):
+
+            # nothing else to read
+            return False
+
+        # end if
+
+        # read the next chunk
+        Chunk = self.File.read(self.ChunkSize)
+
+        # check if anything was read
+        if (not Chunk):
+
+            # flag the end of the file
+            self.EOF = True
+
+            # nothing else to read
+            return False
+
+        # end if
+
+        # keep only the unparsed characters and append the new chunk
+        self.Buffer = self.Buffer[self.Pos:] + Chunk
+        self.Pos    = 0
+
+        # more characters are available
+        return True
+
+    # end Fill
+
+    # -------------------------------------------------------
+
+    # get the next non-whitespace character
+    def Peek(self):
+        """
+
+        Peek(self)
+
+        Skip any whitespace and return the next character without consuming it.
+
+        INPUTS:
+            self: the JSON event parser
+
+        OUTPUTS:
+            the next character, or an empty string at the end of the file
+
+        """
+
+        # iterate until a character is found or the file ends
+        while True:
+
+            # skip the whitespace
+            self.Pos = WHITESPACE.match(self.Buffer, self.Pos).end()
+
+            # check if a character is available
+            if (self.Pos < len(self.Buffer)):
+
+                # return the character
+                return self.Buffer[self.Pos]
+
+            # end if
+
+            # otherwise, read more of the file
+            if (not self.Fill()):
+
+                # the file has ended
+                return ""
+
+            # end if
+        # end while
+    # end Peek
+
+    # -------------------------------------------------------
+
+    # read a string
+    def ReadString(self):
+        """
+
+        ReadString(self)
+
+        Read a JSON string starting at the current position (an opening quote). More chunks are only read while the closing quote is not in the buffer, so an invalid string raises its error right away.
+
+        INPUTS:
+            self: the JSON event parser
+
+        OUTPUTS:
+            Value: the decoded string
+
+        """
+
+        # where to look for the closing quote, counted from the opening quote
+        Offset = 1
+
+        # iterate until the closing quote is in the buffer
+        while True:
+
+            # find the next quote
+            End = self.Buffer.find('"', self.Pos + Offset)
+
+            # check if the string continues past the end of the buffer
+            if (End < 0):
+
+                # read the next chunk and look again from where this one ended
+                Offset = len(self.Buffer) - self.Pos
+                if (self.Fill()):
+                    continue
+                # end if
+
+                # otherwise, the decoder reports the unterminated string
+                break
+
+            # end if
+
+            # count the backslashes just before the quote
+            Text    = self.Buffer[self.Pos + 1:End]
+            Slashes = len(Text) - len(Text.rstrip("\\"))
+
+            # check if the quote closes the string (it is not escaped)
+            if (Slashes % 2 == 0):
+                break
+            # end if
+
+            # look past the escaped quote
+            Offset = End + 1 - self.Pos
+
+        # end while
+
+        # decode from just after the opening quote (an invalid string raises a ValueError)
+        Value, End = JSONDecoder.scanstring(self.Buffer, self.Pos + 1)
+
+        # move past the string
+        self.Pos = End
+
+        # return the string
+        return Value
+
+    # end ReadString
+
+    # -------------------------------------------------------
+
+    # read a number or constant
+    def ReadScalar(self):
+        """
+
+        ReadScalar(self)
+
+        Read a JSON number or constant (true, false, null, NaN, Infinity, -Infinity) starting at the current position.
+
+        INPUTS:
+            self: the JSON event parser
+
+        OUTPUTS:
+            the value that was read
+
+        """
+
+        # make sure the longest constant fits in the buffer
+        while ((len(self.Buffer) - self.Pos) < 9) and (self.Fill()):
+            pass
+        # end while
+
+        # check for each constant
+        for Name, Value in CONSTANTS:
+
+            # check if the buffer starts with the constant
+            if (self.Buffer.startswith(Name, self.Pos)):
+
+                # move past the constant
+                self.Pos += len(Name)
+
+                # return its value
+                return Value
+
+            # end if
+        # end for
+
+        # iterate until the whole number is in the buffer
+        while True:
+
+            # try matching a number
+            Match = NUMBER.match(self.Buffer, self.Pos)
+
+            # check that a number was found
+            if (Match is None):
+
+                # throw an error
+                raise ValueError("Expecting a JSON value at character " + repr(self.Buffer[self.Pos:self.Pos + 20]))
+
+            # end if
+
+            # check if the number may continue in the next chunk (the characters after the match could still be part of it, such as "1." before "5e-3")
+            if (NUMBER_RUN.match(self.Buffer, self.Pos).end() == len(self.Buffer)) and (self.Fill()):
+
+                # try again
+                continue
+
+            # end if
+
+            # move past the number
+            self.Pos = Match.end()
+
+            # get the parts of the number
+            Integer, Fraction, Exponent = Match.groups()
+
+            # check for an integer
+            if (Fraction is None) and (Exponent is None):
+
+                # return an integer
+                return int(Integer)
+
+            # end if
+
+            # return a float
+            return float(Integer + (Fraction or "") + (Exponent or ""))
+
+        # end while
+    # end ReadScalar
+
+    # -------------------------------------------------------
+
+    # generate the parsing events
+    def Events(self):
+        """
+
+        Events(self)
+
+        Parse the file and yield one event at a time, so the caller can act on the data before the whole file is read.
+
+        INPUTS:
+            self: the JSON event parser
+
+        OUTPUTS:
+            a generator of (Event, Value) tuples, where Event is "start_object", "end_object", "start_array", "end_array", "key", or "scalar"
+
+        """
+
+        # remember the open containers
+        Stack = []
+
+        # start by expecting a value
+        State = "value"
+
+        # iterate until the document ends
+        while True:
+
+            # get the next character
+            Char = self.Peek()
+
+            # check what is expected
+            if (State == "value") or (State == "value_or_end"):
+
+                # check for the end of an empty array
+                if (Char == "]") and (State == "value_or_end"):
+
+                    # close the array
+                    self.Pos += 1
+                    Stack.pop()
+                    yield ("end_array", None)
+
+                elif (Char == "{"):
+
+                    # open an object
+                    self.Pos += 1
+                    Stack.append("object")
+                    yield ("start_object", None)
+
+                    # expect a key (or an empty object)
+                    State = "key_or_end"
+
+                    # go to the next character
+                    continue
+
+                elif (Char == "["):
+
+                    # open an array
+                    self.Pos += 1
+                    Stack.append("array")
+                    yield ("start_array", None)
+
+                    # expect a value (or an empty array)
+                    State = "value_or_end"
+
+                    # go to the next character
+                    continue
+
+                elif (Char == "\""):
+
+                    # read the string
+                    yield ("scalar", self.ReadString())
+
+                elif (Char == ""):
+
+                    # the file ended too early
+                    raise ValueError("Unexpected end of the JSON file")
+
+                else:
+
+                    # read the number or constant
+                    yield ("scalar", self.ReadScalar())
+
+                # end if
+
+            elif (State == "key") or (State == "key_or_end"):
+
+                # check for the end of an empty object
+                if (Char == "}") and (State == "key_or_end"):
+
+                    # close the object
+                    self.Pos += 1
+                    Stack.pop()
+                    yield ("end_object", None)
+
+                elif (Char == "\""):
+
+                    # read the key
+                    Key = self.ReadString()
+
+                    # check for the separator
+                    if (self.Peek() != ":"):
+
+                        # throw an error
+                        raise ValueError("Expecting ':' after key " + repr(Key))
+
+                    # end if
+
+                    # move past the separator
+                    self.Pos += 1
+
+                    # yield the key
+                    yield ("key", Key)
+
+                    # expect its value
+                    State = "value"
+
+                    # go to the next character
+                    continue
+
+                else:
+
+                    # throw an error
+                    raise ValueError("Expecting a key in the JSON file, found " + repr(Char))
+
+                # end if
+
+            elif (State == "comma_or_end"):
+
+                # check for another item
+                if (Char == ","):
+
+                    # move past the comma
+                    self.Pos += 1
+
+                    # expect a key in an object or a value in an array
+                    if (Stack[-1] == "object"):
+                        State = "key"
+                    else:
+                        State = "value"
+                    # end if
+
+                    # go to the next character
+                    continue
+
+                elif (Char == "}") and (Stack[-1] == "object"):
+
+                    # close the object
+                    self.Pos += 1
+                    Stack.pop()
+                    yield ("end_object", None)
+
+                elif (Char == "]") and (Stack[-1] == "array"):
+
+                    # close the array
+                    self.Pos += 1
+                    Stack.pop()
+                    yield ("end_array", None)
+
+                else:
+
+                    # throw an error
+                    raise ValueError("Expecting ',' or a closing bracket in the JSON file, found " + repr(Char))
+
+                # end if
+
+            else:
+
+                # check that nothing follows the document
+                if (Char != ""):
+
+                    # throw an error
+                    raise ValueError("Extra data after the end of the JSON file")
+
+                # end if
+
+                # stop generating events
+                return
+
+            # end if
+
+            # a value was completed, so check if the document is done
+            if (len(Stack) == 0):
+                State = "done"
+            else:
+                State = "comma_or_end"
+            # end if
+
+        # end while
+    # end Events
+
+    # -------------------------------------------------------
+
+# end JSONEventParser
+
+# -----------------------------------------------------------
+# -----------------------------------------------------------
+# -----------------------------------------------------------
+
+###############################
+#                             #
+# MESSAGEPACK EVENT PARSER    #
+#                             #
+###############################
+
+# fixed-size MessagePack types: (struct format, number of bytes), by type byte
+MSGPACK_NUMBERS = {0xca : (">f", 4), 0xcb : (">d", 8), \
+                   0xcc : (">B", 1), 0xcd : (">H", 2), 0xce : (">I", 4), 0xcf : (">Q", 8), \
+                   0xd0 : (">b", 1), 0xd1 : (">h", 2), 0xd2 : (">i", 4), 0xd3 : (">q", 8)}
+
+# MessagePack types that hold a length: (kind, struct format of the length, number of bytes), by type byte
+MSGPACK_SIZED = {0xc4 : ("bytes" , ">B", 1), 0xc5 : ("bytes" , ">H", 2), 0xc6 : ("bytes" , ">I", 4), \
+                 0xd9 : ("string", ">B", 1), 0xda : ("string", ">H", 2), 0xdb : ("string", ">I", 4), \
+                 0xdc : ("array" , ">H", 2), 0xdd : ("array" , ">I", 4), \
+                 0xde : ("object", ">H", 2), 0xdf : ("object", ">I", 4)}
+
+class MsgPackEventParser():
+
+    # initialization function
+    def __init__(self, File, ChunkSize = 65536):
+        """
+
+        __init__(self, File, ChunkSize = 65536)
+
+        Initialize an event-driven MessagePack parser that reads a file in fixed-size chunks, and makes the same events as the JSON event parser.
+
+        INPUTS:
+            self     : the MessagePack event parser
+
+            File     : an open file object (in binary mode) containing the MessagePack data
+
+            ChunkSize: (optional, default is 65536) the number of bytes read from the file at a time
+
+        OUTPUTS:
+            none
+
+        """
+
+        # remember the file and chunk size
+        self.File      = File
+        self.ChunkSize = ChunkSize
+
+        # start with an empty buffer
+        self.Buffer = ""
+        self.Pos    = 0
+
+    # end __init__
+
+    # -------------------------------------------------------
+
+    # read a number of bytes
+    def Read(self, Size):
+        """
+
+        Read(self, Size)
+
+        Read a number of bytes, reading more chunks of the file as needed.
+
+        INPUTS:
+            self: the MessagePack event parser
+
+            Size: the number of bytes to read
+
+        OUTPUTS:
+            the bytes read
+
+        """
+
+        # read chunks until enough bytes are buffered
+        while (len(self.Buffer) - self.Pos < Size):
+
+            # read the next chunk
+            Chunk = self.File.read(max(Size, self.ChunkSize))
+
+            # check if anything was read
+            if (not Chunk):
+
+                # throw an error
+                raise ValueError("Unexpected end of the MessagePack file")
+
+            # end if
+
+            # keep only the unread bytes and append the new chunk
+            self.Buffer = self.Buffer[self.Pos:] + Chunk
+            self.Pos    = 0
+
+        # end while
+
+        # get the bytes
+        Bytes = self.Buffer[self.Pos:self.Pos + Size]
+        self.Pos += Size
+
+        # return the bytes
+        return Bytes
+
+    # end Read
+
+    # -------------------------------------------------------
+
+    # read the next value or container header
+    def ReadItem(self):
+        """
+
+        ReadItem(self)
+
+        Read a scalar, or the header of a map or array.
+
+        INPUTS:
+            self: the MessagePack event parser
+
+        OUTPUTS:
+            (Event, Value): ("scalar", value), or ("start_object", number of keys) or ("start_array", number of elements)
+
+        """
+
+        # read the type byte
+        Type = ord(self.Read(1))
+
+        # check for a positive or negative fixed integer
+        if (Type <= 0x7f):
+            return ("scalar", Type)
+        elif (Type >= 0xe0):
+            return ("scalar", Type - 0x100)
+        # end if
+
+        # check for a fixed map, array, or string
+        if (Type <= 0x8f):
+            return ("start_object", Type & 0x0f)
+        elif (Type <= 0x9f):
+            return ("start_array", Type & 0x0f)
+        elif (Type <= 0xbf):
+            return ("scalar", self.Read(Type & 0x1f).decode("utf-8"))
+        # end if
+
+        # check for a null or Boolean
+        if (Type == 0xc0):
+            return ("scalar", None)
+        elif (Type == 0xc2):
+            return ("scalar", False)
+        elif (Type == 0xc3):
+            return ("scalar", True)
+        # end if
+
+        # check for a number
+        if (Type in MSGPACK_NUMBERS):
+            Format, Size = MSGPACK_NUMBERS[Type]
+            return ("scalar", struct.unpack(Format, self.Read(Size))[0])
+        # end if
+
+        # check for anything else that the ADH may contain
+        if (Type not in MSGPACK_SIZED):
+            raise ValueError("Unsupported type 0x%02x in the MessagePack file" % Type)
+        # end if
+
+        # read the length
+        Kind, Format, Size = MSGPACK_SIZED[Type]
+        Length = struct.unpack(Format, self.Read(Size))[0]
+
+        # check for a string (or bytes, which are kept as they are)
+        if (Kind == "string"):
+            return ("scalar", self.Read(Length).decode("utf-8"))
+        elif (Kind == "bytes"):
+            return ("scalar", self.Read(Length))
+        # end if
+
+        # return the header of the map or array
+        return ("start_" + Kind, Length)
+
+    # end ReadItem
+
+    # -------------------------------------------------------
+
+    # generate the parsing events
+    def Events(self):
+        """
+
+        Events(self)
+
+        Parse the file and yield one event at a time, so the caller can act on the data before the whole file is read.
+
+        INPUTS:
+            self: the MessagePack event parser
+
+        OUTPUTS:
+            a generator of (Event, Value) tuples, the same as JSONEventParser.Events makes
+
+        """
+
+        # remember the open containers: [kind, items left, expecting a key]
+        Stack = []
+
+        # iterate until the document ends
+        while True:
+
+            # check if a map is expecting a key
+            if (len(Stack) > 0) and (Stack[-1][2]):
+
+                # read the key
+                Event, Key = self.ReadItem()
+
+                # check that the key is a string
+                if (Event != "scalar") or (not isinstance(Key, basestring)):
+                    raise ValueError("Expecting a key in the MessagePack file, found " + repr(Key))
+                # end if
+
+                # yield the key and expect its value
+                Stack[-1][2] = False
+                yield ("key", Key)
+
+                # go to the next item
+                continue
+
+            # end if
+
+            # read the value
+            Event, Value = self.ReadItem()
+
+            # count the value in its container
+            if (len(Stack) > 0):
+                Stack[-1][1] -= 1
+                Stack[-1][2] = (Stack[-1][0] == "object") and (Stack[-1][1] > 0)
+            # end if
+
+            # check for a container
+            if (Event != "scalar"):
+
+                # open it
+                yield (Event, None)
+                Stack.append([Event[6:], Value, (Event == "start_object") and (Value > 0)])
+
+            else:
+
+                # yield the scalar
+                yield (Event, Value)
+
+            # end if
+
+            # close every container that is complete
+            while (len(Stack) > 0) and (Stack[-1][1] == 0):
+                yield ("end_" + Stack.pop()[0], None)
+            # end while
+
+            # check if the document is done
+            if (len(Stack) == 0):
+
+                # check that nothing follows the document
+                if (self.Pos < len(self.Buffer)) or (self.File.read(1)):
+                    raise ValueError("Extra data after the end of the MessagePack file")
+                # end if
+
+                # stop generating events
+                return
+
+            # end if
+
+        # end while
+    # end Events
+
+    # -------------------------------------------------------
+
+# end MsgPackEventParser
+
+# -----------------------------------------------------------
+# -----------------------------------------------------------
+# -----------------------------------------------------------
+
+###############################
+#                             #
+# FUNCTIONS FOR OPENING AN    #
+# ADH IN ANY FORMAT           #
+#                             #
+###############################
+
+def GetADHFormat(Filename):
+    """
+
+    GetADHFormat(Filename)
+
+    Get the format of an ADH from its extension: MessagePack (.msgpack), gzip-compressed JSON (.gz, such as .json.gz), or JSON (anything else, indented or minified).
+
+    INPUTS:
+        Filename: the name of the ADH
+
+    OUTPUTS:
+        the format: "msgpack", "gzip", or "json"
+
+    """
+
+    # check the extension
+    if (Filename.lower().endswith(".msgpack")):
+        return "msgpack"
+    elif (Filename.lower().endswith(".gz")):
+        return "gzip"
+    else:
+        return "json"
+    # end if
+
+# end GetADHFormat
+
+# -----------------------------------------------------------
+
+def OpenADH(Filename):
+    """
+
+    OpenADH(Filename)
+
+    Open an ADH for reading, decompressing it as it is read if needed.
+
+    INPUTS:
+        Filename: the name of the ADH
+
+    OUTPUTS:
+        the open file
+
+    """
+
+    # get the format
+    Format = GetADHFormat(Filename)
+
+    # open the file
+    if (Format == "msgpack"):
+        return open(Filename, "rb")
+    elif (Format == "gzip"):
+        return gzip.open(Filename, "rb")
+    else:
+        return open(Filename, "r")
+    # end if
+
+# end OpenADH
+
+# -----------------------------------------------------------
+
+def GetADHEvents(File, Filename, ChunkSize = 65536):
+    """
+
+    GetADHEvents(File, Filename, ChunkSize = 65536)
+
+    Get the parsing events of an open ADH, using the parser for its format.
+
+    INPUTS:
+        File     : the ADH, opened by OpenADH
+
+        Filename : the name of the ADH
+
+        ChunkSize: (optional, default is 65536) the number of characters (or bytes) read from the file at a time
+
+    OUTPUTS:
+        a generator of (Event, Value) tuples
+
+    """
+
+    # check for MessagePack
+    if (GetADHFormat(Filename) == "msgpack"):
+        return MsgPackEventParser(File, ChunkSize).Events()
+    else:
+        return JSONEventParser(File, ChunkSize).Events()
+    # end if
+
+# end GetADHEvents
+
+# -----------------------------------------------------------
+# -----------------------------------------------------------
+# -----------------------------------------------------------
+
+###############################
+#                             #
+# FUNCTION FOR BUILDING A     #
+# VALUE FROM PARSING EVENTS   #
+#                             #
+###############################
+
+def BuildJSON(Event, Value, Events):
+    """
+
+    BuildJSON(Event, Value, Events)
+
+    Build a (possibly nested) value from parsing events, consuming only the events that belong to it.
+
+    INPUTS:
+        Event : the first event of the value
+
+        Value : the value attached to the first event
+
+        Events: the generator of the remaining parsing events
+
+    OUTPUTS:
+        Root  : the dictionary, list, or scalar that was built
+
+    """
+
+    # check for a scalar
+    if (Event == "scalar"):
+
+        # nothing else to build
+        return Value
+
+    elif (Event == "start_object"):
+
+        # start a dictionary
+        Root = {}
+
+    elif (Event == "start_array"):
+
+        # start a list
+        Root = []
+
+    else:
+
+        # throw an error
+        raise ValueError("BuildJSON: cannot start a value with a " + repr(Event) + " event")
+
+    # end if
+
+    # remember the open containers and their current keys
+    Stack = [Root]
+    Keys  = [None]
+
+    # loop through the events
+    for Event, Value in Events:
+
+        # check for the end of a container
+        if (Event == "end_object") or (Event == "end_array"):
+
+            # close the container
+            Stack.pop()
+            Keys.pop()
+
+            # check if the value is complete
+            if (len(Stack) == 0):
+
+                # return the value
+                return Root
+
+            # end if
+
+            # go to the next event
+            continue
+
+        # end if
+
+        # check for a key
+        if (Event == "key"):
+
+            # remember the key
+            Keys[-1] = Value
+
+            # go to the next event
+            continue
+
+        # end if
+
+        # create the new item
+        if (Event == "start_object"):
+            NewItem = {}
+        elif (Event == "start_array"):
+            NewItem = []
+        else:
+            NewItem = Value
+        # end if
+
+        # add the item to its container
+        if (isinstance(Stack[-1], dict)):
+            Stack[-1][Keys[-1]] = NewItem
+        else:
+            Stack[-1].append(NewItem)
+        # end if
+
+        # open the new container
+        if (Event != "scalar"):
+            Stack.append(NewItem)
+            Keys.append(None)
+        # end if
+
+    # end for
+
+    # the events ended before the value was complete
+    raise ValueError("Unexpected end of the JSON file")
+
+# end BuildJSON
+
+# -----------------------------------------------------------
+# -----------------------------------------------------------
+# -----------------------------------------------------------
+
+###############################
+#                             #
+# FUNCTION FOR LOADING A JSON #
+# FILE WITH THE EVENT PARSER  #
+#                             #
+###############################
+
+@Timed
+def LoadJSON(Filename, ChunkSize = 65536):
+    """
+
+    LoadJSON(Filename, ChunkSize = 65536)
+
+    Read a JSON file (or an ADH in any other format) with the event parser, so the file is never held in memory as a single string.
+
+    INPUTS:
+        Filename : the name of the JSON file to read
+
+        ChunkSize: (optional, default is 65536) the number of characters (or bytes) read from the file at a time
+
+    OUTPUTS:
+        MyJSON   : the nested dictionary in the JSON file
+
+    """
+
+    # open the ADH
+    f = OpenADH(Filename)
+
+    try:
+
+        # get the parsing events
+        Events = GetADHEvents(f, Filename, ChunkSize)
+
+        # get the first event
+        Event, Value = next(Events)
+
+        # build the nested dictionary
+        MyJSON = BuildJSON(Event, Value, Events)
+
+        # check that nothing follows the document
+        for Event, Value in Events:
+            pass
+        # end for
+
+    finally:
+
+        # close the file
+        f.close()
+
+    # end try-finally
+
+    # return the nested dictionary
+    return MyJSON
+
+# end LoadJSON
+
+# -----------------------------------------------------------
+
+def GetADHFiles(Filename):
+    """
+
+    GetADHFiles(Filename)
+
+    Get the ADHs to be applied by one update. The filename may be a single ADH, a list of ADHs separated by semicolons (applied in the order given), or a folder (every ADH in it, written as .json, .json.gz, or .msgpack, is applied in alphabetical order). Files written by the actions next to an ADH (<ADH>-Progress.json and <ADH>-Base.json) are not ADHs.
+
+    INPUTS:
+        Filename : the ADH, list of ADHs, or folder input by the user
+
+    OUTPUTS:
+        Filenames: the list of ADHs
+
+    """
+
+    # check for a folder
+    if (os.path.isdir(Filename)):
+
+        # remember the ADHs in the folder
+        Filenames = []
+
+        # loop through the files in alphabetical order
+        for MyFile in sorted(os.listdir(Filename)):
+
+            # check for an ADH
+            if (MyFile.lower().endswith((".json", ".json.gz", ".msgpack"))) and (not MyFile.endswith("-Progress.json")) and (not MyFile.endswith("-Base.json")):
+                Filenames.append(os.path.join(Filename, MyFile))
+            # end if
+
+        # end for
+
+        # return the ADHs
+        return Filenames
+
+    # end if
+
+    # split the list of ADHs
+    return [MyFile.strip() for MyFile in Filename.split(";") if (MyFile.strip() != "")]
+
+# end GetADHFiles
+
+# -----------------------------------------------------------
+
+def MergeWanted(Wanted1, Wanted2):
+    """
+
+    MergeWanted(Wanted1, Wanted2)
+
+    Merge two ADHs into one that names every model element named in either of them (used by LAZY_EXPORT when several ADHs are applied at once). Neither ADH is changed.
+
+    INPUTS:
+        Wanted1: the first ADH, or part of it
+
+        Wanted2: the second ADH, or part of it
+
+    OUTPUTS:
+        Merged : the merged ADH
+
+    """
+
+    # only dictionaries are merged (anything else names the same element)
+    if (not isinstance(Wanted1, dict)) or (not isinstance(Wanted2, dict)):
+        return Wanted2
+    # end if
+
+    # start from the first ADH
+    Merged = dict(Wanted1)
+
+    # loop through the second ADH
+    for ikey, ival in Wanted2.items():
+
+        # merge the keys in both ADHs
+        if (ikey in Merged):
+            Merged[ikey] = MergeWanted(Merged[ikey], ival)
+        else:
+            Merged[ikey] = ival
+        # end if
+
+    # end for
+
+    # return the merged ADH
+    return Merged
+
+# end MergeWanted
+
+# -----------------------------------------------------------
+# -----------------------------------------------------------
+# -----------------------------------------------------------
+
+###############################
+#                             #
+# STRUCTURAL DIFF ENGINE      #
+#                             #
+###############################
+
+# types of numbers (2 ** 64 is a long in Python 2 and an int in Python 3)
+NUMBER_TYPES = (int, type(2 ** 64), float)
+
+def ValuesDiffer(Old, New):
+    """
+
+    ValuesDiffer(Old, New)
+
+    Check if a value in the model must be changed to match the ADH. Numbers are the same if they are within ABS_TOLERANCE or REL_TOLERANCE of each other, and (with INT_FLOAT_EQUAL) an integer and a real are the same if their values are. Arrays are compared element by element, and Booleans and strings must be equal.
+
+    INPUTS:
+        Old: the value in the model
+
+        New: the value in the ADH
+
+    OUTPUTS:
+        True if the value must be changed, False otherwise
+
+    """
+
+    # check for numbers (Booleans are not compared as numbers)
+    OldNumber = (isinstance(Old, NUMBER_TYPES)) and (not isinstance(Old, bool))
+    NewNumber = (isinstance(New, NUMBER_TYPES)) and (not isinstance(New, bool))
+
+    # check if an integer became a real (or a real became an integer)
+    if (INT_FLOAT_EQUAL == 0) and (OldNumber) and (NewNumber) and (isinstance(Old, float) != isinstance(New, float)):
+        return True
+    # end if
+
+    # check for arrays
+    if (isinstance(Old, list)) and (isinstance(New, list)):
+
+        # compare the arrays element by element
+        return (len(Old) != len(New)) or (any(ValuesDiffer(OldElem, NewElem) for OldElem, NewElem in zip(Old, New)))
+
+    # end if
+
+    # equal values are the same
+    if (Old == New):
+        return False
+    # end if
+
+    # check for numbers
+    if (OldNumber) and (NewNumber):
+
+        # two values that are not a number are the same
+        if (Old != Old) and (New != New):
+            return False
+        # end if
+
+        # compare the numbers with the tolerances
+        return abs(Old - New) > max(ABS_TOLERANCE, REL_TOLERANCE * max(abs(Old), abs(New)))
+
+    # end if
+
+    # the values are different
+    return True
+
+# end ValuesDiffer
+
+# -----------------------------------------------------------
+
+def DiffArray(Old, New, Name, LastDict, Patch, Indices = ()):
+    """
+
+    DiffArray(Old, New, Name, LastDict, Patch, Indices = ())
+
+    List the elements of an array that differ between the model export and the ADH, with their indices. An array (or part of one) that grew, shrank, or became a value (or the other way around) cannot be changed one element at a time, so it is listed as a "shape" change instead, and its elements past the end of the shorter array are not compared.
+
+    INPUTS:
+        Old     : the array (or part of it) in the model export
+
+        New     : the array (or part of it) in the ADH
+
+        Name    : the qualified name of the array
+
+        LastDict: the two most recent dictionaries from the ADH
+
+        Patch   : the list of changes to be added to
+
+        Indices : (optional) the indices of the part of the array being compared
+
+    OUTPUTS:
+        none
+
+    """
+
+    # loop through the elements both arrays have
+    for ielem in range(min(len(Old), len(New))):
+
+        # get the elements
+        OldElem = Old[ielem]
+        NewElem = New[ielem]
+
+        # check for another dimension
+        if (isinstance(OldElem, list)) and (isinstance(NewElem, list)):
+
+            # compare it element by element
+            DiffArray(OldElem, NewElem, Name, LastDict, Patch, Indices + (ielem,))
+
+        elif (isinstance(OldElem, list)) or (isinstance(NewElem, list)):
+
+            # remember that a value became an array, or an array became a value
+            Patch.append(("shape", Name, OldElem, NewElem, LastDict, Indices + (ielem,)))
+
+        elif (ValuesDiffer(OldElem, NewElem)):
+
+            # remember the changed element
+            Patch.append(("element", Name, OldElem, NewElem, LastDict, Indices + (ielem,)))
+
+        # end if
+    # end for
+
+    # check if the array grew or shrank
+    if (len(Old) != len(New)):
+
+        # remember that its value properties must be rebuilt
+        Patch.append(("shape", Name, Old, New, LastDict, Indices))
+
+    # end if
+
+# end DiffArray
+
+# -----------------------------------------------------------
+
+@Timed
+def DiffADH(Data1, Data2, Name, ParentKeys, SpecialFlag, LastDict, Patch = None):
+    """
+
+    DiffADH(Data1, Data2, Name, ParentKeys, SpecialFlag, LastDict, Patch = None)
+
+    Compare the model export with the ADH and list the changes needed to make the model match the ADH, without changing the model. Only dictionaries, lists, and values are used, so the diff can be run (and timed) outside of MagicDraw. With SKIP_UNCHANGED, a dictionary or list is only opened up if it differs between the model export and the ADH, so only the branches with changes are walked. With LAZY_EXPORT, anything in the model export that the ADH does not have is skipped. Values are compared with ValuesDiffer, so numbers within the tolerances are not changed.
+
+    Each change is a tuple that starts with its kind:
+        ("value"  , Path, Old, New, LastDict)          - a value property (or requirement) at Path is different
+        ("element", Path, Old, New, LastDict, Indices) - the element of the array at Path with the given indices (a tuple) is different
+        ("shape"  , Path, Old, New, LastDict, Indices) - the array (or list of components) at Path grew, shrank, or became a value (or the other way around), so it cannot be changed by UpdateADH and must be read again
+
+    INPUTS:
+        Data1      : the dictionary exported from the model
+
+        Data2      : the dictionary read from the ADH
+
+        Name       : the qualified name of the current element
+
+        ParentKeys : the keys in the parent dictionary
+
+        SpecialFlag: -1 for a block, -2 for requirements/performance/behavior, and 0 otherwise
+
+        LastDict   : the two most recent dictionaries from the ADH (for requirements)
+
+        Patch      : the list of changes to be added to (optional)
+
+    OUTPUTS:
+        Patch      : the list of changes, in the order they were found
+
+    """
+
+    # start a new list of changes, if needed
+    if (Patch is None):
+        Patch = []
+    # end if
+    
+    # check that both items are dictionaries
+    if (isinstance(Data1, dict)) and (isinstance(Data2, dict)):
+        
+        # loop through each level of the dictionaries
+        Items1 = Data1.items()
+        
+        # loop through one dictionary
+        for ikey, ival in Items1:
+
+            # skip anything the (partial) ADH does not have
+            if (LAZY_EXPORT == 1) and (ikey not in Data2):
+                continue
+            # end if
+
+            # skip a dictionary or list that is equal in the model export and ADH (compared all at once, without walking it here)
+            if (SKIP_UNCHANGED == 1) and (INT_FLOAT_EQUAL == 1) and ((isinstance(ival, dict)) or (isinstance(ival, list))):
+
+                # check that nothing inside it changed
+                if (ival == Data2[ikey]):
+                    continue
+                # end if
+
+            # end if
+            
+            # assume a floating point value
+            DataType = 0
+            
+            # check if the value is a dictionary
+            if (isinstance(ival, dict)):
+                
+                # assume it is a block with data inside it
+                DataType = -1
+                
+                # try seeing it a WBS number exists
+                try:
+                    
+                    # get the WBS number
+                    if ("wbs_no" in ival.keys()):
+                        
+                        # it is a component that will may have folders
+                        DataType = +1
+                        
+                    # end if
+                    
+                except:
+                    
+                    # do nothing
+                    pass
+                
+                # end try-except
+            # end if
+            
+            # check if the value is a list
+            if (isinstance(ival, list)):
+                
+                # it is an array to be opened up
+                DataType = +2
+                
+            # end if
+            
+            # check for reserved words
+            if (ikey == "components") or (ikey == "requirements") or (ikey == "performance") or (ikey == "behavior"):
+                
+                # it also needs to be opened up
+                DataType = +2
+                
+            # end if
+            
+            # check how the data must be handled
+            if (DataType == -1):
+
+                # assume no extra quotes are needed
+                ExtraBlock1 = ""
+                ExtraBlock2 = ""
+
+                # try to check if there are keys from the parent item
+                try:
+
+                    # check if there are keys
+                    if ("wbs_no" in ParentKeys):
+                        
+                        # get the last part of the name
+                        ExtraBlock1 = "::Architecture"
+                        
+                except:
+
+                    # do nothing if it fails
+                    pass
+
+                # try to check if there are keys in the current item
+                try:
+
+                    # check if there are keys
+                    if ("wbs_no" in Data1.keys()):
+                        
+                        # get the last part of the name
+                        ExtraBlock2 = "::Architecture"
+                        
+                except:
+
+                    # do nothing if it fails
+                    pass
+                
+                # end try-except
+                
+                # modify the name accordingly
+                if (SpecialFlag >= 0):
+
+                    # modify the name
+                    NewName = Name + ExtraBlock1 + ExtraBlock2 + "::" + ikey
+                    
+                else:
+
+                    # don't add extra blocks when modifying the name
+                    NewName = Name + "::" + ikey
+                    
+                # end if
+
+                # open up the data more
+                DiffADH(Data1[ikey], Data2[ikey], NewName, Data1.keys(), -1, [LastDict[1], Data2], Patch)
+                
+            elif (DataType == 0):
+
+                # assume no extra text is needed
+                ExtraBlock = ""
+
+                # try to see if there's a wbs number in the data
+                try:
+
+                    # see if there's a wbs number
+                    if ("wbs_no" in Data1):
+
+                        # add the extra text required
+                        ExtraBlock = "::" + Name.split("::")[-1]
+
+                    # end if
+                    
+                except:
+
+                    # do nothing if it fails
+                    pass
+
+                # end try-except
+            
+                # modify the name
+                NewName = Name + ExtraBlock + "::" + ikey
+
+                # open up the data more
+                DiffADH(Data1[ikey], Data2[ikey], NewName, Data1.keys(), 0, [LastDict[1], Data2], Patch)
+                
+            elif (DataType == 1):
+                
+                # check for reserved words
+                if (ikey != "wbs_no") and (ikey != "name") and (ikey != "description"):
+                    
+                    # add a string for the extra package to be traversed
+                    ExtraString = "::Architecture"
+                    
+                else:
+                    
+                    # no extra string is needed
+                    ExtraString = ""
+                    
+                # end if
+                                    
+                # check if the name has been set yet
+                if (Name == ""):
+                    
+                    # recursively search the structure
+                    DiffADH(Data1[ikey], Data2[ikey], ikey, Data1.keys(), 0, [LastDict[1], Data2], Patch)
+                    
+                else:
+                    
+                    # modify the names
+                    NewName = Name + ExtraString + "::" + ikey
+
+                    # recursively search the structure
+                    DiffADH(Data1[ikey], Data2[ikey], NewName, Data1.keys(), 0, [LastDict[1], Data2], Patch)
+                    
+                # end if
+            
+            elif (DataType == 2):
+                
+                # check if it's a requirement
+                if (ikey == "requirements"):
+                    
+                    # add the path for the requirements
+                    ExtraString = "::Requirements"
+
+                    # set a special flag
+                    Flag = -2
+                    
+                elif (ikey == "performance"):
+                    
+                    # add the path for the performance package
+                    ExtraString = "::Performance"
+
+                    # set a special flag
+                    Flag = -2
+                    
+                elif (ikey == "behavior"):
+                    
+                    # add the path for the behavior package
+                    ExtraString = "::Behavior"
+
+                    # set a special flag
+                    Flag = -2
+                    
+                else:
+
+                    # don't add an extra path
+                    ExtraString = ""
+
+                    # don't set a special flag
+                    Flag = 0
+                    
+                # end if
+                
+                # check if the value is a list
+                if (isinstance(ival, list)):
+                    
+                    # get the value from the other dictionary
+                    val2 = Data2[ikey]
+
+                    # check if components were added or removed (a partial ADH may leave out the last components)
+                    if (not isinstance(val2, list)) or (len(val2) > len(ival)) or ((len(val2) < len(ival)) and (LAZY_EXPORT == 0)):
+
+                        # remember that the components must be read again
+                        Patch.append(("shape", Name + ExtraString + "::" + ikey, ival, val2, LastDict, ()))
+
+                        # only compare the components both lists have
+                        val2 = val2 if (isinstance(val2, list)) else []
+
+                    # end if
+
+                    # check that the list has a nonzero length
+                    if (len(ival) > 0):
+                    
+                        # loop through each component
+                        for icomp in range(min(len(ival), len(val2))):
+                        
+                            # get the component name
+                            CompName = ikey + "__" + str(icomp)
+
+                            # modify the names
+                            NewName = Name + ExtraString
+                        
+                            # read the entry
+                            DiffADH({CompName : ival[icomp]}, {CompName : val2[icomp]}, NewName, Data1.keys(), Flag, [LastDict[1], Data2], Patch)
+                        
+                        # end for
+                    # end if                        
+                        
+                else:
+                    
+                    # get the value from the other dictionary
+                    val2 = Data2[ikey]
+                    
+                    # loop through the dictionary contents
+                    for jkey in ival.keys():
+
+                        # skip anything the (partial) ADH does not have
+                        if (LAZY_EXPORT == 1) and (jkey not in val2):
+                            continue
                         # end if
                         
-                    except:
+                        # modify the name
+                        NewName = Name + ExtraString
+                        
+                        # read the entry
+                        DiffADH({jkey : ival[jkey]}, {jkey : val2[jkey]}, NewName, Data1.keys(), Flag, [LastDict[1], Data2], Patch)
+                        
+                    # end for
+                # end if
+                
+            else:
+                
+                # throw an error
+                print("ERROR - DiffADH: invalid DataType selected.")
+                
+                # break out of the loop for now
+                break
+            
+            # end if
+        # end for
+    
+    else:
+        
+        # check if each is a list
+        if (isinstance(Data1, list)) and (isinstance(Data2, list)):
+        
+            # remember each changed element with its indices
+            DiffArray(Data1, Data2, Name, LastDict, Patch)
+
+        elif ((isinstance(Data1, list)) != (isinstance(Data2, list))) and (len(Data1 if (isinstance(Data1, list)) else Data2) != 1):
+
+            # remember that an array became a value, or a value became an array
+            Patch.append(("shape", Name, Data1, Data2, LastDict, ()))
+
+        elif (isinstance(Data1, list)) and (not isinstance(Data2, list)):
+            
+            # get the last part of the name
+            LastPart = Name.split("::")[-1]
+            
+            # convert into a dictionary
+            TempData1 = {LastPart : Data1[0]}
+            TempData2 = {LastPart : Data2   }
+
+            # modify the name
+            NewName = Name.replace("::" + LastPart, "")
+
+            # re-evaluate the dictionary
+            DiffADH(TempData1, TempData2, NewName, TempData2.keys(), 0, [LastDict[1], Data2], Patch)
+
+        elif (not isinstance(Data1, list)) and (isinstance(Data2, list)):
+
+            # get the last part of the name
+            LastPart = Name.split("::")[-1]
+
+            # convert into a dictionary
+            TempData1 = {LastPart : Data1   }
+            TempData2 = {LastPart : Data2[0]}
+
+            # modify the name
+            NewName = Name.replace("::" + LastPart, "")
+
+            # re-evaluate the dictionary
+            DiffADH(TempData1, TempData2, NewName, TempData1.keys(), 0, [LastDict[1], Data2], Patch)
+        
+        else:
+
+            # check if the values are different
+            if (ValuesDiffer(Data1, Data2)):
+
+                # remember the changed value
+                Patch.append(("value", Name, Data1, Data2, LastDict))
+                
+            # end if
+            
+        # end if
+
+    # return the changes
+    return Patch
+
+# end DiffADH
+
+# -----------------------------------------------------------
+# -----------------------------------------------------------
+# -----------------------------------------------------------
+
+###############################
+#                             #
+# THREE-WAY MERGE             #
+#                             #
+###############################
+
+def GetBaseFile(Filename):
+    """
+
+    GetBaseFile(Filename)
+
+    Get the name of the snapshot of an ADH as it was when the model was last synced with it (by UpdateADH or WriteADH), as: <ADH>-Base.json.
+
+    INPUTS:
+        Filename: the name of the ADH
+
+    OUTPUTS:
+        the name of the base snapshot
+
+    """
+
+    # replace the extension of the ADH
+    return GetSideFile(Filename, "-Base.json")
+
+# end GetBaseFile
+
+# -----------------------------------------------------------
+
+def WriteBase(Filename, MyJSON):
+    """
+
+    WriteBase(Filename, MyJSON)
+
+    Save the base snapshot of an ADH (without indentation, to keep it small).
+
+    INPUTS:
+        Filename: the name of the ADH
+
+        MyJSON  : the ADH, as a dictionary
+
+    OUTPUTS:
+        none
+
+    """
+
+    # open the snapshot
+    f = open(GetBaseFile(Filename), "w")
+
+    # write the ADH on a single line
+    try:
+        json.dump(MyJSON, f, separators = (",", ":"), ensure_ascii = True)
+    finally:
+        f.close()
+    # end try-finally
+
+# end WriteBase
+
+# -----------------------------------------------------------
+
+@Timed
+def MergeADH(Model, Base, ADH, Name, Filename, Conflicts):
+    """
+
+    MergeADH(Model, Base, ADH, Name, Filename, Conflicts)
+
+    Merge the changes made in the model and in the ADH since they were last synced (the base snapshot). Each value in the ADH that is the same as in the base is replaced by the value in the model, so comparing the model with the merged ADH only changes the values that moved in the ADH. A value that moved to different values in both is a conflict, and is settled by ON_CONFLICT. Values missing from the model or base are taken from the ADH.
+
+    INPUTS:
+        Model    : the dictionary exported from the model, or part of it
+
+        Base     : the base snapshot, or part of it
+
+        ADH      : the dictionary read from the ADH, or part of it
+
+        Name     : the path to the current value (for reporting conflicts)
+
+        Filename : the name of the ADH
+
+        Conflicts: the list that the conflicts are added to, as (path, "the model", value in the model, ADH, value in the ADH)
+
+    OUTPUTS:
+        Merged   : the merged ADH (the ADH is not changed)
+
+    """
+
+    # check if nothing moved in the ADH, without opening it up (only if integers and reals with the same value are equal)
+    if (SKIP_UNCHANGED == 1) and (INT_FLOAT_EQUAL == 1) and (isinstance(ADH, (dict, list))) and (ADH == Base) and (type(Model) == type(ADH)):
+        return Model
+    # end if
+
+    # check for a dictionary
+    if (isinstance(ADH, dict)):
+
+        # a dictionary missing from the model or base is taken from the ADH
+        if (not isinstance(Model, dict)) or (not isinstance(Base, dict)):
+            return ADH
+        # end if
+
+        # merge the dictionaries one key at a time
+        Merged = {}
+
+        # loop through the ADH
+        for ikey, ival in ADH.items():
+
+            # check that the key is in the model and base
+            if (ikey in Model) and (ikey in Base):
+                Merged[ikey] = MergeADH(Model[ikey], Base[ikey], ival, Name + "::" + ikey, Filename, Conflicts)
+            else:
+                Merged[ikey] = ival
+            # end if
+
+        # end for
+
+        # return the merged dictionary
+        return Merged
+
+    # end if
+
+    # check for arrays with the same length, which are merged element by element
+    if (isinstance(ADH, list)) and (isinstance(Model, list)) and (isinstance(Base, list)) and (len(ADH) == len(Model) == len(Base)):
+        return [MergeADH(Model[ielem], Base[ielem], ADH[ielem], Name + "__" + str(ielem), Filename, Conflicts) for ielem in range(len(ADH))]
+    # end if
+
+    # check if the value moved in the ADH
+    if (not ValuesDiffer(Base, ADH)):
+
+        # keep the value in the model
+        return Model
+
+    # end if
+
+    # check if the value stayed in the model, or moved to the same value
+    if (not ValuesDiffer(Base, Model)) or (not ValuesDiffer(Model, ADH)):
+
+        # take the value in the ADH
+        return ADH
+
+    # end if
+
+    # remember the conflict
+    Conflicts.append((Name, "the model", Model, Filename, ADH))
+
+    # settle the conflict
+    return Model if (ON_CONFLICT == "keep") else ADH
+
+# end MergeADH
+
+# -----------------------------------------------------------
+# -----------------------------------------------------------
+# -----------------------------------------------------------
+
+###############################
+#                             #
+# FUNCTION FOR FINDING THE    #
+# SUBSYSTEM OF A CHANGE       #
+#                             #
+###############################
+
+def GetSubsystem(Path):
+    """
+
+    GetSubsystem(Path)
+
+    Get the subsystem that a change belongs to: the component in the top-level architecture, or the top-level component itself.
+
+    INPUTS:
+        Path: the qualified name of the value property (or requirement)
+
+    OUTPUTS:
+        the name of the subsystem
+
+    """
+
+    # split the qualified name
+    Parts = Path.split("::")
+
+    # check for a component in the top-level architecture
+    if (len(Parts) > 3) and (Parts[1] == "Architecture"):
+        return Parts[2]
+    # end if
+
+    # return the top-level component
+    return Parts[0]
+
+# end GetSubsystem
+
+# -----------------------------------------------------------
+# -----------------------------------------------------------
+# -----------------------------------------------------------
+
+###############################
+#                             #
+# CHANGE LOG                  #
+#                             #
+###############################
+
+class ChangeLog():
+
+    # initialization function
+    def __init__(self, Filename, Format = "text", BatchSize = 256):
+        """
+
+        __init__(self, Filename, Format = "text", BatchSize = 256)
+
+        Open the change log next to the ADH and start a background thread that writes it, so the changes are written while the model is updated. The structured formats ("jsonl" and "csv") record the path, old value, new value, type, and time of every change, and end with the number of changes in each subsystem and the total time.
+
+        INPUTS:
+            self     : the change log
+
+            Filename : the name of the ADH
+
+            Format   : (optional, default is "text") the format of the log, "text", "jsonl", or "csv"
+
+            BatchSize: (optional, default is 256) the number of changes handed to the background thread at a time
+
+        OUTPUTS:
+            none
+
+        """
+
+        # check the format
+        if (Format not in ["text", "jsonl", "csv"]):
+
+            # print a warning and use the text format
+            print("WARNING - ChangeLog: unknown format " + repr(Format) + " ... writing a text log.")
+            Format = "text"
+
+        # end if
+
+        # remember the format and batch size
+        self.Format    = Format
+        self.BatchSize = BatchSize
+
+        # remember when the log was opened
+        self.Start = time.time()
+
+        # open the log
+        self.File = open(GetSideFile(Filename, "-ModifiedValues." + ("txt" if (Format == "text") else Format)), "w")
+
+        # write the column names
+        if (Format == "csv"):
+            self.File.write("path,old,new,type,timestamp\n")
+        # end if
+
+        # the number of changes in each subsystem, and in total
+        self.Counts = {}
+        self.Total  = 0
+
+        # the queue of batches and the batch being filled
+        self.Queue = Queue.Queue()
+        self.Batch = []
+
+        # remember an error raised by the background thread
+        self.Error = None
+
+        # write the log on a background thread that does not keep MagicDraw from closing
+        self.Thread = threading.Thread(target = self.Consume)
+        self.Thread.setDaemon(True)
+        self.Thread.start()
+
+    # end __init__
+
+    # -------------------------------------------------------
+
+    # function to add a change to the log
+    def Write(self, Kind, Path, Old, New, Index = None):
+        """
+
+        Write(self, Kind, Path, Old, New, Index = None)
+
+        Add a change to the batch being filled, and hand the batch to the background thread once it is full.
+
+        INPUTS:
+            self : the change log
+
+            Kind : the kind of change ("value", "element", or "shape")
+
+            Path : the qualified name of the value property (or requirement)
+
+            Old  : the value in the model
+
+            New  : the value in the ADH
+
+            Index: (optional) the indices of the element, for an array
+
+        OUTPUTS:
+            none
+
+        """
+
+        # add the change, with the time it was made
+        self.Batch.append((Kind, Path, Old, New, Index, time.time()))
+
+        # check if the batch is full
+        if (len(self.Batch) >= self.BatchSize):
+
+            # send it
+            self.Queue.put(self.Batch)
+
+            # start a new batch
+            self.Batch = []
+
+        # end if
+    # end Write
+
+    # -------------------------------------------------------
+
+    # function run by the background thread
+    def Consume(self):
+        """
+
+        Consume(self)
+
+        Write each batch of changes until the log is closed.
+
+        INPUTS:
+            self: the change log
+
+        OUTPUTS:
+            none
+
+        """
+
+        # loop until the log is closed
+        while True:
+
+            # wait for the next batch
+            Batch = self.Queue.get()
+
+            # check for the end of the log
+            if (Batch is None):
+                return
+            # end if
+
+            # try to write the batch
+            try:
+
+                # loop through the changes
+                for MyChange in Batch:
+                    self.WriteChange(*MyChange)
+                # end for
+
+            except Exception as e:
+
+                # remember the first error, and keep draining the queue
+                if (self.Error is None):
+                    self.Error = e
+                # end if
+
+            # end try-except
+        # end while
+    # end Consume
+
+    # -------------------------------------------------------
+
+    # function to write one change (called by the background thread)
+    def WriteChange(self, Kind, Path, Old, New, Index, Time):
+        """
+
+        WriteChange(self, Kind, Path, Old, New, Index, Time)
+
+        Write one change in the log's format and count it towards its subsystem.
+
+        INPUTS:
+            self : the change log
+
+            Kind : the kind of change ("value", "element", or "shape")
+
+            Path : the qualified name of the value property (or requirement)
+
+            Old  : the value in the model
+
+            New  : the value in the ADH
+
+            Index: the indices of the element, for an array (None otherwise)
+
+            Time : the time the change was made
+
+        OUTPUTS:
+            none
+
+        """
+
+        # count the change
+        self.Total += 1
+
+        # count the change towards its subsystem
+        Subsystem = GetSubsystem(Path)
+        self.Counts[Subsystem] = self.Counts.get(Subsystem, 0) + 1
+
+        # check the format
+        if (self.Format == "text") and (Kind == "shape"):
+
+            # print a note that the value properties must be rebuilt
+            self.File.write("NOT changed " + repr(Path + "".join(["__" + str(i) for i in Index])) + " from " + repr(Old) + " to " + repr(New) + " (it changed size or type; read the ADH again to rebuild it)\n\n")
+
+            # nothing else to write
+            return
+
+        elif (self.Format == "text"):
+
+            # print a note indicating this
+            self.File.write("Changed " + repr(Path) + " from " + repr(Old) + " to " + repr(New) + "\n\n")
+
+            # nothing else to write
+            return
+
+        # end if
+
+        # add the indices to an element of an array
+        if (Index is not None):
+            Path = Path + "".join(["__" + str(i) for i in Index])
+        # end if
+
+        # write the time as an ISO 8601 string (UTC, to the millisecond)
+        Stamp = time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(Time)) + (".%03dZ" % int(1000 * (Time % 1)))
+
+        # check the format
+        if (self.Format == "jsonl"):
+
+            # write one JSON object
+            self.File.write(json.dumps({"path" : Path, "old" : Old, "new" : New, "type" : Kind, "timestamp" : Stamp}, default = repr) + "\n")
+
+        else:
+
+            # write one row (values are written as JSON, so strings and arrays can be told apart)
+            self.File.write(",".join([CSVField(Path), CSVField(json.dumps(Old, default = repr)), CSVField(json.dumps(New, default = repr)), Kind, Stamp]) + "\n")
+
+        # end if
+    # end WriteChange
+
+    # -------------------------------------------------------
+
+    # function to finish the log
+    def Close(self):
+        """
+
+        Close(self)
+
+        Hand the last batch to the background thread, wait for it to finish, write the summary (for the structured formats), and close the log. An error raised by the background thread is raised again here.
+
+        INPUTS:
+            self: the change log
+
+        OUTPUTS:
+            none
+
+        """
+
+        # send the last batch and the end of the log
+        self.Queue.put(self.Batch)
+        self.Queue.put(None)
+        self.Batch = []
+
+        # wait for the background thread
+        self.Thread.join()
+
+        # get the total time
+        Seconds = time.time() - self.Start
+
+        # write the summary
+        if (self.Format == "jsonl"):
+
+            # write one JSON object
+            self.File.write(json.dumps({"summary" : {"changes" : self.Total, "subsystems" : self.Counts, "seconds" : Seconds}}, sort_keys = True) + "\n")
+
+        elif (self.Format == "csv"):
+
+            # write one row per subsystem, then the total
+            for Subsystem in sorted(self.Counts.keys()):
+                self.File.write(",".join([CSVField(Subsystem), "", str(self.Counts[Subsystem]), "subsystem", ""]) + "\n")
+            # end for
+            self.File.write(",".join(["", "", str(self.Total), "total", "%.3f" % Seconds]) + "\n")
+
+        # end if
+
+        # close the log
+        self.File.close()
+
+        # check if the background thread failed
+        if (self.Error is not None):
+            raise self.Error
+        # end if
+
+    # end Close
+
+# end ChangeLog
+
+# -----------------------------------------------------------
+
+def CSVField(Text):
+    """
+
+    CSVField(Text)
+
+    Quote a field of a CSV row.
+
+    INPUTS:
+        Text: the text in the field
+
+    OUTPUTS:
+        the quoted text
+
+    """
+
+    # write unicode as UTF-8
+    if (isinstance(Text, unicode)):
+        Text = Text.encode("utf-8")
+    # end if
+
+    # double the quotes and put the text in quotes
+    return '"' + Text.replace('"', '""') + '"'
+
+# end CSVField
+
+# -----------------------------------------------------------
+# -----------------------------------------------------------
+# -----------------------------------------------------------
+
+###############################
+#                             #
+# MEASURED UPDATE COST        #
+#                             #
+###############################
+
+# time spent making changes (and the number of changes made) by the updates in this MagicDraw session, kept between runs for DRY_RUN's estimate
+CHANGE_COST = {"Seconds" : 0.0, "Changes" : 0}
+
+# -----------------------------------------------------------
+# -----------------------------------------------------------
+# -----------------------------------------------------------
+
+###############################
+#                             #
+# MODEL STRUCTURE GENERATOR   #
+#                             #
+###############################
+
+class ModelStructureGenerator():
+
+    # -------------------------------------------------------
+
+    # initialization
+    def __init__(self):
+        """
+
+        __init__(self)
+
+        Initialize the writer, which exports the SysML model.
+
+        INPUTS:
+            self: the SysML model
+
+        OUTPUTS:
+            none
+
+        """
+        
+        # get the project
+        self.Project = Application.getInstance().getProject()
+
+        # get the elements factory
+        self.Factory = self.Project.getElementsFactory()
+
+        # get the model element manager
+        self.Manager = MEM.getInstance()
+
+        # get the model
+        self.Model = self.Project.getModel()
+
+        # elements visited by GetBlock, by qualified name
+        self.QualNameIndex = {}
+
+        # the change log (only open while updating)
+        self.Log = None
+        
+    # end __init__
+
+    # -------------------------------------------------------
+
+    # action execution
+    def execute(self, ParentPackage, Filename):
+        """
+
+        execute(self, ParentPackage, Filename)
+
+        Extract the model elements from the SysML model and convert their information to a JSON string.
+
+        INPUTS:
+            self         : the SysML model
+
+            ParentPackage: the highest-level model element that the model elements will be stored in
+
+            Filename     : the name of the JSON file to be read for updating the SysML model, a list of them separated by semicolons, or a folder of them (applied in order, in one session)
+
+        OUTPUTS:
+            none
+
+        """
+        
+        # start timing the hot functions
+        ResetTiming()
+
+        # remember when the update started
+        StartTime = time.time()
+
+        # name the logs after the ADH, the folder of ADHs, or the first ADH in a list
+        if (os.path.isdir(Filename)):
+            LogName = Filename.rstrip("/\\") + ".json"
+        else:
+            LogName = Filename.split(";")[0].strip()
+        # end if
+
+        # try to create a session
+        try:
+
+            # create the session (a dry run only reads the model)
+            if (DRY_RUN == 0):
+                SM.getInstance().createSession(self.Project, "Modify ADH")
+            # end if
+
+            # get the block stereotype from the SysML stereotype profile
+            self.BlockSter = SH.getStereotype(self.Project, "Block", "SysML::Blocks")
+
+            # get the requirement stereotype from the SysML stereotype profile
+            self.ReqSter = SH.getStereotype(self.Project, "Requirement", "SysML::Requirements")
+
+            # get the types for integers, reals, and strings
+            self.Integer = Finder.byQualifiedName().find(self.Project, "SysML::Libraries::PrimitiveValueTypes::Integer")
+            self.Real    = Finder.byQualifiedName().find(self.Project, "SysML::Libraries::PrimitiveValueTypes::Real")
+            self.String  = Finder.byQualifiedName().find(self.Project, "SysML::Libraries::PrimitiveValueTypes::String")
+            self.Boolean = Finder.byQualifiedName().find(self.Project, "SysML::Libraries::PrimitiveValueTypes::Boolean")
+
+            # remember the ADH profile
+            self.Profile = SH.getProfile(self.Project, "ImportADHProfile")
+
+            # if there's no profile, throw a warning
+            if (self.Profile is None):
+
+                # throw failure
+                self.ProfileFlag = -1
+                
+                # print a warning
+                Application.getInstance().getGUILog().showMessage("WARNING: No ADH Profile imported ... stereotypes won't be assigned.")
+                
+            else:
+                
+                # throw success
+                self.ProfileFlag = 0
+                
+            # end if
+
+            # get the class metadata
+            self.MetaClass = SH.getMetaClassByName(self.Project, "Class")
+        
+            # get the ADHs to be applied (a folder or list of ADHs is applied in one session)
+            Filenames = GetADHFiles(Filename)
+
+            # check that there is an ADH
+            if (len(Filenames) == 0):
+                raise IOError("no ADH found in " + Filename)
+            # end if
+
+            # get the parent package name
+            ParentPackageName = ParentPackage.getName()
+
+            # remember the ADHs that were read, and their base snapshots
+            ADHs  = []
+            Bases = []
+
+            # loop through the ADHs
+            for MyFile in Filenames:
+
+                # read the JSON file with the event parser
+                MyJSON = LoadJSON(MyFile)
+
+                # check that the ADH holds the top-level package
+                if (ParentPackageName not in MyJSON):
+
+                    # print an error
+                    print("ERROR - " + MyFile + " does not contain " + ParentPackageName + " ... skipping it.")
+
+                    # go to the next ADH
+                    continue
+
+                # end if
+
+                # remember the ADH
+                ADHs.append((MyFile, MyJSON[ParentPackageName]))
+
+                # read the ADH as it was when the model was last synced with it (if it was)
+                if (MERGE_BASE == 1) and (os.path.isfile(GetBaseFile(MyFile))):
+                    Bases.append(LoadJSON(GetBaseFile(MyFile)).get(ParentPackageName))
+                else:
+                    Bases.append(None)
+                # end if
+
+            # end for
+
+            # check that an ADH can be applied
+            if (len(ADHs) == 0):
+                raise ValueError("no ADH contains " + ParentPackageName)
+            # end if
+
+            # open the change log (written on a background thread), unless this is a dry run
+            if (DRY_RUN == 0):
+                self.Log = ChangeLog(LogName, CHANGE_LOG, CHANGE_LOG_BATCH)
+            # end if
+            
+            # elements visited by GetBlock, by qualified name
+            self.QualNameIndex = {}
+
+            # get the parts of the model named in the ADHs (only used with LAZY_EXPORT)
+            Wanted = ADHs[0][1]
+            if (LAZY_EXPORT == 1):
+                for MyFile, MyADH in ADHs[1:]:
+                    Wanted = MergeWanted(Wanted, MyADH)
+                # end for
+            # end if
+
+            # get the dictionary needed for writing to the ADH, once for every ADH (only the parts named in the ADHs, with LAZY_EXPORT)
+            MyDict = self.GetBlock(ParentPackage, Wanted)
+
+            # remember when the comparison started
+            ReadTime  = time.time() - StartTime
+            StartTime = time.time()
+
+            # remember the merged ADHs, and the values that moved in both the model and an ADH
+            Merged = []
+            Merges = []
+
+            # loop through the ADHs
+            for iadh in range(len(ADHs)):
+
+                # get the ADH and its base snapshot
+                MyFile, MyADH = ADHs[iadh]
+
+                # keep the values that only moved in the model
+                if (Bases[iadh] is not None):
+                    MyADH = MergeADH(MyDict, Bases[iadh], MyADH, ParentPackageName, MyFile, Merges)
+                # end if
+
+                # remember the merged ADH
+                Merged.append((MyFile, MyADH))
+
+            # end for
+
+            # list the changes in every ADH, in order, without touching the model
+            Patch, Conflicts = self.CompareDict(MyDict, Merged, ParentPackageName)
+
+            # add the conflicts with the model
+            Conflicts = Merges + Conflicts
+
+            # get the time spent comparing
+            DiffTime = time.time() - StartTime
+
+            # report the values changed differently by more than one ADH
+            if (len(Conflicts) > 0):
+                self.ReportConflicts(Conflicts, LogName)
+            # end if
+
+            # check if the model should be changed
+            if (DRY_RUN == 1):
+
+                # report what would change
+                self.DryRun(Patch, Conflicts, LogName, ReadTime, DiffTime)
+
+            elif (len(Conflicts) > 0) and (ON_CONFLICT == "stop"):
+
+                # change nothing
+                raise ValueError(str(len(Conflicts)) + " conflicting changes (see " + GetSideFile(LogName, "-Conflicts.txt") + ") ... nothing was changed")
+
+            else:
+            
+                # make the changes
+                self.ApplyPatch(Patch)
+
+                # finish the change log
+                self.Log.Close()
+                self.Log = None
+            
+                # close the session
+                SM.getInstance().closeSession(self.Project)
+
+                # remember each ADH as the model was synced with it
+                for MyFile, MyADH in ADHs:
+                    WriteBase(MyFile, {ParentPackageName : MyADH})
+                # end for
+
+            # end if
+
+        except Exception as e:
+            
+            # print that an exception occurred
+            Application.getInstance().getGUILog().showMessage("Exception occurred: " + repr(e))
+        
+            # cancel the session (a dry run has none)
+            if (DRY_RUN == 0):
+                SM.getInstance().cancelSession(self.Project)
+            # end if
+
+            # finish the change log, if it was opened
+            if (self.Log is not None):
+
+                # try to close it
+                try:
+                    self.Log.Close()
+                except Exception:
+                    pass
+                # end try-except
+
+                # forget it
+                self.Log = None
+
+            # end if
+
+        # end try-except
+
+        # write where the time went
+        WriteTiming(LogName)
+
+    # end execute
+
+    # -------------------------------------------------------
+
+    @Timed
+    def CompareDict(self, Data1, ADHs, Name):
+        """
+
+        CompareDict(self, Data1, ADHs, Name)
+
+        Find the differences between the model export and each ADH, in order, without changing the model. Every ADH is compared with the same export, so the changes are merged into one list: a value changed by several ADHs is changed once, to the value in the last of them, at the place it was first found. If the ADHs change it to different values, it is a conflict, settled by ON_CONFLICT. An ADH that leaves a value as it is in the model does not change it, so it never undoes a change made by another ADH.
+
+        INPUTS:
+            self     : the SysML model
+
+            Data1    : the dictionary exported from the model
+
+            ADHs     : a list of the ADHs' filenames and dictionaries (below the top-level package)
+
+            Name     : the name of the top-level package
+
+        OUTPUTS:
+            Patch    : the list of changes
+
+            Conflicts: a list of the values changed differently by more than one ADH, as (path, first ADH, first value, later ADH, later value)
+
+        """
+
+        # remember the changes, and where each changed value is in the list (and which ADH changed it)
+        Patch     = []
+        Changed   = {}
+        Conflicts = []
+
+        # remember the values in conflict that are kept as they are in the model
+        Kept = set()
+
+        # loop through the ADHs
+        for MyFile, Data2 in ADHs:
+
+            # loop through the changes in the ADH
+            for MyChange in DiffADH(Data1, Data2, Name, "", 0, [None, None]):
+
+                # get the value that is changed (with the indices of an array's element)
+                Key = (MyChange[1], MyChange[5] if (len(MyChange) > 5) else ())
+
+                # check if an earlier ADH changed it
+                if (Key not in Changed):
+
+                    # add the change
+                    Changed[Key] = (len(Patch), MyFile)
+                    Patch.append(MyChange)
+
+                    # go to the next change
+                    continue
+
+                # end if
+
+                # get the earlier change
+                ichange, LastFile = Changed[Key]
+
+                # check if the ADHs disagree
+                if (ValuesDiffer(Patch[ichange][3], MyChange[3])):
+
+                    # remember the conflict
+                    Conflicts.append((Key[0] + "".join("__" + str(Index) for Index in Key[1]), LastFile, Patch[ichange][3], MyFile, MyChange[3]))
+
+                    # check if the value in the model is kept
+                    if (ON_CONFLICT == "keep"):
+                        Kept.add(Key)
+                    # end if
+
+                # end if
+
+                # the later ADH wins
+                Patch[ichange] = MyChange
+                Changed[Key] = (ichange, MyFile)
+
+            # end for
+        # end for
+
+        # leave the values in conflict as they are in the model
+        if (len(Kept) > 0):
+            Patch = [MyChange for MyChange in Patch if ((MyChange[1], MyChange[5] if (len(MyChange) > 5) else ()) not in Kept)]
+        # end if
+
+        # return the changes and conflicts
+        return Patch, Conflicts
+
+    # end CompareDict
+
+    # -------------------------------------------------------
 
-                        # do nothing if it fails
-                        pass
+    # function to report the conflicts between ADHs
+    def ReportConflicts(self, Conflicts, Filename):
+        """
 
-                    # end try-except
-                
-                    # modify the name
-                    NewName = Name + ExtraBlock + "::" + ikey
+        ReportConflicts(self, Conflicts, Filename)
 
-                    # open up the data more
-                    self.CompareDict(Data1[ikey], Data2[ikey], NewName, Data1.keys(), 0, [LastDict[1], Data2])
-                    
-                elif (DataType == 1):
-                    
-                    # check for reserved words
-                    if (ikey != "wbs_no") and (ikey != "name") and (ikey != "description"):
-                        
-                        # add a string for the extra package to be traversed
-                        ExtraString = "::Architecture"
-                        
-                    else:
-                        
-                        # no extra string is needed
-                        ExtraString = ""
-                        
-                    # end if
-                                        
-                    # check if the name has been set yet
-                    if (Name == ""):
-                        
-                        # recursively search the structure
-                        self.CompareDict(Data1[ikey], Data2[ikey], ikey, Data1.keys(), 0, [LastDict[1], Data2])
-                        
-                    else:
-                        
-                        # modify the names
-                        NewName = Name + ExtraString + "::" + ikey
+        Write the values changed differently by more than one ADH, or by the model and an ADH, to <name>-Conflicts.txt and show how many there are.
 
-                        # recursively search the structure
-                        self.CompareDict(Data1[ikey], Data2[ikey], NewName, Data1.keys(), 0, [LastDict[1], Data2])
-                        
-                    # end if
-                
-                elif (DataType == 2):
-                    
-                    # check if it's a requirement
-                    if (ikey == "requirements"):
-                        
-                        # add the path for the requirements
-                        ExtraString = "::Requirements"
+        INPUTS:
+            self     : the SysML model
 
-                        # set a special flag
-                        Flag = -2
-                        
-                    elif (ikey == "performance"):
-                        
-                        # add the path for the performance package
-                        ExtraString = "::Performance"
+            Conflicts: the list of conflicts from CompareDict
 
-                        # set a special flag
-                        Flag = -2
-                        
-                    elif (ikey == "behavior"):
-                        
-                        # add the path for the behavior package
-                        ExtraString = "::Behavior"
+            Filename : the name of the ADH (or batch of ADHs)
 
-                        # set a special flag
-                        Flag = -2
-                        
-                    else:
+        OUTPUTS:
+            none
 
-                        # don't add an extra path
-                        ExtraString = ""
+        """
 
-                        # don't set a special flag
-                        Flag = 0
-                        
-                    # end if
-                    
-                    # check if the value is a list
-                    if (isinstance(ival, list)):
-                        
-                        # get the value from the other dictionary
-                        val2 = Data2[ikey]
+        # write the report
+        Report = open(GetSideFile(Filename, "-Conflicts.txt"), "w")
 
-                        # check that the list has a nonzero length
-                        if (len(ival) > 0):
-                        
-                            # loop through each component
-                            for icomp in range(len(ival)):
-                            
-                                # get the component name
-                                CompName = ikey + "__" + str(icomp)
+        # loop through the conflicts
+        for Path, File1, Value1, File2, Value2 in Conflicts:
+            Report.write("Conflict on " + repr(Path) + ": " + repr(Value1) + " in " + File1 + ", " + repr(Value2) + " in " + File2 + "\n\n")
+        # end for
 
-                                # modify the names
-                                NewName = Name + ExtraString
-                            
-                                # read the entry
-                                self.CompareDict({CompName : ival[icomp]}, {CompName : val2[icomp]}, NewName, Data1.keys(), Flag, [LastDict[1], Data2])
-                            
-                            # end for
-                        # end if                        
-                            
-                    else:
-                        
-                        # get the value from the other dictionary
-                        val2 = Data2[ikey]
-                        
-                        # loop through the dictionary contents
-                        for jkey in ival.keys():
-                            
-                            # modify the name
-                            NewName = Name + ExtraString
-                            
-                            # read the entry
-                            self.CompareDict({jkey : ival[jkey]}, {jkey : val2[jkey]}, NewName, Data1.keys(), Flag, [LastDict[1], Data2])
-                            
-                        # end for
-                    # end if
-                    
-                else:
-                    
-                    # throw an error
-                    print("ERROR - CompareDict: invalid DataType selected.")
-                    
-                    # break out of the loop for now
-                    break
-                
+        # close the report
+        Report.close()
+
+        # show a summary
+        Application.getInstance().getGUILog().showMessage("WARNING: " + str(len(Conflicts)) + " values are changed differently by more than one ADH, or by the model and an ADH (" + {"last" : "the last ADH wins", "keep" : "the values in the model are kept", "stop" : "nothing will be changed"}.get(ON_CONFLICT, "") + "; see " + GetSideFile(Filename, "-Conflicts.txt") + ").")
+
+    # end ReportConflicts
+
+    # -------------------------------------------------------
+
+    # function to make the changes listed by the diff engine
+    @Timed
+    def ApplyPatch(self, Patch):
+        """
+
+        ApplyPatch(self, Patch)
+
+        Change the model to match the ADH. Every change is handed to the change log in the order it was found, and then the changes are made one block at a time (grouped by the qualified name of the block that owns them). Within a block, the changed elements of each array (VarName__i__j__...__k) are made together with CorrectArray.
+
+        INPUTS:
+            self : the SysML model
+
+            Patch: the list of changes from DiffADH
+
+        OUTPUTS:
+            none
+
+        """
+
+        # remember the changes owned by each block, in the order the blocks were found
+        Owners = []
+        Groups = {}
+
+        # remember the arrays (and lists of components) that changed shape
+        Reshaped = []
+
+        # loop through the changes
+        for MyChange in Patch:
+
+            # get the kind, path, and values
+            Kind, Path, Old, New = MyChange[:4]
+
+            # add the change to the log (with the indices of an array's element)
+            self.Log.Write(Kind, Path, Old, New, MyChange[5] if (Kind != "value") else None)
+
+            # check for a change that cannot be made here
+            if (Kind == "shape"):
+                Reshaped.append(Path + "".join(["__" + str(Index) for Index in MyChange[5]]))
+                continue
+            # end if
+
+            # get the block that owns the change
+            Owner = Path.rsplit("::", 1)[0]
+
+            # check if the block has been seen yet
+            if (Owner not in Groups):
+
+                # start a new group
+                Owners.append(Owner)
+                Groups[Owner] = []
+
+            # end if
+
+            # add the change to its block
+            Groups[Owner].append(MyChange)
+
+        # end for
+
+        # remember when the changes started
+        StartTime = time.time()
+
+        # loop through the blocks
+        for Owner in Owners:
+
+            # remember the changed elements of each array, in the order the arrays were found
+            Arrays  = []
+            Changes = {}
+
+            # loop through the changes in the block
+            for MyChange in Groups[Owner]:
+
+                # find the array that the change belongs to (if any)
+                ArrayPath, Indices = self.GetArrayElement(MyChange)
+
+                # check for a single value
+                if (ArrayPath is None):
+
+                    # correct the value
+                    self.CorrectValue(MyChange[1], MyChange[3], MyChange[4])
+
+                    # go to the next change
+                    continue
+
+                # end if
+
+                # check if the array has been seen yet
+                if (ArrayPath not in Changes):
+                    Arrays.append(ArrayPath)
+                    Changes[ArrayPath] = []
                 # end if
+
+                # add the element to its array
+                Changes[ArrayPath].append((Indices, MyChange[3]))
+
             # end for
-        
-        else:
-            
-            # check if each is a list
-            if (isinstance(Data1, list)) and (isinstance(Data2, list)):
-            
-                # get the length of the list
-                ListLen = len(Data1)
-            
-                # loop through each entry
-                for ielem in range(ListLen):
 
-                    # check if the values are different
-                    if (Data1[ielem] != Data2[ielem]):
+            # correct each array once
+            for ArrayPath in Arrays:
+                self.CorrectArray(ArrayPath, Changes[ArrayPath])
+            # end for
 
-                        # print a note indicating this
-                        self.OutFile.write("Changed " + repr(Name) + " from " + repr(Data1[ielem]) + " to " + repr(Data2[ielem]) + "\n\n")
-                        
-                        # call a function
-                        self.CorrectValue(Name, Data2, LastDict)
-            
-                    # end if
-                # end for
+        # end for
 
-            elif (isinstance(Data1, list)) and (not isinstance(Data2, list)):
-                
-                # get the last part of the name
-                LastPart = Name.split("::")[-1]
-                
-                # convert into a dictionary
-                TempData1 = {LastPart : Data1[0]}
-                TempData2 = {LastPart : Data2   }
+        # remember the cost of the changes for DRY_RUN's estimate
+        CHANGE_COST["Seconds"] += time.time() - StartTime
+        CHANGE_COST["Changes"] += len(Patch) - len(Reshaped)
 
-                # modify the name
-                NewName = Name.replace("::" + LastPart, "")
+        # warn that the model does not match the ADH yet
+        if (len(Reshaped) > 0):
+            Application.getInstance().getGUILog().showMessage("WARNING: " + str(len(Reshaped)) + " arrays or lists of components changed size or type and were not updated (e.g., " + Reshaped[0] + "); read the ADH again to rebuild their value properties (see the change log).")
+        # end if
 
-                # re-evaluate the dictionary
-                self.CompareDict(TempData1, TempData2, NewName, TempData2.keys(), 0, [LastDict[1], Data2])
+    # end ApplyPatch
 
-            elif (not isinstance(Data1, list)) and (isinstance(Data2, list)):
+    # -------------------------------------------------------
 
-                # get the last part of the name
-                LastPart = Name.split("::")[-1]
+    # function to find the array that a change belongs to
+    def GetArrayElement(self, MyChange):
+        """
 
-                # convert into a dictionary
-                TempData1 = {LastPart : Data1   }
-                TempData2 = {LastPart : Data2[0]}
+        GetArrayElement(self, MyChange)
 
-                # modify the name
-                NewName = Name.replace("::" + LastPart, "")
+        Find the array that a change belongs to: an "element" change from DiffADH, or a "value" change to a value property named after an array with its indices appended (VarName__i__j__...__k). Requirements are never arrays.
 
-                # re-evaluate the dictionary
-                self.CompareDict(TempData1, TempData2, NewName, TempData1.keys(), 0, [LastDict[1], Data2])
-            
+        INPUTS:
+            self     : the SysML model
+
+            MyChange : a change from DiffADH
+
+        OUTPUTS:
+            ArrayPath: the qualified name of the array (None if the change is not to an array's element)
+
+            Indices  : the indices of the element (None if the change is not to an array's element)
+
+        """
+
+        # check for an element found by comparing two arrays
+        if (MyChange[0] == "element"):
+            return MyChange[1], MyChange[5]
+        # end if
+
+        # check for a requirement
+        if (self.GetTargetName(MyChange[1])[1] != -1):
+            return None, None
+        # end if
+
+        # split the element name into the array name and its indices
+        LastPart = MyChange[1].split("::")[-1]
+        Parts = LastPart.split("__")
+
+        # check that there are indices
+        if (len(Parts) < 2) or (not all(Index.isdigit() for Index in Parts[1:])):
+            return None, None
+        # end if
+
+        # return the array and the indices
+        return MyChange[1][:len(MyChange[1]) - len(LastPart)] + Parts[0], tuple([int(Index) for Index in Parts[1:]])
+
+    # end GetArrayElement
+
+    # -------------------------------------------------------
+
+    # function to correct the changed elements of one array
+    @Timed
+    def CorrectArray(self, ArrayPath, Changes):
+        """
+
+        CorrectArray(self, ArrayPath, Changes)
+
+        Correct the changed elements of one array. If the model holds one value property per element (found in the index built by GetBlock), each changed value property is corrected. If the model holds the array in a single value property, the value property and its shape are looked up once and the changed elements are replaced in its expression.
+
+        INPUTS:
+            self     : the SysML model
+
+            ArrayPath: the qualified name of the array
+
+            Changes  : a list with the indices and new value of each changed element
+
+        OUTPUTS:
+            none
+
+        """
+
+        # get the qualified name of each element
+        ElemPaths = [ArrayPath + "".join(["__" + str(Index) for Index in Indices]) for Indices, Value in Changes]
+
+        # assume the array is stored as one value property per element
+        Shape = None
+
+        # check if the elements were not visited by the export
+        if (ElemPaths[0] not in self.QualNameIndex):
+
+            # look for a value property holding the whole array
+            MyEntity = self.FindElement(ArrayPath)
+
+            # get its shape, if it holds a compact array
+            if (MyEntity is not None):
+                ValSpec = MyEntity.getDefaultValue()
+                Shape   = GetArrayShape(ValSpec)
+            # end if
+
+        # end if
+
+        # check for an array stored as one value property per element
+        if (Shape is None):
+
+            # loop through the changed elements
+            for ielem in range(len(Changes)):
+
+                # get the value property of the element
+                MyElement = self.FindElement(ElemPaths[ielem])
+
+                # check that it exists
+                if (MyElement is None):
+
+                    # print error
+                    print("ERROR - model element with name " + ElemPaths[ielem] + " not found ... cannot update.")
+
+                    # go to the next element
+                    continue
+
+                # end if
+
+                # create the literal
+                MyValueInst = self.CreateLiteral(Changes[ielem][1])
+
+                # check that the type is known
+                if (MyValueInst is None):
+
+                    # print an error
+                    print("ERROR: the type for " + ElemPaths[ielem] + " is not known ... not creating a value property.")
+
+                    # go to the next element
+                    continue
+
+                # end if
+
+                # set the value in the value property
+                MyElement.setDefaultValue(MyValueInst)
+
+            # end for
+
+            # all elements were corrected
+            return
+
+        # end if
+
+        # get the values of the compact array
+        Operands = ValSpec.getOperand()
+
+        # loop through the changed elements
+        for ielem in range(len(Changes)):
+
+            # get the indices and value
+            Indices, Value = Changes[ielem]
+
+            # find the position of the element in the flattened array
+            Position = GetArrayPosition(Indices, Shape)
+
+            # check that the indices fit the shape
+            if (Position is None):
+
+                # print error
+                print("ERROR - model element with name " + ElemPaths[ielem] + " not found ... cannot update.")
+
+                # go to the next element
+                continue
+
+            # end if
+
+            # create the literal
+            MyValueInst = self.CreateLiteral(Value)
+
+            # check that the type is known
+            if (MyValueInst is None):
+
+                # print an error
+                print("ERROR: the type for " + ElemPaths[ielem] + " is not known ... not updating the array.")
+
+                # go to the next element
+                continue
+
+            # end if
+
+            # replace the element
+            Operands.set(Position, MyValueInst)
+
+        # end for
+    # end CorrectArray
+
+    # -------------------------------------------------------
+
+    # function to report what an update would change
+    def DryRun(self, Patch, Conflicts, Filename, ReadTime, DiffTime):
+        """
+
+        DryRun(self, Patch, Conflicts, Filename, ReadTime, DiffTime)
+
+        Report what an update would change, without changing the model. The report (<name>-DryRun.txt) counts the changes in each subsystem and block and the model elements that must be looked up, and estimates how long the update would take from the time spent reading the ADH and model, comparing them, and looking up the elements, plus the measured cost of a change (from the updates run in this MagicDraw session, or DRY_RUN_CHANGE_COST if there were none).
+
+        INPUTS:
+            self     : the SysML model
+
+            Patch    : the list of changes from CompareDict
+
+            Conflicts: the list of conflicts from CompareDict
+
+            Filename : the name of the ADH (or batch of ADHs)
+
+            ReadTime : the time spent reading the ADH and exporting the model
+
+            DiffTime : the time spent comparing them
+
+        OUTPUTS:
+            none
+
+        """
+
+        # count the changes in each subsystem and block
+        Subsystems = {}
+        Blocks     = {}
+
+        # remember the elements to be looked up
+        Targets = []
+
+        # remember the arrays (and lists of components) that changed shape
+        Reshaped = []
+
+        # loop through the changes
+        for MyChange in Patch:
+
+            # check for a change that an update cannot make
+            if (MyChange[0] == "shape"):
+                Reshaped.append(MyChange[1] + "".join(["__" + str(Index) for Index in MyChange[5]]))
+                continue
+            # end if
+
+            # count the change
+            Subsystem = GetSubsystem(MyChange[1])
+            Subsystems[Subsystem] = Subsystems.get(Subsystem, 0) + 1
+            Owner = MyChange[1].rsplit("::", 1)[0]
+            Blocks[Owner] = Blocks.get(Owner, 0) + 1
+
+            # find the array that the change belongs to (if any)
+            ArrayPath, Indices = self.GetArrayElement(MyChange)
+
+            # remember the element that would be changed (an array's element by its own name, as ApplyPatch finds it)
+            if (ArrayPath is None):
+                Targets.append((self.GetTargetName(MyChange[1])[0], None))
             else:
+                Targets.append((ArrayPath + "".join(["__" + str(Index) for Index in Indices]), ArrayPath))
+            # end if
 
-                # check if the values are different
-                if (Data1 != Data2):
+        # end for
 
-                    # print a note indicating this
-                    self.OutFile.write("Changed " + repr(Name) + " from " + repr(Data1) + " to " + repr(Data2) + "\n\n")
-                    
-                    # call a function
-                    self.CorrectValue(Name, Data2, LastDict)
-                    
+        # look up each element once (this only reads the model), and time it
+        StartTime = time.time()
+        Looked  = set()
+        Indexed = 0
+        Missing = 0
+
+        # remember which arrays are held in a single value property
+        Compact = {}
+
+        # loop through the elements
+        for QualName, ArrayPath in set(Targets):
+
+            # check for an array's element that was not visited by the export
+            if (ArrayPath is not None) and (QualName not in self.QualNameIndex):
+
+                # check if a single value property holds the whole array (as CorrectArray does)
+                if (ArrayPath not in Compact):
+                    MyEntity = self.FindElement(ArrayPath)
+                    Compact[ArrayPath] = (MyEntity is not None) and (GetArrayShape(MyEntity.getDefaultValue()) is not None)
                 # end if
-                
+
+                # the array is then looked up once for all its elements
+                if (Compact[ArrayPath]):
+                    QualName = ArrayPath
+                # end if
+
             # end if
-            
-    # end CompareDict
+
+            # check if the element was already looked up
+            if (QualName in Looked):
+                continue
+            # end if
+            Looked.add(QualName)
+
+            # check if the element was visited by the export
+            if (QualName in self.QualNameIndex):
+                Indexed += 1
+            # end if
+
+            # look up the element
+            if (self.FindElement(QualName) is None):
+                Missing += 1
+            # end if
+
+        # end for
+
+        # get the time spent looking up the elements
+        LookupTime = time.time() - StartTime
+        Lookups = len(Looked)
+
+        # get the cost of a change
+        if (CHANGE_COST["Changes"] > 0):
+
+            # use the cost measured by earlier updates (which includes looking up the element)
+            ChangeCost = CHANGE_COST["Seconds"] / CHANGE_COST["Changes"]
+            CostSource = "measured over " + str(CHANGE_COST["Changes"]) + " changes in this session"
+            Estimate   = ReadTime + DiffTime + ChangeCost * len(Patch)
+
+        else:
+
+            # use the lookups measured now and the default cost of a change
+            ChangeCost = DRY_RUN_CHANGE_COST
+            CostSource = "DRY_RUN_CHANGE_COST"
+            Estimate   = ReadTime + DiffTime + LookupTime + ChangeCost * len(Patch)
+
+        # end if
+
+        # write the report
+        Report = open(GetSideFile(Filename, "-DryRun.txt"), "w")
+        Report.write("Dry run of " + Filename + " (the model was not changed)\n\n")
+        Report.write("Changes                 : %d\n" % len(Patch))
+        Report.write("Conflicts               : %d\n" % len(Conflicts))
+        Report.write("Changed size or type    : %d (not updated; read the ADH again to rebuild them)\n" % len(Reshaped))
+        Report.write("Lookups                 : %d (%d from the export's index, %d searched by qualified name, %d not found)\n" % (Lookups, Indexed, Lookups - Indexed, Missing))
+        Report.write("Read ADH and model      : %.3f s\n" % ReadTime)
+        Report.write("Compare                 : %.3f s\n" % DiffTime)
+        Report.write("Look up elements        : %.3f s\n" % LookupTime)
+        Report.write("Cost of a change        : %.6f s (%s)\n" % (ChangeCost, CostSource))
+        Report.write("Estimated update time   : %.3f s\n" % Estimate)
+        Report.write("\nChanges by subsystem:\n")
+        for Subsystem in sorted(Subsystems.keys()):
+            Report.write("    %6d  %s\n" % (Subsystems[Subsystem], Subsystem))
+        # end for
+        Report.write("\nChanges by block:\n")
+        for Owner in sorted(Blocks.keys()):
+            Report.write("    %6d  %s\n" % (Blocks[Owner], Owner))
+        # end for
+        if (len(Reshaped) > 0):
+            Report.write("\nChanged size or type (not updated):\n")
+            for MyPath in Reshaped:
+                Report.write("    %s\n" % MyPath)
+            # end for
+        # end if
+        Report.close()
+
+        # show a summary
+        Application.getInstance().getGUILog().showMessage("Dry run: " + str(len(Patch)) + " changes in " + str(len(Blocks)) + " blocks, " + str(Lookups) + " lookups, estimated update time " + ("%.1f" % Estimate) + " s" + ((", " + str(len(Reshaped)) + " arrays changed size or type and would not be updated") if (len(Reshaped) > 0) else "") + " (see " + GetSideFile(Filename, "-DryRun.txt") + ").")
+
+    # end DryRun
 
     # -------------------------------------------------------
 
+    @Timed
     def CorrectValue(self, Name, Data2, LastDict):
         
-        # check if the qualified name is for a requirement
-        HasReq = Name.find("Requirements")
-        
-        # check if a requirement block was found
-        if (HasReq != -1):
-            
-            # split the text at the requirement
-            SplitText = Name.split("Requirements")
-            
-            # get the text before/after the requirement
-            Prefix = SplitText[ 0]
-            Suffix = SplitText[-1]
-            
-            # get the requirement name
-            ReqName = Suffix.split("::")[1]
-            
-            # modify the name being searched
-            QualName = Prefix + "Requirements::" + ReqName
-            
-        else:
-            
-            # use the given qualified name
-            QualName = Name
-            
-        # end if                        
+        # get the model element to be changed (the whole requirement, for part of one)
+        QualName, HasReq = self.GetTargetName(Name)
                
         # get the entity with the qualified name
-        MyEntity = Finder.byQualifiedName().find(self.Project, QualName)
+        MyEntity = self.FindElement(QualName)
         
         if (MyEntity != None):
             
             # modify the value
             if (HasReq == -1):
                 
-                # check the value type
-                if (isinstance(Data2, int)):
-                    
-                    # create the integer
-                    MyValueInst = self.Factory.createLiteralIntegerInstance()
-                    
-                elif (isinstance(Data2, float)):
-                                        
-                    # create the real
-                    MyValueInst = self.Factory.createLiteralRealInstance()
-                    
-                elif (isinstance(Data2, unicode)) or (isinstance(Data2, str)):
-                    
-                    # create the string
-                    MyValueInst = self.Factory.createLiteralStringInstance()
-                    
-                else:
+                # create the literal
+                MyValueInst = self.CreateLiteral(Data2)
+
+                # check that the type is known
+                if (MyValueInst is None):
                     
                     # print an error
                     print("ERROR: the type for " + QualName + " is not known ... not creating a value property.")
@@ -1140,12 +4054,9 @@ class ModelStructureGenerator():
                 
                 # end if
                 
-                # set the value
-                MyValueInst.setValue(Data2)                                
-                
                 # set the value in the ValueProperty
                 MyEntity.setDefaultValue(MyValueInst)
-                
+
             else:
                                 
                 try:
@@ -1220,6 +4131,11 @@ class ModelStructureGenerator():
                 # end try-execept
             # end if
                         
+        elif (HasReq == -1) and (self.CorrectArrayValue(QualName, Data2) == 1):
+
+            # the value was an element of a compact array
+            pass
+
         else:
             
             # print error
@@ -1228,21 +4144,292 @@ class ModelStructureGenerator():
         # end if
         
     # end CorrectValue
+
+    # -------------------------------------------------------
+
+    # function to get the model element that a change is made to
+    def GetTargetName(self, Name):
+        """
+
+        GetTargetName(self, Name)
+
+        Get the qualified name of the model element that a change is made to. A change to part of a requirement (its name, description, or value) is made to the whole requirement.
+
+        INPUTS:
+            self    : the SysML model
+
+            Name    : the qualified name from the diff
+
+        OUTPUTS:
+            QualName: the qualified name of the model element
+
+            HasReq  : the position of "Requirements" in the name (-1 if it is not a requirement)
+
+        """
+
+        # check if the qualified name is for a requirement
+        HasReq = Name.find("Requirements")
+        
+        # check if a requirement block was found
+        if (HasReq != -1):
+            
+            # split the text at the requirement
+            SplitText = Name.split("Requirements")
+            
+            # get the text before/after the requirement
+            Prefix = SplitText[ 0]
+            Suffix = SplitText[-1]
+            
+            # get the requirement name
+            ReqName = Suffix.split("::")[1]
+            
+            # modify the name being searched
+            QualName = Prefix + "Requirements::" + ReqName
+            
+        else:
+            
+            # use the given qualified name
+            QualName = Name
+            
+        # end if
+
+        # return the qualified name
+        return QualName, HasReq
+
+    # end GetTargetName
+
+    # -------------------------------------------------------
+
+    # function to correct one element of a compact array
+    def CorrectArrayValue(self, Name, Data2):
+        """
+
+        CorrectArrayValue(self, Name, Data2)
+
+        Correct one element of an array stored in a single value property. The element is named after the array with its indices appended (i.e., VarName__i__j__...__k).
+
+        INPUTS:
+            self : the SysML model
+
+            Name : the qualified name of the array element
+
+            Data2: the new value of the array element
+
+        OUTPUTS:
+            1 if the element was corrected, 0 if no compact array holds it
+
+        """
+
+        # split the element name into the array name and its indices
+        Parts = Name.split("::")[-1].split("__")
+
+        # check that there are indices
+        if (len(Parts) < 2) or (not all(Index.isdigit() for Index in Parts[1:])):
+
+            # not an array element
+            return 0
+
+        # end if
+
+        # get the qualified name of the array
+        QualName = Name[:len(Name) - len(Name.split("::")[-1])] + Parts[0]
+
+        # get the value property holding the array
+        MyEntity = self.FindElement(QualName)
+
+        # check that it exists
+        if (MyEntity is None):
+
+            # no array found
+            return 0
+
+        # end if
+
+        # get the expression holding the values and its shape
+        ValSpec = MyEntity.getDefaultValue()
+        Shape = GetArrayShape(ValSpec)
+
+        # find the position of the element in the flattened array
+        Position = GetArrayPosition([int(Index) for Index in Parts[1:]], Shape)
+
+        # check that the indices fit the shape
+        if (Position is None):
+
+            # not an element of a compact array
+            return 0
+
+        # end if
+
+        # create the literal
+        MyValueInst = self.CreateLiteral(Data2)
+
+        # check that the type is known
+        if (MyValueInst is None):
+
+            # print an error
+            print("ERROR: the type for " + Name + " is not known ... not updating the array.")
+
+            # the element was found, but could not be changed
+            return 1
+
+        # end if
+
+        # replace the element
+        ValSpec.getOperand().set(Position, MyValueInst)
+
+        # the element was corrected
+        return 1
+
+    # end CorrectArrayValue
+
+    # -------------------------------------------------------
+
+    # function to create a literal holding a value
+    def CreateLiteral(self, Value):
+        """
+
+        CreateLiteral(self, Value)
+
+        Create a literal holding a Boolean, integer, float, or string.
+
+        INPUTS:
+            self : the SysML model
+
+            Value: the value to be held
+
+        OUTPUTS:
+            MyValueInst: the literal holding the value (None if the type is not known)
+
+        """
+
+        # check the value type
+        if (isinstance(Value, bool)):
+
+            # create the boolean
+            MyValueInst = self.Factory.createLiteralBooleanInstance()
+
+        elif (isinstance(Value, int)):
+            
+            # create the integer
+            MyValueInst = self.Factory.createLiteralIntegerInstance()
+            
+        elif (isinstance(Value, float)):
+                                        
+            # create the real
+            MyValueInst = self.Factory.createLiteralRealInstance()
+            
+        elif (isinstance(Value, unicode)) or (isinstance(Value, str)):
+            
+            # create the string
+            MyValueInst = self.Factory.createLiteralStringInstance()
+            
+        else:
+            
+            # the type is not known
+            return None
+        
+        # end if
+        
+        # set the value
+        MyValueInst.setValue(Value)
+
+        # return the literal
+        return MyValueInst
+
+    # end CreateLiteral
+
+    # -------------------------------------------------------
+
+    # function to index the children of a block or package by qualified name
+    def IndexChildren(self, ParentBlock, MyChildren):
+        """
+
+        IndexChildren(self, ParentBlock, MyChildren)
+
+        Remember the children of a block or package by their qualified names, which are built from the parent's qualified name. If two children have the same qualified name, the first one is kept (as the finder would return it).
+
+        INPUTS:
+            self       : the SysML model
+
+            ParentBlock: the block or package whose children are indexed
+
+            MyChildren : the children of the block or package
+
+        OUTPUTS:
+            none
+
+        """
+
+        # get the qualified name of the parent once
+        Prefix = str(ParentBlock.getQualifiedName()) + "::"
+
+        # loop through the children
+        for MyChild in MyChildren:
+
+            # get the qualified name of the child
+            QualName = Prefix + str(MyChild.getName())
+
+            # remember the first child with the name
+            if (QualName not in self.QualNameIndex):
+                self.QualNameIndex[QualName] = MyChild
+            # end if
+
+        # end for
+    # end IndexChildren
+
+    # -------------------------------------------------------
+
+    # function to find a model element by qualified name
+    def FindElement(self, QualName):
+        """
+
+        FindElement(self, QualName)
+
+        Find a model element by qualified name, using the index built by GetBlock and searching the model only if the element was not visited.
+
+        INPUTS:
+            self    : the SysML model
+
+            QualName: the qualified name of the element
+
+        OUTPUTS:
+            MyEntity: the model element (None if it does not exist)
+
+        """
+
+        # look up the element
+        MyEntity = self.QualNameIndex.get(QualName)
+
+        # check if it was not visited
+        if (MyEntity is None):
+
+            # search the model
+            MyEntity = Finder.byQualifiedName().find(self.Project, QualName)
+
+        # end if
+
+        # return the element
+        return MyEntity
+
+    # end FindElement
     
     # -------------------------------------------------------
 
-    def GetBlock(self, ParentBlock):
+    @Timed
+    def GetBlock(self, ParentBlock, Wanted = None):
         """
 
-        GetBlock(self, ParentBlock)
+        GetBlock(self, ParentBlock, Wanted = None)
 
-        Get the JSON string associated with a block and its owned model elements.
+        Get the JSON string associated with a block and its owned model elements. With LAZY_EXPORT, only the owned model elements named in the matching part of the ADH are exported (the WBS number is always kept, so qualified names can be built).
 
         INPUTS:
             self       : the SysML model
 
             ParentBlock: the block whose children will be searched
 
+            Wanted     : the part of the ADH that matches the block (optional, everything is exported if not given)
+
         OUTPUTS:
             MySysDict  : dictionary to be converted to a JSON string
 
@@ -1251,6 +4438,11 @@ class ModelStructureGenerator():
         # create empty dictionary
         MySysDict = {}
 
+        # export everything unless only part of the model is wanted
+        if (LAZY_EXPORT == 0) or (not isinstance(Wanted, dict)):
+            Wanted = None
+        # end if
+
         # try to get the name of the block
         try:
 
@@ -1306,6 +4498,9 @@ class ModelStructureGenerator():
             # get the children of the current model
             MyChildren = ParentBlock.getOwnedElement()
 
+            # index the children by qualified name, so changed values can be found without searching the model
+            self.IndexChildren(ParentBlock, MyChildren)
+
         # end if
 
         # proceed for the appropriate block type
@@ -1336,6 +4531,11 @@ class ModelStructureGenerator():
                 
                 # check if a double underscore exists
                 HasUnder = BlockName.find("__")
+
+                # skip a value the ADH does not have
+                if (self.IsUnwanted(Wanted, BlockName)):
+                    continue
+                # end if
                 
                 # if an underscore exists, check if we're in an array
                 if (HasUnder != -1):
@@ -1358,7 +4558,7 @@ class ModelStructureGenerator():
                         # end for
                         
                         # get the value
-                        BlockValue = self.GetBlockValue(MyChildren[ichild])
+                        BlockValue = self.GetBlockValue(MyChildren[ichild], self.GetWanted(Wanted, BlockName))
                         
                         # append to the array
                         TempArray.append(BlockValue)
@@ -1409,7 +4609,7 @@ class ModelStructureGenerator():
                         OldBaseString = NewBaseString
                         
                         # get the value
-                        BlockValue = self.GetBlockValue(MyChildren[ichild])
+                        BlockValue = self.GetBlockValue(MyChildren[ichild], self.GetWanted(Wanted, BlockName))
                         
                         # start the array
                         TempArray = [BlockValue]
@@ -1443,7 +4643,7 @@ class ModelStructureGenerator():
                     # end if
                     
                     # get the value
-                    MyValu = self.GetBlockValue(MyChildren[ichild])
+                    MyValu = self.GetBlockValue(MyChildren[ichild], self.GetWanted(Wanted, BlockName))
 
                     # check if the value is unicode
                     if (isinstance(MyValu, unicode)):
@@ -1514,7 +4714,7 @@ class ModelStructureGenerator():
                 if (CompName == Name):
 
                     # get out all of the floating parameters
-                    MyValue = self.GetBlock(MyChildren[ichild])
+                    MyValue = self.GetBlock(MyChildren[ichild], Wanted)
 
                     # loop through all of the values
                     for ikey, ival in MyValue.items():
@@ -1554,6 +4754,11 @@ class ModelStructureGenerator():
                         # check if a double underscore exists
                         HasUnder = ChildName.find("__")
 
+                        # skip a component the ADH does not have
+                        if (self.IsUnwanted(Wanted, ChildName)):
+                            continue
+                        # end if
+
                         # if an underscore exists, check if we're in an array
                         if (HasUnder != -1):
 
@@ -1572,7 +4777,7 @@ class ModelStructureGenerator():
                                 # end for
                                 
                                 # get the information
-                                MyValue = self.GetBlock(MoreChildren[jchild])
+                                MyValue = self.GetBlock(MoreChildren[jchild], self.GetWanted(Wanted, ChildName))
                                 
                                 # convert the unicode to a string
                                 if (isinstance(MyValue, unicode)):
@@ -1625,7 +4830,7 @@ class ModelStructureGenerator():
                                 OldBaseString = NewBaseString
 
                                 # get the value
-                                MyValue = self.GetBlock(MoreChildren[jchild])
+                                MyValue = self.GetBlock(MoreChildren[jchild], self.GetWanted(Wanted, ChildName))
 
                                 # start the array
                                 TempArray = [MyValue]
@@ -1659,7 +4864,7 @@ class ModelStructureGenerator():
                             # end if
 
                             # get the value
-                            MyValue = self.GetBlock(MoreChildren[jchild])
+                            MyValue = self.GetBlock(MoreChildren[jchild], self.GetWanted(Wanted, ChildName))
 
                             # check if the value is unicode
                             if (isinstance(MyValue, unicode)):
@@ -1711,8 +4916,8 @@ class ModelStructureGenerator():
                     
                 # end if
 
-                # look for the other reserved words
-                if (FindPerf == True) or (FindReqs == True) or (FindBhvr == True):
+                # look for the other reserved words (if the ADH has them)
+                if ((FindPerf == True) or (FindReqs == True) or (FindBhvr == True)) and (not self.IsUnwanted(Wanted, str(Name).lower())):
 
                     # get the children of this branch's package
                     MoreChildren = MyChildren[ichild].getOwnedElement()
@@ -1984,10 +5189,11 @@ class ModelStructureGenerator():
 
     # -------------------------------------------------------
 
-    def GetBlockValue(self, Block):
+    @Timed
+    def GetBlockValue(self, Block, Wanted = None):
         """
 
-        GetBlockValue(self, Block)
+        GetBlockValue(self, Block, Wanted = None)
 
         Look at a single model element and extract information based on its stereotype.
 
@@ -1996,6 +5202,8 @@ class ModelStructureGenerator():
 
             Block      : the model element being analyzed
 
+            Wanted     : the part of the ADH that matches the model element (optional, see GetBlock)
+
         OUTPUTS:
             MyValu     : a dictionary to be converted to a JSON string, which contains the information about the model element
 
@@ -2020,7 +5228,7 @@ class ModelStructureGenerator():
                 if (foo == "Block"):
                     
                     # search a level deeper
-                    MyValu = self.GetBlock(Block)
+                    MyValu = self.GetBlock(Block, Wanted)
                     
                     # check if the stereotype is a value property
                 elif (foo == "ValueProperty"):
@@ -2030,12 +5238,20 @@ class ModelStructureGenerator():
                     
                     # get the type of property it is
                     Type = str(ValSpec.getHumanName())
+
+                    # get the shape, if the value property holds a compact array
+                    Shape = GetArrayShape(ValSpec)
                     
                     # check if the value specification exists
                     if ValSpec is None:
                         
                         # return an empty array
                         MyValu = []
+
+                    elif Shape is not None:
+
+                        # rebuild the array
+                        MyValu = ReadArrayValue(ValSpec.getOperand(), Shape)
                         
                     elif Type == "Literal Boolean":
                         
@@ -2064,6 +5280,97 @@ class ModelStructureGenerator():
 
     # end GetBlockValue
 
+    # -------------------------------------------------------
+
+    # function to check if the ADH leaves out a model element
+    def IsUnwanted(self, Wanted, ChildName):
+        """
+
+        IsUnwanted(self, Wanted, ChildName)
+
+        Check if a model element can be left out of the export because the matching part of the ADH does not have it. Elements of an array are checked by the array's name, and the WBS number is always wanted.
+
+        INPUTS:
+            self     : the SysML model
+
+            Wanted   : the part of the ADH that matches the parent (None if everything is wanted)
+
+            ChildName: the name of the model element
+
+        OUTPUTS:
+            1 if the model element can be left out, 0 otherwise
+
+        """
+
+        # check if everything is wanted
+        if (Wanted is None):
+            return 0
+        # end if
+
+        # get the name used in the ADH (without array indices)
+        Key = str(ChildName).split("__")[0]
+
+        # check if the ADH has it
+        if (Key in Wanted) or (Key == "wbs_no"):
+            return 0
+        # end if
+
+        # it can be left out
+        return 1
+
+    # end IsUnwanted
+
+    # -------------------------------------------------------
+
+    # function to get the part of the ADH that matches a model element
+    def GetWanted(self, Wanted, ChildName):
+        """
+
+        GetWanted(self, Wanted, ChildName)
+
+        Get the part of the ADH that matches a model element, so the model element's children can be checked with IsUnwanted. An element of a list is named by the list and its index (e.g., "components__1" for Wanted["components"][1]), as ReadADH names it.
+
+        INPUTS:
+            self     : the SysML model
+
+            Wanted   : the part of the ADH that matches the parent (None if everything is wanted)
+
+            ChildName: the name of the model element
+
+        OUTPUTS:
+            the part of the ADH, or None if everything is wanted
+
+        """
+
+        # check if everything is wanted
+        if (Wanted is None):
+            return None
+        # end if
+
+        # split the name used in the ADH from any list indices
+        Parts = str(ChildName).split("__")
+
+        # get the matching part of the ADH
+        MyWanted = Wanted.get(Parts[0])
+
+        # loop through the indices
+        for Index in Parts[1:]:
+
+            # check that the index is in the list
+            if (not isinstance(MyWanted, list)) or (not Index.isdigit()) or (int(Index) >= len(MyWanted)):
+                return None
+            # end if
+
+            # get the element of the list
+            MyWanted = MyWanted[int(Index)]
+
+        # end for
+
+        # only a dictionary can leave out any of the model element's children
+        return MyWanted if (isinstance(MyWanted, dict)) else None
+
+    # end GetWanted
+
     # -------------------------------------------------------    
     
 # end ModelStructureGenerator
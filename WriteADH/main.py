@@ -7,7 +7,7 @@ WRITE ADH:
 
 Written by Paul Mokotoff, prmoko@uich.edu
 
-Last Updated: 28 Mar 2025
+Last Updated: 18 Oct 2026
 
 Inputs:
 
@@ -42,6 +42,7 @@ import com.nomagic.magicdraw.ui.browser.actions.DefaultBrowserAction as DBA
 import com.nomagic.magicdraw.ui.dialogs.MDDialogParentProvider       as MDDPP
 import com.nomagic.magicdraw.uml.BaseElement                         as BaseElement
 import com.nomagic.uml2.ext.jmi.helpers.StereotypesHelper            as SH
+import com.nomagic.uml2.ext.magicdraw.classes.mdkernel               as MDKernel
 
 # import java packages
 import java.awt.Color     as Color
@@ -51,6 +52,7 @@ import java.lang.Short    as Short
 
 # import javax packages
 import javax.swing.BorderFactory                  as BorderFactory
+import javax.swing.JComboBox                      as JComboBox
 import javax.swing.GroupLayout                    as GroupLayout
 import javax.swing.JButton                        as JButton
 import javax.swing.JDialog                        as JDialog
@@ -61,7 +63,199 @@ import javax.swing.LayoutStyle.ComponentPlacement as ComponentPlacement
 import javax.swing.WindowConstants                as WindowConstants
 
 # additional python/jython imports
+import functools
+import gzip
 import json
+import os
+import struct
+import threading
+import time
+
+# -----------------------------------------------------------
+# -----------------------------------------------------------
+# -----------------------------------------------------------
+
+###############################
+#                             #
+# SETTINGS                    #
+#                             #
+###############################
+
+# write the ADH while the model is read, reading each component only when the writer gets to it (1), or read the whole model before writing (0)
+STREAM_ADH = 1
+
+# read the model without an editing session (0), so the export adds no undo history and does not hold up other edits, or open a session around the export as older versions did (1)
+EXPORT_SESSION = 0
+
+# format selected in the filename dialog at first: indented JSON ("json"), minified JSON ("minified"), gzip-compressed minified JSON ("gzip", written as .json.gz), or MessagePack ("msgpack", written as .msgpack)
+ADH_FORMAT = "json"
+
+# save a snapshot of the ADH that was written (<ADH>-Base.json), so UpdateADH can keep the values changed in the model since (1), or not (0)
+WRITE_BASE = 1
+
+# time the hot functions and write a summary to <name>-Timing.txt next to the ADH (1) or not (0)
+TIME_ADH = 0
+
+# -----------------------------------------------------------
+# -----------------------------------------------------------
+# -----------------------------------------------------------
+
+###############################
+#                             #
+# TIMING INSTRUMENTATION      #
+#                             #
+###############################
+
+# calls and seconds spent in each timed function, and when and on which thread the action started
+TIMING_STATS = {}
+TIMING_START = [0.0, None]
+
+def Timed(Function):
+    """
+
+    Timed(Function)
+
+    Decorate a function so its calls and time are recorded when TIME_ADH is on. Only the outermost call on the thread that runs the action is recorded.
+
+    INPUTS:
+        Function     : the function to be timed
+
+    OUTPUTS:
+        TimedFunction: the timed function (or the function itself, if TIME_ADH is off)
+
+    """
+
+    # check if the function must be timed
+    if (TIME_ADH == 0):
+        return Function
+    # end if
+
+    # get the name of the function
+    Name = Function.__name__
+
+    # wrap the function
+    @functools.wraps(Function)
+    def TimedFunction(*args, **kwargs):
+
+        # get the statistics of the function: [calls, seconds, running]
+        Stats = TIMING_STATS.setdefault(Name, [0, 0.0, 0])
+
+        # skip recursive calls and other threads
+        if (Stats[2] == 1) or (threading.current_thread() is not TIMING_START[1]):
+            return Function(*args, **kwargs)
+        # end if
+
+        # time the call
+        Stats[2] = 1
+        Start    = time.time()
+
+        try:
+            return Function(*args, **kwargs)
+        finally:
+            Stats[0] += 1
+            Stats[1] += time.time() - Start
+            Stats[2]  = 0
+        # end try-finally
+    # end TimedFunction
+
+    # return the timed function
+    return TimedFunction
+
+# end Timed
+
+# -----------------------------------------------------------
+
+def ResetTiming():
+    """
+
+    ResetTiming()
+
+    Forget the statistics of an earlier action and start timing the current thread.
+
+    INPUTS:
+        none
+
+    OUTPUTS:
+        none
+
+    """
+
+    # forget the statistics and start timing
+    TIMING_STATS.clear()
+    TIMING_START[0] = time.time()
+    TIMING_START[1] = threading.current_thread()
+
+# end ResetTiming
+
+# -----------------------------------------------------------
+
+def GetSideFile(Filename, Suffix):
+    """
+
+    GetSideFile(Filename, Suffix)
+
+    Get the name of a file written next to an ADH, by replacing the ADH's extension (including a compression suffix, such as the ".gz" of ".json.gz") with a suffix, as: <ADH><Suffix>.
+
+    INPUTS:
+        Filename: the name of the ADH
+
+        Suffix  : the end of the file's name (e.g., "-Timing.txt")
+
+    OUTPUTS:
+        the name of the file
+
+    """
+
+    # leave off the ".gz" of a compressed ADH
+    if (Filename.lower().endswith(".gz")):
+        Filename = Filename[:-3]
+    # end if
+
+    # replace the extension of the ADH
+    return os.path.splitext(Filename)[0] + Suffix
+
+# end GetSideFile
+
+# -----------------------------------------------------------
+
+def WriteTiming(Filename):
+    """
+
+    WriteTiming(Filename)
+
+    Write the calls and time of each timed function (slowest first) to <name>-Timing.txt, next to the file given, if TIME_ADH is on.
+
+    INPUTS:
+        Filename: the name of the ADH read or written by the action
+
+    OUTPUTS:
+        none
+
+    """
+
+    # check if the functions were timed
+    if (TIME_ADH == 0):
+        return
+    # end if
+
+    # open a file next to the ADH
+    f = open(GetSideFile(Filename, "-Timing.txt"), "w")
+
+    try:
+
+        # write the total time and each function, slowest first
+        f.write("Total time: %.3f s\n\n" % (time.time() - TIMING_START[0]))
+        for Name, Stats in sorted(TIMING_STATS.items(), key = lambda Item: -Item[1][1]):
+            f.write("%-24s %10d calls %12.3f s\n" % (Name, Stats[0], Stats[1]))
+        # end for
+
+    finally:
+
+        # close the file
+        f.close()
+
+    # end try-finally
+# end WriteTiming
 
 # -----------------------------------------------------------
 # -----------------------------------------------------------
@@ -385,6 +579,7 @@ class FilenamePanel(JPanel):
         self.Title = JLabel()
         self.TextLabel = JLabel()
         self.FilenameInput = JTextField()
+        self.FormatInput = JComboBox()
         self.RunButton = JButton()
 
         # setup the main panel
@@ -406,6 +601,13 @@ class FilenamePanel(JPanel):
         self.FilenameInput.setFont(Font("Times New Roman", 0, 14))
         self.FilenameInput.setText("Input filename to be read/written/updated")
 
+        # setup the format selector (the extension of the file is changed to match the format)
+        self.FormatInput.setFont(Font("Times New Roman", 0, 14))
+        for MyFormat in ADH_FORMATS:
+            self.FormatInput.addItem(MyFormat[1])
+        # end for
+        self.FormatInput.setSelectedIndex([MyFormat[0] for MyFormat in ADH_FORMATS].index(ADH_FORMAT))
+
         # setup the "run" button
         self.RunButton.setFont(Font("Times New Roman", 1, 12))
         self.RunButton.setText("Run")
@@ -427,6 +629,8 @@ class FilenamePanel(JPanel):
                         .addComponent(self.RunButton)) \
                     .addGroup(MainPanelLayout.createSequentialGroup() \
                         .addComponent(self.FilenameInput, GroupLayout.PREFERRED_SIZE, 500, GroupLayout.PREFERRED_SIZE) \
+                        .addPreferredGap(ComponentPlacement.RELATED) \
+                        .addComponent(self.FormatInput, GroupLayout.PREFERRED_SIZE, GroupLayout.DEFAULT_SIZE, GroupLayout.PREFERRED_SIZE) \
                         .addGap(0, 0, Short.MAX_VALUE)) \
                     .addComponent(self.TextLabel, GroupLayout.DEFAULT_SIZE, 718, Short.MAX_VALUE)) \
                 .addContainerGap()) \
@@ -441,7 +645,9 @@ class FilenamePanel(JPanel):
                 .addGap(18, 18, 18) \
                 .addComponent(self.TextLabel) \
                 .addPreferredGap(ComponentPlacement.RELATED) \
-                .addComponent(self.FilenameInput, GroupLayout.PREFERRED_SIZE, GroupLayout.DEFAULT_SIZE, GroupLayout.PREFERRED_SIZE) \
+                .addGroup(MainPanelLayout.createParallelGroup(GroupLayout.Alignment.BASELINE) \
+                    .addComponent(self.FilenameInput, GroupLayout.PREFERRED_SIZE, GroupLayout.DEFAULT_SIZE, GroupLayout.PREFERRED_SIZE) \
+                    .addComponent(self.FormatInput, GroupLayout.PREFERRED_SIZE, GroupLayout.DEFAULT_SIZE, GroupLayout.PREFERRED_SIZE)) \
                 .addPreferredGap(ComponentPlacement.RELATED, 28, Short.MAX_VALUE) \
                 .addComponent(self.RunButton)
                 .addContainerGap(GroupLayout.DEFAULT_SIZE, Short.MAX_VALUE)) \
@@ -490,11 +696,14 @@ class FilenamePanel(JPanel):
         # get the text input
         Filename = self.FilenameInput.getText()
 
+        # get the format selected
+        Format = ADH_FORMATS[self.FormatInput.getSelectedIndex()][0]
+
         # generate the model structure
         Writer = ADHWriter()
         
         # execute the generator on the object
-        Writer.execute(self.MyParentElement, Filename)
+        Writer.execute(self.MyParentElement, Filename, Format)
         
     # end DoneListener
 
@@ -584,11 +793,53 @@ def ReshapeArray(Arr, NewShape):
 
 ###############################
 #                             #
-# ADH WRITER                  #
+# ARRAY REASSEMBLY            #
 #                             #
 ###############################
 
-class ADHWriter():
+def GetArrayIndices(Name):
+    """
+
+    GetArrayIndices(Name)
+
+    Split the name of an array's element (VarName__i__j__...__k) into the name of the array and the element's indices.
+
+    INPUTS:
+        Name   : the name of the model element
+
+    OUTPUTS:
+        Base   : the name of the array (None if the model element is not an array's element)
+
+        Indices: a tuple with the element's indices (None if the model element is not an array's element)
+
+    """
+
+    # check if a double underscore exists
+    HasUnder = Name.find("__")
+
+    # check for a plain name
+    if (HasUnder == -1):
+        return None, None
+    # end if
+
+    # get the indices
+    Parts = Name[HasUnder + 2:].split("__")
+
+    # check that every index is an integer
+    for Part in Parts:
+        if (not Part.isdigit()):
+            return None, None
+        # end if
+    # end for
+
+    # return the name of the array and the indices
+    return str(Name[:HasUnder]), tuple(int(Part) for Part in Parts)
+
+# end GetArrayIndices
+
+# -----------------------------------------------------------
+
+class ArrayBuilder():
 
     # -------------------------------------------------------
 
@@ -598,356 +849,1207 @@ class ADHWriter():
 
         __init__(self)
 
-        Initialize the writer, which exports the SysML model.
+        Rebuild the arrays whose elements are stored as separate model elements (VarName__i__j__...__k). The elements are collected by the name of their array, in any order, and each array is then made once, at its full shape, with every element placed directly at its indices. Indices that no element was found at are left as null.
 
         INPUTS:
-            self: the SysML model
+            self: the array builder
 
         OUTPUTS:
             none
 
         """
-        
-        # get the project
-        self.Project = Application.getInstance().getProject()
 
-        # get the elements factory
-        self.Factory = self.Project.getElementsFactory()
+        # names of the arrays, in the order they were found
+        self.Names = []
 
-        # get the model element manager
-        self.Manager = MEM.getInstance()
+        # elements of each array, as (indices, value), by the name of the array
+        self.Elements = {}
 
-        # get the model
-        self.Model = self.Project.getModel()
-        
     # end __init__
 
     # -------------------------------------------------------
 
-    # action execution
-    def execute(self, ParentPackage, Filename):
+    # function to add an element
+    def Add(self, Name, Value):
         """
 
-        execute(self, ParentPackage, Filename)
+        Add(self, Name, Value)
 
-        Extract the model elements from the SysML model and convert their information to a JSON string.
+        Add a model element to its array, if it is an array's element.
 
         INPUTS:
-            self         : the SysML model
+            self : the array builder
 
-            ParentPackage: the highest-level model element that the model elements will be stored in
+            Name : the name of the model element
 
-            Filename     : the name of the JSON file to be read for updating the SysML model
+            Value: the value of the model element
 
         OUTPUTS:
-            none
+            1 if the model element is an array's element (and was added), 0 otherwise
 
         """
-                
-        # try to create a session
-        try:
 
-            # create the session
-            SM.getInstance().createSession(self.Project, "Write ADH")
+        # get the name of the array and the indices
+        Base, Indices = GetArrayIndices(Name)
 
-            # get the requirement stereotype from the SysML stereotype profile
-            self.ReqSter = SH.getStereotype(self.Project, "Requirement", "SysML::Requirements")
+        # check for a plain name
+        if (Base is None):
+            return 0
+        # end if
 
-            # get the name of the parent pacakge
-            ParentPackageName = ParentPackage.getName()
-            
-            # get the dictionary needed for writing to the ADH
-            MyDict = self.GetBlock(ParentPackage)
+        # check if the array was found yet
+        if (Base not in self.Elements):
 
-            # convert the dictionaries to JSON strings
-            OutJSON = json.dumps({ParentPackageName : MyDict}, indent = 4, ensure_ascii = True)
-            
-            # open a file
-            f = open(Filename, "w")
+            # start a new array
+            self.Names.append(Base)
+            self.Elements[Base] = []
 
-            # print the JSON string to the file
-            f.write(OutJSON)
+        # check that the element has as many indices as the rest of the array
+        elif (len(Indices) != len(self.Elements[Base][0][0])):
 
-            # close the file
-            f.close()
+            # it is not part of the array
+            return 0
 
-            # close the session
-            SM.getInstance().closeSession(self.Project)
+        # end if
 
-        except Exception as e:
-        
-            # print that an exception occurred
-            Application.getInstance().getGUILog().showMessage("Exception occurred: " + repr(e))
-        
-            # cancel the session
-            SM.getInstance().cancelSession(self.Project)
+        # add the element
+        self.Elements[Base].append((Indices, Value))
 
-        # end try-except
-    # end execute
+        # the element was added
+        return 1
+
+    # end Add
 
     # -------------------------------------------------------
 
-    def GetBlock(self, ParentBlock):
+    # function to add the arrays to a dictionary
+    def Update(self, MyDict):
         """
 
-        GetBlock(self, ParentBlock)
+        Update(self, MyDict)
 
-        Get the JSON string associated with a block and its owned model elements.
+        Make each array and add it to a dictionary.
 
         INPUTS:
-            self       : the SysML model
+            self  : the array builder
 
-            ParentBlock: the block whose children will be searched
+            MyDict: the dictionary that the arrays are added to
 
         OUTPUTS:
-            MySysDict  : dictionary to be converted to a JSON string
+            none
 
         """
-        
-        # create empty dictionary
-        MySysDict = {}
 
-        # try to get the name of the block
-        try:
+        # loop through the arrays
+        for Base in self.Names:
 
-            # get the name
-            TempName = ParentBlock.getHumanName()
+            # get the elements
+            Elements = self.Elements[Base]
 
-        except:
+            # get the shape of the array (one more than the largest index in each dimension)
+            Shape = [0] * len(Elements[0][0])
+            for Indices, Value in Elements:
+                for idim in range(len(Indices)):
+                    Shape[idim] = max(Shape[idim], Indices[idim] + 1)
+                # end for
+            # end for
 
-            # not a valid block
-            return MySysDict
+            # make the array at its full shape
+            MyArray = AllocateArray(Shape)
 
-        # end if
+            # loop through the elements
+            for Indices, Value in Elements:
 
-        try:
-            
-            # isolate the model entity type and name (applicable for blocks, packages, and requirements)
-            TypeName = str(TempName.split(" ")[0])
-            CompName = str(TempName.split(" ")[1])
+                # find the list that holds the element
+                Row = MyArray
+                for Index in Indices[:-1]:
+                    Row = Row[Index]
+                # end for
 
-        except:
+                # place the element
+                Row[Indices[-1]] = Value
 
-            # not a valid block
-            return MySysDict
+            # end for
 
-        # end if
-        
-        # check for a block or package
-        if (TypeName == "Block"):
+            # add the array
+            MyDict.update({Base : MyArray})
 
-            # tag the component as a block
-            BlockType = 1
+        # end for
 
-        elif (TypeName == "Package"):
+    # end Update
 
-            # tag the component as a package
-            BlockType = 2
+    # -------------------------------------------------------
 
-        elif (TypeName == "Requirement"):
+# end ArrayBuilder
 
-            # tag the component as a requirement
-            BlockType = 3
+# -----------------------------------------------------------
 
-        else:
+def AllocateArray(Shape):
+    """
 
-            # pass for now
-            return MySysDict
+    AllocateArray(Shape)
 
-        # end if        
-       
-        # check if a valid block was selected
-        if (BlockType > 0):
-            
-            # get the children of the current model
-            MyChildren = ParentBlock.getOwnedElement()
+    Make a nested list of nulls with the given shape.
 
-        # end if
+    INPUTS:
+        Shape  : a list with the length of each dimension
 
-        # proceed for the appropriate block type
-        if (BlockType == 1):
-            
-            # flag for names with underscores
-            UseArray = 0
-            
-            # old string to compare base string to
-            OldBaseString = ""
-            
-            # loop through all children
-            for ichild in range(len(MyChildren)):
-                
-                # get the block name
-                BlockName = MyChildren[ichild].getName()
+    OUTPUTS:
+        MyArray: the nested list
 
-                # get the human name of the block
-                HumanName = MyChildren[ichild].getHumanName()
-            
-                # check if the part property exists
-                if ("Part Property" in HumanName):
+    """
 
-                    # skip over it
-                    continue
+    # make the innermost lists
+    if (len(Shape) == 1):
+        return [None] * Shape[0]
+    # end if
 
-                # end if
-                
-                # check if a double underscore exists
-                HasUnder = BlockName.find("__")
-                
-                # if an underscore exists, check if we're in an array
-                if (HasUnder != -1):
-                                        
-                    # get the new base string
-                    NewBaseString = BlockName[:HasUnder]
-                    
-                    # check if the strings match
-                    if (NewBaseString == OldBaseString):
-
-                        # remember the indices
-                        Indices = BlockName.split("__")[1:]
-                 
-                        # change each index to an integer (and add 1 for reshaping)
-                        for ival in range(len(Indices)):
-                            
-                            # convert the value and take the maximum for array space allocation
-                            IntIndices[ival] = max(IntIndices[ival], int(Indices[ival]))
-                            
-                        # end for
-                        
-                        # get the value
-                        BlockValue = self.GetBlockValue(MyChildren[ichild])
-                        
-                        # append to the array
-                        TempArray.append(BlockValue)
-                        
-                    else:
-                        
-                        # check if another array already exists
-                        if (UseArray == 1):
-                            
-                            # increment the indices by 1
-                            for ival in range(len(IntIndices)):
-                                IntIndices[ival] += 1
-                            # end for
-                            
-                            # reshape the temporary array
-                            FinalArray = ReshapeArray(TempArray, IntIndices)
+    # make each row
+    return [AllocateArray(Shape[1:]) for irow in range(Shape[0])]
 
-                            # reset indices
-                            for ival in range(len(IntIndices)):
-                                IntIndices[ival] = 0
-                            # end for
+# end AllocateArray
 
-                            # write out the first array
-                            MySysDict.update({str(OldBaseString) : FinalArray})
+# -----------------------------------------------------------
+# -----------------------------------------------------------
+# -----------------------------------------------------------
 
-                        else:
+###############################
+#                             #
+# FUNCTIONS FOR READING A     #
+# COMPACT ARRAY               #
+#                             #
+###############################
 
-                            # begin using the array
-                            UseArray = 1
-                            
-                        # end if
+# symbol marking the expression that holds a compact array, followed by its shape (e.g., "ADHArray:3x2")
+ARRAY_SYMBOL = "ADHArray"
 
-                        # remember the indices
-                        Indices = BlockName.split("__")[1:]
-                        
-                        # create a list for the actual indices
-                        IntIndices = [0] * len(Indices)
-                        
-                        # change each index to an integer (and add 1 for reshaping)
-                        for ival in range(len(Indices)):
-                            
-                            # convert the value and take the maximum for array space allocation
-                            IntIndices[ival] = max(IntIndices[ival], int(Indices[ival]))
-                            
-                        # end for
-                        
-                        # remember the new string
-                        OldBaseString = NewBaseString
-                        
-                        # get the value
-                        BlockValue = self.GetBlockValue(MyChildren[ichild])
-                        
-                        # start the array
-                        TempArray = [BlockValue]
-                        
-                    # end if
-                    
-                else:
-                    
-                    # check if we were in an array
-                    if (UseArray == 1):
+def GetArrayShape(ValSpec):
+    """
 
-                        # increment the indices by 1
-                        for ival in range(len(IntIndices)):
-                            IntIndices[ival] += 1
-                        # end for
-                        
-                        # reshape the temporary array
-                        FinalArray = ReshapeArray(TempArray, IntIndices)
+    GetArrayShape(ValSpec)
 
-                        # reset indices
-                        for ival in range(len(IntIndices)):
-                            IntIndices[ival] = 0
-                        # end for
-                        
-                        # write out the first array
-                        MySysDict.update({str(OldBaseString) : FinalArray})
-                        
-                        # the array is no longer being used
-                        UseArray = 0
-                        
-                    # end if
-                    
-                    # get the value
-                    MyValu = self.GetBlockValue(MyChildren[ichild])
+    Get the shape of a compact array from the symbol of the expression holding its values.
 
-                    # check if the value is unicode
-                    if (isinstance(MyValu, unicode)):
+    INPUTS:
+        ValSpec: the value specification to be analyzed
+
+    OUTPUTS:
+        a list with the size of each dimension (None if the value specification is not a compact array)
+
+    """
+
+    # try to get the expression symbol
+    try:
+
+        # get the symbol
+        Symbol = ValSpec.getSymbol()
+
+    except AttributeError:
+
+        # not an expression
+        return None
+
+    # end try-except
+
+    # check that the symbol marks a compact array
+    if (Symbol is None) or (not str(Symbol).startswith(ARRAY_SYMBOL + ":")):
+
+        # not a compact array
+        return None
+
+    # end if
+
+    # return the size of each dimension
+    return [int(n) for n in str(Symbol)[len(ARRAY_SYMBOL) + 1:].split("x")]
+
+# end GetArrayShape
+
+# -----------------------------------------------------------
+
+def GetLiteralValue(Literal):
+    """
+
+    GetLiteralValue(Literal)
+
+    Get the value held by a literal value specification.
+
+    INPUTS:
+        Literal: the literal to be read
+
+    OUTPUTS:
+        the value of the literal
+
+    """
+
+    # check for a Boolean
+    if (str(Literal.getHumanName()) == "Literal Boolean"):
+
+        # return the value
+        return Literal.isValue()
+
+    # end if
+
+    # return the value
+    return Literal.getValue()
+
+# end GetLiteralValue
+
+# -----------------------------------------------------------
+
+def ReadArrayValue(Literals, Shape):
+    """
+
+    ReadArrayValue(Literals, Shape)
+
+    Read the values of a compact array and reshape them into an n-dimensional array.
+
+    INPUTS:
+        Literals: the literals holding the array values, in order
+
+        Shape   : the size of each dimension
+
+    OUTPUTS:
+        the n-dimensional array (or a flat list if the number of values does not match the shape)
+
+    """
+
+    # get the values
+    Values = [GetLiteralValue(Literal) for Literal in Literals]
+
+    # get the number of values the shape holds
+    Size = 1
+    for Dim in Shape:
+        Size *= Dim
+    # end for
+
+    # check that the values fill the shape
+    if (Size != len(Values)):
+
+        # return the values as they are
+        return Values
+
+    # end if
+
+    # reshape the array
+    return ReshapeArray(Values, Shape)
+
+# end ReadArrayValue
+
+# -----------------------------------------------------------
+# -----------------------------------------------------------
+# -----------------------------------------------------------
+
+###############################
+#                             #
+# FUNCTION FOR NAMING THE     #
+# BASE SNAPSHOT               #
+#                             #
+###############################
+
+def GetBaseFile(Filename):
+    """
+
+    GetBaseFile(Filename)
+
+    Get the name of the snapshot of an ADH as it was when the model was last synced with it (by UpdateADH or WriteADH), as: <ADH>-Base.json.
+
+    INPUTS:
+        Filename: the name of the ADH
+
+    OUTPUTS:
+        the name of the base snapshot
+
+    """
+
+    # replace the extension of the ADH
+    return GetSideFile(Filename, "-Base.json")
+
+# end GetBaseFile
+
+# -----------------------------------------------------------
+# -----------------------------------------------------------
+# -----------------------------------------------------------
+
+###############################
+#                             #
+# ADH FILE FORMATS            #
+#                             #
+###############################
+
+# formats the ADH can be written in: (format, name in the filename dialog, extension, layout given to the JSON writer)
+ADH_FORMATS = [("json"    , "JSON (indented)"       , ".json"   , 4        ), \
+               ("minified", "JSON (minified)"       , ".json"   , None     ), \
+               ("gzip"    , "JSON (gzip-compressed)", ".json.gz", None     ), \
+               ("msgpack" , "MessagePack (binary)"  , ".msgpack", "msgpack")]
+
+def GetFormat(Format):
+    """
+
+    GetFormat(Format)
+
+    Get the description of an ADH format.
+
+    INPUTS:
+        Format: the format ("json", "minified", "gzip", or "msgpack")
+
+    OUTPUTS:
+        the format's entry in ADH_FORMATS
+
+    """
+
+    # loop through the formats
+    for MyFormat in ADH_FORMATS:
+
+        # check for the format
+        if (MyFormat[0] == Format):
+            return MyFormat
+        # end if
+
+    # end for
+
+    # throw an error
+    raise ValueError("Unknown ADH format " + repr(Format))
+
+# end GetFormat
+
+# -----------------------------------------------------------
+
+def GetFormatFile(Filename, Format):
+    """
+
+    GetFormatFile(Filename, Format)
+
+    Get the name of the file an ADH is written to, so its extension matches its format (the readers choose how to read an ADH by its extension). A file named for another format is renamed (e.g., ADH.json is written as ADH.msgpack), and JSON may still be written to a file with any other extension.
+
+    INPUTS:
+        Filename: the name of the ADH input by the user
+
+        Format  : the format of the ADH
+
+    OUTPUTS:
+        the name of the file to write
+
+    """
+
+    # get the extension of the format
+    Extension = GetFormat(Format)[2]
+
+    # check if the file already has it
+    if (Filename.lower().endswith(Extension)):
+        return Filename
+    # end if
+
+    # leave off the extension of another format (longest first, so ".json.gz" is not read as ".gz")
+    Stem = Filename
+    for MyExtension in sorted(set([MyFormat[2] for MyFormat in ADH_FORMATS]), key = len, reverse = True):
+
+        # check for the extension
+        if (Stem.lower().endswith(MyExtension)):
+            Stem = Stem[:-len(MyExtension)]
+            break
+        # end if
+
+    # end for
+
+    # keep the name of a JSON file that is not named for another format
+    if (Extension == ".json") and (Stem == Filename):
+        return Filename
+    # end if
+
+    # add the extension
+    return Stem + Extension
+
+# end GetFormatFile
+
+# -----------------------------------------------------------
+
+def OpenFormatFile(Filename, Format):
+    """
+
+    OpenFormatFile(Filename, Format)
+
+    Open a file for writing an ADH in a given format, compressing it as it is written if needed.
+
+    INPUTS:
+        Filename: the name of the file
+
+        Format  : the format of the ADH
+
+    OUTPUTS:
+        the open file
+
+    """
+
+    # open the file
+    if (Format == "gzip"):
+        return gzip.open(Filename, "wb")
+    elif (Format == "msgpack"):
+        return open(Filename, "wb", 65536)
+    else:
+        return open(Filename, "w", 65536)
+    # end if
+
+# end OpenFormatFile
+
+# -----------------------------------------------------------
+
+# integer types, in the order they are tried: (smallest value, largest value, type byte, struct format)
+MSGPACK_INTEGERS = [(0                  , 0xff              , "\xcc", ">B"), \
+                    (0                  , 0xffff            , "\xcd", ">H"), \
+                    (0                  , 0xffffffff        , "\xce", ">I"), \
+                    (0                  , 0xffffffffffffffff, "\xcf", ">Q"), \
+                    (-0x80              , 0x7f              , "\xd0", ">b"), \
+                    (-0x8000            , 0x7fff            , "\xd1", ">h"), \
+                    (-0x80000000        , 0x7fffffff        , "\xd2", ">i"), \
+                    (-0x8000000000000000, 0x7fffffffffffffff, "\xd3", ">q")]
+
+def PackHeader(Kind, Size):
+    """
+
+    PackHeader(Kind, Size)
+
+    Encode the header of a MessagePack map, array, or string, using the shortest type that holds its size.
+
+    INPUTS:
+        Kind: "object" (a map), "array", or "string"
+
+        Size: the number of keys, elements, or bytes
+
+    OUTPUTS:
+        the encoded header
+
+    """
+
+    # get the fixed type, and the largest size it holds
+    if (Kind == "object"):
+        Fixed, Limit = 0x80, 16
+    elif (Kind == "array"):
+        Fixed, Limit = 0x90, 16
+    else:
+        Fixed, Limit = 0xa0, 32
+    # end if
+
+    # check for a small size
+    if (Size < Limit):
+        return chr(Fixed + Size)
+    # end if
+
+    # check for a short string
+    if (Kind == "string") and (Size <= 0xff):
+        return "\xd9" + chr(Size)
+    # end if
+
+    # get the 16- and 32-bit types
+    Type16, Type32 = {"object" : ("\xde", "\xdf"), "array" : ("\xdc", "\xdd"), "string" : ("\xda", "\xdb")}[Kind]
+
+    # encode the size
+    if (Size <= 0xffff):
+        return Type16 + struct.pack(">H", Size)
+    else:
+        return Type32 + struct.pack(">I", Size)
+    # end if
+
+# end PackHeader
+
+# -----------------------------------------------------------
+
+def PackValue(Value):
+    """
+
+    PackValue(Value)
+
+    Encode a string, number, Boolean, or null in MessagePack.
+
+    INPUTS:
+        Value: the value to encode
+
+    OUTPUTS:
+        the encoded value
+
+    """
+
+    # check for a null or Boolean
+    if (Value is None):
+        return "\xc0"
+    elif (Value is True):
+        return "\xc3"
+    elif (Value is False):
+        return "\xc2"
+    # end if
+
+    # check for an integer
+    if (isinstance(Value, (int, long))):
+
+        # check for a positive or negative fixed integer
+        if (0 <= Value <= 0x7f):
+            return chr(Value)
+        elif (-32 <= Value < 0):
+            return chr(Value + 0x100)
+        # end if
+
+        # use the first type that holds the integer
+        for Smallest, Largest, Type, Format in MSGPACK_INTEGERS:
+            if (Smallest <= Value <= Largest):
+                return Type + struct.pack(Format, Value)
+            # end if
+        # end for
+
+        # write integers too large for 64 bits as floats
+        Value = float(Value)
+
+    # end if
+
+    # check for a float
+    if (isinstance(Value, float)):
+        return "\xcb" + struct.pack(">d", Value)
+    # end if
+
+    # check for a string
+    if (isinstance(Value, basestring)):
+
+        # encode the string as UTF-8
+        if (isinstance(Value, unicode)):
+            Value = Value.encode("utf-8")
+        # end if
+
+        # write the header and the string
+        return PackHeader("string", len(Value)) + Value
+
+    # end if
+
+    # throw an error
+    raise TypeError(repr(Value) + " cannot be written in MessagePack")
+
+# end PackValue
+
+# -----------------------------------------------------------
+# -----------------------------------------------------------
+# -----------------------------------------------------------
+
+###############################
+#                             #
+# STREAMING JSON WRITER       #
+#                             #
+###############################
+
+class DeferredValue():
+
+    # -------------------------------------------------------
+
+    # initialization
+    def __init__(self, Function, *Args):
+        """
+
+        __init__(self, Function, *Args)
+
+        Remember how to read a part of the ADH from the model, without reading it yet. The JSON writer reads it when it gets there, writes it, and then lets it go.
+
+        INPUTS:
+            self    : the deferred value
+
+            Function: the function that reads the value from the model
+
+            Args    : the inputs to the function
+
+        OUTPUTS:
+            none
+
+        """
+
+        # remember the function and its inputs
+        self.Function = Function
+        self.Args     = Args
+
+    # end __init__
+
+    # -------------------------------------------------------
+
+    # function to read the value
+    def Get(self):
+        """
+
+        Get(self)
+
+        Read the value from the model.
+
+        INPUTS:
+            self: the deferred value
+
+        OUTPUTS:
+            the value
+
+        """
+
+        # read the value
+        return self.Function(*self.Args)
+
+    # end Get
+
+    # -------------------------------------------------------
+
+# end DeferredValue
+
+# -----------------------------------------------------------
+
+class JSONWriter():
+
+    # -------------------------------------------------------
+
+    # initialization
+    def __init__(self, Files, Indents):
+        """
+
+        __init__(self, Files, Indents)
+
+        Write a JSON value to one or more files as it is walked, so the whole JSON string is never held in memory. The output is the same as json.dumps (with ensure_ascii) would make, either pretty-printed or on a single line, or the same value encoded in MessagePack.
+
+        INPUTS:
+            self   : the JSON writer
+
+            Files  : the files to write to
+
+            Indents: the indent of each file (None writes the file on a single line, and "msgpack" writes it in MessagePack)
+
+        OUTPUTS:
+            none
+
+        """
+
+        # remember the JSON files and how each is laid out: (file, indent, item separator, key separator)
+        self.Targets = []
+
+        # remember the MessagePack files
+        self.Packed = []
+
+        # loop through the files
+        for ifile in range(len(Files)):
+
+            # check for MessagePack or a single line
+            if (Indents[ifile] == "msgpack"):
+                self.Packed.append(Files[ifile])
+            elif (Indents[ifile] is None):
+                self.Targets.append((Files[ifile], None, ",", ":"))
+            else:
+                self.Targets.append((Files[ifile], " " * Indents[ifile], ", ", ": "))
+            # end if
+
+        # end for
+
+        # encoder for the strings, numbers, Booleans, and nulls
+        self.Encoder = json.JSONEncoder(ensure_ascii = True)
+
+    # end __init__
+
+    # -------------------------------------------------------
+
+    # function to write text to every file
+    def WriteText(self, Text):
+        """
+
+        WriteText(self, Text)
+
+        Write the same text to every file.
+
+        INPUTS:
+            self: the JSON writer
+
+            Text: the text to write
+
+        OUTPUTS:
+            none
+
+        """
+
+        # loop through the files
+        for MyFile, Indent, ItemSep, KeySep in self.Targets:
+            MyFile.write(Text)
+        # end for
+
+    # end WriteText
+
+    # -------------------------------------------------------
+
+    # function to write bytes to every MessagePack file
+    def WritePacked(self, Bytes):
+        """
+
+        WritePacked(self, Bytes)
+
+        Write the same encoded bytes to every MessagePack file.
+
+        INPUTS:
+            self : the JSON writer
+
+            Bytes: the bytes to write
+
+        OUTPUTS:
+            none
+
+        """
+
+        # loop through the files
+        for MyFile in self.Packed:
+            MyFile.write(Bytes)
+        # end for
+
+    # end WritePacked
+
+    # -------------------------------------------------------
+
+    # function to write a separator
+    def WriteBreak(self, Level, Separator):
+        """
+
+        WriteBreak(self, Level, Separator)
+
+        Write the text between two items, or at the start or end of a dictionary or list, laid out for each file.
+
+        INPUTS:
+            self     : the JSON writer
+
+            Level    : how deeply the next line is indented
+
+            Separator: 1 to separate two items (or keys and values), 0 otherwise
+
+        OUTPUTS:
+            none
+
+        """
+
+        # loop through the files
+        for MyFile, Indent, ItemSep, KeySep in self.Targets:
+
+            # get the separator
+            Text = ItemSep if (Separator == 1) else ""
+
+            # start a new line in pretty-printed files
+            if (Indent is not None):
+                Text = Text + "\n" + Indent * Level
+            # end if
+
+            # write the separator
+            MyFile.write(Text)
+
+        # end for
+
+    # end WriteBreak
+
+    # -------------------------------------------------------
+
+    # function to write a value
+    def Write(self, Value, Level = 0):
+        """
+
+        Write(self, Value, Level = 0)
+
+        Write a JSON value, reading each deferred value from the model when it is reached.
+
+        INPUTS:
+            self : the JSON writer
+
+            Value: the value to write
+
+            Level: (optional, default is 0) how deeply the value is nested
+
+        OUTPUTS:
+            none
+
+        """
+
+        # read a deferred value from the model
+        if (isinstance(Value, DeferredValue)):
+            Value = Value.Get()
+        # end if
+
+        # check for a dictionary
+        if (isinstance(Value, dict)):
+
+            # start the map in the MessagePack files
+            self.WritePacked(PackHeader("object", len(Value)))
+
+            # check for an empty dictionary
+            if (len(Value) == 0):
+                self.WriteText("{}")
+                return
+            # end if
+
+            # open the dictionary
+            self.WriteText("{")
+
+            # loop through the keys (in the order json.dumps uses)
+            First = 1
+            for ikey, ival in Value.items():
+
+                # separate the items
+                self.WriteBreak(Level + 1, 1 - First)
+                First = 0
+
+                # write the key
+                self.WriteText(self.Encoder.encode(ikey) if (len(self.Targets) > 0) else "")
+                for MyFile, Indent, ItemSep, KeySep in self.Targets:
+                    MyFile.write(KeySep)
+                # end for
+                self.WritePacked(PackValue(ikey) if (len(self.Packed) > 0) else "")
+
+                # write the value
+                self.Write(ival, Level + 1)
+
+            # end for
+
+            # close the dictionary
+            self.WriteBreak(Level, 0)
+            self.WriteText("}")
+
+        # check for a list
+        elif (isinstance(Value, (list, tuple))):
+
+            # start the array in the MessagePack files
+            self.WritePacked(PackHeader("array", len(Value)))
+
+            # check for an empty list
+            if (len(Value) == 0):
+                self.WriteText("[]")
+                return
+            # end if
+
+            # open the list
+            self.WriteText("[")
+
+            # loop through the elements
+            for ielem in range(len(Value)):
+
+                # separate the elements
+                self.WriteBreak(Level + 1, 1 if (ielem > 0) else 0)
+
+                # write the element
+                self.Write(Value[ielem], Level + 1)
+
+            # end for
+
+            # close the list
+            self.WriteBreak(Level, 0)
+            self.WriteText("]")
+
+        else:
+
+            # write a string, number, Boolean, or null
+            self.WriteText(self.Encoder.encode(Value) if (len(self.Targets) > 0) else "")
+            self.WritePacked(PackValue(Value) if (len(self.Packed) > 0) else "")
+
+        # end if
+
+    # end Write
+
+    # -------------------------------------------------------
+
+# end JSONWriter
+
+# -----------------------------------------------------------
+
+def ReplaceFile(TempFile, Filename):
+    """
+
+    ReplaceFile(TempFile, Filename)
+
+    Replace a file with the one written next to it, so a failed write never leaves half of a file behind.
+
+    INPUTS:
+        TempFile: the file that was written
+
+        Filename: the file to be replaced
+
+    OUTPUTS:
+        none
+
+    """
+
+    # remove the old file (renaming onto an existing file fails on Windows)
+    if (os.path.isfile(Filename)):
+        os.remove(Filename)
+    # end if
+
+    # move the new file into place
+    os.rename(TempFile, Filename)
+
+# end ReplaceFile
+
+# -----------------------------------------------------------
+# -----------------------------------------------------------
+# -----------------------------------------------------------
+
+###############################
+#                             #
+# ADH WRITER                  #
+#                             #
+###############################
+
+class ADHWriter():
+
+    # -------------------------------------------------------
+
+    # initialization
+    def __init__(self):
+        """
+
+        __init__(self)
+
+        Initialize the writer, which exports the SysML model.
+
+        INPUTS:
+            self: the SysML model
+
+        OUTPUTS:
+            none
+
+        """
+        
+        # get the project
+        self.Project = Application.getInstance().getProject()
+
+        # get the elements factory
+        self.Factory = self.Project.getElementsFactory()
+
+        # get the model element manager
+        self.Manager = MEM.getInstance()
+
+        # get the model
+        self.Model = self.Project.getModel()
+
+        # kind of each element visited, by element ID (see Classify)
+        self.Kinds = {}
+
+        # name of each stereotype seen, by stereotype ID
+        self.StereotypeNames = {}
+        
+    # end __init__
+
+    # -------------------------------------------------------
+
+    # action execution
+    def execute(self, ParentPackage, Filename, Format = None):
+        """
+
+        execute(self, ParentPackage, Filename, Format = None)
+
+        Extract the model elements from the SysML model and convert their information to a JSON string.
+
+        INPUTS:
+            self         : the SysML model
+
+            ParentPackage: the highest-level model element that the model elements will be stored in
+
+            Filename     : the name of the JSON file to be read for updating the SysML model
+
+            Format       : (optional, default is ADH_FORMAT) the format of the ADH (see ADH_FORMATS)
+
+        OUTPUTS:
+            none
+
+        """
+                
+        # get the format, and name the file to match it
+        Format   = ADH_FORMAT if (Format is None) else Format
+        Filename = GetFormatFile(Filename, Format)
+
+        # start timing the hot functions
+        ResetTiming()
+
+        # try to write the ADH
+        try:
+
+            # create a session, unless the model is only read (the export changes nothing, so it needs no undo history)
+            if (EXPORT_SESSION == 1):
+                SM.getInstance().createSession(self.Project, "Write ADH")
+            # end if
+
+            # get the requirement stereotype from the SysML stereotype profile
+            self.ReqSter = SH.getStereotype(self.Project, "Requirement", "SysML::Requirements")
+
+            # get the name of the parent pacakge
+            ParentPackageName = ParentPackage.getName()
+            
+            # get the dictionary needed for writing to the ADH (with STREAM_ADH, the components are only read while they are written)
+            MyDict = self.GetBlock(ParentPackage)
+
+            # write the ADH, and the base snapshot for UpdateADH (always as JSON), next to the files they replace
+            Filenames = [Filename] + ([GetBaseFile(Filename)] if (WRITE_BASE == 1) else [])
+            Files     = [OpenFormatFile(Filename + ".tmp", Format)] + [open(MyFile + ".tmp", "w", 65536) for MyFile in Filenames[1:]]
+
+            # try to write the files
+            Written = 0
+            try:
+
+                # write the JSON to every file at once (the ADH laid out for its format and the snapshot on a single line)
+                JSONWriter(Files, [GetFormat(Format)[3], None][:len(Files)]).Write({ParentPackageName : MyDict})
+                Written = 1
+
+            finally:
+
+                # close the files
+                for MyFile in Files:
+                    MyFile.close()
+                # end for
+
+                # remove the files if they were not finished
+                if (Written == 0):
+                    for MyFile in Filenames:
+                        os.remove(MyFile + ".tmp")
+                    # end for
+                # end if
+
+            # end try-finally
+
+            # replace the ADH (and base snapshot) only once they were written
+            for MyFile in Filenames:
+                ReplaceFile(MyFile + ".tmp", MyFile)
+            # end for
+
+            # close the session
+            if (EXPORT_SESSION == 1):
+                SM.getInstance().closeSession(self.Project)
+            # end if
+
+        except Exception as e:
+        
+            # print that an exception occurred
+            Application.getInstance().getGUILog().showMessage("Exception occurred: " + repr(e))
+        
+            # cancel the session
+            if (EXPORT_SESSION == 1):
+                SM.getInstance().cancelSession(self.Project)
+            # end if
+
+        # end try-except
+
+        # write where the time went
+        WriteTiming(Filename)
+
+    # end execute
+
+    # -------------------------------------------------------
+
+    @Timed
+    def GetBlock(self, ParentBlock):
+        """
+
+        GetBlock(self, ParentBlock)
+
+        Get the JSON string associated with a block and its owned model elements.
+
+        INPUTS:
+            self       : the SysML model
+
+            ParentBlock: the block whose children will be searched
+
+        OUTPUTS:
+            MySysDict  : dictionary to be converted to a JSON string
+
+        """
+        
+        # create empty dictionary
+        MySysDict = {}
 
-                        # convert it to a string
-                        MyValu = str(MyValu)
+        # try to get the kind and name of the block
+        try:
 
-                    # end if
+            # get the kind of element (applicable for blocks, packages, and requirements) and its name
+            TypeName = self.Classify(ParentBlock)
+            CompName = str(ParentBlock.getName())
 
-                    # check that the element exists
-                    if (str(BlockName) == "") and (MyValu == {} or MyValu == []):
+        except:
 
-                        # do nothing
-                        pass
+            # not a valid block
+            return MySysDict
+
+        # end if
+        
+        # check for a block or package
+        if (TypeName == "Block"):
+
+            # tag the component as a block
+            BlockType = 1
+
+        elif (TypeName == "Package"):
+
+            # tag the component as a package
+            BlockType = 2
+
+        elif (TypeName == "Requirement"):
+
+            # tag the component as a requirement
+            BlockType = 3
+
+        else:
+
+            # pass for now
+            return MySysDict
+
+        # end if        
+       
+        # check if a valid block was selected
+        if (BlockType > 0):
+            
+            # get the children of the current model
+            MyChildren = ParentBlock.getOwnedElement()
+
+        # end if
+
+        # proceed for the appropriate block type
+        if (BlockType == 1):
+            
+            # collect the elements of arrays (VarName__i__j__...__k), in any order
+            Arrays = ArrayBuilder()
+            
+            # loop through all children
+            for ichild in range(len(MyChildren)):
+                
+                # get the block name
+                BlockName = MyChildren[ichild].getName()
+            
+                # check if the part property exists
+                if (self.Classify(MyChildren[ichild]) == "PartProperty"):
 
-                    else:
-                        
-                        # add the element as normal
-                        MySysDict.update({str(BlockName) : MyValu})
+                    # skip over it
+                    continue
 
-                    # end if
+                # end if
                     
+                # get the value
+                MyValu = self.GetBlockValue(MyChildren[ichild])
+
+                # check for an element of an array
+                if (Arrays.Add(BlockName, MyValu) == 1):
+
+                    # it is added once the array is complete
+                    continue
+
                 # end if
-            # end for
 
-            # check if we were in an array
-            if (UseArray == 1):
-                
-                # increment the indices by 1
-                for ival in range(len(IntIndices)):
-                    IntIndices[ival] += 1
-                # end for
-                
-                # reshape the temporary array
-                FinalArray = ReshapeArray(TempArray, IntIndices)
+                # check if the value is unicode
+                if (isinstance(MyValu, unicode)):
 
-                # reset indices
-                for ival in range(len(IntIndices)):
-                    IntIndices[ival] = 0
-                # end for
-                
-                # write out the first array
-                MySysDict.update({str(OldBaseString) : FinalArray})
-                
-                # the array is no longer being used
-                UseArray = 0
-                
-            # end if
+                    # convert it to a string
+                    MyValu = str(MyValu)
+
+                # end if
+
+                # check that the element exists
+                if (str(BlockName) == "") and (MyValu == {} or MyValu == []):
+
+                    # do nothing
+                    pass
+
+                else:
+                    
+                    # add the element as normal
+                    MySysDict.update({str(BlockName) : MyValu})
+
+                # end if
+                    
+            # end for
+
+            # write out the arrays
+            Arrays.Update(MySysDict)
 
         elif (BlockType == 2):
 
@@ -992,11 +2094,8 @@ class ADHWriter():
                 # look for the system architecture
                 if (FindArch == True):
 
-                    # flag for names with understcores
-                    UseArray = 0
-
-                    # old string to compare base string to
-                    OldBaseString = ""
+                    # collect the elements of arrays (VarName__i__j__...__k), in any order
+                    Arrays = ArrayBuilder()
 
                     # get the children of this branch package
                     MoreChildren = MyChildren[ichild].getOwnedElement()
@@ -1007,163 +2106,42 @@ class ADHWriter():
                         # get the child's name
                         ChildName = MoreChildren[jchild].getName()
 
-                        # check if a double underscore exists
-                        HasUnder = ChildName.find("__")
-
-                        # if an underscore exists, check if we're in an array
-                        if (HasUnder != -1):
-
-                            # get the new base string
-                            NewBaseString = ChildName[:HasUnder]
-
-                            # check if the strings match
-                            if (NewBaseString == OldBaseString):
-
-                                # remember the indices
-                                Indices = ChildName.split("__")[1:]
-
-                                # change each index to an integer
-                                for ival in range(len(Indices)):
-                                    IntIndices[ival] = max(IntIndices[ival], int(Indices[ival]))
-                                # end for
-                                
-                                # get the information
-                                MyValue = self.GetBlock(MoreChildren[jchild])
-                                
-                                # convert the unicode to a string
-                                if (isinstance(MyValue, unicode)):
-                                    MyValue = str(MyValue)
-                                # end if
-
-                                # append to the array
-                                TempArray.append(MyValue)
-
-                            else:
-
-                                # check if another array already exists
-                                if (UseArray == 1):
-
-                                    # increment the indices by 1
-                                    for ival in range(len(IntIndices)):
-                                        IntIndices[ival] += 1
-                                    # end for
-
-                                    # reshape the temporary array
-                                    FinalArray = ReshapeArray(TempArray, IntIndices)
-
-                                    # reset indices
-                                    for ival in range(len(IntIndices)):
-                                        IntIndices[ival] = 0
-                                    # end for
-                                    
-                                    # write out the first array
-                                    TempDict.update({str(OldBaseString): FinalArray})
-
-                                else:
+                        # get the information
+                        MyValue = self.GetChild(MoreChildren[jchild])
 
-                                    # strt using the array
-                                    UseArray = 1
-                                    
-                                # end if
+                        # check for an element of an array
+                        if (Arrays.Add(ChildName, MyValue) == 1):
 
-                                # remember the indices
-                                Indices = ChildName.split("__")[1:]
+                            # it is added once the array is complete
+                            continue
 
-                                # create a list for the actual indices
-                                IntIndices = [0] * len(Indices)
+                        # end if
 
-                                # change each index to an integer
-                                for ival in range(len(Indices)):
-                                    IntIndices[ival] = max(IntIndices[ival], int(Indices[ival]))
-                                # end for
+                        # check if the value is unicode
+                        if (isinstance(MyValue, unicode)):
 
-                                # remember the new string
-                                OldBaseString = NewBaseString
+                            # convert it to a string
+                            MyValue = str(MyValue)
 
-                                # get the value
-                                MyValue = self.GetBlock(MoreChildren[jchild])
+                        # end if
 
-                                # start the array
-                                TempArray = [MyValue]
+                        # check if the result isn't empty
+                        if (str(ChildName) == "") and (MyValue == {} or MyValue == []):
 
-                            # end if
+                            # do nothing
+                            pass
 
                         else:
-
-                            # check if we were in an array
-                            if (UseArray == 1):
-
-                                # increment the indices by 1
-                                for ival in range(len(IntIndices)):
-                                    IntIndices[ival] += 1
-                                # end for
-
-                                # reshape the temporary array
-                                FinalArray = ReshapeArray(TempArray, IntIndices)
-
-                                # reset indices
-                                for ival in range(len(IntIndices)):
-                                    IntIndices[ival] = 0
-                                # end for
-                                
-                                # write out the array
-                                TempDict.update({str(OldBaseString) :  FinalArray})
-
-                                # the array is no longer being used
-                                UseArray = 0
-
-                            # end if
-
-                            # get the value
-                            MyValue = self.GetBlock(MoreChildren[jchild])
-
-                            # check if the value is unicode
-                            if (isinstance(MyValue, unicode)):
-
-                                # convert it to a string
-                                MyValue = str(MyValue)
-
-                            # end if
-
-                            # check if the result isn't empty
-                            if (str(ChildName) == "") and (MyValue == {} or MyValue == []):
-
-                                # do nothing
-                                pass
-
-                            else:
-                                
-                                # add the element as normal
-                                TempDict.update({str(ChildName) : MyValue})
-
-                            # end if
+                            
+                            # add the element as normal
+                            TempDict.update({str(ChildName) : MyValue})
 
                         # end if
-                    # end for
 
-                    # check if an array needs to be written
-                    if (UseArray == 1):
-
-                        # increment the indices by 1
-                        for ival in range(len(IntIndices)):
-                            IntIndices[ival] += 1
-                        # end for
-                        
-                        # reshape the temporary array
-                        FinalArray = ReshapeArray(TempArray, IntIndices)
+                    # end for
 
-                        # reset indices
-                        for ival in range(len(IntIndices)):
-                            IntIndices[ival] = 0
-                        # end for
-                            
-                        # turn off the flag
-                        UseArray = 0
-                        
-                        # write out the first array
-                        TempDict.update({str(OldBaseString) : FinalArray})
-                        
-                    # end if
+                    # write out the arrays
+                    Arrays.Update(TempDict)
                     
                 # end if
 
@@ -1176,11 +2154,8 @@ class ADHWriter():
                     # define a local dictionary
                     LocalDict = {}
 
-                    # flag for names with underscores
-                    UseArray = 0
-
-                    # old string to compare base string to
-                    OldBaseString = ""
+                    # collect the elements of arrays (VarName__i__j__...__k), in any order
+                    Arrays = ArrayBuilder()
 
                     # loop through these children
                     for jchild in range(len(MoreChildren)):
@@ -1188,159 +2163,38 @@ class ADHWriter():
                         # get the child's name
                         ChildName = MoreChildren[jchild].getName()
 
-                        # check if a double underscore exists
-                        HasUnder = ChildName.find("__")
-
-                        # if an underscoreexists, check if we're in an array
-                        if (HasUnder != -1):
-
-                            # get the new base string
-                            NewBaseString = ChildName[:HasUnder]
+                        # get the information
+                        MyValue = self.GetBlock(MoreChildren[jchild])
 
-                            # check if the strings match
-                            if (NewBaseString == OldBaseString):
+                        # check for an element of an array
+                        if (Arrays.Add(ChildName, MyValue) == 1):
 
-                                # remember the indices
-                                Indices = ChildName.split("__")[1:]
+                            # it is added once the array is complete
+                            continue
 
-                                # change each index to an integer
-                                for ival in range(len(Indices)):
-                                    IntIndices[ival] = max(IntIndices[ival], int(Indices[ival]))
-                                # end for
-
-                                # get the information
-                                MyValue = self.GetBlock(MoreChildren[jchild])
-
-                                # check for unicode values
-                                if (isinstance(MyValue, unicode)):
-                                    MyValue = str(MyValue)
-                                # end if
-
-                                # append to the array
-                                TempArray.append(MyValue)
-
-                            else:
-
-                                # check if another array already exists
-                                if (UseArray == 1):
-
-                                    # increment indices by 1
-                                    for ival in range(len(IntIndices)):
-                                        IntIndices[ival] += 1
-                                    # end for
-
-                                    # reshape the temporary array
-                                    FinalArray = ReshapeArray(TempArray, IntIndices)
-
-                                    # reset indices
-                                    for ival in range(len(IntIndices)):
-                                        IntIndices[ival] = 0
-                                    # end for
-                                    
-                                    # write out the first array
-                                    LocalDict.update({str(OldBaseString) : FinalArray})
-
-                                else:
-
-                                    # start using the array
-                                    UseArray = 1
-                                    
-                                # end if
-
-                                # remember the indices
-                                Indices = ChildName.split("__")[1:]
-                                
-                                # create a list for the actual indices
-                                IntIndices = [0] * len(Indices)
-                                
-                                # change each index to an integer
-                                for ival in range(len(Indices)):
-                                    IntIndices[ival] = max(IntIndices[ival], int(Indices[ival]))
-                                # end for
-                                
-                                # remember the new string
-                                OldBaseString = NewBaseString
+                        # end if
 
-                                # get the value
-                                MyValue = self.GetBlock(MoreChildren[jchild])
+                        # make sure unicode becomes a string
+                        if (isinstance(MyValue, unicode)):
+                            MyValue = str(MyValue)
+                        # end if
 
-                                # start the array
-                                TempArray = [MyValue]
+                        # check if the dictionary should be updated
+                        if (str(ChildName) == "") and (MyValue == {} or MyValue == []):
 
-                            # end if
+                            # do nothing
+                            pass
 
                         else:
+                            
+                            # add them to the current dictionary
+                            LocalDict.update({str(ChildName) : MyValue})
 
-                            # check if we were in an array
-                            if (UseArray == 1):
-
-                                # increment the indices by 1
-                                for ival in range(len(IntIndices)):
-                                    IntIndices[ival] += 1
-                                # end for
-
-                                # reshape the temporary array
-                                FinalArray = ReshapeArray(TempArray, IntIndices)
-
-                                # reset indices
-                                for ival in range(len(IntIndices)):
-                                    IntIndices[ival] = 0
-                                # end for
-
-                                # write out the array
-                                LocalDict.update({str(OldBaseString) : FinalArray})
-
-                                # the array is no longer being used
-                                UseArray = 0
-
-                            # end if
-
-                            # get the value
-                            MyValue = self.GetBlock(MoreChildren[jchild])
-
-                            # make sure unicode becomes a string
-                            if (isinstance(MyValue, unicode)):
-                                MyValue = str(MyValue)
-                            # end if
-
-                            # check if the dictionary should be updated
-                            if (str(ChildName) == "") and (MyValue == {} or MyValue == []):
-
-                                # do nothing
-                                pass
-
-                            else:
-                                
-                                # add them to the current dictionary
-                                LocalDict.update({str(ChildName) : MyValue})
-
-                            # end if
                         # end if
                     # end for
 
-                    # check if an array nneeds to be written
-                    if (UseArray == 1):
-
-                        # increment the indices by 1
-                        for ival in range(len(IntIndices)):
-                            IntIndices[ival] += 1
-                        # end for
-
-                        # reshape the temporary array
-                        FinalArray = ReshapeArray(TempArray, IntIndices)
-
-                        # reset indices
-                        for ival in range(len(IntIndices)):
-                            IntIndices[ival] = 0
-                        # end for
-                        
-                        # turn off the flag
-                        UseArray = 0
-
-                        # write out the array
-                        LocalDict.update({str(OldBaseString) : FinalArray})
-
-                    # end if
+                    # write out the arrays
+                    Arrays.Update(LocalDict)
 
                     # get the keys from the current local dictionary
                     try:
@@ -1440,6 +2294,37 @@ class ADHWriter():
 
     # -------------------------------------------------------
 
+    # function to read a component, now or when it is written
+    def GetChild(self, Child):
+        """
+
+        GetChild(self, Child)
+
+        Get the dictionary of a component in a system architecture. With STREAM_ADH, the component is read from the model only when the JSON writer gets to it, so the whole model is never held in memory at once.
+
+        INPUTS:
+            self : the SysML model
+
+            Child: the package of the component
+
+        OUTPUTS:
+            the dictionary of the component, or a deferred value that reads it
+
+        """
+
+        # read an unnamed element now (it is left out of the ADH if it is empty)
+        if (STREAM_ADH == 0) or (str(Child.getName()) == ""):
+            return self.GetBlock(Child)
+        # end if
+
+        # read the component when it is written
+        return DeferredValue(self.GetBlock, Child)
+
+    # end GetChild
+
+    # -------------------------------------------------------
+
+    @Timed
     def GetBlockValue(self, Block):
         """
 
@@ -1458,57 +2343,50 @@ class ADHWriter():
         """
         
         # get the element type
-        MyStereotype = Block.getAppliedStereotype()
+        Kind = self.Classify(Block)
         
         # assume an empty dictionary
         MyValu = {}
+                
+        # check if the stereotype is a block
+        if (Kind == "Block"):
+            
+            # search a level deeper
+            MyValu = self.GetBlock(Block)
+            
+            # check if the stereotype is a value property
+        elif (Kind == "ValueProperty"):
 
-        # check if there are stereotypes
-        if (len(MyStereotype) > 0):
-        
-            # loop through all the stereotypes
-            for itype in MyStereotype:
+            # get the value property
+            ValSpec = Block.getDefaultValue()
+
+            # get the shape, if the value property holds a compact array
+            Shape = GetArrayShape(ValSpec)
+            
+            # check if the value specification exists
+            if ValSpec is None:
                 
-                # get the stereotype name and convert to a string
-                foo = str(itype.getName())
+                # return an empty array
+                MyValu = []
+
+            elif Shape is not None:
+
+                # rebuild the array
+                MyValu = ReadArrayValue(ValSpec.getOperand(), Shape)
                 
-                # check if the stereotype is a block
-                if (foo == "Block"):
-                    
-                    # search a level deeper
-                    MyValu = self.GetBlock(Block)
-                    
-                    # check if the stereotype is a value property
-                elif (foo == "ValueProperty"):
-                    
-                    # get the value property
-                    ValSpec = Block.getDefaultValue()
-                    
-                    # get the type of property it is
-                    Type = str(ValSpec.getHumanName())
-                    
-                    # check if the value specification exists
-                    if ValSpec is None:
-                        
-                        # return an empty array
-                        MyValu = []
-                        
-                    elif Type == "Literal Boolean":
-                        
-                        # return the value
-                        MyValu = ValSpec.isValue()
-                        
-                    else:
-                        
-                        # try getting the value
-                        MyValu = ValSpec.getValue()
-                        
-                    # end if
-                    
-                # end if
-            # end for
+            elif isinstance(ValSpec, MDKernel.LiteralBoolean):
+                
+                # return the value
+                MyValu = ValSpec.isValue()
+                
+            else:
+                
+                # try getting the value
+                MyValu = ValSpec.getValue()
+                
+            # end if
 
-        else:
+        elif (len(Block.getAppliedStereotype()) == 0):
 
             # assume that it is a null property (i.e., an empty value property) and return an empty array
             MyValu = []
@@ -1521,6 +2399,107 @@ class ADHWriter():
     # end GetBlockValue
 
     # -------------------------------------------------------
+
+    # function to find what kind of element is being written
+    def Classify(self, Element):
+        """
+
+        Classify(self, Element)
+
+        Find what kind of element is being written from its metaclass and stereotypes, instead of its human name. The kind of each element is remembered by its ID, and the name of each stereotype by the stereotype's ID, so an element is only looked at once.
+
+        INPUTS:
+            self   : the SysML model
+
+            Element: the model element
+
+        OUTPUTS:
+            Kind   : "Package", "Requirement", "Block", "ValueProperty", "PartProperty", "Stereotyped" (any other element with a stereotype), or "Plain" (any other element)
+
+        """
+
+        # get the element's ID
+        ElementID = Element.getID()
+
+        # check if the element was seen before
+        if (ElementID in self.Kinds):
+            return self.Kinds[ElementID]
+        # end if
+
+        # get the names of the element's stereotypes
+        Names = [self.GetStereotypeName(itype) for itype in Element.getAppliedStereotype()]
+
+        # check for a package
+        if (isinstance(Element, MDKernel.Package)):
+            Kind = "Package"
+
+        # check for a requirement
+        elif (isinstance(Element, MDKernel.Class)) and ("Requirement" in Names):
+            Kind = "Requirement"
+
+        # check for a block
+        elif ("Block" in Names):
+            Kind = "Block"
+
+        # check for a value property
+        elif ("ValueProperty" in Names):
+            Kind = "ValueProperty"
+
+        # check for a part property (owned by its block and typed by another block)
+        elif (isinstance(Element, MDKernel.Property)) and (Element.getType() is not None) and (Element.getAggregation() == MDKernel.AggregationKindEnum.COMPOSITE) and (self.Classify(Element.getType()) == "Block"):
+            Kind = "PartProperty"
+
+        # check for any other element with a stereotype
+        elif (len(Names) > 0):
+            Kind = "Stereotyped"
+
+        else:
+            Kind = "Plain"
+
+        # end if
+
+        # remember the kind of element
+        self.Kinds[ElementID] = Kind
+
+        # return the kind of element
+        return Kind
+
+    # end Classify
+
+    # -------------------------------------------------------
+
+    # function to get the name of a stereotype
+    def GetStereotypeName(self, Stereotype):
+        """
+
+        GetStereotypeName(self, Stereotype)
+
+        Get the name of a stereotype, remembered by the stereotype's ID.
+
+        INPUTS:
+            self      : the SysML model
+
+            Stereotype: the stereotype
+
+        OUTPUTS:
+            Name      : the name of the stereotype
+
+        """
+
+        # get the stereotype's ID
+        StereotypeID = Stereotype.getID()
+
+        # get the name the first time the stereotype is seen
+        if (StereotypeID not in self.StereotypeNames):
+            self.StereotypeNames[StereotypeID] = str(Stereotype.getName())
+        # end if
+
+        # return the name
+        return self.StereotypeNames[StereotypeID]
+
+    # end GetStereotypeName
+
+    # -------------------------------------------------------
     
 # end ADHWriter
 
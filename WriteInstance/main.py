@@ -8,7 +8,7 @@ WRITE INSTANCE:
 
 Written by Paul Mokotoff, prmoko@umich.edu
 
-Last Updated: 17 Apr 2025
+Last Updated: 18 Oct 2026
 
 Inputs:
 
@@ -54,6 +54,7 @@ import java.lang.Short    as Short
 
 # import javax packages
 import javax.swing.BorderFactory                  as BorderFactory
+import javax.swing.JComboBox                      as JComboBox
 import javax.swing.GroupLayout                    as GroupLayout
 import javax.swing.JButton                        as JButton
 import javax.swing.JDialog                        as JDialog
@@ -64,7 +65,196 @@ import javax.swing.LayoutStyle.ComponentPlacement as ComponentPlacement
 import javax.swing.WindowConstants                as WindowConstants
 
 # additional python/jython imports
+import functools
+import gzip
 import json
+import os
+import struct
+import threading
+import time
+
+# -----------------------------------------------------------
+# -----------------------------------------------------------
+# -----------------------------------------------------------
+
+###############################
+#                             #
+# SETTINGS                    #
+#                             #
+###############################
+
+# write the ADH while the instance is read, reading each part only when the writer gets to it (1), or read the whole instance before writing (0)
+STREAM_ADH = 1
+
+# read the instances without an editing session (0), so the export adds no undo history and does not hold up other edits, or open a session around the export as older versions did (1)
+EXPORT_SESSION = 0
+
+# format selected in the filename dialog at first: indented JSON ("json"), minified JSON ("minified"), gzip-compressed minified JSON ("gzip", written as .json.gz), or MessagePack ("msgpack", written as .msgpack)
+ADH_FORMAT = "json"
+
+# time the hot functions and write a summary to <name>-Timing.txt next to the ADH (1) or not (0)
+TIME_ADH = 0
+
+# -----------------------------------------------------------
+# -----------------------------------------------------------
+# -----------------------------------------------------------
+
+###############################
+#                             #
+# TIMING INSTRUMENTATION      #
+#                             #
+###############################
+
+# calls and seconds spent in each timed function, and when and on which thread the action started
+TIMING_STATS = {}
+TIMING_START = [0.0, None]
+
+def Timed(Function):
+    """
+
+    Timed(Function)
+
+    Decorate a function so its calls and time are recorded when TIME_ADH is on. Only the outermost call on the thread that runs the action is recorded.
+
+    INPUTS:
+        Function     : the function to be timed
+
+    OUTPUTS:
+        TimedFunction: the timed function (or the function itself, if TIME_ADH is off)
+
+    """
+
+    # check if the function must be timed
+    if (TIME_ADH == 0):
+        return Function
+    # end if
+
+    # get the name of the function
+    Name = Function.__name__
+
+    # wrap the function
+    @functools.wraps(Function)
+    def TimedFunction(*args, **kwargs):
+
+        # get the statistics of the function: [calls, seconds, running]
+        Stats = TIMING_STATS.setdefault(Name, [0, 0.0, 0])
+
+        # skip recursive calls and other threads
+        if (Stats[2] == 1) or (threading.current_thread() is not TIMING_START[1]):
+            return Function(*args, **kwargs)
+        # end if
+
+        # time the call
+        Stats[2] = 1
+        Start    = time.time()
+
+        try:
+            return Function(*args, **kwargs)
+        finally:
+            Stats[0] += 1
+            Stats[1] += time.time() - Start
+            Stats[2]  = 0
+        # end try-finally
+    # end TimedFunction
+
+    # return the timed function
+    return TimedFunction
+
+# end Timed
+
+# -----------------------------------------------------------
+
+def ResetTiming():
+    """
+
+    ResetTiming()
+
+    Forget the statistics of an earlier action and start timing the current thread.
+
+    INPUTS:
+        none
+
+    OUTPUTS:
+        none
+
+    """
+
+    # forget the statistics and start timing
+    TIMING_STATS.clear()
+    TIMING_START[0] = time.time()
+    TIMING_START[1] = threading.current_thread()
+
+# end ResetTiming
+
+# -----------------------------------------------------------
+
+def GetSideFile(Filename, Suffix):
+    """
+
+    GetSideFile(Filename, Suffix)
+
+    Get the name of a file written next to an ADH, by replacing the ADH's extension (including a compression suffix, such as the ".gz" of ".json.gz") with a suffix, as: <ADH><Suffix>.
+
+    INPUTS:
+        Filename: the name of the ADH
+
+        Suffix  : the end of the file's name (e.g., "-Timing.txt")
+
+    OUTPUTS:
+        the name of the file
+
+    """
+
+    # leave off the ".gz" of a compressed ADH
+    if (Filename.lower().endswith(".gz")):
+        Filename = Filename[:-3]
+    # end if
+
+    # replace the extension of the ADH
+    return os.path.splitext(Filename)[0] + Suffix
+
+# end GetSideFile
+
+# -----------------------------------------------------------
+
+def WriteTiming(Filename):
+    """
+
+    WriteTiming(Filename)
+
+    Write the calls and time of each timed function (slowest first) to <name>-Timing.txt, next to the file given, if TIME_ADH is on.
+
+    INPUTS:
+        Filename: the name of the ADH read or written by the action
+
+    OUTPUTS:
+        none
+
+    """
+
+    # check if the functions were timed
+    if (TIME_ADH == 0):
+        return
+    # end if
+
+    # open a file next to the ADH
+    f = open(GetSideFile(Filename, "-Timing.txt"), "w")
+
+    try:
+
+        # write the total time and each function, slowest first
+        f.write("Total time: %.3f s\n\n" % (time.time() - TIMING_START[0]))
+        for Name, Stats in sorted(TIMING_STATS.items(), key = lambda Item: -Item[1][1]):
+            f.write("%-24s %10d calls %12.3f s\n" % (Name, Stats[0], Stats[1]))
+        # end for
+
+    finally:
+
+        # close the file
+        f.close()
+
+    # end try-finally
+# end WriteTiming
 
 # -----------------------------------------------------------
 # -----------------------------------------------------------
@@ -388,6 +578,7 @@ class FilenamePanel(JPanel):
         self.Title = JLabel()
         self.TextLabel = JLabel()
         self.FilenameInput = JTextField()
+        self.FormatInput = JComboBox()
         self.RunButton = JButton()
 
         # setup the main panel
@@ -409,6 +600,13 @@ class FilenamePanel(JPanel):
         self.FilenameInput.setFont(Font("Times New Roman", 0, 14))
         self.FilenameInput.setText("Input filename to be read/written/updated")
 
+        # setup the format selector (the extension of the file is changed to match the format)
+        self.FormatInput.setFont(Font("Times New Roman", 0, 14))
+        for MyFormat in ADH_FORMATS:
+            self.FormatInput.addItem(MyFormat[1])
+        # end for
+        self.FormatInput.setSelectedIndex([MyFormat[0] for MyFormat in ADH_FORMATS].index(ADH_FORMAT))
+
         # setup the "run" button
         self.RunButton.setFont(Font("Times New Roman", 1, 12))
         self.RunButton.setText("Run")
@@ -430,6 +628,8 @@ class FilenamePanel(JPanel):
                         .addComponent(self.RunButton)) \
                     .addGroup(MainPanelLayout.createSequentialGroup() \
                         .addComponent(self.FilenameInput, GroupLayout.PREFERRED_SIZE, 500, GroupLayout.PREFERRED_SIZE) \
+                        .addPreferredGap(ComponentPlacement.RELATED) \
+                        .addComponent(self.FormatInput, GroupLayout.PREFERRED_SIZE, GroupLayout.DEFAULT_SIZE, GroupLayout.PREFERRED_SIZE) \
                         .addGap(0, 0, Short.MAX_VALUE)) \
                     .addComponent(self.TextLabel, GroupLayout.DEFAULT_SIZE, 718, Short.MAX_VALUE)) \
                 .addContainerGap()) \
@@ -444,7 +644,9 @@ class FilenamePanel(JPanel):
                 .addGap(18, 18, 18) \
                 .addComponent(self.TextLabel) \
                 .addPreferredGap(ComponentPlacement.RELATED) \
-                .addComponent(self.FilenameInput, GroupLayout.PREFERRED_SIZE, GroupLayout.DEFAULT_SIZE, GroupLayout.PREFERRED_SIZE) \
+                .addGroup(MainPanelLayout.createParallelGroup(GroupLayout.Alignment.BASELINE) \
+                    .addComponent(self.FilenameInput, GroupLayout.PREFERRED_SIZE, GroupLayout.DEFAULT_SIZE, GroupLayout.PREFERRED_SIZE) \
+                    .addComponent(self.FormatInput, GroupLayout.PREFERRED_SIZE, GroupLayout.DEFAULT_SIZE, GroupLayout.PREFERRED_SIZE)) \
                 .addPreferredGap(ComponentPlacement.RELATED, 28, Short.MAX_VALUE) \
                 .addComponent(self.RunButton)
                 .addContainerGap(GroupLayout.DEFAULT_SIZE, Short.MAX_VALUE)) \
@@ -493,11 +695,14 @@ class FilenamePanel(JPanel):
         # get the text input
         Filename = self.FilenameInput.getText()
 
+        # get the format selected
+        Format = ADH_FORMATS[self.FormatInput.getSelectedIndex()][0]
+
         # generate the model structure
         Writer = ADHInstanceWriter()
         
         # execute the generator on the object
-        Writer.execute(self.MyParentElement, Filename)
+        Writer.execute(self.MyParentElement, Filename, Format)
         
     # end DoneListener
 
@@ -602,474 +807,1152 @@ def ReshapeArray(Arr, NewShape):
 
 ###############################
 #                             #
-# ADH WRITER                  #
+# FUNCTIONS FOR READING A     #
+# COMPACT ARRAY               #
 #                             #
 ###############################
 
-class ADHInstanceWriter():
+# symbol marking the expression that holds a compact array, followed by its shape (e.g., "ADHArray:3x2")
+ARRAY_SYMBOL = "ADHArray"
 
-    # initialization
-    def __init__(self):
-        """
+def GetArrayShape(ValSpec):
+    """
 
-        __init__(self)
+    GetArrayShape(ValSpec)
 
-        Initialization function for the ADH instance writer.
+    Get the shape of a compact array from the symbol of the expression holding its values.
 
-        INPUTS:
-            self: the class for writing the instance.
+    INPUTS:
+        ValSpec: the value specification to be analyzed
 
-        OUTPUTS:
-            none
+    OUTPUTS:
+        a list with the size of each dimension (None if the value specification is not a compact array)
 
-        """
-        
-        # get the project
-        self.Project = Application.getInstance().getProject()
+    """
 
-        # get the elements factory
-        self.Factory = self.Project.getElementsFactory()
+    # try to get the expression symbol
+    try:
 
-        # get the model element manager
-        self.Manager = MEM.getInstance()
+        # get the symbol
+        Symbol = ValSpec.getSymbol()
 
-        # get the model
-        self.Model = self.Project.getModel()
-        
-    # end __init__
+    except AttributeError:
 
-    # -------------------------------------------------------
+        # not an expression
+        return None
 
-    # action execution
-    def execute(self, ParentPackage, Filename):
-        """
-        
-        execute(self, ParentPackage, Filename)
+    # end try-except
 
-        Function to run the ADH instance writer.
+    # check that the symbol marks a compact array
+    if (Symbol is None) or (not str(Symbol).startswith(ARRAY_SYMBOL + ":")):
 
-        INPUTS:
-            self         : the ADH instance writer class.
+        # not a compact array
+        return None
 
-            ParentPackage: the highest-level model element selected.
+    # end if
 
-            Filename     : the name of the JSON file input by the user.
+    # return the size of each dimension
+    return [int(n) for n in str(Symbol)[len(ARRAY_SYMBOL) + 1:].split("x")]
 
-        OUTPUTS:
-            none
+# end GetArrayShape
 
-        """
-        
-        # try to create a session
-        try:
+# -----------------------------------------------------------
 
-            # create the session
-            SM.getInstance().createSession(self.Project, "Write ADH")
+def GetLiteralValue(Literal):
+    """
 
-            # get the requirement stereotype from the SysML stereotype profile
-            self.ReqSter = SH.getStereotype(self.Project, "Requirement", "SysML::Requirements")
+    GetLiteralValue(Literal)
 
-            # get the name of the parent pacakge
-            ParentPackageName = ParentPackage.getName()
-            
-            # get the dictionary needed for writing to the ADH
-            MyDict = self.GetBlock(ParentPackage, 1)
+    Get the value held by a literal value specification.
 
-            # convert the dictionaries to JSON strings
-            OutJSON = json.dumps({ParentPackageName : MyDict}, indent = 4, ensure_ascii = True)
-            
-            # open a file
-            f = open(Filename, "w")
+    INPUTS:
+        Literal: the literal to be read
 
-            # print the JSON string to the file
-            f.write(OutJSON)
+    OUTPUTS:
+        the value of the literal
 
-            # close the file
-            f.close()
+    """
 
-            # close the session
-            SM.getInstance().closeSession(self.Project)
+    # check for a Boolean
+    if (str(Literal.getHumanName()) == "Literal Boolean"):
 
-        except Exception as e:
-        
-            # print that an exception occurred
-            Application.getInstance().getGUILog().showMessage("Exception occurred: " + repr(e))
-        
-            # cancel the session
-            SM.getInstance().cancelSession(self.Project)
+        # return the value
+        return Literal.isValue()
 
-        # end try-except
-    # end execute
+    # end if
 
-    # -------------------------------------------------------
+    # return the value
+    return Literal.getValue()
 
-    def GetBlock(self, ParentBlock, HighestLevel):
-        """
+# end GetLiteralValue
 
-        GetBlock(self, ParentBlock, HighestLevel)
+# -----------------------------------------------------------
 
-        Function to recursively explore a branch of the instance to be written.
+def ReadArrayValue(Literals, Shape):
+    """
 
-        INPUTS:
-            self        : the ADH instance writer class
+    ReadArrayValue(Literals, Shape)
 
-            ParentBlock : the highest-level block selected
+    Read the values of a compact array and reshape them into an n-dimensional array.
 
-            HighestLevel: flag to indicate whether this block was selected by the user (1) or not (0)
+    INPUTS:
+        Literals: the literals holding the array values, in order
 
-        OUTPUTS:
-            MySysDict   : dictionary representing the system and its nested part and value properties
+        Shape   : the size of each dimension
 
-        """
+    OUTPUTS:
+        the n-dimensional array (or a flat list if the number of values does not match the shape)
 
-        # create two dictionaries for storing data
-        MySysDict = {}
-        TempDict  = {}
-        
-        # get the name
-        TempName = ParentBlock.getHumanName()
+    """
 
-        # get the component name
-        CompName = TempName.split("Instance Specification ")[1]
+    # get the values
+    Values = [GetLiteralValue(Literal) for Literal in Literals]
 
-        # try to get only the component name (not the entire path)
-        try:
+    # get the number of values the shape holds
+    Size = 1
+    for Dim in Shape:
+        Size *= Dim
+    # end for
 
-            # split up all of the sub-names and take the last one
-            CompName = CompName.split(".")[-1]
+    # check that the values fill the shape
+    if (Size != len(Values)):
 
-        except:
+        # return the values as they are
+        return Values
 
-            # do nothing
-            pass
+    # end if
 
-        # end try-except
-        
-        # get the children of the current block
-        MyChildren = ParentBlock.getSlot()
+    # reshape the array
+    return ReshapeArray(Values, Shape)
 
-        # flag for names with underscores
-        UseArray = 0
+# end ReadArrayValue
 
-        # string to compare other strings to (for array writing)
-        OldBaseString = ""
-        
-        for ichild in range(len(MyChildren)):
-            
-            # get the defining feature
-            MyFeature = MyChildren[ichild].getDefiningFeature()
-            
-            # get the name
-            FeatureName = MyFeature.getHumanName()
-            
-            # get the value
-            MyValue = MyChildren[ichild].getValue()                
+# -----------------------------------------------------------
+# -----------------------------------------------------------
+# -----------------------------------------------------------
 
-            # check for the type of feature
-            if ("Value Property " in FeatureName):
+###############################
+#                             #
+# ARRAY REASSEMBLY            #
+#                             #
+###############################
 
-                # get the property name
-                PropertyName = str(FeatureName.split("Value Property ")[1])
-                
-                # get the value
-                try:
+def GetArrayIndices(Name):
+    """
 
-                    # try treating it as an integer/double/string
-                    PropertyValue = MyValue[0].getValue()
+    GetArrayIndices(Name)
 
-                except:
+    Split the name of an array's element (VarName__i__j__...__k) into the name of the array and the element's indices.
 
-                    # if it fails, try another method
-                    try:
+    INPUTS:
+        Name   : the name of the model element
 
-                        # treat the value as a boolean
-                        PropertyValue = MyValue[0].isValue()
+    OUTPUTS:
+        Base   : the name of the array (None if the model element is not an array's element)
 
-                    except:
+        Indices: a tuple with the element's indices (None if the model element is not an array's element)
 
-                        # return a null value
-                        PropertyValue = None
+    """
 
-                        # there is an issue with the value property format/type
-                        raise Exception("ERROR - WriteInstance: " + repr(FeatureName) + " is neither an integer, double, string, or Boolean.")
+    # check if a double underscore exists
+    HasUnder = Name.find("__")
 
-                    # end try-except
-                # end try-except
+    # check for a plain name
+    if (HasUnder == -1):
+        return None, None
+    # end if
 
-                # check if the name has an underscore
-                HasUnder = PropertyName.find("__")
+    # get the indices
+    Parts = Name[HasUnder + 2:].split("__")
 
-                # if an underscore exists, follow the procedure
-                if (HasUnder != -1):
+    # check that every index is an integer
+    for Part in Parts:
+        if (not Part.isdigit()):
+            return None, None
+        # end if
+    # end for
 
-                    # get the new base string
-                    NewBaseString = PropertyName[:HasUnder]
+    # return the name of the array and the indices
+    return str(Name[:HasUnder]), tuple(int(Part) for Part in Parts)
 
-                    # get the indices
-                    Indices = PropertyName.split("__")[1:]
-                    
-                    # check if the strings match
-                    if (NewBaseString == OldBaseString):
+# end GetArrayIndices
 
-                        # change each index to an integer
-                        for ival in range(len(Indices)):
+# -----------------------------------------------------------
 
-                            # convert the value and take the maximum for array space allocation
-                            IntIndices[ival] = max(IntIndices[ival], int(Indices[ival]))
+class ArrayBuilder():
 
-                        # end for
+    # -------------------------------------------------------
 
-                        # append to the array
-                        TempArray.append(PropertyValue)
+    # initialization
+    def __init__(self):
+        """
 
-                    else:
+        __init__(self)
 
-                        # check if another array already exists
-                        if (UseArray == 1):
+        Rebuild the arrays whose elements are stored as separate model elements (VarName__i__j__...__k). The elements are collected by the name of their array, in any order, and each array is then made once, at its full shape, with every element placed directly at its indices. Indices that no element was found at are left as null.
 
-                            # loop through all indices
-                            for ival in range(len(IntIndices)):
+        INPUTS:
+            self: the array builder
 
-                                # increment the indices by 1
-                                IntIndices[ival] += 1
+        OUTPUTS:
+            none
 
-                            # end for
+        """
 
-                            # reshape the temporary array
-                            FinalArray = ReshapeArray(TempArray, IntIndices)
+        # names of the arrays, in the order they were found
+        self.Names = []
 
-                            # reset the indices
-                            for ival in range(len(IntIndices)):
-                                IntIndices[ival] = 0
-                            # end if
+        # elements of each array, as (indices, value), by the name of the array
+        self.Elements = {}
 
-                            # write out the first array
-                            TempDict.update({str(OldBaseString) : FinalArray})
+    # end __init__
 
-                        else:
+    # -------------------------------------------------------
 
-                            # start using the array
-                            UseArray = 1
+    # function to add an element
+    def Add(self, Name, Value):
+        """
 
-                        # end if
+        Add(self, Name, Value)
 
-                        # create a list for the actual indices
-                        IntIndices = [0] * len(Indices)
+        Add a model element to its array, if it is an array's element.
 
-                        # change each index to an integer
-                        for ival in range(len(Indices)):
-                            
-                            # convert the value and take the maximum for array space allocation
-                            IntIndices[ival] = max(IntIndices[ival], int(Indices[ival]))
-                            
-                        # end for
+        INPUTS:
+            self : the array builder
 
-                        # remember the new string
-                        OldBaseString = NewBaseString
+            Name : the name of the model element
 
-                        # remember the value in an array
-                        TempArray = [PropertyValue]
+            Value: the value of the model element
 
-                    # end if
+        OUTPUTS:
+            1 if the model element is an array's element (and was added), 0 otherwise
 
-                else:
+        """
 
-                    # check if we were in an array
-                    if (UseArray == 1):
+        # get the name of the array and the indices
+        Base, Indices = GetArrayIndices(Name)
 
-                        # loop through all the indices
-                        for ival in range(len(IntIndices)):
+        # check for a plain name
+        if (Base is None):
+            return 0
+        # end if
 
-                            # increment the indices by 1
-                            IntIndices[ival] += 1
+        # check if the array was found yet
+        if (Base not in self.Elements):
 
-                        # end for
+            # start a new array
+            self.Names.append(Base)
+            self.Elements[Base] = []
 
-                        # reshape the temporary array
-                        FinalArray = ReshapeArray(TempArray, IntIndices)
+        # check that the element has as many indices as the rest of the array
+        elif (len(Indices) != len(self.Elements[Base][0][0])):
 
-                        # reset the indices
-                        for ival in range(len(IntIndices)):
-                            IntIndices[ival] = 0
-                        # end if
+            # it is not part of the array
+            return 0
 
-                        # write out the first array
-                        TempDict.update({str(OldBaseString) : FinalArray})
+        # end if
 
-                        # the array is no longer used, turn off the flag
-                        UseArray = 0
+        # add the element
+        self.Elements[Base].append((Indices, Value))
 
-                    # end if
+        # the element was added
+        return 1
 
-                    # check if the value is unicode
-                    if (isinstance(PropertyValue, unicode)):
+    # end Add
 
-                        # convert it to a string
-                        PropertyValue = str(PropertyValue)
+    # -------------------------------------------------------
 
-                    # end if
-                
-                    # update the dictionary
-                    TempDict.update({PropertyName : PropertyValue})
-                                
-            elif ("Part Property " in FeatureName):
+    # function to add the arrays to a dictionary
+    def Update(self, MyDict):
+        """
+
+        Update(self, MyDict)
+
+        Make each array and add it to a dictionary.
+
+        INPUTS:
+            self  : the array builder
+
+            MyDict: the dictionary that the arrays are added to
+
+        OUTPUTS:
+            none
+
+        """
+
+        # loop through the arrays
+        for Base in self.Names:
+
+            # get the elements
+            Elements = self.Elements[Base]
+
+            # get the shape of the array (one more than the largest index in each dimension)
+            Shape = [0] * len(Elements[0][0])
+            for Indices, Value in Elements:
+                for idim in range(len(Indices)):
+                    Shape[idim] = max(Shape[idim], Indices[idim] + 1)
+                # end for
+            # end for
+
+            # make the array at its full shape
+            MyArray = AllocateArray(Shape)
+
+            # loop through the elements
+            for Indices, Value in Elements:
+
+                # find the list that holds the element
+                Row = MyArray
+                for Index in Indices[:-1]:
+                    Row = Row[Index]
+                # end for
+
+                # place the element
+                Row[Indices[-1]] = Value
+
+            # end for
+
+            # add the array
+            MyDict.update({Base : MyArray})
+
+        # end for
+
+    # end Update
+
+    # -------------------------------------------------------
+
+# end ArrayBuilder
+
+# -----------------------------------------------------------
+
+def AllocateArray(Shape):
+    """
+
+    AllocateArray(Shape)
+
+    Make a nested list of nulls with the given shape.
+
+    INPUTS:
+        Shape  : a list with the length of each dimension
+
+    OUTPUTS:
+        MyArray: the nested list
+
+    """
+
+    # make the innermost lists
+    if (len(Shape) == 1):
+        return [None] * Shape[0]
+    # end if
+
+    # make each row
+    return [AllocateArray(Shape[1:]) for irow in range(Shape[0])]
+
+# end AllocateArray
+
+# -----------------------------------------------------------
+# -----------------------------------------------------------
+# -----------------------------------------------------------
+
+###############################
+#                             #
+# ADH FILE FORMATS            #
+#                             #
+###############################
+
+# formats the ADH can be written in: (format, name in the filename dialog, extension, layout given to the JSON writer)
+ADH_FORMATS = [("json"    , "JSON (indented)"       , ".json"   , 4        ), \
+               ("minified", "JSON (minified)"       , ".json"   , None     ), \
+               ("gzip"    , "JSON (gzip-compressed)", ".json.gz", None     ), \
+               ("msgpack" , "MessagePack (binary)"  , ".msgpack", "msgpack")]
+
+def GetFormat(Format):
+    """
+
+    GetFormat(Format)
+
+    Get the description of an ADH format.
+
+    INPUTS:
+        Format: the format ("json", "minified", "gzip", or "msgpack")
+
+    OUTPUTS:
+        the format's entry in ADH_FORMATS
+
+    """
+
+    # loop through the formats
+    for MyFormat in ADH_FORMATS:
+
+        # check for the format
+        if (MyFormat[0] == Format):
+            return MyFormat
+        # end if
+
+    # end for
+
+    # throw an error
+    raise ValueError("Unknown ADH format " + repr(Format))
+
+# end GetFormat
+
+# -----------------------------------------------------------
+
+def GetFormatFile(Filename, Format):
+    """
+
+    GetFormatFile(Filename, Format)
+
+    Get the name of the file an ADH is written to, so its extension matches its format (the readers choose how to read an ADH by its extension). A file named for another format is renamed (e.g., ADH.json is written as ADH.msgpack), and JSON may still be written to a file with any other extension.
+
+    INPUTS:
+        Filename: the name of the ADH input by the user
+
+        Format  : the format of the ADH
+
+    OUTPUTS:
+        the name of the file to write
+
+    """
+
+    # get the extension of the format
+    Extension = GetFormat(Format)[2]
+
+    # check if the file already has it
+    if (Filename.lower().endswith(Extension)):
+        return Filename
+    # end if
+
+    # leave off the extension of another format (longest first, so ".json.gz" is not read as ".gz")
+    Stem = Filename
+    for MyExtension in sorted(set([MyFormat[2] for MyFormat in ADH_FORMATS]), key = len, reverse = True):
+
+        # check for the extension
+        if (Stem.lower().endswith(MyExtension)):
+            Stem = Stem[:-len(MyExtension)]
+            break
+        # end if
+
+    # end for
+
+    # keep the name of a JSON file that is not named for another format
+    if (Extension == ".json") and (Stem == Filename):
+        return Filename
+    # end if
+
+    # add the extension
+    return Stem + Extension
+
+# end GetFormatFile
+
+# -----------------------------------------------------------
+
+def OpenFormatFile(Filename, Format):
+    """
+
+    OpenFormatFile(Filename, Format)
+
+    Open a file for writing an ADH in a given format, compressing it as it is written if needed.
+
+    INPUTS:
+        Filename: the name of the file
+
+        Format  : the format of the ADH
+
+    OUTPUTS:
+        the open file
+
+    """
+
+    # open the file
+    if (Format == "gzip"):
+        return gzip.open(Filename, "wb")
+    elif (Format == "msgpack"):
+        return open(Filename, "wb", 65536)
+    else:
+        return open(Filename, "w", 65536)
+    # end if
+
+# end OpenFormatFile
+
+# -----------------------------------------------------------
+
+# integer types, in the order they are tried: (smallest value, largest value, type byte, struct format)
+MSGPACK_INTEGERS = [(0                  , 0xff              , "\xcc", ">B"), \
+                    (0                  , 0xffff            , "\xcd", ">H"), \
+                    (0                  , 0xffffffff        , "\xce", ">I"), \
+                    (0                  , 0xffffffffffffffff, "\xcf", ">Q"), \
+                    (-0x80              , 0x7f              , "\xd0", ">b"), \
+                    (-0x8000            , 0x7fff            , "\xd1", ">h"), \
+                    (-0x80000000        , 0x7fffffff        , "\xd2", ">i"), \
+                    (-0x8000000000000000, 0x7fffffffffffffff, "\xd3", ">q")]
+
+def PackHeader(Kind, Size):
+    """
+
+    PackHeader(Kind, Size)
+
+    Encode the header of a MessagePack map, array, or string, using the shortest type that holds its size.
+
+    INPUTS:
+        Kind: "object" (a map), "array", or "string"
+
+        Size: the number of keys, elements, or bytes
+
+    OUTPUTS:
+        the encoded header
+
+    """
+
+    # get the fixed type, and the largest size it holds
+    if (Kind == "object"):
+        Fixed, Limit = 0x80, 16
+    elif (Kind == "array"):
+        Fixed, Limit = 0x90, 16
+    else:
+        Fixed, Limit = 0xa0, 32
+    # end if
+
+    # check for a small size
+    if (Size < Limit):
+        return chr(Fixed + Size)
+    # end if
+
+    # check for a short string
+    if (Kind == "string") and (Size <= 0xff):
+        return "\xd9" + chr(Size)
+    # end if
+
+    # get the 16- and 32-bit types
+    Type16, Type32 = {"object" : ("\xde", "\xdf"), "array" : ("\xdc", "\xdd"), "string" : ("\xda", "\xdb")}[Kind]
+
+    # encode the size
+    if (Size <= 0xffff):
+        return Type16 + struct.pack(">H", Size)
+    else:
+        return Type32 + struct.pack(">I", Size)
+    # end if
+
+# end PackHeader
+
+# -----------------------------------------------------------
+
+def PackValue(Value):
+    """
+
+    PackValue(Value)
+
+    Encode a string, number, Boolean, or null in MessagePack.
+
+    INPUTS:
+        Value: the value to encode
+
+    OUTPUTS:
+        the encoded value
+
+    """
+
+    # check for a null or Boolean
+    if (Value is None):
+        return "\xc0"
+    elif (Value is True):
+        return "\xc3"
+    elif (Value is False):
+        return "\xc2"
+    # end if
+
+    # check for an integer
+    if (isinstance(Value, (int, long))):
+
+        # check for a positive or negative fixed integer
+        if (0 <= Value <= 0x7f):
+            return chr(Value)
+        elif (-32 <= Value < 0):
+            return chr(Value + 0x100)
+        # end if
+
+        # use the first type that holds the integer
+        for Smallest, Largest, Type, Format in MSGPACK_INTEGERS:
+            if (Smallest <= Value <= Largest):
+                return Type + struct.pack(Format, Value)
+            # end if
+        # end for
+
+        # write integers too large for 64 bits as floats
+        Value = float(Value)
+
+    # end if
+
+    # check for a float
+    if (isinstance(Value, float)):
+        return "\xcb" + struct.pack(">d", Value)
+    # end if
+
+    # check for a string
+    if (isinstance(Value, basestring)):
+
+        # encode the string as UTF-8
+        if (isinstance(Value, unicode)):
+            Value = Value.encode("utf-8")
+        # end if
+
+        # write the header and the string
+        return PackHeader("string", len(Value)) + Value
+
+    # end if
+
+    # throw an error
+    raise TypeError(repr(Value) + " cannot be written in MessagePack")
+
+# end PackValue
+
+# -----------------------------------------------------------
+# -----------------------------------------------------------
+# -----------------------------------------------------------
+
+###############################
+#                             #
+# STREAMING JSON WRITER       #
+#                             #
+###############################
+
+class DeferredValue():
+
+    # -------------------------------------------------------
+
+    # initialization
+    def __init__(self, Function, *Args):
+        """
+
+        __init__(self, Function, *Args)
+
+        Remember how to read a part of the ADH from the model, without reading it yet. The JSON writer reads it when it gets there, writes it, and then lets it go.
+
+        INPUTS:
+            self    : the deferred value
+
+            Function: the function that reads the value from the model
+
+            Args    : the inputs to the function
+
+        OUTPUTS:
+            none
+
+        """
+
+        # remember the function and its inputs
+        self.Function = Function
+        self.Args     = Args
+
+    # end __init__
+
+    # -------------------------------------------------------
+
+    # function to read the value
+    def Get(self):
+        """
+
+        Get(self)
+
+        Read the value from the model.
+
+        INPUTS:
+            self: the deferred value
+
+        OUTPUTS:
+            the value
+
+        """
+
+        # read the value
+        return self.Function(*self.Args)
+
+    # end Get
+
+    # -------------------------------------------------------
+
+# end DeferredValue
+
+# -----------------------------------------------------------
+
+class JSONWriter():
+
+    # -------------------------------------------------------
+
+    # initialization
+    def __init__(self, Files, Indents):
+        """
+
+        __init__(self, Files, Indents)
+
+        Write a JSON value to one or more files as it is walked, so the whole JSON string is never held in memory. The output is the same as json.dumps (with ensure_ascii) would make, either pretty-printed or on a single line, or the same value encoded in MessagePack.
+
+        INPUTS:
+            self   : the JSON writer
+
+            Files  : the files to write to
+
+            Indents: the indent of each file (None writes the file on a single line, and "msgpack" writes it in MessagePack)
+
+        OUTPUTS:
+            none
+
+        """
+
+        # remember the JSON files and how each is laid out: (file, indent, item separator, key separator)
+        self.Targets = []
+
+        # remember the MessagePack files
+        self.Packed = []
+
+        # loop through the files
+        for ifile in range(len(Files)):
+
+            # check for MessagePack or a single line
+            if (Indents[ifile] == "msgpack"):
+                self.Packed.append(Files[ifile])
+            elif (Indents[ifile] is None):
+                self.Targets.append((Files[ifile], None, ",", ":"))
+            else:
+                self.Targets.append((Files[ifile], " " * Indents[ifile], ", ", ": "))
+            # end if
+
+        # end for
+
+        # encoder for the strings, numbers, Booleans, and nulls
+        self.Encoder = json.JSONEncoder(ensure_ascii = True)
+
+    # end __init__
+
+    # -------------------------------------------------------
+
+    # function to write text to every file
+    def WriteText(self, Text):
+        """
+
+        WriteText(self, Text)
+
+        Write the same text to every file.
+
+        INPUTS:
+            self: the JSON writer
+
+            Text: the text to write
+
+        OUTPUTS:
+            none
+
+        """
+
+        # loop through the files
+        for MyFile, Indent, ItemSep, KeySep in self.Targets:
+            MyFile.write(Text)
+        # end for
+
+    # end WriteText
+
+    # -------------------------------------------------------
+
+    # function to write bytes to every MessagePack file
+    def WritePacked(self, Bytes):
+        """
+
+        WritePacked(self, Bytes)
+
+        Write the same encoded bytes to every MessagePack file.
+
+        INPUTS:
+            self : the JSON writer
+
+            Bytes: the bytes to write
+
+        OUTPUTS:
+            none
+
+        """
+
+        # loop through the files
+        for MyFile in self.Packed:
+            MyFile.write(Bytes)
+        # end for
+
+    # end WritePacked
+
+    # -------------------------------------------------------
+
+    # function to write a separator
+    def WriteBreak(self, Level, Separator):
+        """
+
+        WriteBreak(self, Level, Separator)
+
+        Write the text between two items, or at the start or end of a dictionary or list, laid out for each file.
+
+        INPUTS:
+            self     : the JSON writer
+
+            Level    : how deeply the next line is indented
+
+            Separator: 1 to separate two items (or keys and values), 0 otherwise
+
+        OUTPUTS:
+            none
+
+        """
+
+        # loop through the files
+        for MyFile, Indent, ItemSep, KeySep in self.Targets:
+
+            # get the separator
+            Text = ItemSep if (Separator == 1) else ""
+
+            # start a new line in pretty-printed files
+            if (Indent is not None):
+                Text = Text + "\n" + Indent * Level
+            # end if
+
+            # write the separator
+            MyFile.write(Text)
+
+        # end for
+
+    # end WriteBreak
+
+    # -------------------------------------------------------
+
+    # function to write a value
+    def Write(self, Value, Level = 0):
+        """
+
+        Write(self, Value, Level = 0)
+
+        Write a JSON value, reading each deferred value from the model when it is reached.
+
+        INPUTS:
+            self : the JSON writer
+
+            Value: the value to write
+
+            Level: (optional, default is 0) how deeply the value is nested
+
+        OUTPUTS:
+            none
+
+        """
+
+        # read a deferred value from the model
+        if (isinstance(Value, DeferredValue)):
+            Value = Value.Get()
+        # end if
+
+        # check for a dictionary
+        if (isinstance(Value, dict)):
+
+            # start the map in the MessagePack files
+            self.WritePacked(PackHeader("object", len(Value)))
+
+            # check for an empty dictionary
+            if (len(Value) == 0):
+                self.WriteText("{}")
+                return
+            # end if
+
+            # open the dictionary
+            self.WriteText("{")
+
+            # loop through the keys (in the order json.dumps uses)
+            First = 1
+            for ikey, ival in Value.items():
+
+                # separate the items
+                self.WriteBreak(Level + 1, 1 - First)
+                First = 0
+
+                # write the key
+                self.WriteText(self.Encoder.encode(ikey) if (len(self.Targets) > 0) else "")
+                for MyFile, Indent, ItemSep, KeySep in self.Targets:
+                    MyFile.write(KeySep)
+                # end for
+                self.WritePacked(PackValue(ikey) if (len(self.Packed) > 0) else "")
+
+                # write the value
+                self.Write(ival, Level + 1)
+
+            # end for
 
-                # get the part property name
-                PropertyName = str(FeatureName.split("Part Property ")[1])
+            # close the dictionary
+            self.WriteBreak(Level, 0)
+            self.WriteText("}")
 
-                # get the next instance specification
-                NextInst = MyChildren[ichild].getOwnedElement()[0]
-                
-                # get the instance value
-                InstanceValue = NextInst.getInstance()
+        # check for a list
+        elif (isinstance(Value, (list, tuple))):
 
-                # recursively search the model
-                NewDict = self.GetBlock(InstanceValue, 0)
+            # start the array in the MessagePack files
+            self.WritePacked(PackHeader("array", len(Value)))
 
-                # check if a double underscore exists
-                HasUnder = PropertyName.find("__")
+            # check for an empty list
+            if (len(Value) == 0):
+                self.WriteText("[]")
+                return
+            # end if
 
-                # if an underscore exists, check if we're in an array
-                if (HasUnder != -1):
+            # open the list
+            self.WriteText("[")
 
-                    # get the new base string
-                    NewBaseString = PropertyName[:HasUnder]
+            # loop through the elements
+            for ielem in range(len(Value)):
 
-                    # get the indices
-                    Indices = PropertyName.split("__")[1:]
+                # separate the elements
+                self.WriteBreak(Level + 1, 1 if (ielem > 0) else 0)
 
-                    # check if the strings match
-                    if (NewBaseString == OldBaseString):
+                # write the element
+                self.Write(Value[ielem], Level + 1)
 
-                        # change each index to an integer
-                        for ival in range(len(Indices)):
+            # end for
 
-                            # convert the value to an integer and take the maximum for array space allocation
-                            IntIndices[ival] = max(IntIndices[ival], int(Indices[ival]))
+            # close the list
+            self.WriteBreak(Level, 0)
+            self.WriteText("]")
 
-                        # end for
+        else:
 
-                        # append to the array
-                        TempArray.append(NewDict[PropertyName])
+            # write a string, number, Boolean, or null
+            self.WriteText(self.Encoder.encode(Value) if (len(self.Targets) > 0) else "")
+            self.WritePacked(PackValue(Value) if (len(self.Packed) > 0) else "")
 
-                    else:
+        # end if
 
-                        # check if another array already exists
-                        if (UseArray == 1):
+    # end Write
 
-                            # loop through all the indices
-                            for ival in range(len(IntIndices)):
+    # -------------------------------------------------------
 
-                                # increment the indices by 1
-                                IntIndices[ival] += 1
+# end JSONWriter
 
-                            # end for
+# -----------------------------------------------------------
 
-                            # reshape the temporary array
-                            FinalArray = ReshapeArray(TempArray, IntIndices)
+def ReplaceFile(TempFile, Filename):
+    """
 
-                            # reset indices
-                            for ival in range(len(IntIndices)):
-                                IntIndices[ival] = 0
-                            # end for                            
+    ReplaceFile(TempFile, Filename)
 
-                            # write out the first array
-                            TempDict.update({OldBaseString : FinalArray})
+    Replace a file with the one written next to it, so a failed write never leaves half of a file behind.
 
-                        else:
+    INPUTS:
+        TempFile: the file that was written
 
-                            # start using the array
-                            UseArray = 1
+        Filename: the file to be replaced
 
-                        # end if
+    OUTPUTS:
+        none
 
-                        # create a list for the actual indices
-                        IntIndices = [0] * len(Indices)
+    """
 
-                        # change each index to an integer
-                        for ival in range(len(Indices)):
+    # remove the old file (renaming onto an existing file fails on Windows)
+    if (os.path.isfile(Filename)):
+        os.remove(Filename)
+    # end if
 
-                            # conert the value to an integer and take the maximum for array space allocation
-                            IntIndices[ival] = max(IntIndices[ival], int(Indices[ival]))
-                            
-                        # end for
+    # move the new file into place
+    os.rename(TempFile, Filename)
 
-                        # remember the new string
-                        OldBaseString = NewBaseString
+# end ReplaceFile
 
-                        # remmeber the value in an array
-                        TempArray = [NewDict[PropertyName]]
+# -----------------------------------------------------------
+# -----------------------------------------------------------
+# -----------------------------------------------------------
 
-                    # end if
+###############################
+#                             #
+# ADH WRITER                  #
+#                             #
+###############################
 
-                else:
+class ADHInstanceWriter():
+
+    # initialization
+    def __init__(self):
+        """
 
-                    # check if we were in an array
-                    if (UseArray == 1):
+        __init__(self)
 
-                        # loop through all the indices
-                        for ival in range(len(IntIndices)):
+        Initialization function for the ADH instance writer.
 
-                            # increment the indices by 1
-                            IntIndices[ival] += 1
+        INPUTS:
+            self: the class for writing the instance.
 
-                        # end for
+        OUTPUTS:
+            none
 
-                        # reshape the temporary array
-                        FinalArray = ReshapeArray(TempArray, IntIndices)
+        """
+        
+        # get the project
+        self.Project = Application.getInstance().getProject()
 
-                        # reset indices
-                        for ival in range(len(IntIndices)):
-                            IntIndices[ival] = 0
-                        # end for                        
+        # get the elements factory
+        self.Factory = self.Project.getElementsFactory()
 
-                        # write out the first array
-                        TempDict.update({OldBaseString : FinalArray})
+        # get the model element manager
+        self.Manager = MEM.getInstance()
 
-                        # the array is no longer used, turn off the flag
-                        UseArray = 0
+        # get the model
+        self.Model = self.Project.getModel()
+        
+    # end __init__
 
-                    # end if
+    # -------------------------------------------------------
 
-                    # update the dictionary
-                    TempDict.update(NewDict)
+    # action execution
+    def execute(self, ParentPackage, Filename, Format = None):
+        """
+        
+        execute(self, ParentPackage, Filename, Format = None)
 
-                # end if
+        Function to run the ADH instance writer.
+
+        INPUTS:
+            self         : the ADH instance writer class.
+
+            ParentPackage: the highest-level model element selected.
+
+            Filename     : the name of the JSON file input by the user.
+
+            Format       : (optional, default is ADH_FORMAT) the format of the ADH (see ADH_FORMATS).
+
+        OUTPUTS:
+            none
+
+        """
+        
+        # get the format, and name the file to match it
+        Format   = ADH_FORMAT if (Format is None) else Format
+        Filename = GetFormatFile(Filename, Format)
+
+        # start timing the hot functions
+        ResetTiming()
+
+        # try to write the ADH
+        try:
+
+            # create a session, unless the instances are only read (the export changes nothing, so it needs no undo history)
+            if (EXPORT_SESSION == 1):
+                SM.getInstance().createSession(self.Project, "Write ADH")
             # end if
-        # end for
 
-        # check if the array is still in use after iterating
-        if (UseArray == 1):
+            # get the requirement stereotype from the SysML stereotype profile
+            self.ReqSter = SH.getStereotype(self.Project, "Requirement", "SysML::Requirements")
 
-            # loop through all the indices
-            for ival in range(len(IntIndices)):
-                
-                # increment the indices by 1
-                IntIndices[ival] += 1
-                
-            # end for
-            
-            # reshape the temporary array
-            FinalArray = ReshapeArray(TempArray, IntIndices)
-            
-            # write out the first array
-            TempDict.update({OldBaseString : FinalArray})
+            # get the name of the parent pacakge
+            ParentPackageName = ParentPackage.getName()
             
-            # the array is no longer used, turn off the flag
-            UseArray = 0
+            # get the dictionary needed for writing to the ADH (with STREAM_ADH, the parts are only read while they are written)
+            MyDict = self.GetBlock(ParentPackage, 1)
 
-        # end if
+            # write the ADH next to the file it replaces
+            f = OpenFormatFile(Filename + ".tmp", Format)
+
+            # try to write the file
+            Written = 0
+            try:
+
+                # write the JSON to the file, laid out for its format
+                JSONWriter([f], [GetFormat(Format)[3]]).Write({ParentPackageName : MyDict})
+                Written = 1
+
+            finally:
+
+                # close the file
+                f.close()
+
+                # remove the file if it was not finished
+                if (Written == 0):
+                    os.remove(Filename + ".tmp")
+                # end if
+
+            # end try-finally
+
+            # replace the ADH only once it was written
+            ReplaceFile(Filename + ".tmp", Filename)
+
+            # close the session
+            if (EXPORT_SESSION == 1):
+                SM.getInstance().closeSession(self.Project)
+            # end if
+
+        except Exception as e:
+        
+            # print that an exception occurred
+            Application.getInstance().getGUILog().showMessage("Exception occurred: " + repr(e))
+        
+            # cancel the session
+            if (EXPORT_SESSION == 1):
+                SM.getInstance().cancelSession(self.Project)
+            # end if
+
+        # end try-except
+
+        # write where the time went
+        WriteTiming(Filename)
+
+    # end execute
+
+    # -------------------------------------------------------
+
+    @Timed
+    def GetBlock(self, ParentBlock, HighestLevel):
+        """
+
+        GetBlock(self, ParentBlock, HighestLevel)
+
+        Function to recursively explore a branch of the instance to be written.
+
+        INPUTS:
+            self        : the ADH instance writer class
+
+            ParentBlock : the highest-level block selected
+
+            HighestLevel: flag to indicate whether this block was selected by the user (1) or not (0)
+
+        OUTPUTS:
+            MySysDict   : dictionary representing the system and its nested part and value properties
+
+        """
+
+        # create a dictionary for storing data
+        MySysDict = {}
+        
+        # get the name
+        TempName = ParentBlock.getHumanName()
 
+        # get the component name
+        CompName = TempName.split("Instance Specification ")[1]
+
+        # try to get only the component name (not the entire path)
+        try:
+
+            # split up all of the sub-names and take the last one
+            CompName = CompName.split(".")[-1]
+
+        except:
+
+            # do nothing
+            pass
+
+        # end try-except
+        
         # check whether the block name must be written or not
         if (HighestLevel == 1):
             
             # update with only the dictionary
-            MySysDict.update(TempDict)
+            MySysDict.update(self.GetSlots(ParentBlock))
+
+        elif (STREAM_ADH == 1):
+
+            # add a name with the dictionary, which is read when it is written
+            MySysDict.update({str(CompName) : DeferredValue(self.GetSlots, ParentBlock)})
             
         else:
             
             # add a name with the dictionary
-            MySysDict.update({str(CompName) : TempDict})
+            MySysDict.update({str(CompName) : self.GetSlots(ParentBlock)})
             
         # end if
 
@@ -1078,6 +1961,150 @@ class ADHInstanceWriter():
     # end GetBlock
 
     # -------------------------------------------------------
+
+    @Timed
+    def GetSlots(self, ParentBlock):
+        """
+
+        GetSlots(self, ParentBlock)
+
+        Function to read the slots of an instance specification (its value properties, and the instances of its part properties).
+
+        INPUTS:
+            self        : the ADH instance writer class
+
+            ParentBlock : the instance specification
+
+        OUTPUTS:
+            TempDict    : dictionary representing the nested part and value properties
+
+        """
+
+        # create a dictionary for storing data
+        TempDict = {}
+
+        # get the children of the current block
+        MyChildren = ParentBlock.getSlot()
+
+        # collect the elements of arrays (VarName__i__j__...__k), in any order
+        Arrays = ArrayBuilder()
+        
+        for ichild in range(len(MyChildren)):
+            
+            # get the defining feature
+            MyFeature = MyChildren[ichild].getDefiningFeature()
+            
+            # get the name
+            FeatureName = MyFeature.getHumanName()
+            
+            # get the value
+            MyValue = MyChildren[ichild].getValue()                
+
+            # check for the type of feature
+            if ("Value Property " in FeatureName):
+
+                # get the property name
+                PropertyName = str(FeatureName.split("Value Property ")[1])
+                
+                # get the shape, if the value property holds a compact array
+                Shape = GetArrayShape(MyFeature.getDefaultValue())
+
+                # check for a compact array
+                if (Shape is not None):
+
+                    # the slot holds either a copy of the expression or one literal per value
+                    if (len(MyValue) == 1) and (GetArrayShape(MyValue[0]) is not None):
+
+                        # rebuild the array from the expression
+                        PropertyValue = ReadArrayValue(MyValue[0].getOperand(), GetArrayShape(MyValue[0]))
+
+                    else:
+
+                        # rebuild the array from the literals
+                        PropertyValue = ReadArrayValue(MyValue, Shape)
+
+                    # end if
+
+                else:
+
+                    # get the value
+                    try:
+
+                        # try treating it as an integer/double/string
+                        PropertyValue = MyValue[0].getValue()
+
+                    except:
+
+                        # if it fails, try another method
+                        try:
+
+                            # treat the value as a boolean
+                            PropertyValue = MyValue[0].isValue()
+
+                        except:
+
+                            # return a null value
+                            PropertyValue = None
+
+                            # there is an issue with the value property format/type
+                            raise Exception("ERROR - WriteInstance: " + repr(FeatureName) + " is neither an integer, double, string, or Boolean.")
+
+                        # end try-except
+                    # end try-except
+                # end if
+
+                # check for an element of an array
+                if (Arrays.Add(PropertyName, PropertyValue) == 1):
+
+                    # it is added once the array is complete
+                    continue
+
+                # end if
+
+                # check if the value is unicode
+                if (isinstance(PropertyValue, unicode)):
+
+                    # convert it to a string
+                    PropertyValue = str(PropertyValue)
+
+                # end if
+            
+                # update the dictionary
+                TempDict.update({PropertyName : PropertyValue})
+                                
+            elif ("Part Property " in FeatureName):
+
+                # get the part property name
+                PropertyName = str(FeatureName.split("Part Property ")[1])
+
+                # get the next instance specification
+                NextInst = MyChildren[ichild].getOwnedElement()[0]
+                
+                # get the instance value
+                InstanceValue = NextInst.getInstance()
+
+                # recursively search the model
+                NewDict = self.GetBlock(InstanceValue, 0)
+
+                # check for an element of an array (which is added once the array is complete, and must be named as the part property)
+                if (GetArrayIndices(PropertyName)[0] is None) or (Arrays.Add(PropertyName, NewDict[PropertyName]) == 0):
+
+                    # update the dictionary
+                    TempDict.update(NewDict)
+
+                # end if
+            # end if
+        # end for
+
+        # write out the arrays
+        Arrays.Update(TempDict)
+
+        # return the dictionary
+        return TempDict
+
+    # end GetSlots
+
+    # -------------------------------------------------------
     
 # end ADHInstanceWriter
 